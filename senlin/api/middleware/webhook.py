@@ -10,12 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from six.moves.urllib import parse as urlparse
 import webob
 
 from senlin.api.common import util
 from senlin.api.common import wsgi
+from senlin.common import cache
 from senlin.common import context
 from senlin.common import exception as exc
 from senlin.common.i18n import _
@@ -24,6 +26,9 @@ from senlin.rpc import client as rpc
 
 LOG = logging.getLogger(__name__)
 
+# Actors of the receivers triggered recently, keyed by receiver identity
+_RECEIVERS = cache.ObjectCache('receiver', size=1024)
+
 
 class WebhookMiddleware(wsgi.Middleware):
     """Middleware for authenticating webhook triggering requests.
@@ -48,10 +53,7 @@ class WebhookMiddleware(wsgi.Middleware):
         ctx = context.RequestContext(is_admin=True, api_version=api_version)
         req.context = ctx
 
-        obj = util.parse_request(
-            'ReceiverGetRequest', req, {'identity': receiver_id})
-        rpcc = rpc.EngineClient()
-        receiver = rpcc.call(ctx, 'receiver_get', obj)
+        actor = self._get_actor(req, ctx, receiver_id)
 
         svc_ctx = context.get_service_credentials()
         kwargs = {
@@ -60,12 +62,36 @@ class WebhookMiddleware(wsgi.Middleware):
             'user_domain_name': svc_ctx['user_domain_name'],
             'password': svc_ctx['password']
         }
-        kwargs.update(receiver['actor'])
+        kwargs.update(actor)
 
-        # Get token and fill it into the request header
+        # Get token and fill it into the request header. The connection used
+        # for authenticating is pooled per actor and trust, so the token is
+        # only requested from keystone again when it is about to expire.
         token = self._get_token(**kwargs)
         req.headers['X-Auth-Token'] = token
 
+    def _get_actor(self, req, ctx, receiver_id):
+        """Get the actor of a receiver, from the cache if possible.
+
+        :param req: The webhook trigger request.
+        :param ctx: The context for looking up the receiver.
+        :param receiver_id: The identity of the receiver.
+        :returns: A dict containing the actor of the receiver.
+        """
+        actor = _RECEIVERS.get(receiver_id)
+        if actor is not None:
+            return actor
+
+        obj = util.parse_request(
+            'ReceiverGetRequest', req, {'identity': receiver_id})
+        rpcc = rpc.EngineClient()
+        receiver = rpcc.call(ctx, 'receiver_get', obj)
+
+        ttl = cfg.CONF.receiver.cache_ttl
+        if ttl > 0:
+            _RECEIVERS.put(receiver_id, None, receiver['actor'], ttl=ttl)
+        return receiver['actor']
+
     def _parse_url(self, url):
         """Extract receiver ID from the request URL.
 
@@ -14,6 +14,7 @@
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.common import wsgi
 from senlin.common import consts
 from senlin.common.i18n import _
@@ -66,6 +67,8 @@ class ActionController(wsgi.Controller):
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
         }
+        if req.version_request >= vr.APIVersionRequest('1.11'):
+            whitelist[consts.PARAM_FIELDS] = 'mixed'
         for key in req.params.keys():
             if key not in whitelist.keys():
                 raise exc.HTTPBadRequest(_('Invalid parameter %s') % key)
@@ -75,6 +78,10 @@ class ActionController(wsgi.Controller):
             consts.PARAM_GLOBAL_PROJECT,
             params.pop(consts.PARAM_GLOBAL_PROJECT, False))
         params['project_safe'] = project_safe
+        # Note: 'fields' is the name of the field definitions of the request
+        # object, so the attributes requested are passed as 'attributes'.
+        if consts.PARAM_FIELDS in params:
+            params['attributes'] = params.pop(consts.PARAM_FIELDS)
 
         obj = util.parse_request('ActionListRequest', req, params)
         actions = self.rpc_client.call(req.context, "action_list", obj)
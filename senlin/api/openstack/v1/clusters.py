@@ -18,6 +18,7 @@ Cluster endpoint for Senlin v1 REST API.
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.common import wsgi
 from senlin.common import consts
 from senlin.common.i18n import _
@@ -50,6 +51,8 @@ class ClusterController(wsgi.Controller):
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
         }
+        if req.version_request >= vr.APIVersionRequest('1.11'):
+            whitelist[consts.PARAM_FIELDS] = 'mixed'
         for key in req.params.keys():
             if key not in whitelist:
                 raise exc.HTTPBadRequest(_("Invalid parameter '%s'") % key)
@@ -60,6 +63,10 @@ class ClusterController(wsgi.Controller):
         is_global = params.pop(consts.PARAM_GLOBAL_PROJECT, False)
         unsafe = util.parse_bool_param(consts.PARAM_GLOBAL_PROJECT, is_global)
         params['project_safe'] = not unsafe
+        # Note: 'fields' is the name of the field definitions of the request
+        # object, so the attributes requested are passed as 'attributes'.
+        if consts.PARAM_FIELDS in params:
+            params['attributes'] = params.pop(consts.PARAM_FIELDS)
         req_obj = util.parse_request('ClusterListRequest', req, params)
         clusters = self.rpc_client.call(req.context, 'cluster_list', req_obj)
         return {'clusters': clusters}
@@ -219,11 +226,20 @@ class ClusterController(wsgi.Controller):
                                     'cluster_policy_update', obj)
 
     def _do_check(self, req, cid, data):
+        # The 'recover' parameter is reserved for the health manager
+        if data and 'recover' in data:
+            raise exc.HTTPBadRequest(_("Invalid parameter '%s'") % 'recover')
+
         params = {'identity': cid, 'params': data}
         obj = util.parse_request('ClusterCheckRequest', req, params)
         return self.rpc_client.call(req.context, 'cluster_check', obj)
 
     def _do_recover(self, req, cid, data):
+        # The 'nodes' parameter is supported since microversion 1.11
+        if (data and 'nodes' in data and
+                req.version_request < vr.APIVersionRequest('1.11')):
+            raise exc.HTTPBadRequest(_("Invalid parameter '%s'") % 'nodes')
+
         params = {'identity': cid, 'params': data}
         obj = util.parse_request('ClusterRecoverRequest', req, params)
         return self.rpc_client.call(req.context, 'cluster_recover', obj)
@@ -17,6 +17,7 @@ Event endpoint for Senlin v1 REST API.
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.common import wsgi
 from senlin.common import consts
 from senlin.common.i18n import _
@@ -43,6 +44,8 @@ class EventController(wsgi.Controller):
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
         }
+        if req.version_request >= vr.APIVersionRequest('1.11'):
+            whitelist[consts.PARAM_FIELDS] = 'mixed'
 
         for key in req.params.keys():
             if key not in whitelist.keys():
@@ -53,6 +56,10 @@ class EventController(wsgi.Controller):
             consts.PARAM_GLOBAL_PROJECT,
             params.pop(consts.PARAM_GLOBAL_PROJECT, False))
         params['project_safe'] = project_safe
+        # Note: 'fields' is the name of the field definitions of the request
+        # object, so the attributes requested are passed as 'attributes'.
+        if consts.PARAM_FIELDS in params:
+            params['attributes'] = params.pop(consts.PARAM_FIELDS)
 
         obj = util.parse_request('EventListRequest', req, params)
         events = self.rpc_client.call(req.context, "event_list", obj)
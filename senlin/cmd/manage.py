@@ -47,10 +47,31 @@ def do_event_purge():
     if CONF.command.age < 0:
         print(_("age must be a positive integer."))
         return
-    api.event_purge(api.get_engine(),
-                    CONF.command.project_id,
-                    CONF.command.granularity,
-                    CONF.command.age)
+    if CONF.command.batch_size is not None and CONF.command.batch_size < 1:
+        print(_("batch-size must be a positive integer."))
+        return
+    count = api.event_purge(api.get_engine(),
+                            CONF.command.project_id,
+                            CONF.command.granularity,
+                            CONF.command.age,
+                            batch_size=CONF.command.batch_size)
+    print(_("%s event records purged.") % count)
+
+
+def do_action_purge():
+    '''Purge the finished action records in senlin's database.'''
+    if CONF.command.age < 0:
+        print(_("age must be a positive integer."))
+        return
+    if CONF.command.batch_size is not None and CONF.command.batch_size < 1:
+        print(_("batch-size must be a positive integer."))
+        return
+    count = api.action_purge(api.get_engine(),
+                             CONF.command.project_id,
+                             CONF.command.granularity,
+                             CONF.command.age,
+                             batch_size=CONF.command.batch_size)
+    print(_("%s action records purged.") % count)
 
 
 class ServiceManageCommand(object):
@@ -147,6 +168,13 @@ def add_command_parsers(subparsers):
                                "by age and granularity, whose value must be "
                                "one of 'days', 'hours', 'minutes' or "
                                "'seconds' (default)."))
+    parser.add_argument('-b',
+                        '--batch-size',
+                        type=int,
+                        default=None,
+                        help=_("Maximum number of event records deleted in "
+                               "one transaction. Defaults to the value of "
+                               "the event_purge_batch_size option."))
     parser.add_argument('age',
                         type=int,
                         default=30,
@@ -157,6 +185,41 @@ def add_command_parsers(subparsers):
                                "events created two hours ago. Defaults to "
                                "30."))
 
+    parser = subparsers.add_parser('action_purge')
+    parser.set_defaults(func=do_action_purge)
+    parser.add_argument('-p',
+                        '--project-id',
+                        nargs='?',
+                        metavar='<project1;project2...>',
+                        help=_("Purge action records with specified project. "
+                               "This can be specified multiple times, or once "
+                               "with parameters separated by semicolon."),
+                        action='append')
+    parser.add_argument('-g',
+                        '--granularity',
+                        default='days',
+                        choices=['days', 'hours', 'minutes', 'seconds'],
+                        help=_("Purge action records which were finished in "
+                               "the specified time period. The time is "
+                               "specified by age and granularity, whose value "
+                               "must be one of 'days' (default), 'hours', "
+                               "'minutes' or 'seconds'."))
+    parser.add_argument('-b',
+                        '--batch-size',
+                        type=int,
+                        default=None,
+                        help=_("Maximum number of action records deleted in "
+                               "one transaction. Defaults to the value of "
+                               "the action_purge_batch_size option."))
+    parser.add_argument('age',
+                        type=int,
+                        default=30,
+                        help=_("Purge action records which were finished in "
+                               "the specified time period. The time is "
+                               "specified by age and granularity. Only the "
+                               "actions SUCCEEDED, FAILED or CANCELLED are "
+                               "purged. Defaults to 30."))
+
 
 command_opt = cfg.SubCommandOpt('command',
                                 title='Commands',
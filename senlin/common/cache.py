@@ -0,0 +1,116 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A bounded LRU cache for objects reconstructed from database records."""
+
+import collections
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+_ANY = object()
+
+
+class ObjectCache(object):
+    """A bounded, least-recently-used cache of objects.
+
+    Each entry is keyed by the ID of the object and is tagged with a version,
+    which is the ``updated_at`` timestamp of the database record the object
+    was built from. A lookup with an explicit version only hits if the cached
+    entry was built from the same version of the record. An entry can also be
+    given a time-to-live, after which it is dropped from the cache.
+
+    The cache is local to an engine process. Objects are expected to be
+    treated as templates by callers, i.e. callers should make a copy before
+    modifying any cached object.
+    """
+
+    def __init__(self, name, size=None, size_opt='object_cache_size'):
+        self.name = name
+        self._size = size
+        self._size_opt = size_opt
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        if self._size is not None:
+            return self._size
+        return getattr(cfg.CONF, self._size_opt)
+
+    def get(self, key, version=_ANY):
+        """Get an object from the cache.
+
+        :param key: The ID of the object.
+        :param version: Optional version the cached object must match.
+        :returns: The cached object or None if there is no valid entry.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[3] is not None:
+            if timeutils.is_older_than(entry[2], entry[3]):
+                del self._entries[key]
+                entry = None
+
+        if entry is None or (version is not _ANY and entry[0] != version):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        # mark the entry as the most recently used one
+        del self._entries[key]
+        self._entries[key] = entry
+        return entry[1]
+
+    def put(self, key, version, obj, ttl=None):
+        """Add or replace an object in the cache.
+
+        :param key: The ID of the object.
+        :param version: The version of the object.
+        :param obj: The object to cache.
+        :param ttl: Optional number of seconds the object can be got from the
+                    cache. Defaults to no expiry.
+        :returns: None
+        """
+        size = self.size
+        if size <= 0:
+            return
+
+        cached_at = timeutils.utcnow() if ttl is not None else None
+        self._entries.pop(key, None)
+        self._entries[key] = (version, obj, cached_at, ttl)
+        while len(self._entries) > size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Remove an object from the cache, if it is there."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all objects and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Get the statistics of the cache.
+
+        :returns: A dict containing the number of entries, the capacity and
+                  the hit/miss counters of the cache.
+        """
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'size': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -30,7 +30,18 @@ service_opts = [
                help=_('Default region name used to get services endpoints.')),
     cfg.IntOpt('max_response_size',
                default=524288,
-               help=_('Maximum raw byte size of data from web response.'))
+               help=_('Maximum raw byte size of data from web response.')),
+    cfg.IntOpt('connection_pool_size',
+               default=128, min=0,
+               help=_('Maximum number of authenticated connections to the '
+                      'OpenStack services each process keeps for reuse. '
+                      'A value of 0 disables the pooling.')),
+    cfg.IntOpt('connection_ttl',
+               default=3600, min=1,
+               help=_('Maximum seconds a pooled connection is reused before '
+                      'it is re-created with fresh credentials. A connection '
+                      'is also re-created when its token is about to '
+                      'expire.')),
 ]
 
 cfg.CONF.register_opts(service_opts)
@@ -72,19 +83,98 @@ engine_opts = [
                help=_('Timeout in seconds for actions.')),
     cfg.IntOpt('max_actions_per_batch',
                default=0,
+               deprecated_for_removal=True,
+               deprecated_reason=_('Use the action_rate_limits option '
+                                   'instead.'),
                help=_('Maximum number of node actions that each engine worker '
-                      'can schedule consecutively per batch. 0 means no '
-                      'limit.')),
+                      'can start per batch interval, unless a rate limit is '
+                      'set for node actions by the action_rate_limits '
+                      'option. 0 means no limit.')),
     cfg.IntOpt('batch_interval',
                default=3,
-               help=_('Seconds to pause between scheduling two consecutive '
-                      'batches of node actions.')),
+               deprecated_for_removal=True,
+               deprecated_reason=_('Use the action_rate_limits option '
+                                   'instead.'),
+               help=_('Length in seconds of the batch interval during which '
+                      'at most max_actions_per_batch node actions are '
+                      'started.')),
+    cfg.DictOpt('action_rate_limits',
+                default={},
+                help=_('Maximum rates at which each engine starts actions. '
+                       'The keys are action names, e.g. NODE_CREATE, or the '
+                       'prefixes of action names, e.g. NODE for all node '
+                       'actions. The values are in the form of '
+                       '<count>[:<seconds>], e.g. NODE:50:10 allows up to 50 '
+                       'node actions every 10 seconds. The seconds default '
+                       'to 1. Actions exceeding the rates stay ready until '
+                       'the rates allow starting them.')),
+    cfg.IntOpt('max_actions_per_acquire',
+               default=32, min=1,
+               help=_('Maximum number of ready actions that each engine '
+                      'worker claims from the database in one round-trip.')),
+    cfg.ListOpt('action_priority_weights',
+                item_type=cfg.types.Integer(min=1),
+                default=[8, 4, 1],
+                help=_('Relative shares of the scheduling slots given to the '
+                       'ready actions of the high, normal and low priority '
+                       'classes respectively. Actions recovering or checking '
+                       'clusters and nodes are of high priority, actions '
+                       'requested by users are of normal priority and '
+                       'actions derived from other actions are of low '
+                       'priority.')),
+    cfg.IntOpt('max_running_actions_per_engine',
+               default=0, min=0,
+               help=_('Maximum number of derived actions each engine runs '
+                      'concurrently. 0 means no limit.')),
+    cfg.IntOpt('max_running_actions_per_project',
+               default=0, min=0,
+               help=_('Maximum number of derived actions of a project each '
+                      'engine runs concurrently. 0 means no limit.')),
+    cfg.IntOpt('max_running_actions_per_cluster',
+               default=0, min=0,
+               help=_('Maximum number of derived actions targeting a cluster '
+                      'or its nodes each engine runs concurrently. 0 means '
+                      'no limit.')),
+    cfg.IntOpt('node_check_concurrency',
+               default=10, min=1,
+               help=_('Maximum number of nodes of a cluster checked '
+                      'concurrently when the profile of the nodes does not '
+                      'support checking them in bulk.')),
+    cfg.IntOpt('node_check_batch_threshold',
+               default=20, min=1,
+               help=_('Minimum number of nodes sharing a profile for them '
+                      'to be checked with a filtered list of their physical '
+                      'objects when the profile supports it. Fewer nodes are '
+                      'checked one by one.')),
+    cfg.IntOpt('node_check_timeout',
+               default=60, min=1,
+               help=_('Timeout in seconds for checking a single node of a '
+                      'cluster being health checked. A node whose check '
+                      'times out is considered unhealthy.')),
+    cfg.IntOpt('dependency_check_interval',
+               default=10, min=1,
+               help=_('Maximum seconds an action waits before checking the '
+                      'status of its depended actions in the database. '
+                      'Depended actions executed by the same engine wake up '
+                      'the waiting action immediately when they complete.')),
+    cfg.IntOpt('object_cache_size',
+               default=256, min=0,
+               help=_('Maximum number of parsed profile objects and of parsed '
+                      'policy objects each engine keeps in memory. A value '
+                      'of 0 disables the caching.')),
     cfg.IntOpt('lock_retry_times',
                default=3,
                help=_('Number of times trying to grab a lock.')),
     cfg.IntOpt('lock_retry_interval',
                default=10,
                help=_('Number of seconds between lock retries.')),
+    cfg.IntOpt('lock_wait_timeout',
+               default=3, min=0,
+               help=_('Maximum number of seconds an action waits for a '
+                      'cluster lock held by other actions of the same '
+                      'engine before falling back to retrying the lock. '
+                      'The retries add a few seconds to the total wait, '
+                      'after which the action is rescheduled.')),
     cfg.IntOpt('database_retry_limit',
                default=10,
                help=_('Number of times retrying a failed operation on the '
@@ -107,6 +197,26 @@ engine_opts = [
                default=60,
                help=_('Maximum time since last check-in for a service to be '
                       'considered up.')),
+    cfg.IntOpt('max_list_limit',
+               default=1000, min=1,
+               help=_('Maximum number of records returned by a request '
+                      'listing events or actions. A request asking for more '
+                      'records, or not setting a limit, gets at most this '
+                      'number of records and has to use the marker of the '
+                      'last record to get the following ones.')),
+    cfg.IntOpt('action_purge_batch_size',
+               default=100, min=1,
+               help=_('Maximum number of action records deleted in one '
+                      'transaction when purging actions.')),
+    cfg.IntOpt('action_retention_days',
+               default=0, min=0,
+               help=_('Number of days the records of finished actions are '
+                      'kept in the database before being purged by the '
+                      'engine. A value of 0 disables the periodic purge.')),
+    cfg.IntOpt('action_purge_interval',
+               default=3600, min=1,
+               help=_('Seconds between two runs of the periodic purge of '
+                      'action records.')),
 ]
 cfg.CONF.register_opts(engine_opts)
 
@@ -130,7 +240,17 @@ cfg.CONF.register_opts(cloud_backend_opts)
 # DEFAULT, event dispatchers
 event_opts = [
     cfg.MultiStrOpt("event_dispatchers", default=['database'],
-                    help=_("Event dispatchers to enable."))]
+                    help=_("Event dispatchers to enable.")),
+    cfg.IntOpt("event_purge_batch_size", default=1000, min=1,
+               help=_("Maximum number of event records deleted in one "
+                      "transaction when purging events.")),
+    cfg.IntOpt("event_retention_days", default=0, min=0,
+               help=_("Number of days event records are kept in the "
+                      "database before being purged by the engine. A value "
+                      "of 0 disables the periodic purge.")),
+    cfg.IntOpt("event_purge_interval", default=3600, min=1,
+               help=_("Seconds between two runs of the periodic purge of "
+                      "event records."))]
 cfg.CONF.register_opts(event_opts)
 
 # Dispatcher section
@@ -140,7 +260,20 @@ dispatcher_opts = [
                choices=("critical", "error", "warning", "info", "debug"),
                help=_("Lowest event priorities to be dispatched.")),
     cfg.BoolOpt("exclude_derived_actions", default=True,
-                help=_("Exclude derived actions from events dumping."))]
+                help=_("Exclude derived actions from events dumping.")),
+    cfg.IntOpt("database_queue_size", default=10000, min=0,
+               help=_("Maximum number of events buffered in memory by the "
+                      "database dispatcher before being written to the "
+                      "database in the background. Dumping an event blocks "
+                      "while the buffer is full. A value of 0 disables the "
+                      "buffering, i.e. each event is written when dumped.")),
+    cfg.IntOpt("database_batch_size", default=100, min=1,
+               help=_("Maximum number of events the database dispatcher "
+                      "writes to the database in one statement.")),
+    cfg.FloatOpt("database_flush_interval", default=1.0, min=0,
+                 help=_("Maximum seconds an event buffered by the database "
+                        "dispatcher waits for other events to be written "
+                        "along with it."))]
 
 cfg.CONF.register_group(dispatcher_group)
 cfg.CONF.register_opts(dispatcher_opts, group=dispatcher_group)
@@ -173,6 +306,17 @@ healthmgr_opts = [
                help=_("Exchange name for heat notifications.")),
     cfg.MultiStrOpt("enabled_endpoints", default=['nova', 'heat'],
                     help=_("Notification endpoints to enable.")),
+    cfg.IntOpt('poll_url_concurrency', default=32, min=1,
+               help=_("Maximum number of nodes of a cluster whose health "
+                      "URL is polled concurrently.")),
+    cfg.IntOpt('poll_url_timeout', default=10, min=1,
+               help=_("Timeout in seconds for a single request to the "
+                      "health URL of a node.")),
+    cfg.IntOpt('recover_batch_window', default=5, min=0,
+               help=_("Number of seconds during which the node failure "
+                      "events of a cluster received from notifications are "
+                      "collected before a single recover request is sent "
+                      "for all the nodes of the cluster found failed.")),
 ]
 cfg.CONF.register_group(healthmgr_group)
 cfg.CONF.register_opts(healthmgr_opts, group=healthmgr_group)
@@ -201,7 +345,12 @@ receiver_opts = [
                        'behind a proxy.')),
     cfg.IntOpt('max_message_size', default=65535,
                help=_('The max size(bytes) of message can be posted to '
-                      'receiver queue.'))
+                      'receiver queue.')),
+    cfg.IntOpt('cache_ttl', default=60, min=0,
+               help=_('Seconds the API service keeps the details of a '
+                      'webhook receiver after it is triggered, so that '
+                      'repeated triggers do not look the receiver up from '
+                      'the engine. A value of 0 disables the caching.')),
 ]
 cfg.CONF.register_group(receiver_group)
 cfg.CONF.register_opts(receiver_opts, group=receiver_group)
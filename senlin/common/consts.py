@@ -28,10 +28,10 @@ RPC_ATTRS = (
 
 RPC_PARAMS = (
     PARAM_LIMIT, PARAM_MARKER, PARAM_GLOBAL_PROJECT,
-    PARAM_SHOW_DETAILS, PARAM_SORT,
+    PARAM_SHOW_DETAILS, PARAM_SORT, PARAM_FIELDS,
 ) = (
     'limit', 'marker', 'global_project',
-    'show_details', 'sort',
+    'show_details', 'sort', 'fields',
 )
 
 SUPPORT_STATUSES = (
@@ -133,6 +133,14 @@ CLUSTER_SORT_KEYS = [
     CLUSTER_INIT_AT, CLUSTER_CREATED_AT, CLUSTER_UPDATED_AT,
 ]
 
+# Keys of a cluster that can be selected when listing clusters
+CLUSTER_LIST_FIELDS = [
+    'id', 'name', 'profile_id', 'profile_name', 'user', 'project', 'domain',
+    'init_at', 'created_at', 'updated_at', 'min_size', 'max_size',
+    'desired_capacity', 'timeout', 'status', 'status_reason', 'metadata',
+    'data', 'dependents', 'config', 'nodes', 'policies',
+]
+
 NODE_ATTRS = (
     NODE_INDEX, NODE_NAME, NODE_PROFILE_ID, NODE_CLUSTER_ID,
     NODE_INIT_AT, NODE_CREATED_AT, NODE_UPDATED_AT,
@@ -148,6 +156,14 @@ NODE_SORT_KEYS = [
     NODE_INIT_AT, NODE_CREATED_AT, NODE_UPDATED_AT,
 ]
 
+# Keys of a node that can be selected when listing nodes
+NODE_LIST_FIELDS = [
+    'id', 'name', 'cluster_id', 'physical_id', 'profile_id', 'profile_name',
+    'user', 'project', 'domain', 'index', 'role', 'init_at', 'created_at',
+    'updated_at', 'status', 'status_reason', 'data', 'metadata',
+    'dependents',
+]
+
 NODE_PARAMS = (
     NODE_DELETE_FORCE,
 ) = (
@@ -208,6 +224,11 @@ EVENT_SORT_KEYS = [
     EVENT_ACTION, EVENT_STATUS, EVENT_OBJ_ID, EVENT_CLUSTER_ID,
 ]
 
+EVENT_LIST_FIELDS = [
+    'id', 'timestamp', 'oid', 'oname', 'otype', 'cluster_id', 'level', 'user',
+    'project', 'action', 'status', 'status_reason', 'meta_data',
+]
+
 ACTION_ATTRS = (
     ACTION_NAME, ACTION_TARGET, ACTION_ACTION, ACTION_CAUSE,
     ACTION_INTERVAL, ACTION_START_TIME, ACTION_END_TIME,
@@ -227,6 +248,14 @@ ACTION_SORT_KEYS = [
     ACTION_STATUS,
 ]
 
+# Keys of an action that can be selected when listing actions
+ACTION_LIST_FIELDS = [
+    'id', 'name', 'action', 'target', 'cause', 'owner', 'interval',
+    'start_time', 'end_time', 'timeout', 'status', 'status_reason', 'inputs',
+    'outputs', 'depends_on', 'depended_by', 'created_at', 'updated_at',
+    'data', 'user', 'project',
+]
+
 RECEIVER_TYPES = (
     RECEIVER_WEBHOOK, RECEIVER_MESSAGE,
 ) = (
@@ -266,6 +295,23 @@ ACTION_STATUSES = (
     'SUSPENDED',
 )
 
+# Statuses of the actions that have finished
+ACTION_FINAL_STATUSES = (
+    ACTION_SUCCEEDED, ACTION_FAILED, ACTION_CANCELLED,
+)
+
+ACTION_PRIORITIES = (
+    ACTION_PRIORITY_HIGH, ACTION_PRIORITY_NORMAL, ACTION_PRIORITY_LOW,
+) = (
+    0, 1, 2,
+)
+
+# Actions restoring the health of clusters and nodes are scheduled before
+# any other action
+ACTION_HIGH_PRIORITY = (
+    CLUSTER_CHECK, CLUSTER_RECOVER, NODE_CHECK, NODE_RECOVER,
+)
+
 EVENT_LEVELS = {
     'CRITICAL': logging.CRITICAL,
     'ERROR': logging.ERROR,
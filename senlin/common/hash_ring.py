@@ -0,0 +1,56 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A consistent hash ring for distributing keys across engines."""
+
+import bisect
+import hashlib
+
+from oslo_utils import encodeutils
+
+# Number of points each node occupies on the ring
+REPLICAS = 128
+
+
+def _hash(key):
+    digest = hashlib.md5(encodeutils.safe_encode(key)).hexdigest()
+    return int(digest[:16], 16)
+
+
+class HashRing(object):
+    """A consistent hash ring.
+
+    Each node is placed at a number of points on the ring and a key is
+    mapped to the node owning the first point found clockwise from the hash
+    of the key. When a node joins or leaves the ring, only the keys mapped
+    to the points of that node move, i.e. about 1/N of the keys for a ring
+    of N nodes, while the other keys stay where they are.
+    """
+
+    def __init__(self, nodes, replicas=REPLICAS):
+        self.nodes = sorted(set(nodes))
+        self._ring = sorted(
+            (_hash('%s-%s' % (node, i)), node)
+            for node in self.nodes for i in range(replicas))
+        self._points = [p for p, _node in self._ring]
+
+    def get_node(self, key):
+        """Get the node a key is mapped to.
+
+        :param key: A string key, e.g. the ID of a cluster.
+        :returns: The node owning the key or None if the ring is empty.
+        """
+        if not self._ring:
+            return None
+
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._ring[index][1]
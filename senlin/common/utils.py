@@ -88,12 +88,14 @@ def level_from_number(value):
     return levels.get(n, None)
 
 
-def url_fetch(url, allowed_schemes=('http', 'https'), verify=True):
+def url_fetch(url, allowed_schemes=('http', 'https'), verify=True,
+              timeout=None, session=None):
     '''Get the data at the specified URL.
 
     The URL must use the http: or https: schemes.
     The file: scheme is also supported if you override
-    the allowed_schemes argument.
+    the allowed_schemes argument. An optional ``requests.Session`` can be
+    given so that connections are kept alive and reused across calls.
     Raise an IOError if getting the data fails.
     '''
     LOG.info('Fetching data from %s', url)
@@ -110,7 +112,8 @@ def url_fetch(url, allowed_schemes=('http', 'https'), verify=True):
             raise URLFetchError(_('Failed to retrieve data: %s') % uex)
 
     try:
-        resp = requests.get(url, stream=True, verify=verify)
+        resp = (session or requests).get(url, stream=True, verify=verify,
+                                         timeout=timeout)
         resp.raise_for_status()
 
         # We cannot use resp.text here because it would download the entire
@@ -125,6 +128,7 @@ def url_fetch(url, allowed_schemes=('http', 'https'), verify=True):
         for chunk in reader:
             result += chunk
             if len(result) > cfg.CONF.max_response_size:
+                resp.close()
                 raise URLFetchError("Data exceeds maximum allowed size (%s"
                                     " bytes)" % cfg.CONF.max_response_size)
         return result
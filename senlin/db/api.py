@@ -51,13 +51,14 @@ def cluster_get_by_short_id(context, short_id, project_safe=True):
 
 
 def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                    project_safe=True):
+                    project_safe=True, columns=None):
     return IMPL.cluster_get_all(context, limit=limit, marker=marker, sort=sort,
-                                filters=filters, project_safe=project_safe)
+                                filters=filters, project_safe=project_safe,
+                                columns=columns)
 
 
-def cluster_next_index(context, cluster_id):
-    return IMPL.cluster_next_index(context, cluster_id)
+def cluster_next_index(context, cluster_id, count=1):
+    return IMPL.cluster_next_index(context, cluster_id, count=count)
 
 
 def cluster_count_all(context, filters=None, project_safe=True):
@@ -78,6 +79,10 @@ def node_create(context, values):
     return IMPL.node_create(context, values)
 
 
+def node_create_batch(context, values_list):
+    return IMPL.node_create_batch(context, values_list)
+
+
 def node_get(context, node_id, project_safe=True):
     return IMPL.node_get(context, node_id, project_safe=project_safe)
 
@@ -92,10 +97,10 @@ def node_get_by_short_id(context, short_id, project_safe=True):
 
 
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
-                 filters=None, project_safe=True):
+                 filters=None, project_safe=True, columns=None):
     return IMPL.node_get_all(context, cluster_id=cluster_id, filters=filters,
                              limit=limit, marker=marker, sort=sort,
-                             project_safe=project_safe)
+                             project_safe=project_safe, columns=columns)
 
 
 def node_get_all_by_cluster(context, cluster_id, filters=None,
@@ -116,6 +121,10 @@ def node_update(context, node_id, values):
     return IMPL.node_update(context, node_id, values)
 
 
+def node_update_status_batch(context, statuses, timestamp):
+    return IMPL.node_update_status_batch(context, statuses, timestamp)
+
+
 def node_migrate(context, node_id, to_cluster, timestamp, role=None):
     return IMPL.node_migrate(context, node_id, to_cluster, timestamp, role)
 
@@ -276,6 +285,10 @@ def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_batch(context, values_list):
+    return IMPL.event_create_batch(context, values_list)
+
+
 def event_get(context, event_id, project_safe=True):
     return IMPL.event_get(context, event_id, project_safe=project_safe)
 
@@ -286,9 +299,10 @@ def event_get_by_short_id(context, short_id, project_safe=True):
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                  project_safe=True):
+                  project_safe=True, columns=None):
     return IMPL.event_get_all(context, limit=limit, marker=marker, sort=sort,
-                              filters=filters, project_safe=project_safe)
+                              filters=filters, project_safe=project_safe,
+                              columns=columns)
 
 
 def event_count_by_cluster(context, cluster_id, project_safe=True):
@@ -312,15 +326,28 @@ def action_create(context, values):
     return IMPL.action_create(context, values)
 
 
+def action_create_batch(context, values_list):
+    return IMPL.action_create_batch(context, values_list)
+
+
 def action_update(context, action_id, values):
     return IMPL.action_update(context, action_id, values)
 
 
+def action_update_batch(context, action_ids, values):
+    return IMPL.action_update_batch(context, action_ids, values)
+
+
 def action_get(context, action_id, project_safe=True, refresh=False):
     return IMPL.action_get(context, action_id, project_safe=project_safe,
                            refresh=refresh)
 
 
+def action_get_status(context, action_id):
+    '''Get the status of an action without loading the whole record.'''
+    return IMPL.action_get_status(context, action_id)
+
+
 def action_get_by_name(context, name, project_safe=True):
     return IMPL.action_get_by_name(context, name, project_safe=project_safe)
 
@@ -335,10 +362,10 @@ def action_get_all_by_owner(context, owner):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
+                   project_safe=True, columns=None):
     return IMPL.action_get_all(context, filters=filters, sort=sort,
                                limit=limit, marker=marker,
-                               project_safe=project_safe)
+                               project_safe=project_safe, columns=columns)
 
 
 def action_check_status(context, action_id, timestamp):
@@ -392,6 +419,17 @@ def action_acquire_first_ready(context, owner, timestamp):
     return IMPL.action_acquire_first_ready(context, owner, timestamp)
 
 
+def action_get_all_ready(context, limit_per_project=None):
+    return IMPL.action_get_all_ready(context,
+                                     limit_per_project=limit_per_project)
+
+
+def action_acquire_batch(context, owner, timestamp, limit=None,
+                         action_ids=None):
+    return IMPL.action_acquire_batch(context, owner, timestamp, limit=limit,
+                                     action_ids=action_ids)
+
+
 def action_abandon(context, action_id, values=None):
     return IMPL.action_abandon(context, action_id, values)
 
@@ -415,6 +453,11 @@ def action_delete(context, action_id):
     return IMPL.action_delete(context, action_id)
 
 
+def action_purge(engine, project, granularity, age, batch_size=None):
+    """Purge the finished action records in database."""
+    return IMPL.action_purge(project, granularity, age, batch_size=batch_size)
+
+
 def receiver_create(context, values):
     return IMPL.receiver_create(context, values)
 
@@ -486,8 +529,8 @@ def registry_delete(context, cluster_id):
     return IMPL.registry_delete(context, cluster_id)
 
 
-def registry_claim(context, engine_id):
-    return IMPL.registry_claim(context, engine_id)
+def registry_claim(context, engine_id, ring=None):
+    return IMPL.registry_claim(context, engine_id, ring=ring)
 
 
 def registry_get(context, cluster_id):
@@ -498,6 +541,10 @@ def registry_get_by_param(context, params):
     return IMPL.registry_get_by_param(context, params)
 
 
+def registry_get_all_by_engine(context, engine_id):
+    return IMPL.registry_get_all_by_engine(context, engine_id)
+
+
 def db_sync(engine, version=None):
     """Migrate the database to `version` or the most recent version."""
     return IMPL.db_sync(engine, version=version)
@@ -508,6 +555,6 @@ def db_version(engine):
     return IMPL.db_version(engine)
 
 
-def event_purge(engine, project, granularity, age):
+def event_purge(engine, project, granularity, age, batch_size=None):
     """Purge the event records in database."""
-    return IMPL.event_purge(project, granularity, age)
+    return IMPL.event_purge(project, granularity, age, batch_size=batch_size)
@@ -14,6 +14,7 @@
 Implementation of SQLAlchemy backend.
 """
 
+import collections
 import datetime
 import six
 import sys
@@ -27,8 +28,12 @@ from oslo_db.sqlalchemy import enginefacade
 from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_log import log as logging
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
+from oslo_utils import versionutils
 import osprofiler.sqlalchemy
 import sqlalchemy
+from sqlalchemy import orm
+from sqlalchemy.orm import attributes
 from sqlalchemy.orm import joinedload_all
 from sqlalchemy.sql.expression import func
 
@@ -93,8 +98,42 @@ def model_query(context, *args):
         return query
 
 
-def query_by_short_id(context, model, short_id, project_safe=True):
-    q = model_query(context, model)
+def _paginate_query(context, query, model, limit=None, marker=None,
+                    sort=None, default_key=None, columns=None):
+    """Get a page of the records matching a query.
+
+    The page is located with a keyset predicate on the sort keys, which
+    always end with ``id``, so that no row is skipped or repeated.
+
+    :param context: The request context.
+    :param query: The query to paginate.
+    :param model: The model class of the records.
+    :param limit: Maximum number of records returned.
+    :param marker: ID of the last record of the previous page.
+    :param sort: A string containing the sorting parameters.
+    :param default_key: Key used for sorting if ``sort`` is not specified.
+    :param columns: An optional list of the names of the columns to load.
+                    The other columns are not loaded, e.g. to avoid reading
+                    large JSON blobs that are not needed.
+    :return: A list of the records in the page.
+    """
+    if columns:
+        query = query.options(orm.load_only(*set(columns) | set(['id'])))
+
+    keys, dirs = utils.get_sort_params(sort, default_key)
+    if marker:
+        # only the sort keys of the marker are needed to locate the page
+        sort_columns = [getattr(model, k) for k in keys]
+        with session_for_read() as session:
+            marker = session.query(*sort_columns).filter(
+                model.id == marker).first()
+
+    return sa_utils.paginate_query(query, model, limit, keys,
+                                   marker=marker, sort_dirs=dirs).all()
+
+
+def query_by_short_id(context, model, short_id, project_safe=True, query=None):
+    q = query if query is not None else model_query(context, model)
     q = q.filter(model.id.like('%s%%' % short_id))
 
     if project_safe:
@@ -108,8 +147,8 @@ def query_by_short_id(context, model, short_id, project_safe=True):
         raise exception.MultipleChoices(arg=short_id)
 
 
-def query_by_name(context, model, name, project_safe=True):
-    q = model_query(context, model)
+def query_by_name(context, model, name, project_safe=True, query=None):
+    q = query if query is not None else model_query(context, model)
     q = q.filter_by(name=name)
 
     if project_safe:
@@ -164,20 +203,24 @@ def _query_cluster_get_all(context, project_safe=True):
 
 
 def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                    project_safe=True):
+                    project_safe=True, columns=None):
     query = _query_cluster_get_all(context, project_safe=project_safe)
     if filters:
         query = utils.exact_filter(query, models.Cluster, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.CLUSTER_INIT_AT)
-    if marker:
-        marker = model_query(context, models.Cluster).get(marker)
+    return _paginate_query(context, query, models.Cluster, limit=limit,
+                           marker=marker, sort=sort,
+                           default_key=consts.CLUSTER_INIT_AT,
+                           columns=columns)
 
-    return sa_utils.paginate_query(query, models.Cluster, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
 
+def cluster_next_index(context, cluster_id, count=1):
+    """Reserve node indexes of a cluster.
 
-def cluster_next_index(context, cluster_id):
+    :param cluster_id: ID of the cluster.
+    :param count: Number of consecutive indexes to reserve.
+    :return: The first index reserved, or 0 if the cluster is not found.
+    """
     with session_for_write() as session:
         cluster = session.query(models.Cluster).with_for_update().get(
             cluster_id)
@@ -185,7 +228,7 @@ def cluster_next_index(context, cluster_id):
             return 0
 
         next_index = cluster.next_index
-        cluster.next_index = cluster.next_index + 1
+        cluster.next_index = cluster.next_index + count
         cluster.save(session)
         return next_index
 
@@ -242,8 +285,36 @@ def node_create(context, values):
         return node
 
 
+@retry_on_deadlock
+def node_create_batch(context, values_list):
+    """Create nodes in a batch.
+
+    :param values_list: A list of dictionaries, one for each node.
+    :return: A list of the IDs of the nodes created, in the same order.
+    """
+    rows = [dict(values) for values in values_list]
+    for row in rows:
+        row.setdefault('id', uuidutils.generate_uuid())
+
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Node, rows)
+
+    return [row['id'] for row in rows]
+
+
+def _node_query(context):
+    """Query nodes with the profile columns needed by node objects.
+
+    Only the profile name and creation time are loaded along with each node
+    row, the profile spec and context are not retrieved.
+    """
+    query = model_query(context, models.Node)
+    return query.options(orm.joinedload(models.Node.profile).load_only(
+        models.Profile.name, models.Profile.created_at))
+
+
 def node_get(context, node_id, project_safe=True):
-    node = model_query(context, models.Node).get(node_id)
+    node = _node_query(context).get(node_id)
     if not node:
         return None
 
@@ -255,16 +326,18 @@ def node_get(context, node_id, project_safe=True):
 
 
 def node_get_by_name(context, name, project_safe=True):
-    return query_by_name(context, models.Node, name, project_safe=project_safe)
+    return query_by_name(context, models.Node, name, project_safe=project_safe,
+                         query=_node_query(context))
 
 
 def node_get_by_short_id(context, short_id, project_safe=True):
     return query_by_short_id(context, models.Node, short_id,
-                             project_safe=project_safe)
+                             project_safe=project_safe,
+                             query=_node_query(context))
 
 
 def _query_node_get_all(context, project_safe=True, cluster_id=None):
-    query = model_query(context, models.Node)
+    query = _node_query(context)
 
     if cluster_id is not None:
         query = query.filter_by(cluster_id=cluster_id)
@@ -276,18 +349,16 @@ def _query_node_get_all(context, project_safe=True, cluster_id=None):
 
 
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
-                 filters=None, project_safe=True):
+                 filters=None, project_safe=True, columns=None):
     query = _query_node_get_all(context, project_safe=project_safe,
                                 cluster_id=cluster_id)
 
     if filters:
         query = utils.exact_filter(query, models.Node, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.NODE_INIT_AT)
-    if marker:
-        marker = model_query(context, models.Node).get(marker)
-    return sa_utils.paginate_query(query, models.Node, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return _paginate_query(context, query, models.Node, limit=limit,
+                           marker=marker, sort=sort,
+                           default_key=consts.NODE_INIT_AT, columns=columns)
 
 
 def node_get_all_by_cluster(context, cluster_id, filters=None,
@@ -348,6 +419,60 @@ def node_update(context, node_id, values):
                 cluster.save(session)
 
 
+@retry_on_deadlock
+def node_update_status_batch(context, statuses, timestamp):
+    """Update the status of a group of nodes in one transaction.
+
+    Nodes sharing the same new status and reason are updated by a single
+    statement. The clusters of the nodes are updated as node_update does,
+    i.e. their status reason is set to the one of their last node updated,
+    and they are set to WARNING status if any of their nodes turns into
+    ERROR status.
+
+    :param statuses: A dict mapping the IDs of the nodes to be updated to
+                     tuples of their new status and status reason.
+    :param timestamp: The timestamp of the update.
+    :return: The number of nodes updated.
+    """
+    if not statuses:
+        return 0
+
+    groups = {}
+    for node_id, value in statuses.items():
+        groups.setdefault(value, []).append(node_id)
+
+    count = 0
+    with session_for_write() as session:
+        for (status, reason), node_ids in groups.items():
+            query = session.query(models.Node).filter(
+                models.Node.id.in_(node_ids))
+            count += query.update({'status': status,
+                                   'status_reason': reason,
+                                   'updated_at': timestamp},
+                                  synchronize_session=False)
+
+        query = session.query(models.Node.id, models.Node.name,
+                              models.Node.cluster_id).filter(
+            models.Node.id.in_(list(statuses)))
+        nodes = dict((n.id, n) for n in query.all() if n.cluster_id)
+        clusters = collections.OrderedDict()
+        for node_id, (status, reason) in statuses.items():
+            node = nodes.get(node_id)
+            if node is None:
+                continue
+            values = clusters.setdefault(node.cluster_id, {})
+            if status == 'ERROR':
+                values['status'] = consts.CS_WARNING
+            values['status_reason'] = 'Node %(node)s: %(reason)s' % {
+                'node': node.name, 'reason': reason}
+
+        for cluster_id, values in clusters.items():
+            query = session.query(models.Cluster).filter_by(id=cluster_id)
+            query.update(values, synchronize_session=False)
+
+    return count
+
+
 @retry_on_deadlock
 def node_add_dependents(context, depended, dependent, dep_type=None):
     """Add dependency between nodes.
@@ -925,6 +1050,23 @@ def event_create(context, values):
         return event
 
 
+@retry_on_deadlock
+def event_create_batch(context, values_list):
+    """Create events in a batch.
+
+    :param values_list: A list of dictionaries, one for each event.
+    :return: The number of events created.
+    """
+    rows = [dict(values) for values in values_list]
+    for row in rows:
+        row.setdefault('id', uuidutils.generate_uuid())
+
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Event, rows)
+
+    return len(rows)
+
+
 @retry_on_deadlock
 def event_get(context, event_id, project_safe=True):
     event = model_query(context, models.Event).get(event_id)
@@ -941,25 +1083,26 @@ def event_get_by_short_id(context, short_id, project_safe=True):
 
 
 def _event_filter_paginate_query(context, query, filters=None,
-                                 limit=None, marker=None, sort=None):
+                                 limit=None, marker=None, sort=None,
+                                 columns=None):
     if filters:
         query = utils.exact_filter(query, models.Event, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.EVENT_TIMESTAMP)
-    if marker:
-        marker = model_query(context, models.Event).get(marker)
-    return sa_utils.paginate_query(query, models.Event, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return _paginate_query(context, query, models.Event, limit=limit,
+                           marker=marker, sort=sort,
+                           default_key=consts.EVENT_TIMESTAMP,
+                           columns=columns)
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                  project_safe=True):
+                  project_safe=True, columns=None):
     query = model_query(context, models.Event)
     if project_safe:
         query = query.filter_by(project=context.project_id)
 
     return _event_filter_paginate_query(context, query, filters=filters,
-                                        limit=limit, marker=marker, sort=sort)
+                                        limit=limit, marker=marker, sort=sort,
+                                        columns=columns)
 
 
 def event_count_by_cluster(context, cluster_id, project_safe=True):
@@ -995,23 +1138,56 @@ def event_prune(context, cluster_id, project_safe=True):
         return query.delete(synchronize_session='fetch')
 
 
-@retry_on_deadlock
-def event_purge(project, granularity='days', age=30):
-    with session_for_write() as session:
-        query = session.query(models.Event).with_for_update()
-        if project is not None:
-            query = query.filter(models.Event.project.in_(project))
-        if granularity is not None and age is not None:
-            if granularity == 'days':
-                age = age * 86400
-            elif granularity == 'hours':
-                age = age * 3600
-            elif granularity == 'minutes':
-                age = age * 60
-            time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
-            query = query.filter(models.Event.timestamp < time_line)
+def _age_in_seconds(granularity, age):
+    if granularity == 'days':
+        return age * 86400
+    elif granularity == 'hours':
+        return age * 3600
+    elif granularity == 'minutes':
+        return age * 60
+    return age
 
-        return query.delete(synchronize_session='fetch')
+
+@retry_on_deadlock
+def event_purge(project, granularity='days', age=30, batch_size=None):
+    """Purge event records in chunks.
+
+    The records are deleted by their IDs, at most ``batch_size`` of them in
+    each transaction, so that the rows are not locked for long and the
+    events dumped meanwhile are not blocked.
+
+    :param project: A list of project IDs the records purged belong to, or
+                    None for all projects.
+    :param granularity: The unit of ``age``.
+    :param age: Only the records older than this age are purged.
+    :param batch_size: Maximum number of records deleted in a transaction.
+    :return: The number of records purged.
+    """
+    time_line = None
+    if granularity is not None and age is not None:
+        age = _age_in_seconds(granularity, age)
+        time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
+
+    batch_size = batch_size or cfg.CONF.event_purge_batch_size
+    total = 0
+    while True:
+        with session_for_write() as session:
+            query = session.query(models.Event.id)
+            if project is not None:
+                query = query.filter(models.Event.project.in_(project))
+            if time_line is not None:
+                query = query.filter(models.Event.timestamp < time_line)
+            ids = [r[0] for r in query.limit(batch_size)]
+            if ids:
+                total += session.query(models.Event).filter(
+                    models.Event.id.in_(ids)).delete(
+                        synchronize_session=False)
+
+        if len(ids) < batch_size:
+            return total
+
+        # let the other threads run between two chunks
+        time.sleep(0)
 
 
 # Actions
@@ -1024,6 +1200,23 @@ def action_create(context, values):
         return action
 
 
+@retry_on_deadlock
+def action_create_batch(context, values_list):
+    """Create actions in a batch.
+
+    :param values_list: A list of dictionaries, one for each action.
+    :return: A list of the IDs of the actions created, in the same order.
+    """
+    rows = [dict(values) for values in values_list]
+    for row in rows:
+        row.setdefault('id', uuidutils.generate_uuid())
+
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Action, rows)
+
+    return [row['id'] for row in rows]
+
+
 @retry_on_deadlock
 def action_update(context, action_id, values):
     with session_for_write() as session:
@@ -1035,6 +1228,23 @@ def action_update(context, action_id, values):
         action.save(session)
 
 
+@retry_on_deadlock
+def action_update_batch(context, action_ids, values):
+    """Update a group of actions with the same values in one statement.
+
+    :param action_ids: IDs of the actions to be updated.
+    :param values: A dictionary of values to be updated on the actions.
+    :return: The number of actions updated.
+    """
+    if not action_ids:
+        return 0
+
+    with session_for_write() as session:
+        query = session.query(models.Action).filter(
+            models.Action.id.in_(action_ids))
+        return query.update(values, synchronize_session=False)
+
+
 def action_get(context, action_id, project_safe=True, refresh=False):
     with session_for_read() as session:
         action = session.query(models.Action).get(action_id)
@@ -1049,6 +1259,13 @@ def action_get(context, action_id, project_safe=True, refresh=False):
         return action
 
 
+def action_get_status(context, action_id):
+    with session_for_read() as session:
+        row = session.query(models.Action.status).filter_by(
+            id=action_id).first()
+        return row[0] if row else None
+
+
 def action_get_by_name(context, name, project_safe=True):
     return query_by_name(context, models.Action, name,
                          project_safe=project_safe)
@@ -1066,7 +1283,7 @@ def action_get_all_by_owner(context, owner_id):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
+                   project_safe=True, columns=None):
 
     query = model_query(context, models.Action)
     if project_safe:
@@ -1075,11 +1292,10 @@ def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
     if filters:
         query = utils.exact_filter(query, models.Action, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.ACTION_CREATED_AT)
-    if marker:
-        marker = model_query(context, models.Action).get(marker)
-    return sa_utils.paginate_query(query, models.Action, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return _paginate_query(context, query, models.Action, limit=limit,
+                           marker=marker, sort=sort,
+                           default_key=consts.ACTION_CREATED_AT,
+                           columns=columns)
 
 
 @retry_on_deadlock
@@ -1128,11 +1344,21 @@ def dependency_add(context, depended, dependent):
                 r = models.ActionDependency(depended=d, dependent=dependent)
                 session.add(r)
 
+            # a dependent already failed or cancelled, e.g. because of an
+            # action it depended on, is left in its final status
             query = session.query(models.Action).with_for_update()
             query = query.filter_by(id=dependent)
+            query = query.filter(
+                ~models.Action.status.in_(consts.ACTION_FINAL_STATUSES))
             query.update({'status': consts.ACTION_WAITING,
                           'status_reason': 'Waiting for depended actions.'},
                          synchronize_session='fetch')
+
+            # the parent is kept after the dependencies are removed, so that
+            # the depended actions are not purged while it is running
+            query = session.query(models.Action)
+            query = query.filter(models.Action.id.in_(depended))
+            query.update({'parent': dependent}, synchronize_session=False)
             return
 
         # Only dependent can be a list now, convert it to a list if it
@@ -1185,26 +1411,70 @@ def action_mark_ready(context, action_id, timestamp):
         query.update(values, synchronize_session=False)
 
 
-@retry_on_deadlock
-def _mark_failed(session, action_id, timestamp, reason=None):
-    # mark myself as failed
-    query = session.query(models.Action).filter_by(id=action_id)
+def _get_all_dependents(session, action_id):
+    """Get the IDs of all actions transitively depending on an action.
+
+    The dependency graph is walked breadth-first with one query per level
+    instead of one query per action.
+
+    :param session: The DB session to use.
+    :param action_id: ID of the action at the root of the dependency graph.
+    :return: A list of IDs of the dependent actions, excluding the root.
+    """
+    seen = set([action_id])
+    dependents = []
+    depended = [action_id]
+    while depended:
+        query = session.query(models.ActionDependency.dependent)
+        query = query.filter(models.ActionDependency.depended.in_(depended))
+        depended = []
+        for (dependent,) in query.all():
+            if dependent not in seen:
+                seen.add(dependent)
+                depended.append(dependent)
+        dependents.extend(depended)
+
+    return dependents
+
+
+def _mark_cascade(session, action_id, status, timestamp, reason=None):
+    """Set an action and all actions depending on it to a final status.
+
+    :param session: The DB session to use.
+    :param action_id: ID of the action at the root of the dependency graph.
+    :param status: The final status of the actions.
+    :param timestamp: The end time of the actions.
+    :param reason: An optional reason for the root action.
+    """
+    dependents = _get_all_dependents(session, action_id)
+
     values = {
         'owner': None,
-        'status': consts.ACTION_FAILED,
-        'status_reason': (six.text_type(reason) if reason else
-                          'Action execution failed'),
+        'status': status,
+        'status_reason': 'Action execution failed',
         'end_time': timestamp,
     }
+    if dependents:
+        query = session.query(models.Action)
+        query = query.filter(models.Action.id.in_(dependents))
+        query.update(values, synchronize_session=False)
+
+    # mark myself
+    if reason:
+        values['status_reason'] = six.text_type(reason)
+    query = session.query(models.Action).filter_by(id=action_id)
     query.update(values, synchronize_session=False)
 
     query = session.query(models.ActionDependency)
-    query = query.filter_by(depended=action_id)
-    dependents = [d.dependent for d in query.all()]
+    query = query.filter(models.ActionDependency.depended.in_(
+        [action_id] + dependents))
     query.delete(synchronize_session=False)
 
-    for d in dependents:
-        _mark_failed(session, d, timestamp)
+
+@retry_on_deadlock
+def _mark_failed(session, action_id, timestamp, reason=None):
+    _mark_cascade(session, action_id, consts.ACTION_FAILED, timestamp,
+                  reason)
 
 
 @retry_on_deadlock
@@ -1215,23 +1485,8 @@ def action_mark_failed(context, action_id, timestamp, reason=None):
 
 @retry_on_deadlock
 def _mark_cancelled(session, action_id, timestamp, reason=None):
-    query = session.query(models.Action).filter_by(id=action_id)
-    values = {
-        'owner': None,
-        'status': consts.ACTION_CANCELLED,
-        'status_reason': (six.text_type(reason) if reason else
-                          'Action execution failed'),
-        'end_time': timestamp,
-    }
-    query.update(values, synchronize_session=False)
-
-    query = session.query(models.ActionDependency)
-    query = query.filter_by(depended=action_id)
-    dependents = [d.dependent for d in query.all()]
-    query.delete(synchronize_session=False)
-
-    for d in dependents:
-        _mark_cancelled(session, d, timestamp)
+    _mark_cascade(session, action_id, consts.ACTION_CANCELLED, timestamp,
+                  reason)
 
 
 @retry_on_deadlock
@@ -1292,6 +1547,179 @@ def action_acquire_first_ready(context, owner, timestamp):
         return action_acquire(context, action.id, owner, timestamp)
 
 
+# Number of times the limit per project that is read when the backend does
+# not support window functions
+_READY_SCAN_FACTOR = 10
+
+
+def _window_functions_supported(session):
+    """Check whether the database supports window functions."""
+    dialect = session.get_bind().dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'postgresql':
+        return True
+    if dialect.name == 'mysql':
+        if getattr(dialect, '_is_mariadb', False):
+            return version >= (10, 2)
+        return version >= (8, 0)
+    if dialect.name == 'sqlite':
+        return version >= (3, 25)
+    return False
+
+
+def action_get_all_ready(context, limit_per_project=None):
+    """Get the ready actions that are not owned by any worker.
+
+    The actions are sorted by their priority and then by their creation
+    time. Actions restoring the health of clusters or nodes come first,
+    followed by the actions requested by users and then by the actions
+    derived from other actions.
+
+    The actions are retrieved by a single query. The number of actions per
+    project is limited with a window function where the database supports
+    them. Otherwise at most ``_READY_SCAN_FACTOR`` times the limit per
+    project actions are read and the limit is applied to them.
+
+    :param limit_per_project: Maximum number of actions returned for each
+                              project, None means no limit.
+    :return: A list of rows with the ``id``, ``action``, ``cause``,
+             ``project``, ``target``, ``cluster_id`` and ``priority`` of the
+             ready actions. ``cluster_id`` is the cluster of the target node
+             for node actions and None otherwise.
+    """
+    priority = sqlalchemy.case(
+        [(models.Action.action.in_(consts.ACTION_HIGH_PRIORITY),
+          consts.ACTION_PRIORITY_HIGH),
+         (models.Action.cause == consts.CAUSE_RPC,
+          consts.ACTION_PRIORITY_NORMAL)],
+        else_=consts.ACTION_PRIORITY_LOW).label('priority')
+
+    columns = [models.Action.id, models.Action.action, models.Action.cause,
+               models.Action.project, models.Action.target,
+               models.Node.cluster_id, priority]
+
+    with session_for_read() as session:
+        query = session.query(*columns).filter(
+            models.Action.status == consts.ACTION_READY).filter(
+            models.Action.owner.is_(None)).outerjoin(
+            models.Node, models.Node.id == models.Action.target)
+
+        if not limit_per_project:
+            return query.order_by(priority, models.Action.created_at).all()
+
+        if _window_functions_supported(session):
+            rank = func.row_number().over(
+                partition_by=models.Action.project,
+                order_by=(priority, models.Action.created_at)).label('rank')
+            ranked = query.add_columns(models.Action.created_at,
+                                       rank).subquery()
+            query = session.query(
+                ranked.c.id, ranked.c.action, ranked.c.cause,
+                ranked.c.project, ranked.c.target, ranked.c.cluster_id,
+                ranked.c.priority).filter(
+                ranked.c.rank <= limit_per_project).order_by(
+                ranked.c.priority, ranked.c.created_at)
+            return query.all()
+
+        query = query.order_by(priority, models.Action.created_at).limit(
+            limit_per_project * _READY_SCAN_FACTOR)
+        results = []
+        counts = collections.Counter()
+        for row in query.all():
+            if counts[row.project] < limit_per_project:
+                counts[row.project] += 1
+                results.append(row)
+        return results
+
+
+def _skip_locked_supported(session):
+    """Check whether rows locked by others can be skipped when selecting.
+
+    The ``skip_locked`` option of ``with_for_update`` was added in
+    SQLAlchemy 1.1 and the ``SKIP LOCKED`` clause is only understood by
+    PostgreSQL 9.5, MySQL 8.0 and MariaDB 10.6 or later.
+    """
+    if not versionutils.is_compatible('1.1.0', sqlalchemy.__version__,
+                                      same_major=False):
+        return False
+
+    dialect = session.get_bind().dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'postgresql':
+        return version >= (9, 5)
+    if dialect.name == 'mysql':
+        if getattr(dialect, '_is_mariadb', False):
+            return version >= (10, 6)
+        return version >= (8, 0)
+    return False
+
+
+@retry_on_deadlock
+def action_acquire_batch(context, owner, timestamp, limit=None,
+                         action_ids=None):
+    """Acquire a batch of ready actions in a single transaction.
+
+    The candidate rows are selected and locked by one statement and then
+    claimed by one UPDATE, so that a large fan-out of actions can be started
+    without a round-trip per action. On backends that support it, rows
+    locked by another engine are skipped instead of waited on. The UPDATE
+    only claims the rows still ready and not owned, so that on backends
+    without row locks, e.g. SQLite, an action claimed by another engine in
+    the meantime is not returned.
+
+    :param owner: ID of the worker that is claiming the actions.
+    :param timestamp: Start time to be recorded for the claimed actions.
+    :param limit: Maximum number of actions to claim, None means no limit.
+    :param action_ids: Optional IDs of the actions to claim. Actions not
+                       ready any more are silently skipped.
+    :return: A list of the DB action objects claimed.
+    """
+    with session_for_write() as session:
+        query = session.query(models.Action).filter_by(
+            status=consts.ACTION_READY).filter_by(
+            owner=None).order_by(models.Action.created_at)
+        if action_ids is not None:
+            if not action_ids:
+                return []
+            query = query.filter(models.Action.id.in_(action_ids))
+        if limit:
+            query = query.limit(limit)
+        if _skip_locked_supported(session):
+            query = query.with_for_update(skip_locked=True)
+        else:
+            query = query.with_for_update()
+        actions = query.all()
+        if not actions:
+            return []
+
+        values = {
+            'owner': owner,
+            'start_time': timestamp,
+            'status': consts.ACTION_RUNNING,
+            'status_reason': 'The action is being processed.',
+        }
+        ids = [a.id for a in actions]
+        query = session.query(models.Action).filter(
+            models.Action.id.in_(ids)).filter_by(
+            status=consts.ACTION_READY).filter_by(owner=None)
+        count = query.update(values, synchronize_session=False)
+        if count < len(actions):
+            # Some of the actions were claimed by another engine since they
+            # were selected, keep only the ones claimed by this update
+            query = session.query(models.Action.id).filter(
+                models.Action.id.in_(ids)).filter_by(
+                owner=owner, status=consts.ACTION_RUNNING)
+            claimed = set(row[0] for row in query.all())
+            actions = [a for a in actions if a.id in claimed]
+
+        # Reflect the update on the loaded objects without another flush
+        for action in actions:
+            for key, value in values.items():
+                attributes.set_committed_value(action, key, value)
+
+        return actions
+
+
 @retry_on_deadlock
 def action_abandon(context, action_id, values=None):
     '''Abandon an action for other workers to execute again.
@@ -1379,6 +1807,105 @@ def action_delete_by_target(context, target, action=None,
         return q.delete(synchronize_session='fetch')
 
 
+def _purge_actions(session, ids):
+    """Delete a chunk of finished actions and their dependencies.
+
+    The actions started for an action not yet finished are skipped, as the
+    latter may still read their results. They are found using the parent
+    recorded when the dependencies were added.
+
+    :param session: The DB session to use.
+    :param ids: A list of IDs of the finished actions to purge.
+    :return: The number of actions purged.
+    """
+    query = session.query(models.Action.id, models.Action.parent)
+    query = query.filter(models.Action.id.in_(ids))
+    query = query.filter(models.Action.parent.isnot(None))
+    parents = dict(query.all())
+
+    candidates = set(ids)
+    if parents:
+        query = session.query(models.Action.id)
+        query = query.filter(models.Action.id.in_(set(parents.values())))
+        query = query.filter(
+            ~models.Action.status.in_(consts.ACTION_FINAL_STATUSES))
+        running = set(r[0] for r in query.all())
+        candidates -= set(a for a, p in parents.items() if p in running)
+
+    if not candidates:
+        return 0
+
+    query = session.query(models.ActionDependency)
+    query = query.filter(sqlalchemy.or_(
+        models.ActionDependency.depended.in_(candidates),
+        models.ActionDependency.dependent.in_(candidates)))
+    query.delete(synchronize_session=False)
+
+    query = session.query(models.Action)
+    query = query.filter(models.Action.id.in_(candidates))
+    return query.delete(synchronize_session=False)
+
+
+@retry_on_deadlock
+def _purge_action_chunk(project, end_time, skipped, batch_size):
+    """Purge a chunk of finished actions in a transaction.
+
+    :return: A tuple containing the number of actions found, the number of
+             actions purged and a list of IDs of the actions skipped.
+    """
+    with session_for_write() as session:
+        query = session.query(models.Action.id)
+        query = query.filter(
+            models.Action.status.in_(consts.ACTION_FINAL_STATUSES))
+        query = query.filter(models.Action.end_time < end_time)
+        if project is not None:
+            query = query.filter(models.Action.project.in_(project))
+        if skipped:
+            query = query.filter(~models.Action.id.in_(skipped))
+        ids = [r[0] for r in query.limit(batch_size)]
+        if not ids:
+            return 0, 0, []
+
+        count = _purge_actions(session, ids)
+        left = []
+        if count < len(ids):
+            query = session.query(models.Action.id)
+            left = [r[0] for r in query.filter(models.Action.id.in_(ids))]
+        return len(ids), count, left
+
+
+def action_purge(project, granularity='days', age=30, batch_size=None):
+    """Purge finished action records in chunks.
+
+    Only the actions that are SUCCEEDED, FAILED or CANCELLED and ended
+    before the given age are purged, together with their dependencies. At
+    most ``batch_size`` actions are deleted in each transaction, which is
+    retried on deadlocks.
+
+    :param project: A list of project IDs the records purged belong to, or
+                    None for all projects.
+    :param granularity: The unit of ``age``.
+    :param age: Only the actions ended before this age are purged.
+    :param batch_size: Maximum number of records deleted in a transaction.
+    :return: The number of records purged.
+    """
+    end_time = time.time() - _age_in_seconds(granularity, age)
+    batch_size = batch_size or cfg.CONF.action_purge_batch_size
+    # actions skipped because they were started for running actions
+    skipped = set()
+    total = 0
+    while True:
+        found, count, left = _purge_action_chunk(project, end_time, skipped,
+                                                 batch_size)
+        total += count
+        skipped.update(left)
+        if found < batch_size:
+            return total
+
+        # let the other threads run between two chunks
+        time.sleep(0)
+
+
 # Receivers
 @retry_on_deadlock
 def receiver_create(context, values):
@@ -1587,7 +2114,7 @@ def registry_update(context, cluster_id, values):
 
 
 @retry_on_deadlock
-def registry_claim(context, engine_id):
+def registry_claim(context, engine_id, ring=None):
     with session_for_write() as session:
         engines = session.query(models.Service).all()
         svc_ids = [e.id for e in engines if not utils.is_service_dead(e)]
@@ -1597,6 +2124,15 @@ def registry_claim(context, engine_id):
                 models.HealthRegistry.engine_id.notin_(svc_ids))
 
         result = q_reg.all()
+        if ring is not None:
+            # only claim the registries the hash ring assigns to the engine
+            result = [r for r in result
+                      if ring.get_node(r.cluster_id) == engine_id]
+            if not result:
+                return []
+            q_reg = q_reg.filter(
+                models.HealthRegistry.id.in_([r.id for r in result]))
+
         q_reg.update({'engine_id': engine_id}, synchronize_session=False)
 
         return result
@@ -1626,6 +2162,13 @@ def registry_get_by_param(context, params):
     return obj
 
 
+def registry_get_all_by_engine(context, engine_id):
+    with session_for_read() as session:
+        query = session.query(models.HealthRegistry).filter_by(
+            engine_id=engine_id)
+        return query.all()
+
+
 # Utils
 def db_sync(engine, version=None):
     """Migrate the database to `version` or the most recent version."""
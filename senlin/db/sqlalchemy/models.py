@@ -16,7 +16,7 @@ SQLAlchemy models for Senlin data.
 
 from oslo_db.sqlalchemy import models
 from oslo_utils import uuidutils
-from sqlalchemy import Boolean, Column, Numeric, ForeignKey, Integer
+from sqlalchemy import Boolean, Column, Numeric, ForeignKey, Index, Integer
 from sqlalchemy import String, Text
 from sqlalchemy.ext import declarative
 from sqlalchemy.orm import backref
@@ -99,7 +99,11 @@ class Cluster(BASE, TimestampMixin, models.ModelBase):
 class Node(BASE, TimestampMixin, models.ModelBase):
     """Node objects."""
 
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_node_cluster_id_project', 'cluster_id', 'project'),
+        Index('ix_node_project', 'project'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'node'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -205,7 +209,11 @@ class Credential(BASE, models.ModelBase):
 
 class ActionDependency(BASE, models.ModelBase):
     """Action dependencies."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_dependency_depended', 'depended'),
+        Index('ix_dependency_dependent', 'dependent'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'dependency'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -217,7 +225,12 @@ class ActionDependency(BASE, models.ModelBase):
 
 class Action(BASE, TimestampMixin, models.ModelBase):
     """Action objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_action_status_owner', 'status', 'owner'),
+        Index('ix_action_target', 'target'),
+        Index('ix_action_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'action'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -240,11 +253,17 @@ class Action(BASE, TimestampMixin, models.ModelBase):
     user = Column(String(32))
     project = Column(String(32))
     domain = Column(String(32))
+    # the action waiting for this one, kept after their dependency is removed
+    parent = Column(String(36))
 
 
 class Event(BASE, models.ModelBase):
     """Events generated by the Senin engine."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_event_cluster_id_timestamp', 'cluster_id', 'timestamp'),
+        Index('ix_event_timestamp_id', 'timestamp', 'id'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'event'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -262,10 +281,20 @@ class Event(BASE, models.ModelBase):
     status_reason = Column(Text)
     meta_data = Column(types.Dict)
 
-    def as_dict(self):
-        data = super(Event, self)._as_dict()
-        ts = data['timestamp'].replace(microsecond=0).isoformat()
-        data['timestamp'] = ts
+    def as_dict(self, keys=None):
+        """Get the dict representation of the event.
+
+        :param keys: An optional list of the keys to return, e.g. when only
+                     the matching columns were loaded. Defaults to all the
+                     keys.
+        """
+        if keys is None:
+            data = super(Event, self)._as_dict()
+        else:
+            data = dict((k, self[k]) for k in keys)
+        if 'timestamp' in data:
+            ts = data['timestamp'].replace(microsecond=0).isoformat()
+            data['timestamp'] = ts
         return data
 
 
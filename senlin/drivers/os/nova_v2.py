@@ -57,6 +57,15 @@ class NovaClient(base.DriverBase):
     def server_get(self, server):
         return self.conn.compute.get_server(server)
 
+    @sdk.translate_exception
+    def server_list(self, details=True, **query):
+        """List the servers visible to the connection.
+
+        The result pages are fetched transparently and returned as a single
+        list, so that errors are raised and translated by this call.
+        """
+        return list(self.conn.compute.servers(details=details, **query))
+
     @sdk.translate_exception
     def server_update(self, server, **attrs):
         return self.conn.compute.update_server(server, **attrs)
@@ -17,6 +17,9 @@ from oslo_utils import uuidutils
 from senlin.drivers import base
 from senlin.drivers import sdk
 
+# Servers created through the fake driver, indexed by their IDs
+_servers = {}
+
 
 class NovaClient(base.DriverBase):
     '''Fake Nova V2 driver for test.'''
@@ -182,10 +185,18 @@ class NovaClient(base.DriverBase):
     def server_create(self, **attrs):
         self.fake_server_create['id'] = uuidutils.generate_uuid()
         self.fake_server_get['id'] = self.fake_server_create['id']
+        server = copy.deepcopy(self.fake_server_get)
+        server['name'] = attrs.get('name', server['name'])
+        server['metadata'] = attrs.get('metadata', {})
+        _servers[server['id']] = server
         return sdk.FakeResourceObject(self.fake_server_create)
 
     def server_get(self, server):
-        return sdk.FakeResourceObject(self.fake_server_get)
+        return sdk.FakeResourceObject(_servers.get(server,
+                                                   self.fake_server_get))
+
+    def server_list(self, details=True, **query):
+        return [sdk.FakeResourceObject(s) for s in _servers.values()]
 
     def wait_for_server(self, server, timeout=None):
         return
@@ -222,10 +233,10 @@ class NovaClient(base.DriverBase):
         return
 
     def server_delete(self, server, ignore_missing=True):
-        return
+        _servers.pop(getattr(server, 'id', server), None)
 
     def server_force_delete(self, server, ignore_missing=True):
-        return
+        _servers.pop(getattr(server, 'id', server), None)
 
     def server_metadata_get(self, server):
         return {}
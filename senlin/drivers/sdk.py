@@ -13,6 +13,7 @@
 '''
 SDK Client
 '''
+import hashlib
 import sys
 
 import functools
@@ -22,9 +23,11 @@ from openstack import utils as sdk_utils
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
+from oslo_utils import encodeutils
 from requests import exceptions as req_exc
 import six
 
+from senlin.common import cache
 from senlin.common import exception as senlin_exc
 from senlin import version
 
@@ -32,6 +35,13 @@ USER_AGENT = 'senlin'
 exc = sdk_exc
 LOG = logging.getLogger(__name__)
 
+# Connections shared by all the drivers of a process, keyed by a digest of
+# their parameters, e.g. the credentials, the trust and the region used.
+_CONNECTIONS = cache.ObjectCache('connection',
+                                 size_opt='connection_pool_size')
+# Seconds before the expiry of its token a connection is no longer reused
+TOKEN_STALE_DURATION = 60
+
 sdk_utils.enable_logging(debug=False, stream=sys.stdout)
 
 
@@ -104,7 +114,47 @@ def translate_exception(func):
     return invoke_with_catch
 
 
+def _connection_key(params):
+    """Get the key of a connection in the pool.
+
+    The key is a digest of the parameters so that no credential is kept in
+    clear text in the keys of the pool.
+    """
+    data = jsonutils.dumps(params, sort_keys=True)
+    return hashlib.sha256(encodeutils.safe_encode(data)).hexdigest()
+
+
+def _get_pooled_connection(key):
+    """Get a connection from the pool if it can still be used.
+
+    :param key: The key of the connection.
+    :returns: The connection or None if there is no valid connection.
+    """
+    conn = _CONNECTIONS.get(key)
+    if conn is None:
+        return None
+
+    # the token is only fetched on the first request of a connection
+    auth_ref = getattr(conn.session.auth, 'auth_ref', None)
+    if (auth_ref is not None and
+            auth_ref.will_expire_soon(TOKEN_STALE_DURATION)):
+        _CONNECTIONS.invalidate(key)
+        return None
+
+    return conn
+
+
 def create_connection(params=None):
+    """Get a connection to the OpenStack services.
+
+    Connections authenticated with other means than a token are shared by
+    all the drivers of a process, so that a new session and token are not
+    created for each request. A connection is re-created after
+    ``connection_ttl`` seconds or when its token is about to expire.
+
+    :param params: A dict of the parameters of the connection.
+    :returns: A connection object.
+    """
     if params is None:
         params = {}
 
@@ -116,11 +166,20 @@ def create_connection(params=None):
     params.setdefault('identity_api_version', '3')
     params.setdefault('messaging_api_version', '2')
 
+    key = None
+    if 'token' not in params:
+        key = _connection_key(params)
+        conn = _get_pooled_connection(key)
+        if conn is not None:
+            return conn
+
     try:
         conn = connection.Connection(**params)
     except Exception as ex:
         raise parse_exception(ex)
 
+    if key is not None:
+        _CONNECTIONS.put(key, None, conn, ttl=cfg.CONF.connection_ttl)
     return conn
 
 
@@ -24,6 +24,7 @@ from senlin.common import exception
 from senlin.common import utils
 from senlin.engine import dispatcher
 from senlin.engine import event as EVENT
+from senlin.engine import waiters
 from senlin.objects import action as ao
 from senlin.objects import cluster_policy as cpo
 from senlin.objects import dependency as dobj
@@ -137,16 +138,8 @@ class Action(object):
 
         self.data = kwargs.get('data', {})
 
-    def store(self, ctx):
-        """Store the action record into database table.
-
-        :param ctx: An instance of the request context.
-        :return: The ID of the stored object.
-        """
-
-        timestamp = timeutils.utcnow(True)
-
-        values = {
+    def _to_values(self):
+        return {
             'name': self.name,
             'context': self.context.to_dict(),
             'target': self.target,
@@ -169,6 +162,17 @@ class Action(object):
             'domain': self.domain,
         }
 
+    def store(self, ctx):
+        """Store the action record into database table.
+
+        :param ctx: An instance of the request context.
+        :return: The ID of the stored object.
+        """
+
+        timestamp = timeutils.utcnow(True)
+
+        values = self._to_values()
+
         if self.id:
             self.updated_at = timestamp
             values['updated_at'] = timestamp
@@ -259,6 +263,38 @@ class Action(object):
         obj = cls(target, action, c, **kwargs)
         return obj.store(ctx)
 
+    @classmethod
+    def create_batch(cls, ctx, action, specs):
+        """Create a group of actions of the same type in one DB operation.
+
+        :param ctx: The requesting context.
+        :param action: Name of the actions.
+        :param specs: A list of (target, kwargs) tuples, one for each action
+                      to create, where kwargs is a dict of keyword arguments
+                      for the action.
+        :return: A list of IDs of the actions created, in the same order.
+        """
+        if not specs:
+            return []
+
+        params = {
+            'user_id': ctx.user_id,
+            'project_id': ctx.project_id,
+            'domain_id': ctx.domain_id,
+            'is_admin': ctx.is_admin,
+            'request_id': ctx.request_id,
+            'trusts': ctx.trusts,
+        }
+        c = req_context.RequestContext.from_dict(params)
+        timestamp = timeutils.utcnow(True)
+        values_list = []
+        for target, kwargs in specs:
+            obj = cls(target, action, c, **kwargs)
+            obj.created_at = timestamp
+            values_list.append(obj._to_values())
+
+        return ao.Action.create_batch(ctx, values_list)
+
     @classmethod
     def delete(cls, ctx, action_id):
         """Delete an action from database.
@@ -351,6 +387,10 @@ class Action(object):
                               '') % cfg.CONF.lock_retry_times
                 ao.Action.mark_failed(self.context, self.id, timestamp, reason)
 
+        if result != self.RES_LIFECYCLE_COMPLETE and status != self.READY:
+            # Wake up the local actions waiting for this one, if any
+            waiters.notify_completion(self.id, status)
+
         if status == self.SUCCEEDED:
             EVENT.info(self, consts.PHASE_END, reason or 'SUCCEEDED')
         elif status == self.READY:
@@ -13,9 +13,11 @@
 import copy
 import eventlet
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
 from osprofiler import profiler
+import six
 
 from senlin.common import consts
 from senlin.common import exception
@@ -26,8 +28,8 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
 from senlin.engine import node as node_mod
 from senlin.engine.notifications import message as msg
-from senlin.engine import scheduler
 from senlin.engine import senlin_lock
+from senlin.engine import waiters
 from senlin.objects import action as ao
 from senlin.objects import cluster as co
 from senlin.objects import dependency as dobj
@@ -65,6 +67,14 @@ class ClusterAction(base.Action):
 
         :returns: A tuple containing the result and the corresponding reason.
         """
+        depended = dobj.Dependency.get_depended(self.context, self.id)
+        waiters.add_waiter(self.id, depended)
+        try:
+            return self._check_dependents(lifecycle_hook_timeout)
+        finally:
+            waiters.remove_waiter(self.id)
+
+    def _check_dependents(self, lifecycle_hook_timeout=None):
         status = self.get_status()
         while status != self.READY:
             if status == self.FAILED:
@@ -97,8 +107,10 @@ class ClusterAction(base.Action):
                 LOG.debug(reason)
                 return self.RES_LIFECYCLE_HOOK_TIMEOUT, reason
 
-            # Continue waiting (with reschedule)
-            scheduler.reschedule(self.id, 3)
+            # Continue waiting, until woken up by a local dependent or until
+            # it is time to check the database again
+            waiters.wait_for_dependents(self.id,
+                                        cfg.CONF.dependency_check_interval)
             status = self.get_status()
 
         return self.RES_OK, 'All dependents ended with success'
@@ -115,11 +127,15 @@ class ClusterAction(base.Action):
 
         placement = self.data.get('placement', None)
 
+        # Reserve the node indexes for all new nodes at once
+        first_index = co.Cluster.get_next_index(self.context, self.entity.id,
+                                                count=count)
+        name_format = self.entity.config.get("node.name.format", "")
+
         nodes = []
-        child = []
         # conunt >= 1
         for m in range(count):
-            index = co.Cluster.get_next_index(self.context, self.entity.id)
+            index = first_index + m
             kwargs = {
                 'index': index,
                 'metadata': {},
@@ -131,28 +147,27 @@ class ClusterAction(base.Action):
                 # We assume placement is a list
                 kwargs['data'] = {'placement': placement['placements'][m]}
 
-            name_format = self.entity.config.get("node.name.format", "")
             name = utils.format_node_name(name_format, self.entity, index)
+            # NOTE: The context is not passed in so that the profile is not
+            # loaded for each node, it is loaded once when nodes are stored.
             node = node_mod.Node(name, self.entity.profile_id,
-                                 self.entity.id, context=self.context,
-                                 **kwargs)
-
-            node.store(self.context)
+                                 self.entity.id, **kwargs)
             nodes.append(node)
 
-            kwargs = {
-                'name': 'node_create_%s' % node.id[:8],
-                'cause': consts.CAUSE_DERIVED,
-            }
-            action_id = base.Action.create(self.context, node.id,
-                                           consts.NODE_CREATE, **kwargs)
-            child.append(action_id)
+        node_mod.Node.store_batch(self.context, nodes)
+
+        specs = [
+            (node.id, {'name': 'node_create_%s' % node.id[:8],
+                       'cause': consts.CAUSE_DERIVED})
+            for node in nodes
+        ]
+        child = base.Action.create_batch(self.context, consts.NODE_CREATE,
+                                         specs)
 
         # Build dependency and make the new action ready
         dobj.Dependency.create(self.context, [a for a in child], self.id)
-        for cid in child:
-            ao.Action.update(self.context, cid,
-                             {'status': base.Action.READY})
+        ao.Action.update_batch(self.context, child,
+                               {'status': base.Action.READY})
         dispatcher.start_action()
 
         # Wait for cluster creation to complete
@@ -731,10 +746,40 @@ class ClusterAction(base.Action):
     def do_check(self):
         """Handler for CLUSTER_CHECK action.
 
+        The nodes are checked in bulk if their profile supports it, or by one
+        NODE_CHECK action per node otherwise. When the ``recover`` input is
+        provided, which only the health manager does, NODE_RECOVER actions
+        are then started for the nodes found unhealthy, using the input as
+        their parameters.
+
         :returns: A tuple containing the result and the corresponding reason.
         """
         self.entity.do_check(self.context)
 
+        res = self.RES_OK
+        reason = 'Cluster checking completed.'
+        try:
+            results = node_mod.Node.check_batch(self.context,
+                                                self.entity.nodes)
+        except exception.InternalError as ex:
+            res = self.RES_ERROR
+            reason = 'Cluster checking failed: %s' % six.text_type(ex)
+        else:
+            if results is None:
+                res, reason = self._check_nodes()
+
+        recover = self.inputs.get('recover', None)
+        if res == self.RES_OK and recover is not None:
+            self._recover_unhealthy_nodes(recover)
+
+        self.entity.eval_status(self.context, consts.CLUSTER_CHECK)
+        return res, reason
+
+    def _check_nodes(self):
+        """Check the nodes of the cluster with one NODE_CHECK per node.
+
+        :returns: A tuple containing the result and the corresponding reason.
+        """
         child = []
         res = self.RES_OK
         reason = 'Cluster checking completed.'
@@ -768,9 +813,43 @@ class ClusterAction(base.Action):
             if res != self.RES_OK:
                 reason = new_reason
 
-        self.entity.eval_status(self.context, consts.CLUSTER_CHECK)
         return res, reason
 
+    def _recover_unhealthy_nodes(self, recover):
+        """Start NODE_RECOVER actions for the nodes not in ACTIVE status.
+
+        The actions are not derived from this one. Same as the recover
+        requests sent by the health manager, they lock the cluster with
+        the NODE scope and go through the policy checks, so they only run
+        once this action has released its cluster lock.
+
+        :param recover: A dict containing the recovery parameters, i.e. the
+                        ``operation``, ``delete_timeout`` and
+                        ``force_recreate`` keys, all optional.
+        :returns: Nothing.
+        """
+        inputs = {}
+        if recover.get('operation'):
+            inputs['operation'] = [{'name': recover['operation']}]
+        for key in ('delete_timeout', 'force_recreate'):
+            if key in recover:
+                inputs[key] = recover[key]
+
+        nodes = no.Node.get_all_by_cluster(self.context, self.entity.id)
+        specs = [
+            (node.id, {'name': 'node_recover_%s' % node.id[:8],
+                       'cause': consts.CAUSE_RPC,
+                       'status': base.Action.READY, 'inputs': inputs})
+            for node in nodes if node.status != consts.NS_ACTIVE
+        ]
+        if not specs:
+            return
+
+        LOG.info("Requesting recovery of %(n)s nodes of cluster %(c)s.",
+                 {'n': len(specs), 'c': self.entity.id})
+        base.Action.create_batch(self.context, consts.NODE_RECOVER, specs)
+        dispatcher.start_action()
+
     def _check_capacity(self):
         cluster = self.entity
 
@@ -787,6 +866,73 @@ class ClusterAction(base.Action):
             candidates = scaleutils.nodes_by_random(nodes, count)
             self._delete_nodes(candidates)
 
+    def _start_node_recovers(self, node_ids, inputs):
+        """Create and start NODE_RECOVER actions for nodes.
+
+        :param node_ids: IDs of the nodes to recover.
+        :param inputs: The inputs of the NODE_RECOVER actions.
+        :returns: A list of IDs of the actions started.
+        """
+        # The dependencies are created before the actions are made READY, so
+        # that none of them can complete before the parent depends on it.
+        specs = [
+            (node_id, {'name': 'node_recover_%s' % node_id[:8],
+                       'cause': consts.CAUSE_DERIVED, 'inputs': inputs})
+            for node_id in node_ids
+        ]
+        children = base.Action.create_batch(self.context, consts.NODE_RECOVER,
+                                            specs)
+        if children:
+            dobj.Dependency.create(self.context, [c for c in children],
+                                   self.id)
+            ao.Action.update_batch(self.context, children,
+                                   {'status': consts.ACTION_READY})
+            dispatcher.start_action()
+
+        return children
+
+    def _check_and_recover_nodes(self, nodes, inputs):
+        """Check nodes and recover the ones found unhealthy.
+
+        The nodes are checked in bulk if their profile supports it.
+        Otherwise they are checked concurrently, at most
+        ``node_check_concurrency`` at a time, and the recovery of a node
+        found unhealthy is started as soon as its check completes.
+
+        :param nodes: The nodes to check.
+        :param inputs: The inputs of the NODE_RECOVER actions.
+        :returns: A list of IDs of the NODE_RECOVER actions started.
+        """
+        try:
+            results = node_mod.Node.check_batch(self.context, nodes)
+        except exception.InternalError as ex:
+            LOG.warning("Failed in checking nodes of cluster %(c)s in bulk: "
+                        "%(r)s", {'c': self.entity.id,
+                                  'r': six.text_type(ex)})
+            results = None
+
+        if results is not None:
+            return self._start_node_recovers(
+                [n.id for n in nodes if n.status != consts.NS_ACTIVE],
+                inputs)
+
+        children = []
+
+        def _check(node_id):
+            node = node_mod.Node.load(self.context, node_id=node_id)
+            node.do_check(self.context)
+            if node.status != consts.NS_ACTIVE:
+                children.extend(self._start_node_recovers([node_id], inputs))
+
+        pool = eventlet.GreenPool(cfg.CONF.node_check_concurrency)
+        threads = [pool.spawn(_check, n.id) for n in nodes]
+        pool.waitall()
+        # re-raise the error of a check if any
+        for thread in threads:
+            thread.wait()
+
+        return children
+
     @profiler.trace('ClusterAction.do_recover', hide_args=False)
     def do_recover(self):
         """Handler for the CLUSTER_RECOVER action.
@@ -812,32 +958,22 @@ class ClusterAction(base.Action):
             if recover_action is not None:
                 inputs['operation'] = recover_action
 
-        children = []
-        for node in self.entity.nodes:
-            node_id = node.id
-            if check:
-                node = node_mod.Node.load(self.context, node_id=node_id)
-                node.do_check(self.context)
-
-            if node.status == consts.NS_ACTIVE:
-                continue
-            action_id = base.Action.create(
-                self.context, node_id, consts.NODE_RECOVER,
-                name='node_recover_%s' % node_id[:8],
-                cause=consts.CAUSE_DERIVED, inputs=inputs,
-            )
-            children.append(action_id)
+        # nodes explicitly requested are recovered unless found healthy by
+        # a check, other nodes are left untouched
+        nodes = self.inputs.get('nodes', None)
+        candidates = [n for n in self.entity.nodes
+                      if nodes is None or n.id in nodes]
+        if check:
+            children = self._check_and_recover_nodes(candidates, inputs)
+        else:
+            children = self._start_node_recovers(
+                [n.id for n in candidates
+                 if n.status != consts.NS_ACTIVE or nodes is not None],
+                inputs)
 
         res = self.RES_OK
         reason = 'Cluster recovery succeeded.'
         if children:
-            dobj.Dependency.create(self.context, [c for c in children],
-                                   self.id)
-            for cid in children:
-                ao.Action.update(self.context, cid,
-                                 {'status': consts.ACTION_READY})
-            dispatcher.start_action()
-
             # Wait for dependent action if any
             res, new_reason = self._wait_for_dependents()
             if res != self.RES_OK:
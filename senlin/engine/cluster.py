@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
@@ -520,18 +521,61 @@ class Cluster(object):
     def health_check(self, ctx):
         """Check physical resources status
 
+        The nodes are checked in bulk if their profile supports it.
+        Otherwise they are checked concurrently, at most
+        ``node_check_concurrency`` at a time, each check being bounded by
+        ``node_check_timeout`` seconds. The statuses changed are written back
+        to the database in a single transaction.
+
         :param ctx: The context to operate node object
         """
-        # Note this procedure is a pure sequential operation,
-        # its not suitable for large scale clusters.
-
-        old_nodes = self.nodes
-        for node in old_nodes:
-            node.do_check(ctx)
+        start = timeutils.utcnow(True)
+        nodes = [n for n in self.nodes if n.physical_id]
+        try:
+            results = node_mod.Node.check_batch(ctx, nodes)
+        except exception.InternalError as ex:
+            LOG.warning("Failed in checking nodes of cluster %(c)s in bulk: "
+                        "%(r)s", {'c': self.id, 'r': six.text_type(ex)})
+            results = None
+
+        if results is None:
+            pool = eventlet.GreenPool(cfg.CONF.node_check_concurrency)
+            results = dict(pool.imap(lambda n: self._check_node(ctx, n),
+                                     nodes))
+            node_mod.Node.store_check_results(ctx, nodes, results)
 
         nodes = node_mod.Node.load_all(ctx, cluster_id=self.id)
         self.update_node([n for n in nodes])
 
+        elapsed = timeutils.delta_seconds(start, timeutils.utcnow(True))
+        LOG.info("Checked %(n)s nodes of cluster %(c)s in %(t).2f seconds.",
+                 {'n': len(results), 'c': self.id, 't': elapsed})
+
+    def _check_node(self, ctx, node):
+        """Check the physical resource of a node.
+
+        :param ctx: The context to operate node object
+        :param node: The node to check.
+        :returns: A tuple containing the ID of the node and a boolean telling
+                  whether the node is healthy, or None if the node was found
+                  without its physical resource.
+        """
+        timeout = cfg.CONF.node_check_timeout
+        try:
+            with eventlet.Timeout(timeout):
+                return node.id, pfb.Profile.check_object(ctx, node)
+        except eventlet.Timeout:
+            LOG.warning("Checking node %(n)s timed out after %(t)s seconds.",
+                        {'n': node.id, 't': timeout})
+        except exception.EServerNotFound as ex:
+            node.set_status(ctx, consts.NS_ERROR, six.text_type(ex),
+                            physical_id=None)
+            return node.id, None
+        except exception.EResourceOperation as ex:
+            LOG.warning("Failed in checking node %(n)s: %(r)s",
+                        {'n': node.id, 'r': six.text_type(ex)})
+        return node.id, False
+
     def eval_status(self, ctx, operation, **params):
         """Re-evaluate cluster's health status.
 
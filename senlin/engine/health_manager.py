@@ -17,6 +17,8 @@ trigger corresponding actions to recover the clusters based on the pre-defined
 health policies.
 """
 
+import eventlet
+from eventlet import semaphore
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging as messaging
@@ -24,18 +26,39 @@ from oslo_service import service
 from oslo_service import threadgroup
 from oslo_utils import timeutils
 import re
+import requests
 import six
-import time
+import threading
 
 from senlin.common import consts
 from senlin.common import context
+from senlin.common import hash_ring
 from senlin.common import messaging as rpc
 from senlin.common import utils
+from senlin.db.sqlalchemy import utils as db_utils
 from senlin import objects
 from senlin.rpc import client as rpc_client
 
 LOG = logging.getLogger(__name__)
 
+# ID of the engine running in this process, if any, which is always part of
+# the hash ring used for registering clusters.
+_local_engine_id = None
+
+
+def get_engine_ring(ctx, engine_id=None):
+    """Get a consistent hash ring of the engines alive.
+
+    :param ctx: The request context.
+    :param engine_id: Optional ID of an engine always included in the ring.
+    :returns: A ``HashRing`` object over the IDs of the engines.
+    """
+    engines = [s.id for s in objects.Service.get_all(ctx)
+               if not db_utils.is_service_dead(s)]
+    if engine_id:
+        engines.append(engine_id)
+    return hash_ring.HashRing(engines)
+
 
 def _chase_up(start_time, interval):
     """Utility function to check if there are missed intervals.
@@ -53,8 +76,96 @@ def _chase_up(start_time, interval):
     return (missed + 1) * interval - elapsed
 
 
+class RecoveryAggregator(object):
+    """Coalesce the recovery of nodes reported failed by notifications.
+
+    The nodes of a cluster reported failed within the
+    ``[health_manager]recover_batch_window`` seconds following the first
+    failure are recovered by a single cluster recover request listing them,
+    instead of one node recover request per notification. Notifications
+    repeated for the same node are only counted once.
+
+    :param tg: The thread group of the health manager, which runs the timers
+               flushing the nodes pending recovery.
+    """
+
+    def __init__(self, tg):
+        self.TG = tg
+        self.rpc = rpc_client.EngineClient()
+        self._lock = threading.Lock()
+        # nodes pending recovery and their flush timers indexed by cluster
+        self._pending = {}
+        self._timers = {}
+
+    def add(self, project_id, user_id, cluster_id, node_id):
+        """Queue the recovery of a node reported failed.
+
+        :param project_id: The project the cluster belongs to.
+        :param user_id: The user the notification was emitted for.
+        :param cluster_id: The UUID of the cluster.
+        :param node_id: The UUID of the node reported failed.
+        :returns: Nothing.
+        """
+        with self._lock:
+            entry = self._pending.get(cluster_id)
+            if entry is None:
+                entry = {'project': project_id, 'user': user_id, 'nodes': []}
+                self._pending[cluster_id] = entry
+                window = cfg.CONF.health_manager.recover_batch_window
+                self._timers[cluster_id] = self.TG.add_timer(
+                    window, self.flush, window, cluster_id)
+            if node_id not in entry['nodes']:
+                entry['nodes'].append(node_id)
+
+    def flush(self, cluster_id):
+        """Request the recovery of the nodes queued for a cluster.
+
+        :param cluster_id: The UUID of the cluster.
+        :returns: Nothing.
+        """
+        with self._lock:
+            entry = self._pending.pop(cluster_id, None)
+            timer = self._timers.pop(cluster_id, None)
+        if timer is not None:
+            # the nodes are flushed once, the timer is not needed any more
+            timer.stop()
+            if timer in self.TG.timers:
+                self.TG.timer_done(timer)
+        if not entry:
+            return
+
+        ctx = context.get_service_context(project_id=entry['project'],
+                                          user_id=entry['user'])
+        # skip the nodes which have left the cluster in the meantime
+        members = objects.Node.ids_by_cluster(ctx, cluster_id)
+        nodes = [n for n in entry['nodes'] if n in members]
+        if not nodes:
+            return
+
+        LOG.info("Requesting recovery of nodes %(n)s of cluster %(c)s",
+                 {'n': nodes, 'c': cluster_id})
+        req = objects.ClusterRecoverRequest(identity=cluster_id,
+                                            params={'nodes': nodes})
+        try:
+            self.rpc.call(ctx, 'cluster_recover', req)
+        except Exception as ex:
+            LOG.warning("Failed in triggering 'cluster_recover' RPC for "
+                        "cluster %(c)s: %(r)s",
+                        {'c': cluster_id, 'r': six.text_type(ex)})
+
+    def flush_all(self):
+        """Request the recovery of all the nodes queued."""
+        with self._lock:
+            clusters = list(self._pending.keys())
+        for cluster_id in clusters:
+            self.flush(cluster_id)
+
+
 class NovaNotificationEndpoint(object):
 
+    PUBLISHER_ID = '^compute.*'
+    EVENT_TYPE = '^compute\.instance\..*'
+
     VM_FAILURE_EVENTS = {
         'compute.instance.pause.end': 'PAUSE',
         'compute.instance.power_off.end': 'POWER_OFF',
@@ -63,37 +174,36 @@ class NovaNotificationEndpoint(object):
         'compute.instance.soft_delete.end': 'SOFT_DELETE',
     }
 
-    def __init__(self, project_id, cluster_id, recover_action):
+    def __init__(self, project_id, cluster_id, recover_action, aggregator):
         self.filter_rule = messaging.NotificationFilter(
-            publisher_id='^compute.*',
-            event_type='^compute\.instance\..*',
+            publisher_id=self.PUBLISHER_ID,
+            event_type=self.EVENT_TYPE,
             context={'project_id': '^%s$' % project_id})
         self.project_id = project_id
         self.cluster_id = cluster_id
-        self.rpc = rpc_client.EngineClient()
+        self.aggregator = aggregator
         self.recover_action = recover_action
 
+    @staticmethod
+    def get_cluster_id(payload):
+        return payload.get('metadata', {}).get('cluster_id')
+
     def info(self, ctxt, publisher_id, event_type, payload, metadata):
         meta = payload['metadata']
         if meta.get('cluster_id') == self.cluster_id:
             if event_type not in self.VM_FAILURE_EVENTS:
                 return
-            params = {
-                'event': self.VM_FAILURE_EVENTS[event_type],
-                'state': payload.get('state', 'Unknown'),
-                'instance_id': payload.get('instance_id', 'Unknown'),
-                'timestamp': metadata['timestamp'],
-                'publisher': publisher_id,
-                'operation': self.recover_action['operation'],
-            }
             node_id = meta.get('cluster_node_id')
             if node_id:
-                LOG.info("Requesting node recovery: %s", node_id)
-                ctx = context.get_service_context(project_id=self.project_id,
-                                                  user_id=payload['user_id'])
-                req = objects.NodeRecoverRequest(identity=node_id,
-                                                 params=params)
-                self.rpc.call(ctx, 'node_recover', req)
+                LOG.info("Node %(n)s reported failed: event=%(e)s, "
+                         "state=%(s)s, instance=%(i)s, publisher=%(p)s",
+                         {'n': node_id,
+                          'e': self.VM_FAILURE_EVENTS[event_type],
+                          's': payload.get('state', 'Unknown'),
+                          'i': payload.get('instance_id', 'Unknown'),
+                          'p': publisher_id})
+                self.aggregator.add(self.project_id, payload['user_id'],
+                                    self.cluster_id, node_id)
 
     def warn(self, ctxt, publisher_id, event_type, payload, metadata):
         meta = payload.get('metadata', {})
@@ -110,20 +220,30 @@ class NovaNotificationEndpoint(object):
 
 class HeatNotificationEndpoint(object):
 
+    PUBLISHER_ID = '^orchestration.*'
+    EVENT_TYPE = '^orchestration\.stack\..*'
+
     STACK_FAILURE_EVENTS = {
         'orchestration.stack.delete.end': 'DELETE',
     }
 
-    def __init__(self, project_id, cluster_id, recover_action):
+    def __init__(self, project_id, cluster_id, recover_action, aggregator):
         self.filter_rule = messaging.NotificationFilter(
-            publisher_id='^orchestration.*',
-            event_type='^orchestration\.stack\..*',
+            publisher_id=self.PUBLISHER_ID,
+            event_type=self.EVENT_TYPE,
             context={'project_id': '^%s$' % project_id})
         self.project_id = project_id
         self.cluster_id = cluster_id
-        self.rpc = rpc_client.EngineClient()
+        self.aggregator = aggregator
         self.recover_action = recover_action
 
+    @staticmethod
+    def get_cluster_id(payload):
+        for tag in payload.get('tags') or []:
+            if tag.find('cluster_id') == 0:
+                return tag[11:]
+        return None
+
     def info(self, ctxt, publisher_id, event_type, payload, metadata):
         if event_type not in self.STACK_FAILURE_EVENTS:
             return
@@ -147,28 +267,77 @@ class HeatNotificationEndpoint(object):
         if cluster_id is None or node_id is None:
             return
 
-        params = {
-            'event': self.STACK_FAILURE_EVENTS[event_type],
-            'state': payload.get('state', 'Unknown'),
-            'stack_id': payload.get('stack_identity', 'Unknown'),
-            'timestamp': metadata['timestamp'],
-            'publisher': publisher_id,
-            'operation': self.recover_action['operation'],
-        }
-        LOG.info("Requesting stack recovery: %s", node_id)
-        ctx = context.get_service_context(project_id=self.project_id,
-                                          user_id=payload['user_identity'])
-        req = objects.NodeRecoverRequest(identity=node_id, params=params)
-        self.rpc.call(ctx, 'node_recover', req)
+        LOG.info("Node %(n)s reported failed: event=%(e)s, state=%(s)s, "
+                 "stack=%(i)s, publisher=%(p)s",
+                 {'n': node_id,
+                  'e': self.STACK_FAILURE_EVENTS[event_type],
+                  's': payload.get('state', 'Unknown'),
+                  'i': payload.get('stack_identity', 'Unknown'),
+                  'p': publisher_id})
+        self.aggregator.add(self.project_id, payload['user_identity'],
+                            self.cluster_id, node_id)
+
+
+class NotificationRouter(object):
+    """Endpoint routing the notifications of an exchange to clusters.
+
+    A single notification listener is started per exchange and engine. The
+    router looks up the endpoint of the cluster a notification is about in
+    a dict, so a notification is only matched against the filter of that
+    endpoint instead of the filters of all the clusters being monitored.
+    """
+
+    def __init__(self, exchange, endpoint_class, aggregator):
+        self.exchange = exchange
+        self.endpoint_class = endpoint_class
+        self.aggregator = aggregator
+        self.filter_rule = messaging.NotificationFilter(
+            publisher_id=endpoint_class.PUBLISHER_ID,
+            event_type=endpoint_class.EVENT_TYPE)
+        self.endpoints = {}
+        self.listener = None
+
+    def add(self, project_id, cluster_id, recover_action):
+        """Start routing the notifications about a cluster."""
+        self.endpoints[cluster_id] = self.endpoint_class(
+            project_id, cluster_id, recover_action, self.aggregator)
+
+    def remove(self, cluster_id):
+        """Stop routing the notifications about a cluster."""
+        self.endpoints.pop(cluster_id, None)
+
+    def _dispatch(self, method, ctxt, publisher_id, event_type, payload,
+                  metadata):
+        cluster_id = self.endpoint_class.get_cluster_id(payload)
+        endpoint = self.endpoints.get(cluster_id)
+        if endpoint is None:
+            return
+        if not endpoint.filter_rule.match(ctxt, publisher_id, event_type,
+                                          metadata, payload):
+            return
+        handler = getattr(endpoint, method, None)
+        if handler:
+            handler(ctxt, publisher_id, event_type, payload, metadata)
 
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        self._dispatch('info', ctxt, publisher_id, event_type, payload,
+                       metadata)
+
+    def warn(self, ctxt, publisher_id, event_type, payload, metadata):
+        self._dispatch('warn', ctxt, publisher_id, event_type, payload,
+                       metadata)
 
-def ListenerProc(exchange, project_id, cluster_id, recover_action):
-    """Thread procedure for running an event listener.
+    def debug(self, ctxt, publisher_id, event_type, payload, metadata):
+        self._dispatch('debug', ctxt, publisher_id, event_type, payload,
+                       metadata)
+
+
+def ListenerProc(exchange, router):
+    """Start an event listener for an exchange.
 
     :param exchange: The control exchange for a target service.
-    :param project_id: The ID of the project to filter.
-    :param cluster_id: The ID of the cluster to filter.
-    :param recover_action: The health policy action name.
+    :param router: The endpoint routing the notifications to clusters.
+    :returns: The notification listener started.
     """
     transport = messaging.get_notification_transport(cfg.CONF)
 
@@ -177,31 +346,33 @@ def ListenerProc(exchange, project_id, cluster_id, recover_action):
             messaging.Target(topic='versioned_notifications',
                              exchange=exchange),
         ]
-        endpoints = [
-            NovaNotificationEndpoint(project_id, cluster_id, recover_action),
-        ]
     else:  # heat notification
         targets = [
             messaging.Target(topic='notifications', exchange=exchange),
         ]
-        endpoints = [
-            HeatNotificationEndpoint(project_id, cluster_id, recover_action),
-        ]
 
     listener = messaging.get_notification_listener(
-        transport, targets, endpoints, executor='threading',
+        transport, targets, [router], executor='threading',
         pool="senlin-listeners")
 
     listener.start()
+    return listener
 
 
 class HealthManager(service.Service):
 
+    # bounds of the interval between two reads of an action status
+    WAIT_INTERVAL_MIN = 1
+    WAIT_INTERVAL_MAX = 16
+
     def __init__(self, engine_service, topic, version):
         super(HealthManager, self).__init__()
 
+        global _local_engine_id
+
         self.TG = threadgroup.ThreadGroup()
         self.engine_id = engine_service.engine_id
+        _local_engine_id = self.engine_id
         self.topic = topic
         self.version = version
         self.ctx = context.get_admin_context()
@@ -209,6 +380,16 @@ class HealthManager(service.Service):
         self.rt = {
             'registries': [],
         }
+        # notification routers indexed by exchange
+        self.routers = {}
+        self.aggregator = RecoveryAggregator(self.TG)
+        # HTTP session shared by URL polling so that connections to the
+        # health endpoints are kept alive across polls
+        self.session = requests.Session()
+        size = cfg.CONF.health_manager.poll_url_concurrency
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def _dummy_task(self):
         """A Dummy task that is queued on the health manager thread group.
@@ -219,18 +400,34 @@ class HealthManager(service.Service):
         self._load_runtime_registry()
 
     def _wait_for_action(self, ctx, action_id, timeout):
+        """Wait for an action to complete.
+
+        The health manager runs in the engine process, so the status of the
+        action is read from the database directly instead of going through
+        an ``action_get`` RPC call. The interval between two reads starts at
+        one second and is doubled after each read, up to a maximum of
+        ``WAIT_INTERVAL_MAX`` seconds.
+
+        :param ctx: The request context.
+        :param action_id: The ID of the action to wait for.
+        :param timeout: The maximum number of seconds to wait.
+        :returns: A tuple containing the result and the reason.
+        """
         done = False
-        req = objects.ActionGetRequest(identity=action_id)
+        interval = self.WAIT_INTERVAL_MIN
         with timeutils.StopWatch(timeout) as timeout_watch:
             while timeout > 0:
-                action = self.rpc_client.call(ctx, 'action_get', req)
-                if action['status'] in [consts.ACTION_SUCCEEDED,
-                                        consts.ACTION_FAILED,
-                                        consts.ACTION_CANCELLED]:
-                    if action['status'] == consts.ACTION_SUCCEEDED:
+                status = objects.Action.get_status(ctx, action_id)
+                if status is None:
+                    return False, "Action %s is not found" % action_id
+                if status in [consts.ACTION_SUCCEEDED,
+                              consts.ACTION_FAILED,
+                              consts.ACTION_CANCELLED]:
+                    if status == consts.ACTION_SUCCEEDED:
                         done = True
                     break
-                time.sleep(2)
+                eventlet.sleep(min(interval, timeout))
+                interval = min(interval * 2, self.WAIT_INTERVAL_MAX)
                 timeout = timeout_watch.leftover(True)
 
         if done:
@@ -256,7 +453,8 @@ class HealthManager(service.Service):
 
         ctx = context.get_service_context(user_id=cluster.user,
                                           project_id=cluster.project)
-        params = {'delete_check_action': True}
+        # The check action recovers the nodes found unhealthy
+        params = {'delete_check_action': True, 'recover': recover_action}
         try:
             req = objects.ClusterCheckRequest(identity=cluster_id,
                                               params=params)
@@ -271,18 +469,26 @@ class HealthManager(service.Service):
         res, reason = self._wait_for_action(ctx, action['action'], timeout)
         if not res:
             LOG.warning("%s", reason)
-            return _chase_up(start_time, timeout)
 
-        # loop through nodes to trigger recovery
-        nodes = objects.Node.get_all_by_cluster(ctx, cluster_id)
-        for node in nodes:
-            if node.status != consts.NS_ACTIVE:
-                LOG.info("Requesting node recovery: %s", node.id)
-                req = objects.NodeRecoverRequest(identity=node.id,
-                                                 params=recover_action)
-                self.rpc_client.call(ctx, 'node_recover', req)
+        return self._record_poll(cluster_id, start_time, timeout)
 
-        return _chase_up(start_time, timeout)
+    def _record_poll(self, cluster_id, start_time, interval):
+        """Log the duration of a polling round for a cluster.
+
+        :param cluster_id: The UUID of the cluster polled.
+        :param start_time: A time object representing the starting time.
+        :param interval: An integer specifying the time interval in seconds.
+        :returns: Number of seconds to sleep before next round.
+        """
+        elapsed = timeutils.delta_seconds(start_time, timeutils.utcnow(True))
+        if elapsed > interval:
+            LOG.warning("Polling cluster %(c)s took %(e).2f seconds which "
+                        "exceeds its interval of %(i)s seconds",
+                        {'c': cluster_id, 'e': elapsed, 'i': interval})
+        else:
+            LOG.debug("Polling cluster %(c)s took %(e).2f seconds",
+                      {'c': cluster_id, 'e': elapsed})
+        return _chase_up(start_time, interval)
 
     def _expand_url_template(self, url_template, node):
         """Expands parameters in an URL template
@@ -300,70 +506,117 @@ class HealthManager(service.Service):
 
         return url
 
-    def _check_url_and_recover_node(self, ctx, node, recover_action, params):
-        """Routine to check a node status from a url and recovery if necessary
+    def _check_url(self, node, params):
+        """Routine to check a node status once from a url.
 
-        :param ctx: The request context to use for recovery action
         :param node: The node to be checked.
-        :param recover_action: The health policy action name.
         :param params: Parameters specific to poll url or recovery action
-        :returns: action if node was triggered for recovery.  Otherwise None.
+        :returns: True if the node is found down and is eligible for
+                  recovery, otherwise False.
         """
-
         url_template = params['poll_url']
         verify_ssl = params['poll_url_ssl_verify']
         expected_resp_str = params['poll_url_healthy_response']
-        max_unhealthy_retry = params['poll_url_retry_limit']
-        retry_interval = params['poll_url_retry_interval']
         node_update_timeout = params['node_update_timeout']
 
         url = self._expand_url_template(url_template, node)
         LOG.info("Polling node status from URL: %s", url)
 
-        available_attemps = max_unhealthy_retry
-        while available_attemps > 0:
-            available_attemps -= 1
+        try:
+            result = utils.url_fetch(
+                url, verify=verify_ssl, session=self.session,
+                timeout=cfg.CONF.health_manager.poll_url_timeout)
+        except utils.URLFetchError as ex:
+            LOG.error("Error when requesting node health status from"
+                      " %s: %s", url, ex)
+            return False
+
+        LOG.debug("Node status returned from URL(%s): %s", url, result)
+        if re.search(expected_resp_str, result):
+            LOG.debug('Node %s is healthy', node.id)
+            return False
+
+        if node.status != consts.NS_ACTIVE:
+            LOG.info("Skip node recovery because node %s is not in "
+                     "ACTIVE state", node.id)
+            return False
+
+        node_last_updated = node.updated_at or node.init_at
+        if not timeutils.is_older_than(node_last_updated,
+                                       node_update_timeout):
+            LOG.info("Node %s was updated at %s which is less than "
+                     "%d secs ago. Skip node recovery.",
+                     node.id, node_last_updated, node_update_timeout)
+            return False
 
-            try:
-                result = utils.url_fetch(url, verify=verify_ssl)
-            except utils.URLFetchError as ex:
-                LOG.error("Error when requesting node health status from"
-                          " %s: %s", url, ex)
-                return None
+        return True
 
-            LOG.debug("Node status returned from URL(%s): %s", url,
-                      result)
-            if re.search(expected_resp_str, result):
-                LOG.debug('Node %s is healthy', node.id)
-                return None
+    def _recover_node(self, ctx, node, recover_action):
+        """Routine to request the recovery of a node.
 
-            if node.status != consts.NS_ACTIVE:
-                LOG.info("Skip node recovery because node %s is not in "
-                         "ACTIVE state", node.id)
-                return None
+        :param ctx: The request context to use for recovery action
+        :param node: The node to be recovered.
+        :param recover_action: The health policy action name.
+        :returns: The action triggered or None if the request failed.
+        """
+        LOG.info("Requesting node recovery: %s", node.id)
+        req = objects.NodeRecoverRequest(identity=node.id,
+                                         params=recover_action)
+        try:
+            return self.rpc_client.call(ctx, 'node_recover', req)
+        except Exception as ex:
+            LOG.warning("Failed in triggering 'node_recover' RPC for "
+                        "'%(n)s': %(r)s",
+                        {'n': node.id, 'r': six.text_type(ex)})
+            return None
 
-            node_last_updated = node.updated_at or node.init_at
-            if not timeutils.is_older_than(
-                    node_last_updated, node_update_timeout):
-                LOG.info("Node %s was updated at %s which is less than "
-                         "%d secs ago. Skip node recovery.",
-                         node.id, node_last_updated, node_update_timeout)
-                return None
+    def _poll_node(self, ctx, node, fetches, timeout, recover_action,
+                   params):
+        """Routine to poll the status of a node from a url until it is up.
+
+        The node is polled again after the retry interval while it is found
+        down, independently of the other nodes. A node still down after the
+        retry limit is reached is recovered.
 
+        :param ctx: The request context to use for recovery action.
+        :param node: The node to be polled.
+        :param fetches: A semaphore bounding the number of concurrent polls.
+        :param timeout: The maximum number of seconds to wait for recovery
+                        action.
+        :param recover_action: The health policy action name.
+        :param params: Parameters specific to poll url or recovery action.
+        :returns: Nothing.
+        """
+        available_attempts = params['poll_url_retry_limit']
+        while available_attempts > 0:
+            available_attempts -= 1
+            with fetches:
+                down = self._check_url(node, params)
+            if not down:
+                return
             LOG.info("Node %s is reported as down (%d retries left)",
-                     node.id, available_attemps)
-            time.sleep(retry_interval)
+                     node.id, available_attempts)
+            if available_attempts > 0:
+                eventlet.sleep(params['poll_url_retry_interval'])
 
         # recover node after exhausting retries
-        LOG.info("Requesting node recovery: %s", node.id)
-        req = objects.NodeRecoverRequest(identity=node.id,
-                                         params=recover_action)
+        action = self._recover_node(ctx, node, recover_action)
+        if not action:
+            return
 
-        return self.rpc_client.call(ctx, 'node_recover', req)
+        # wait for action to complete
+        res, reason = self._wait_for_action(ctx, action['action'], timeout)
+        if not res:
+            LOG.warning("Node recovery action %s did not complete within "
+                        "specified timeout: %s", action['action'], reason)
 
     def _poll_url(self, cluster_id, timeout, recover_action, params):
         """Routine to be executed for polling node status from a url
 
+        Each node is polled in its own green thread, so a slow or dead
+        endpoint only delays the retries and the recovery of its own node.
+        At most ``poll_url_concurrency`` URLs are requested at a time.
+
         :param cluster_id: The UUID of the cluster to be checked.
         :param timeout: The maximum number of seconds to wait for recovery
         action
@@ -381,32 +634,27 @@ class HealthManager(service.Service):
         ctx = context.get_service_context(user_id=cluster.user,
                                           project_id=cluster.project)
 
-        actions = []
-
-        # loop through nodes to poll url for each node
         nodes = objects.Node.get_all_by_cluster(ctx, cluster_id)
+        fetches = semaphore.Semaphore(
+            cfg.CONF.health_manager.poll_url_concurrency)
+        pool = eventlet.GreenPool(max(len(nodes), 1))
         for node in nodes:
-            action = self._check_url_and_recover_node(ctx, node,
-                                                      recover_action, params)
-            if action:
-                actions.append(action)
+            pool.spawn_n(self._poll_node, ctx, node, fetches, timeout,
+                         recover_action, params)
+        pool.waitall()
 
-        for a in actions:
-            # wait for action to complete
-            res, reason = self._wait_for_action(ctx, a['action'], timeout)
-            if not res:
-                LOG.warning("Node recovery action %s did not complete "
-                            "within specified timeout: %s", a['action'],
-                            reason)
-
-        return _chase_up(start_time, timeout)
+        return self._record_poll(cluster_id, start_time, timeout)
 
     def _add_listener(self, cluster_id, recover_action):
         """Routine to be executed for adding cluster listener.
 
+        The listener of an exchange is shared by all the clusters whose
+        notifications are received from that exchange. It is started when
+        the first cluster is added.
+
         :param cluster_id: The UUID of the cluster to be filtered.
         :param recover_action: The health policy action name.
-        :returns: Nothing.
+        :returns: The router of the listener or None if failed.
         """
         cluster = objects.Cluster.get(self.ctx, cluster_id, project_safe=False)
         if not cluster:
@@ -417,14 +665,39 @@ class HealthManager(service.Service):
         profile_type = profile.type.split('-')[0]
         if profile_type == 'os.nova.server':
             exchange = cfg.CONF.health_manager.nova_control_exchange
+            endpoint_class = NovaNotificationEndpoint
         elif profile_type == 'os.heat.stack':
             exchange = cfg.CONF.health_manager.heat_control_exchange
+            endpoint_class = HeatNotificationEndpoint
         else:
             return None
 
-        project = cluster.project
-        return self.TG.add_thread(ListenerProc, exchange, project, cluster_id,
-                                  recover_action)
+        router = self.routers.get(exchange)
+        if router is None:
+            router = NotificationRouter(exchange, endpoint_class,
+                                        self.aggregator)
+            router.listener = ListenerProc(exchange, router)
+            self.routers[exchange] = router
+
+        router.add(cluster.project, cluster_id, recover_action)
+        return router
+
+    def _remove_listener(self, cluster_id, router):
+        """Routine to be executed for removing cluster listener.
+
+        The listener of the exchange is stopped when no cluster is left.
+
+        :param cluster_id: The UUID of the cluster to be removed.
+        :param router: The router of the listener.
+        :returns: Nothing.
+        """
+        router.remove(cluster_id)
+        if router.endpoints:
+            return
+
+        self.routers.pop(router.exchange, None)
+        router.listener.stop()
+        router.listener.wait()
 
     def _start_check(self, entry):
         """Routine for starting the checking for a cluster.
@@ -491,18 +764,60 @@ class HealthManager(service.Service):
 
         listener = entry.get('listener', None)
         if listener:
-            self.TG.thread_done(listener)
-            listener.stop()
+            self._remove_listener(entry['cluster_id'], listener)
             return
 
-    def _load_runtime_registry(self):
-        """Load the initial runtime registry with a DB scan."""
-        db_registries = objects.HealthRegistry.claim(self.ctx, self.engine_id)
+    def _is_engine_settled(self, engine_id):
+        """Check if an engine has been up for a full periodic interval.
+
+        :param engine_id: ID of the engine to check.
+        :returns: True if the engine has been up long enough to take over
+                  health registries, or False otherwise.
+        """
+        svc = objects.Service.get(self.ctx, engine_id)
+        if svc is None:
+            return False
+        return timeutils.is_older_than(svc.created_at,
+                                       cfg.CONF.periodic_interval)
 
+    def _load_runtime_registry(self):
+        """Synchronize the runtime registry with the DB.
+
+        Health registries are distributed across the engines alive using a
+        consistent hash ring over the cluster IDs. Registries being checked
+        by this engine which are now assigned to another engine, e.g. after
+        an engine has joined, are handed over to that engine once it has
+        been up for a full interval, so that an engine restarting or missing
+        a report does not make the registries move back and forth. Registries
+        of dead engines assigned to this engine are claimed, and the
+        registries handed over to this engine are loaded.
+        """
+        ring = get_engine_ring(self.ctx, self.engine_id)
+        settled = {}
+        for entry in list(self.rt['registries']):
+            owner = ring.get_node(entry['cluster_id'])
+            if owner == self.engine_id:
+                continue
+            if owner not in settled:
+                settled[owner] = self._is_engine_settled(owner)
+            if not settled[owner]:
+                continue
+            LOG.info("Handing over health monitoring of cluster %(c)s to "
+                     "engine %(e)s", {'c': entry['cluster_id'], 'e': owner})
+            self._stop_check(entry)
+            self.rt['registries'].remove(entry)
+            objects.HealthRegistry.update(self.ctx, entry['cluster_id'],
+                                          {'engine_id': owner})
+
+        objects.HealthRegistry.claim(self.ctx, self.engine_id, ring=ring)
+
+        loaded = set(e['cluster_id'] for e in self.rt['registries'])
+        db_registries = objects.HealthRegistry.get_all_by_engine(
+            self.ctx, self.engine_id)
         for r in db_registries:
-            # Claiming indicates we claim a health registry who's engine was
-            # dead, and we will update the health registry's engine_id with
-            # current engine id. But we may not start check always.
+            if r.cluster_id in loaded:
+                continue
+
             entry = {
                 'cluster_id': r.cluster_id,
                 'check_type': r.check_type,
@@ -536,6 +851,11 @@ class HealthManager(service.Service):
 
     def stop(self):
         self.TG.stop_timers()
+        for router in list(self.routers.values()):
+            router.listener.stop()
+            router.listener.wait()
+        self.routers.clear()
+        self.aggregator.flush_all()
         super(HealthManager, self).stop()
 
     @property
@@ -641,6 +961,13 @@ def register(cluster_id, engine_id=None, **kwargs):
     interval = kwargs.pop('interval', cfg.CONF.periodic_interval)
     check_type = kwargs.pop('check_type', consts.NODE_STATUS_POLLING)
     enabled = kwargs.pop('enabled', True)
+    if engine_id is None:
+        # register the cluster to the engine the hash ring assigns it to,
+        # the local engine being part of the ring even if it has not
+        # reported its status yet
+        ctx = context.get_admin_context()
+        ring = get_engine_ring(ctx, _local_engine_id)
+        engine_id = ring.get_node(cluster_id)
     return notify(engine_id, 'register_cluster',
                   cluster_id=cluster_id,
                   interval=interval,
@@ -84,16 +84,8 @@ class Node(object):
 
         self.rt = {'profile': profile}
 
-    def store(self, context):
-        """Store the node into database table.
-
-        The invocation of object API could be a node_create or a node_update,
-        depending on whether node has an ID assigned.
-
-        @param context: Request context for node creation.
-        @return: UUID of node created.
-        """
-        values = {
+    def _to_values(self):
+        return {
             'name': self.name,
             'physical_id': self.physical_id,
             'cluster_id': self.cluster_id,
@@ -113,6 +105,17 @@ class Node(object):
             'dependents': self.dependents,
         }
 
+    def store(self, context):
+        """Store the node into database table.
+
+        The invocation of object API could be a node_create or a node_update,
+        depending on whether node has an ID assigned.
+
+        @param context: Request context for node creation.
+        @return: UUID of node created.
+        """
+        values = self._to_values()
+
         if self.id:
             no.Node.update(context, self.id, values)
         else:
@@ -125,6 +128,37 @@ class Node(object):
         self._load_runtime_data(context)
         return self.id
 
+    @classmethod
+    def store_batch(cls, context, nodes):
+        """Create a group of new nodes in database with a single insertion.
+
+        @param context: Request context for node creation.
+        @param nodes: A list of node objects that have no ID assigned.
+        @return: A list of UUIDs of the nodes created.
+        """
+        if not nodes:
+            return []
+
+        init_at = timeutils.utcnow(True)
+        values_list = []
+        for node in nodes:
+            node.init_at = init_at
+            values_list.append(node._to_values())
+
+        node_ids = no.Node.create_batch(context, values_list)
+
+        # the nodes of a batch usually share a profile, which is loaded once
+        profiles = {}
+        for node, node_id in zip(nodes, node_ids):
+            node.id = node_id
+            if node.profile_id not in profiles:
+                node._load_runtime_data(context)
+                profiles[node.profile_id] = node.rt['profile']
+            else:
+                node.rt = {'profile': profiles[node.profile_id]}
+
+        return node_ids
+
     @classmethod
     def _from_object(cls, context, obj):
         """Construct a node from node object.
@@ -328,22 +362,88 @@ class Node(object):
             self.set_status(context, consts.NS_ERROR, six.text_type(ex))
             return False
 
+        status, reason = self._check_status(res)
+        self.set_status(context, status, reason)
+        return True
+
+    def _check_status(self, healthy):
+        """Get the status of the node resulting from a health check.
+
+        :param healthy: Whether the physical object was found healthy.
+        :returns: A tuple containing the new status and status reason.
+        """
+        if not healthy:
+            return consts.NS_ERROR, "Check: Node is not ACTIVE."
+
         # Physical object is ACTIVE but for some reason the node status in
         # senlin was WARNING. We only update the status_reason
-        if res:
-            if self.status == consts.NS_WARNING:
-                msg = ("Check: Physical object is ACTIVE but the node status "
-                       "was WARNING. %s") % self.status_reason
-                self.set_status(context, consts.NS_WARNING, msg)
-                return True
+        if self.status == consts.NS_WARNING:
+            msg = ("Check: Physical object is ACTIVE but the node status "
+                   "was WARNING. %s") % self.status_reason
+            return consts.NS_WARNING, msg
 
-            self.set_status(context, consts.NS_ACTIVE,
-                            "Check: Node is ACTIVE.")
-        else:
-            self.set_status(context, consts.NS_ERROR,
-                            "Check: Node is not ACTIVE.")
+        return consts.NS_ACTIVE, "Check: Node is ACTIVE."
 
-        return True
+    @classmethod
+    def check_batch(cls, context, nodes):
+        """Check the health of nodes in bulk.
+
+        The physical objects are checked by the profiles in one pass and the
+        statuses of the nodes are updated accordingly. Only the nodes whose
+        status changes are written to the database.
+
+        :param context: The request context.
+        :param nodes: A list of node objects.
+        :returns: A dict mapping the ID of each node to a boolean telling
+                  whether the node is healthy, or None if bulk checking is
+                  not supported by the profiles of the nodes.
+        :raises: `InternalError` if the nodes could not be checked.
+        """
+        results = pb.Profile.check_objects(context, nodes)
+        if results is None:
+            return None
+
+        cls.store_check_results(context, nodes, results)
+        return results
+
+    @classmethod
+    def store_check_results(cls, context, nodes, results):
+        """Update the statuses of nodes from the results of a health check.
+
+        Only the nodes whose status changes are written to the database, all
+        of them in a single transaction.
+
+        :param context: The request context.
+        :param nodes: A list of node objects.
+        :param results: A dict mapping the ID of each node checked to a
+                        boolean telling whether the node is healthy, or to
+                        the exception raised when checking the node. Nodes
+                        not found in the dict are left untouched.
+        :returns: ``None``.
+        """
+        now = timeutils.utcnow(True)
+        statuses = {}
+        for node in nodes:
+            if not node.physical_id or node.id not in results:
+                continue
+
+            res = results[node.id]
+            if isinstance(res, exc.EServerNotFound):
+                # Same as do_check, the node lost its physical object
+                node.set_status(context, consts.NS_ERROR, six.text_type(res),
+                                physical_id=None)
+                continue
+            if isinstance(res, exc.InternalError):
+                status, reason = consts.NS_ERROR, six.text_type(res)
+            else:
+                status, reason = node._check_status(res)
+            if status != node.status or reason != node.status_reason:
+                node.status = status
+                node.status_reason = reason
+                node.updated_at = now
+                statuses[node.id] = (status, reason)
+
+        no.Node.update_status_batch(context, statuses, now)
 
     def do_recover(self, context, action):
         """recover a node.
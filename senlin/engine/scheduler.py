@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import time
 
 import eventlet
@@ -19,15 +20,160 @@ from oslo_log import log as logging
 from oslo_service import threadgroup
 from osprofiler import profiler
 
+from senlin.common import consts
 from senlin.common import context
 from senlin.engine.actions import base as action_mod
 from senlin.objects import action as ao
+from senlin.objects import event as eo
 
 LOG = logging.getLogger(__name__)
 
 wallclock = time.time
 
 
+class TokenBucket(object):
+    """A token bucket allowing a number of events per period of time.
+
+    The bucket holds at most ``capacity`` tokens and is refilled continuously
+    at the rate of ``capacity`` tokens per ``period`` seconds. Each event
+    consumes one token, so bursts of up to ``capacity`` events are allowed.
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.timestamp = wallclock()
+
+    def _refill(self):
+        now = wallclock()
+        elapsed = max(now - self.timestamp, 0)
+        self.tokens = min(self.capacity,
+                          self.tokens + elapsed * self.capacity / self.period)
+        self.timestamp = now
+
+    def consume(self):
+        """Consume a token if there is one available.
+
+        :returns: True if a token was consumed, False otherwise.
+        """
+        self._refill()
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+    def refund(self):
+        """Return a token consumed by an event that didn't happen."""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def wait_time(self):
+        """Get the number of seconds until a token is available."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) * self.period / self.capacity
+
+
+class RateLimiter(object):
+    """Rate limits of starting actions, one token bucket per action type.
+
+    The limits are read from the ``action_rate_limits`` option, which maps
+    action names, e.g. ``NODE_CREATE``, or action name prefixes, e.g.
+    ``NODE``, to the number of actions allowed per period of time. The
+    option is parsed once when the limiter is created.
+    """
+
+    def __init__(self):
+        self._limits = self._parse_limits()
+        self._buckets = {}
+        self._counters = collections.defaultdict(lambda: [0, 0])
+
+    @staticmethod
+    def _parse_limits():
+        limits = {}
+        for key, value in cfg.CONF.action_rate_limits.items():
+            parts = value.split(':')
+            try:
+                count = int(parts[0])
+                period = float(parts[1]) if len(parts) > 1 else 1.0
+            except ValueError:
+                count = 0
+            if count <= 0 or period <= 0:
+                LOG.warning('Invalid action rate limit %(key)s:%(value)s '
+                            'ignored.', {'key': key, 'value': value})
+                continue
+            limits[key] = (count, period)
+
+        # Compatibility with the batch options of node actions
+        batch_size = cfg.CONF.max_actions_per_batch
+        if batch_size > 0 and 'NODE' not in limits:
+            limits['NODE'] = (batch_size, max(cfg.CONF.batch_interval, 1))
+
+        return limits
+
+    def _get_bucket(self, action):
+        key = action
+        if key not in self._limits:
+            key = action.split('_', 1)[0]
+            if key not in self._limits:
+                return None
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(*self._limits[key])
+            self._buckets[key] = bucket
+        return key, bucket
+
+    def consume(self, action):
+        """Check whether an action of the given type can be started now.
+
+        :param action: The name of the action, e.g. ``NODE_CREATE``.
+        :returns: True if the action is allowed to start, False otherwise.
+        """
+        found = self._get_bucket(action)
+        if found is None:
+            return True
+
+        key, bucket = found
+        allowed = bucket.consume()
+        self._counters[key][0 if allowed else 1] += 1
+        return allowed
+
+    def refund(self, action):
+        """Refund the token consumed for an action that was not started."""
+        found = self._get_bucket(action)
+        if found is not None:
+            found[1].refund()
+            self._counters[found[0]][0] -= 1
+
+    def wait_time(self):
+        """Get the number of seconds until an exhausted bucket has a token."""
+        waits = [b.wait_time() for b in self._buckets.values()]
+        return min([w for w in waits if w > 0] or [0])
+
+    def stats(self):
+        """Get the state of the token buckets.
+
+        :returns: A list of dicts, one for each bucket used, containing the
+                  limit, the tokens left and the number of actions allowed
+                  and throttled so far.
+        """
+        stats = []
+        for key, bucket in sorted(self._buckets.items()):
+            bucket._refill()
+            stats.append({
+                'name': key,
+                'capacity': bucket.capacity,
+                'period': bucket.period,
+                'tokens': bucket.tokens,
+                'allowed': self._counters[key][0],
+                'throttled': self._counters[key][1],
+            })
+        return stats
+
+
 class ThreadGroupManager(object):
     '''Thread group manager.'''
 
@@ -39,10 +185,29 @@ class ThreadGroupManager(object):
         # on self.tg the process exits
         self.add_timer(cfg.CONF.periodic_interval, self._service_task)
 
+        # Purge the events older than the retention age periodically
+        if cfg.CONF.event_retention_days > 0:
+            self.add_timer(cfg.CONF.event_purge_interval, self._purge_events)
+
+        # Purge the actions finished before the retention age periodically
+        if cfg.CONF.action_retention_days > 0:
+            self.add_timer(cfg.CONF.action_purge_interval,
+                           self._purge_actions)
+
         # TODO(Yanyan Hu): Build a DB session with full privilege
         # for DB accessing in scheduler module
         self.db_session = context.RequestContext(is_admin=True)
 
+        # Derived actions started by this engine and still running, indexed
+        # by their IDs, with their projects and the clusters they affect
+        self._running = {}
+        # Whether some ready actions are held back by the concurrency limits
+        self._deferred = False
+        # Whether a thread is waiting for the rate limits to allow starting
+        # more actions
+        self._wakeup = False
+        self.limiter = RateLimiter()
+
     def _service_task(self):
         '''Dummy task which gets queued on the service.Service threadgroup.
 
@@ -53,9 +218,34 @@ class ThreadGroupManager(object):
 
         (Yanyan)Not sure this is still necessary, just keep it temporarily.
         '''
-        # TODO(Yanyan): have this task call dbapi purge events
         pass
 
+    def _purge_events(self):
+        '''Periodic task purging the events older than the retention age.'''
+        try:
+            count = eo.Event.purge(granularity='days',
+                                   age=cfg.CONF.event_retention_days)
+        except Exception as ex:
+            LOG.error("Failed in purging events: %s", ex)
+            return
+
+        if count:
+            LOG.info("Purged %s events older than %s days.", count,
+                     cfg.CONF.event_retention_days)
+
+    def _purge_actions(self):
+        '''Periodic task purging the actions finished long enough ago.'''
+        try:
+            count = ao.Action.purge(granularity='days',
+                                    age=cfg.CONF.action_retention_days)
+        except Exception as ex:
+            LOG.error("Failed in purging actions: %s", ex)
+            return
+
+        if count:
+            LOG.info("Purged %s actions finished more than %s days ago.",
+                     count, cfg.CONF.action_retention_days)
+
     def _serialize_profile_info(self):
         prof = profiler.get()
         trace_info = None
@@ -77,7 +267,7 @@ class ThreadGroupManager(object):
     def start(self, func, *args, **kwargs):
         '''Run the given method in a thread.'''
         req_cnxt = oslo_context.get_current()
-        self.group.add_thread(
+        return self.group.add_thread(
             self._start_with_trace, req_cnxt,
             self._serialize_profile_info(),
             func, *args, **kwargs)
@@ -85,53 +275,83 @@ class ThreadGroupManager(object):
     def start_action(self, worker_id, action_id=None):
         '''Run action(s) in sub-thread(s).
 
+        Ready actions are selected by :func:`select_actions`, so that actions
+        of higher priority classes start first and each project gets a fair
+        share of the engine. Actions held back by the concurrency limits
+        remain ready and are reconsidered when a running action completes.
+
         :param worker_id: ID of the worker thread; we fake workers using
                           senlin engines at the moment.
         :param action_id: ID of the action to be executed. None means all
                           ready actions will be acquired and scheduled to run.
         '''
-        actions_launched = 0
-        max_batch_size = cfg.CONF.max_actions_per_batch
-        batch_interval = cfg.CONF.batch_interval
-
         if action_id is not None:
             timestamp = wallclock()
             action = ao.Action.acquire(self.db_session, action_id, worker_id,
                                        timestamp)
             if action:
                 self.start(action_mod.ActionProc, self.db_session, action.id)
-                actions_launched += 1
 
+        limit = cfg.CONF.max_actions_per_acquire
         while True:
-            timestamp = wallclock()
-            action = ao.Action.acquire_first_ready(self.db_session, worker_id,
-                                                   timestamp)
-            if not action:
+            candidates = ao.Action.get_all_ready(self.db_session,
+                                                 limit_per_project=limit)
+            selected, held, throttled = select_actions(
+                candidates, list(self._running.values()), limit,
+                limiter=self.limiter)
+            if held:
+                self._deferred = True
+            if throttled:
+                self._start_later(worker_id, self.limiter.wait_time())
+            if not selected:
                 break
 
-            if max_batch_size == 0 or 'NODE' not in action.action:
-                self.start(action_mod.ActionProc, self.db_session, action.id)
-                continue
-
-            if max_batch_size > actions_launched:
-                self.start(action_mod.ActionProc, self.db_session, action.id)
-                actions_launched += 1
-                continue
-
-            self.start(action_mod.ActionProc, self.db_session, action.id)
-
-            LOG.debug(
-                'Engine %(id)s has launched %(num)s node actions '
-                'consecutively, stop scheduling node action for '
-                '%(interval)s second...',
-                {
-                    'id': worker_id,
-                    'num': max_batch_size,
-                    'interval': batch_interval
-                })
+            timestamp = wallclock()
+            actions = ao.Action.acquire_batch(
+                self.db_session, worker_id, timestamp, limit=len(selected),
+                action_ids=[c.id for c in selected])
+            claimed = set(a.id for a in actions)
+            for c in selected:
+                if c.id in claimed:
+                    self._launch(worker_id, c)
+                else:
+                    self.limiter.refund(c.action)
+
+            # A short batch means there is nothing more to claim for now
+            if len(actions) < limit:
+                break
 
-            sleep(batch_interval)
-            actions_launched = 1
+    def _launch(self, worker_id, candidate):
+        thread = self.start(action_mod.ActionProc, self.db_session,
+                            candidate.id)
+        if candidate.cause == consts.CAUSE_RPC:
+            return
+
+        self._running[candidate.id] = (candidate.project,
+                                       candidate.cluster_id or
+                                       candidate.target)
+        thread.link(self._action_done, worker_id, candidate.id)
+
+    def _action_done(self, gt, worker_id, action_id):
+        self._running.pop(action_id, None)
+        if self._deferred:
+            # Reconsider the actions held back by the concurrency limits
+            self._deferred = False
+            self.start(self.start_action, worker_id)
+
+    def _start_later(self, worker_id, delay):
+        if self._wakeup:
+            return
+
+        LOG.debug('Engine %(id)s throttled, scheduling actions again in '
+                  '%(delay).2f seconds.', {'id': worker_id, 'delay': delay})
+        self._wakeup = True
+        self.start(self._wakeup_after, worker_id, delay)
+
+    def _wakeup_after(self, worker_id, delay):
+        sleep(delay)
+        self._wakeup = False
+        self.start_action(worker_id)
 
     def cancel_action(self, action_id):
         '''Cancel an action execution progress.'''
@@ -183,6 +403,91 @@ class ThreadGroupManager(object):
             eventlet.sleep()
 
 
+def select_actions(candidates, running, limit=None, limiter=None):
+    """Select the ready actions to be started next.
+
+    Candidates are grouped into priority classes which are served in a
+    weighted round-robin fashion according to the ``action_priority_weights``
+    option. Within a priority class, the projects are served in a round-robin
+    fashion and the actions of each project in their original order.
+
+    Actions derived from other actions are held back when starting them
+    would exceed any of the limits on the number of running actions per
+    engine, per project or per cluster. Actions requested by users are not
+    subject to these limits. Any action is throttled when the rate limit of
+    its type is exceeded.
+
+    :param candidates: A list of ready actions as returned by
+                       :meth:`senlin.objects.action.Action.get_all_ready`.
+    :param running: A list of (project, cluster) tuples, one for each derived
+                    action running in this engine.
+    :param limit: Maximum number of actions to select, None means no limit.
+    :param limiter: An optional :class:`RateLimiter` to be consulted.
+    :returns: A tuple of the list of actions selected, in the order they
+              should be started, the number of actions held back by the
+              concurrency limits and the number of actions throttled by the
+              rate limits.
+    """
+    max_engine = cfg.CONF.max_running_actions_per_engine
+    max_project = cfg.CONF.max_running_actions_per_project
+    max_cluster = cfg.CONF.max_running_actions_per_cluster
+    weights = cfg.CONF.action_priority_weights
+
+    num_running = len(running)
+    per_project = collections.Counter(p for p, c in running)
+    per_cluster = collections.Counter(c for p, c in running)
+
+    def _allowed(candidate, cluster):
+        if candidate.cause == consts.CAUSE_RPC:
+            return True
+        return not ((max_engine and num_running >= max_engine) or
+                    (max_project and
+                     per_project[candidate.project] >= max_project) or
+                    (max_cluster and per_cluster[cluster] >= max_cluster))
+
+    classes = collections.OrderedDict(
+        (p, collections.OrderedDict()) for p in consts.ACTION_PRIORITIES)
+    for c in candidates:
+        projects = classes.setdefault(c.priority, collections.OrderedDict())
+        projects.setdefault(c.project, collections.deque()).append(c)
+
+    selected = []
+    held = 0
+    throttled = 0
+    while any(classes.values()):
+        for priority, projects in classes.items():
+            weight = weights[priority] if priority < len(weights) else 1
+            for _ in range(weight):
+                if not projects:
+                    break
+                if limit is not None and len(selected) >= limit:
+                    return selected, held, throttled
+
+                project, actions = projects.popitem(last=False)
+                while actions:
+                    c = actions.popleft()
+                    cluster = c.cluster_id or c.target
+                    if not _allowed(c, cluster):
+                        held += 1
+                        continue
+                    if limiter is not None and not limiter.consume(c.action):
+                        throttled += 1
+                        continue
+
+                    selected.append(c)
+                    if c.cause != consts.CAUSE_RPC:
+                        num_running += 1
+                        per_project[c.project] += 1
+                        per_cluster[cluster] += 1
+                    break
+
+                if actions:
+                    # the project goes to the end of the round
+                    projects[project] = actions
+
+    return selected, held, throttled
+
+
 def reschedule(action_id, sleep_time=1):
     '''Eventlet Sleep for the specified number of seconds.
 
@@ -10,10 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import eventlet
 import random
 import time
 
+from eventlet import semaphore
 from oslo_config import cfg
 from oslo_log import log as logging
 
@@ -28,6 +30,7 @@ CONF = cfg.CONF
 
 CONF.import_opt('lock_retry_times', 'senlin.common.config')
 CONF.import_opt('lock_retry_interval', 'senlin.common.config')
+CONF.import_opt('lock_wait_timeout', 'senlin.common.config')
 
 LOG = logging.getLogger(__name__)
 
@@ -37,6 +40,105 @@ LOCK_SCOPES = (
     -1, 1,
 )
 
+# Actions of this engine holding cluster locks, keyed by cluster ID.
+_holders = {}
+
+# Actions of this engine waiting for cluster locks held by other actions of
+# this engine, keyed by cluster ID. Each value is a FIFO queue of waiters,
+# each waiter being a tuple of the lock scope wanted and a semaphore on which
+# the waiter sleeps.
+_waiters = {}
+
+
+def _held_locally(cluster_id, owners):
+    """Check if a cluster lock is only held by actions of this engine."""
+    holders = _holders.get(cluster_id, set())
+    return bool(owners) and all(o in holders for o in owners)
+
+
+def _add_holder(cluster_id, action_id):
+    _holders.setdefault(cluster_id, set()).add(action_id)
+
+
+def _remove_holder(cluster_id, action_id):
+    holders = _holders.get(cluster_id)
+    if holders is None:
+        return
+    holders.discard(action_id)
+    if not holders:
+        del _holders[cluster_id]
+
+
+def _wake_waiters(cluster_id):
+    """Wake up the waiters at the head of the queue of a cluster.
+
+    The first waiter is always woken up. If it wants a node scope lock, the
+    node scope waiters that directly follow it are woken up as well since
+    they can share the lock.
+    """
+    for index, (scope, sem) in enumerate(_waiters.get(cluster_id, [])):
+        if index > 0 and scope == CLUSTER_SCOPE:
+            break
+        sem.release()
+        if scope == CLUSTER_SCOPE:
+            break
+
+
+def _steal(cluster_id, action_id):
+    """Steal the lock of a cluster for an action.
+
+    The actions of this engine that held the lock lose it, and the local
+    waiters are woken up to check the new state of the lock.
+
+    :returns: A list of IDs of the actions holding the lock.
+    """
+    owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
+    _holders.pop(cluster_id, None)
+    if action_id in owners:
+        _add_holder(cluster_id, action_id)
+    _wake_waiters(cluster_id)
+    return owners
+
+
+def _acquire_or_wait(cluster_id, action_id, scope):
+    """Try to lock a cluster, waiting in line while it is held locally.
+
+    If the lock is held by other actions of this engine, the caller is put
+    into a FIFO queue and woken up when the lock is released, instead of
+    polling the database. The wait stops if the lock turns out to be held by
+    an action of another engine or when `lock_wait_timeout` expires.
+
+    :returns: A list of IDs of the actions holding the lock after the last
+              try.
+    """
+    sem = semaphore.Semaphore(0)
+    waiter = (scope, sem)
+    waiters = _waiters.setdefault(cluster_id, collections.deque())
+    waiters.append(waiter)
+    deadline = time.time() + CONF.lock_wait_timeout
+
+    owners = []
+    try:
+        # Get in line behind the actions already waiting for the lock
+        if len(waiters) > 1:
+            sem.acquire(timeout=CONF.lock_wait_timeout)
+
+        while True:
+            owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
+            if action_id in owners or not _held_locally(cluster_id, owners):
+                return owners
+
+            remaining = deadline - time.time()
+            if remaining <= 0 or not sem.acquire(timeout=remaining):
+                return owners
+    finally:
+        waiters.remove(waiter)
+        if not waiters:
+            _waiters.pop(cluster_id, None)
+        elif action_id not in owners:
+            # Leaving the queue without the lock, let the next one try
+            _wake_waiters(cluster_id)
+
 
 def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
                          scope=CLUSTER_SCOPE, forced=False):
@@ -54,16 +156,24 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
     """
 
     # Step 1: try lock the cluster - if the returned owner_id is the
-    #         action id, it was a success
-    for retries in range(3):
-        owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
+    #         action id, it was a success. While the lock is held by other
+    #         actions of this engine, wait in line for them to release it,
+    #         otherwise retry after a random interval.
+    owners = _acquire_or_wait(cluster_id, action_id, scope)
+    for retries in range(2):
         if action_id in owners:
+            _add_holder(cluster_id, action_id)
             return True
         eventlet.sleep(random.randrange(1, 3))
+        owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
+
+    if action_id in owners:
+        _add_holder(cluster_id, action_id)
+        return True
 
     # Step 2: Last resort is 'forced locking', only needed when retry failed
     if forced:
-        owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
+        owners = _steal(cluster_id, action_id)
         return action_id in owners
 
     # Step 3: check if the owner is a dead engine, if so, steal the lock.
@@ -75,9 +185,9 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
                  'try to steal the lock.',
                  {'c': cluster_id, 'a': owners[0]})
         dead_engine = action.owner
-        owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
+        owners = _steal(cluster_id, action_id)
         # Cleanse locks affected by the dead engine
-        objects.Service.gc_by_engine(dead_engine)
+        gc_by_engine(dead_engine)
         return action_id in owners
 
     lock_owners = []
@@ -97,7 +207,23 @@ def cluster_lock_release(cluster_id, action_id, scope):
     :param action_id: ID of the action that attempts to release the cluster.
     :param scope: The scope of the lock to be released.
     """
-    return cl_obj.ClusterLock.release(cluster_id, action_id, scope)
+    res = cl_obj.ClusterLock.release(cluster_id, action_id, scope)
+    _remove_holder(cluster_id, action_id)
+    _wake_waiters(cluster_id)
+    return res
+
+
+def gc_by_engine(engine_id):
+    """Break the locks held by the actions of a dead engine.
+
+    The local waiters are woken up since the locks they are waiting for may
+    have been released.
+
+    :param engine_id: ID of the dead engine.
+    """
+    objects.Service.gc_by_engine(engine_id)
+    for cluster_id in list(_waiters):
+        _wake_waiters(cluster_id)
 
 
 def node_lock_acquire(context, node_id, action_id, engine=None,
@@ -40,6 +40,7 @@ from senlin.engine import health_manager
 from senlin.engine import node as node_mod
 from senlin.engine.receivers import base as receiver_mod
 from senlin.engine import scheduler
+from senlin.engine import senlin_lock
 from senlin.objects import action as action_obj
 from senlin.objects import base as obj_base
 from senlin.objects import cluster as co
@@ -75,6 +76,23 @@ def request_context(func):
     return wrapped
 
 
+def _list_limit(req):
+    """Get the number of records to list, capped by max_list_limit.
+
+    :param req: A list request object with an optional `limit` field.
+    :returns: The limit requested, or max_list_limit if no limit or a larger
+              limit was requested.
+    """
+    limit = None
+    if req.obj_attr_is_set('limit'):
+        limit = req.limit
+    if limit is None or limit > CONF.max_list_limit:
+        LOG.debug("Listing at most %(m)s records instead of %(l)s.",
+                  {'m': CONF.max_list_limit, 'l': limit})
+        return CONF.max_list_limit
+    return limit
+
+
 @profiler.trace_cls("rpc")
 class EngineService(service.Service):
     """Lifecycle manager for a running service engine.
@@ -172,6 +190,9 @@ class EngineService(service.Service):
 
         self.TG.stop()
 
+        # Write the events buffered by the dispatchers
+        EVENT.flush()
+
         service_obj.Service.delete(self.engine_id)
         LOG.info('Engine %s is deleted', self.engine_id)
 
@@ -184,6 +205,19 @@ class EngineService(service.Service):
         except Exception as ex:
             LOG.error('Error while updating engine service: %s', ex)
 
+        for stats in (profile_base._CACHE.stats(),
+                      policy_base._CACHE.stats()):
+            LOG.debug("Cache %(name)s: %(entries)s/%(size)s entries, "
+                      "%(hits)s hits, %(misses)s misses.", stats)
+
+        if self.TG is None:
+            return
+
+        for stats in self.TG.limiter.stats():
+            LOG.debug("Action rate limit %(name)s: %(capacity)s per "
+                      "%(period)s seconds, %(tokens).1f tokens left, "
+                      "%(allowed)s allowed, %(throttled)s throttled.", stats)
+
     def _service_manage_cleanup(self):
         try:
             ctx = senlin_context.get_admin_context()
@@ -195,7 +229,7 @@ class EngineService(service.Service):
                 if timeutils.is_older_than(svc['updated_at'], time_window):
                     LOG.info('Service %s was aborted', svc['id'])
                     LOG.info('Breaking locks for dead engine %s', svc['id'])
-                    service_obj.Service.gc_by_engine(svc['id'])
+                    senlin_lock.gc_by_engine(svc['id'])
                     LOG.info('Done breaking locks for engine %s', svc['id'])
                     service_obj.Service.delete(svc['id'])
         except Exception as ex:
@@ -699,7 +733,11 @@ class EngineService(service.Service):
         if filters:
             query['filters'] = filters
 
-        return [c.to_dict() for c in co.Cluster.get_all(ctx, **query)]
+        fields = None
+        if req.obj_attr_is_set('attributes') and req.attributes is not None:
+            fields = query['fields'] = req.attributes
+
+        return [c.to_dict(fields) for c in co.Cluster.get_all(ctx, **query)]
 
     @request_context
     def cluster_get(self, context, req):
@@ -1450,6 +1488,16 @@ class EngineService(service.Service):
             if 'check_capacity' in req.params:
                 inputs['check_capacity'] = req.params.pop('check_capacity')
 
+            if 'nodes' in req.params:
+                nodes = req.params.pop('nodes')
+                members = node_obj.Node.ids_by_cluster(ctx, db_cluster.id)
+                bad_nodes = [n for n in nodes if n not in members]
+                if bad_nodes:
+                    msg = _("Nodes not members of specified cluster: "
+                            "%s.") % bad_nodes
+                    raise exception.BadRequest(msg=msg)
+                inputs['nodes'] = nodes
+
             if len(req.params):
                 keys = [str(k) for k in req.params]
                 msg = _("Action parameter %s is not recognizable.") % keys
@@ -1584,8 +1632,12 @@ class EngineService(service.Service):
         if filters:
             query['filters'] = filters
 
+        fields = None
+        if req.obj_attr_is_set('attributes') and req.attributes is not None:
+            fields = query['fields'] = req.attributes
+
         nodes = node_obj.Node.get_all(ctx, **query)
-        return [node.to_dict() for node in nodes]
+        return [node.to_dict(fields) for node in nodes]
 
     @request_context
     def node_create(self, ctx, req):
@@ -2211,9 +2263,10 @@ class EngineService(service.Service):
         if not req.project_safe and not ctx.is_admin:
             raise exception.Forbidden()
 
-        query = {'project_safe': req.project_safe}
-        if req.obj_attr_is_set('limit'):
-            query['limit'] = req.limit
+        query = {
+            'project_safe': req.project_safe,
+            'limit': _list_limit(req),
+        }
         if req.obj_attr_is_set('marker'):
             query['marker'] = req.marker
         if req.obj_attr_is_set('sort') and req.sort is not None:
@@ -2231,8 +2284,12 @@ class EngineService(service.Service):
         if filters:
             query['filters'] = filters
 
+        fields = None
+        if req.obj_attr_is_set('attributes') and req.attributes is not None:
+            fields = query['fields'] = req.attributes
+
         actions = action_obj.Action.get_all(ctx, **query)
-        return [a.to_dict() for a in actions]
+        return [a.to_dict(fields) for a in actions]
 
     @request_context
     def action_create(self, ctx, req):
@@ -2548,9 +2605,10 @@ class EngineService(service.Service):
         if not req.project_safe and not ctx.is_admin:
             raise exception.Forbidden()
 
-        query = {'project_safe': req.project_safe}
-        if req.obj_attr_is_set('limit'):
-            query['limit'] = req.limit
+        query = {
+            'project_safe': req.project_safe,
+            'limit': _list_limit(req),
+        }
         if req.obj_attr_is_set('marker'):
             query['marker'] = req.marker
         if req.obj_attr_is_set('sort') and req.sort is not None:
@@ -2586,13 +2644,17 @@ class EngineService(service.Service):
             if value is not None:
                 filters[consts.EVENT_LEVEL] = value
 
+        keys = None
+        if req.obj_attr_is_set('attributes') and req.attributes is not None:
+            keys = query['columns'] = sorted(set(req.attributes) | set(['id']))
+
         all_events = event_obj.Event.get_all(ctx, **query)
 
         results = []
         for event in all_events:
-            evt = event.as_dict()
-            level = utils.level_from_number(evt['level'])
-            evt['level'] = level
+            evt = event.as_dict(keys)
+            if 'level' in evt:
+                evt['level'] = utils.level_from_number(evt['level'])
             results.append(evt)
 
         return results
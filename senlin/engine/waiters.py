@@ -0,0 +1,99 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+from eventlet import queue
+from oslo_log import log as logging
+
+from senlin.common import consts
+
+LOG = logging.getLogger(__name__)
+
+# Actions waiting for their depended actions to complete, indexed by the ID of
+# the waiting action, and the reverse index from depended action IDs to the
+# IDs of their waiting actions.
+_waiters = {}
+_depended = {}
+
+
+def add_waiter(action_id, depended_ids):
+    """Register an action as waiting for its depended actions.
+
+    Completion of a depended action executed by this engine will wake up the
+    waiting action directly, so it doesn't have to poll the database.
+
+    :param action_id: ID of the waiting action.
+    :param depended_ids: IDs of the actions the waiting action depends on.
+    """
+    _waiters[action_id] = (set(depended_ids), queue.LightQueue())
+    for d in depended_ids:
+        _depended.setdefault(d, set()).add(action_id)
+
+
+def remove_waiter(action_id):
+    """Unregister a waiting action.
+
+    :param action_id: ID of the waiting action.
+    """
+    waiter = _waiters.pop(action_id, None)
+    if waiter is None:
+        return
+
+    for d in waiter[0]:
+        waiting = _depended.get(d, set())
+        waiting.discard(action_id)
+        if not waiting:
+            _depended.pop(d, None)
+
+
+def notify_completion(action_id, status):
+    """Notify the waiting actions that a depended action has completed.
+
+    A waiting action is woken up when all its depended actions known to this
+    engine have succeeded, or as soon as any of them has not succeeded.
+
+    :param action_id: ID of the completed action.
+    :param status: Final status of the completed action.
+    """
+    for waiter_id in _depended.pop(action_id, set()):
+        waiter = _waiters.get(waiter_id)
+        if waiter is None:
+            continue
+
+        pending, events = waiter
+        pending.discard(action_id)
+        if status != consts.ACTION_SUCCEEDED or not pending:
+            events.put(action_id)
+
+
+def wait_for_dependents(action_id, timeout):
+    """Wait for a notification about the depended actions.
+
+    Depended actions executed by other engines are not notified about, so
+    the waiting is bounded by a timeout after which the caller is expected
+    to check the database instead.
+
+    :param action_id: ID of the waiting action.
+    :param timeout: Maximum seconds to wait for a notification.
+    """
+    waiter = _waiters.get(action_id)
+    if waiter is None:
+        LOG.debug('Action %s sleep for %s seconds', action_id, timeout)
+        eventlet.sleep(timeout)
+        return
+
+    LOG.debug('Action %s wait for dependents for at most %s seconds',
+              action_id, timeout)
+    try:
+        waiter[1].get(timeout=timeout)
+    except queue.Empty:
+        pass
@@ -47,3 +47,11 @@ class EventBackend(object):
         :returns: None
         """
         raise NotImplementedError
+
+    @classmethod
+    def flush(cls):
+        """A method for sub-class to override if events are buffered.
+
+        :returns: None
+        """
+        return
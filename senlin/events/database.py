@@ -10,12 +10,107 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
+
+import eventlet
+from eventlet import queue
+from oslo_config import cfg
+from oslo_log import log as logging
 from oslo_utils import timeutils
+import six
 
 from senlin.common import consts
+from senlin.common import context
 from senlin.events import base
 from senlin.objects import event as eo
 
+LOG = logging.getLogger(__name__)
+
+# Marker put in the queue for stopping the writer
+_STOP = object()
+
+
+class EventWriter(object):
+    """Writer of the events dumped into the database.
+
+    Events are buffered in a bounded queue drained by a background green
+    thread, which writes them with multi-row inserts of at most
+    ``database_batch_size`` events. A batch is written as soon as it is
+    full or ``database_flush_interval`` seconds after its first event was
+    queued. Dumping an event blocks while the queue is full, so that the
+    memory used by the buffer stays bounded.
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._thread = None
+
+    def put(self, ctx, values):
+        """Write an event into the database.
+
+        :param ctx: The request context.
+        :param values: A dict containing the values of the event.
+        :returns: None
+        """
+        size = cfg.CONF.dispatchers.database_queue_size
+        if size == 0:
+            eo.Event.create(ctx, values)
+            return
+
+        # the writer is started lazily so that each engine worker process
+        # gets its own one
+        if self._thread is None:
+            self._queue = queue.LightQueue(size)
+            self._thread = eventlet.spawn(self._run, self._queue)
+        self._queue.put(values)
+
+    def _run(self, events):
+        batch_size = cfg.CONF.dispatchers.database_batch_size
+        interval = cfg.CONF.dispatchers.database_flush_interval
+        stopped = False
+        while not stopped:
+            batch = []
+            item = events.get()
+            deadline = time.time() + interval
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = events.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            stopped = item is _STOP
+            self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            eo.Event.create_batch(context.get_admin_context(), batch)
+        except Exception as ex:
+            LOG.error("Failed in writing %(n)s events: %(r)s",
+                      {'n': len(batch), 'r': six.text_type(ex)})
+
+    def flush(self):
+        """Write all the events queued and stop the background writer.
+
+        :returns: None
+        """
+        if self._thread is None:
+            return
+
+        self._queue.put(_STOP)
+        self._thread.wait()
+        self._queue = None
+        self._thread = None
+
+
+WRITER = EventWriter()
+
 
 class DBEvent(base.EventBackend):
     """DB driver for event dumping"""
@@ -60,4 +155,9 @@ class DBEvent(base.EventBackend):
             'meta_data': extra,
         }
 
-        eo.Event.create(ctx, values)
+        WRITER.put(ctx, values)
+
+    @classmethod
+    def flush(cls):
+        """Write the events buffered into the database."""
+        WRITER.flush()
@@ -51,11 +51,20 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         'domain': fields.StringField(nullable=True),
     }
 
+    DICT_KEY_FIELDS = {
+        'depends_on': [],
+        'depended_by': [],
+    }
+
     @classmethod
     def create(cls, context, values):
         obj = db_api.action_create(context, values)
         return cls._from_db_object(context, cls(context), obj)
 
+    @classmethod
+    def create_batch(cls, context, values_list):
+        return db_api.action_create_batch(context, values_list)
+
     @classmethod
     def find(cls, context, identity, **kwargs):
         """Find an action with the given identity.
@@ -85,6 +94,10 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.action_get(context, action_id, **kwargs)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def get_status(cls, context, action_id):
+        return db_api.action_get_status(context, action_id)
+
     @classmethod
     def get_by_name(cls, context, name, **kwargs):
         obj = db_api.action_get_by_name(context, name, **kwargs)
@@ -96,9 +109,17 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         return cls._from_db_object(context, cls(), obj)
 
     @classmethod
-    def get_all(cls, context, **kwargs):
-        objs = db_api.action_get_all(context, **kwargs)
-        return [cls._from_db_object(context, cls(), obj) for obj in objs]
+    def get_all(cls, context, fields=None, **kwargs):
+        """Get actions matching the given criteria.
+
+        :param fields: An optional list of the keys of the dict
+                       representations of the actions. Only the columns
+                       needed by these keys are loaded.
+        """
+        obj_fields, columns = cls._select(fields)
+        objs = db_api.action_get_all(context, columns=columns, **kwargs)
+        return [cls._from_db_object(context, cls(), obj, obj_fields)
+                for obj in objs]
 
     @classmethod
     def get_all_by_owner(cls, context, owner):
@@ -137,6 +158,17 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
     def acquire_first_ready(cls, context, owner, timestamp):
         return db_api.action_acquire_first_ready(context, owner, timestamp)
 
+    @classmethod
+    def get_all_ready(cls, context, limit_per_project=None):
+        return db_api.action_get_all_ready(
+            context, limit_per_project=limit_per_project)
+
+    @classmethod
+    def acquire_batch(cls, context, owner, timestamp, limit=None,
+                      action_ids=None):
+        return db_api.action_acquire_batch(context, owner, timestamp,
+                                           limit=limit, action_ids=action_ids)
+
     @classmethod
     def abandon(cls, context, action_id, values=None):
         return db_api.action_abandon(context, action_id, values)
@@ -157,10 +189,20 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
     def update(cls, context, action_id, values):
         return db_api.action_update(context, action_id, values)
 
+    @classmethod
+    def update_batch(cls, context, action_ids, values):
+        return db_api.action_update_batch(context, action_ids, values)
+
     @classmethod
     def delete(cls, context, action_id):
         db_api.action_delete(context, action_id)
 
+    @classmethod
+    def purge(cls, project=None, granularity='days', age=30,
+              batch_size=None):
+        return db_api.action_purge(None, project, granularity, age,
+                                   batch_size=batch_size)
+
     @classmethod
     def delete_by_target(cls, context, target, action=None,
                          action_excluded=None, status=None):
@@ -176,13 +218,31 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
                                               action_excluded=action_excluded,
                                               status=status)
 
-    def to_dict(self):
-        if self.id:
-            dep_on = dobj.Dependency.get_depended(self.context, self.id)
-            dep_by = dobj.Dependency.get_dependents(self.context, self.id)
-        else:
-            dep_on = []
-            dep_by = []
+    def _dependencies(self, key):
+        if not self.id:
+            return []
+        if key == 'depends_on':
+            return dobj.Dependency.get_depended(self.context, self.id)
+        return dobj.Dependency.get_dependents(self.context, self.id)
+
+    def to_dict(self, fields=None):
+        """Get the dict representation of the action.
+
+        :param fields: An optional list of the keys to return, the ``id``
+                       being always returned. Defaults to all the keys.
+        """
+        if fields is not None:
+            keys = set(fields) | set(['id'])
+            action_dict = {}
+            for key in keys:
+                if key in ('depends_on', 'depended_by'):
+                    action_dict[key] = self._dependencies(key)
+                elif key in ('created_at', 'updated_at'):
+                    action_dict[key] = utils.isotime(self[key])
+                else:
+                    action_dict[key] = self[key]
+            return action_dict
+
         action_dict = {
             'id': self.id,
             'name': self.name,
@@ -198,8 +258,8 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
             'status_reason': self.status_reason,
             'inputs': self.inputs,
             'outputs': self.outputs,
-            'depends_on': dep_on,
-            'depended_by': dep_by,
+            'depends_on': self._dependencies('depends_on'),
+            'depended_by': self._dependencies('depended_by'),
             'created_at': utils.isotime(self.created_at),
             'updated_at': utils.isotime(self.updated_at),
             'data': self.data,
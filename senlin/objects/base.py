@@ -42,11 +42,46 @@ class SenlinObject(base.VersionedObject):
     # {'1.2': '1.0', '1.4': '1.1'}
     VERSION_MAP = {}
 
+    # Fields a key of the dict representation of an object is built from,
+    # for the keys not named after a field. The ID is always needed.
+    DICT_KEY_FIELDS = {}
+
+    # Columns the fields of an object are loaded from, for the fields not
+    # named after a column.
+    FIELD_COLUMNS = {'metadata': 'meta_data'}
+
+    @classmethod
+    def _select(cls, keys):
+        """Get the fields and columns needed by some keys of the object dict.
+
+        :param keys: A list of the keys of the dict representation of the
+                     object to build, or None for all the keys.
+        :returns: A tuple of the set of the names of the fields and the list
+                  of the names of the DB columns needed, both including the
+                  ID, or a tuple of two None for all the keys.
+        """
+        if keys is None:
+            return None, None
+
+        fields = set(['id'])
+        for key in keys:
+            fields.update(cls.DICT_KEY_FIELDS.get(key, [key]))
+        columns = set(cls.FIELD_COLUMNS.get(f, f) for f in fields)
+        return fields, sorted(columns)
+
     @staticmethod
-    def _from_db_object(context, obj, db_obj):
+    def _from_db_object(context, obj, db_obj, fields=None):
+        """Set the fields of an object from a DB object.
+
+        :param fields: An optional list of the names of the fields to set,
+                       e.g. when only some columns were loaded. The other
+                       fields are left unset. Defaults to all the fields.
+        """
         if db_obj is None:
             return None
         for field in obj.fields:
+            if fields is not None and field not in fields:
+                continue
             if field == 'metadata':
                 obj['metadata'] = db_obj['meta_data']
             else:
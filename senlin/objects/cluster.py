@@ -51,6 +51,12 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
         'config': fields.JsonField(nullable=True),
     }
 
+    DICT_KEY_FIELDS = {
+        'profile_name': ['profile_id'],
+        'nodes': [],
+        'policies': [],
+    }
+
     @classmethod
     def create(cls, context, values):
         values = cls._transpose_metadata(values)
@@ -95,13 +101,21 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
         return cls._from_db_object(context, cls(), obj)
 
     @classmethod
-    def get_all(cls, context, **kwargs):
-        objs = db_api.cluster_get_all(context, **kwargs)
-        return [cls._from_db_object(context, cls(), obj) for obj in objs]
+    def get_all(cls, context, fields=None, **kwargs):
+        """Get clusters matching the given criteria.
+
+        :param fields: An optional list of the keys of the dict
+                       representations of the clusters. Only the columns
+                       needed by these keys are loaded.
+        """
+        obj_fields, columns = cls._select(fields)
+        objs = db_api.cluster_get_all(context, columns=columns, **kwargs)
+        return [cls._from_db_object(context, cls(), obj, obj_fields)
+                for obj in objs]
 
     @classmethod
-    def get_next_index(cls, context, cluster_id):
-        return db_api.cluster_next_index(context, cluster_id)
+    def get_next_index(cls, context, cluster_id, count=1):
+        return db_api.cluster_next_index(context, cluster_id, count=count)
 
     @classmethod
     def count_all(cls, context, **kwargs):
@@ -117,8 +131,32 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
     def delete(cls, context, obj_id):
         db_api.cluster_delete(context, obj_id)
 
-    def to_dict(self):
+    def _dict_value(self, context, key):
+        if key == 'profile_name':
+            profile = db_api.profile_get(context, self.profile_id,
+                                         project_safe=False)
+            return profile.name
+        if key == 'nodes':
+            return db_api.node_ids_by_cluster(context, self.id)
+        if key == 'policies':
+            return db_api.cluster_policy_ids_by_cluster(context, self.id)
+        if key in ('init_at', 'created_at', 'updated_at'):
+            return utils.isotime(self[key])
+        if key in ('metadata', 'data', 'dependents', 'config'):
+            return self[key] or {}
+        return self[key]
+
+    def to_dict(self, fields=None):
+        """Get the dict representation of the cluster.
+
+        :param fields: An optional list of the keys to return, the ``id``
+                       being always returned. Defaults to all the keys.
+        """
         context = senlin_context.get_admin_context()
+        if fields is not None:
+            return dict((key, self._dict_value(context, key))
+                        for key in set(fields) | set(['id']))
+
         profile = db_api.profile_get(context, self.profile_id,
                                      project_safe=False)
         return {
@@ -45,6 +45,10 @@ class Event(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.event_create(context, values)
         return cls._from_db_object(context, cls(context), obj)
 
+    @classmethod
+    def create_batch(cls, context, values_list):
+        return db_api.event_create_batch(context, values_list)
+
     @classmethod
     def find(cls, context, identity, **kwargs):
         """Find an event with the given identity.
@@ -85,3 +89,9 @@ class Event(base.SenlinObject, base.VersionedObjectDictCompat):
     def get_all_by_cluster(cls, context, cluster_id, **kwargs):
         objs = db_api.event_get_all_by_cluster(context, cluster_id, **kwargs)
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
+
+    @classmethod
+    def purge(cls, project=None, granularity='days', age=30,
+              batch_size=None):
+        return db_api.event_purge(None, project, granularity, age,
+                                  batch_size=batch_size)
@@ -45,8 +45,8 @@ class HealthRegistry(base.SenlinObject, base.VersionedObjectDictCompat):
         db_api.registry_update(context, cluster_id, values)
 
     @classmethod
-    def claim(cls, context, engine_id):
-        objs = db_api.registry_claim(context, engine_id)
+    def claim(cls, context, engine_id, ring=None):
+        objs = db_api.registry_claim(context, engine_id, ring=ring)
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
     @classmethod
@@ -67,6 +67,11 @@ class HealthRegistry(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.registry_get_by_param(context, params)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def get_all_by_engine(cls, context, engine_id):
+        objs = db_api.registry_get_all_by_engine(context, engine_id)
+        return [cls._from_db_object(context, cls(), obj) for obj in objs]
+
     @classmethod
     def disable_registry(cls, context, cluster_id):
         cls.update(context, cluster_id, {'enabled': False})
@@ -49,11 +49,19 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
         'profile_created_at': fields.StringField(nullable=True),
     }
 
+    FIELD_COLUMNS = {
+        'metadata': 'meta_data',
+        'profile_name': 'profile_id',
+        'profile_created_at': 'profile_id',
+    }
+
     @staticmethod
-    def _from_db_object(context, obj, db_obj):
+    def _from_db_object(context, obj, db_obj, fields=None):
         if db_obj is None:
             return None
         for field in obj.fields:
+            if fields is not None and field not in fields:
+                continue
             if field == 'metadata':
                 obj['metadata'] = db_obj['meta_data']
             elif field == 'profile_name':
@@ -79,6 +87,11 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.node_get(context, obj.id)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def create_batch(cls, context, values_list):
+        values_list = [cls._transpose_metadata(v) for v in values_list]
+        return db_api.node_create_batch(context, values_list)
+
     @classmethod
     def find(cls, context, identity, project_safe=True):
         """Find a node with the given identity.
@@ -127,9 +140,17 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
         return cls._from_db_object(context, cls(), obj)
 
     @classmethod
-    def get_all(cls, context, **kwargs):
-        objs = db_api.node_get_all(context, **kwargs)
-        return [cls._from_db_object(context, cls(), obj) for obj in objs]
+    def get_all(cls, context, fields=None, **kwargs):
+        """Get nodes matching the given criteria.
+
+        :param fields: An optional list of the keys of the dict
+                       representations of the nodes. Only the columns
+                       needed by these keys are loaded.
+        """
+        obj_fields, columns = cls._select(fields)
+        objs = db_api.node_get_all(context, columns=columns, **kwargs)
+        return [cls._from_db_object(context, cls(), obj, obj_fields)
+                for obj in objs]
 
     @classmethod
     def get_all_by_cluster(cls, context, cluster_id, filters=None,
@@ -152,6 +173,10 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
         values = cls._transpose_metadata(values)
         db_api.node_update(context, obj_id, values)
 
+    @classmethod
+    def update_status_batch(cls, context, statuses, timestamp):
+        return db_api.node_update_status_batch(context, statuses, timestamp)
+
     @classmethod
     def migrate(cls, context, obj_id, to_cluster, timestamp, role=None):
         return db_api.node_migrate(context, obj_id, to_cluster, timestamp,
@@ -161,7 +186,21 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
     def delete(cls, context, obj_id):
         return db_api.node_delete(context, obj_id)
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        """Get the dict representation of the node.
+
+        :param fields: An optional list of the keys to return, the ``id``
+                       being always returned. Defaults to all the keys.
+        """
+        if fields is not None:
+            node_dict = {}
+            for key in set(fields) | set(['id']):
+                if key in ('init_at', 'created_at', 'updated_at'):
+                    node_dict[key] = utils.isotime(self[key])
+                else:
+                    node_dict[key] = self[key]
+            return node_dict
+
         return {
             'id': self.id,
             'name': self.name,
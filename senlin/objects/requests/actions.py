@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_utils import versionutils
+
 from senlin.common import consts
 from senlin.objects import base
 from senlin.objects import fields
@@ -35,6 +37,13 @@ class ActionCreateRequest(base.SenlinObject):
 
 @base.SenlinObjectRegistry.register
 class ActionListRequest(base.SenlinObject):
+    # VERSION 1.0: Initial version
+    # VERSION 1.1: Added field 'attributes'
+    VERSION = '1.1'
+    VERSION_MAP = {
+        '1.11': '1.1',
+    }
+
     action_name_list = list(consts.CLUSTER_ACTION_NAMES)
     action_name_list.extend(list(consts.NODE_ACTION_NAMES))
 
@@ -49,9 +58,19 @@ class ActionListRequest(base.SenlinObject):
         'marker': fields.UUIDField(nullable=True),
         'sort': fields.SortField(
             valid_keys=list(consts.ACTION_SORT_KEYS), nullable=True),
-        'project_safe': fields.FlexibleBooleanField(default=True)
+        'project_safe': fields.FlexibleBooleanField(default=True),
+        'attributes': fields.ListOfEnumField(
+            valid_values=list(consts.ACTION_LIST_FIELDS), nullable=True),
     }
 
+    def obj_make_compatible(self, primitive, target_version):
+        super(ActionListRequest, self).obj_make_compatible(
+            primitive, target_version)
+        target_version = versionutils.convert_version_to_tuple(target_version)
+        if target_version < (1, 1):
+            if 'attributes' in primitive['senlin_object.data']:
+                del primitive['senlin_object.data']['attributes']
+
 
 @base.SenlinObjectRegistry.register
 class ActionGetRequest(base.SenlinObject):
@@ -23,6 +23,12 @@ CONF.import_opt('default_action_timeout', 'senlin.common.config')
 
 @base.SenlinObjectRegistry.register
 class ClusterListRequest(base.SenlinObject):
+    # VERSION 1.0: Initial version
+    # VERSION 1.1: Added field 'attributes'
+    VERSION = '1.1'
+    VERSION_MAP = {
+        '1.11': '1.1',
+    }
 
     fields = {
         'name': fields.ListOfStringsField(nullable=True),
@@ -33,8 +39,18 @@ class ClusterListRequest(base.SenlinObject):
         'sort': fields.SortField(
             valid_keys=list(consts.CLUSTER_SORT_KEYS), nullable=True),
         'project_safe': fields.FlexibleBooleanField(default=True),
+        'attributes': fields.ListOfEnumField(
+            valid_values=list(consts.CLUSTER_LIST_FIELDS), nullable=True),
     }
 
+    def obj_make_compatible(self, primitive, target_version):
+        super(ClusterListRequest, self).obj_make_compatible(
+            primitive, target_version)
+        target_version = versionutils.convert_version_to_tuple(target_version)
+        if target_version < (1, 1):
+            if 'attributes' in primitive['senlin_object.data']:
+                del primitive['senlin_object.data']['attributes']
+
 
 @base.SenlinObjectRegistry.register
 class ClusterCreateRequestBody(base.SenlinObject):
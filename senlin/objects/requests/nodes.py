@@ -39,6 +39,12 @@ class NodeCreateRequest(base.SenlinObject):
 
 @base.SenlinObjectRegistry.register
 class NodeListRequest(base.SenlinObject):
+    # VERSION 1.0: Initial version
+    # VERSION 1.1: Added field 'attributes'
+    VERSION = '1.1'
+    VERSION_MAP = {
+        '1.11': '1.1',
+    }
 
     fields = {
         'cluster_id': fields.StringField(nullable=True),
@@ -49,9 +55,19 @@ class NodeListRequest(base.SenlinObject):
         'marker': fields.UUIDField(nullable=True),
         'sort': fields.SortField(
             valid_keys=list(consts.NODE_SORT_KEYS), nullable=True),
-        'project_safe': fields.FlexibleBooleanField(default=True)
+        'project_safe': fields.FlexibleBooleanField(default=True),
+        'attributes': fields.ListOfEnumField(
+            valid_values=list(consts.NODE_LIST_FIELDS), nullable=True),
     }
 
+    def obj_make_compatible(self, primitive, target_version):
+        super(NodeListRequest, self).obj_make_compatible(
+            primitive, target_version)
+        target_version = versionutils.convert_version_to_tuple(target_version)
+        if target_version < (1, 1):
+            if 'attributes' in primitive['senlin_object.data']:
+                del primitive['senlin_object.data']['attributes']
+
 
 @base.SenlinObjectRegistry.register
 class NodeGetRequest(base.SenlinObject):
@@ -10,10 +10,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import copy
+
 from oslo_context import context as oslo_context
 from oslo_utils import reflection
 from oslo_utils import timeutils
 
+from senlin.common import cache
 from senlin.common import context as senlin_context
 from senlin.common import exception
 from senlin.common.i18n import _
@@ -30,6 +33,9 @@ CHECK_RESULTS = (
     'OK', 'ERROR',
 )
 
+# Policies parsed from DB records, shared by all threads of an engine
+_CACHE = cache.ObjectCache('policy')
+
 
 class Policy(object):
     """Base class for policies."""
@@ -151,7 +157,10 @@ class Policy(object):
         :param project_safe: Optional parameter specifying whether only
                              policies belong to the context.project will be
                              loaded.
-        :returns: An object of the proper policy class.
+        :returns: An object of the proper policy class. It is a private copy
+                  of the policy object cached by the engine, which is only
+                  used if it was built from the current version of the DB
+                  record.
         """
         if db_policy is None:
             db_policy = po.Policy.get(context, policy_id,
@@ -159,11 +168,24 @@ class Policy(object):
             if db_policy is None:
                 raise exception.ResourceNotFound(type='policy', id=policy_id)
 
-        return cls._from_object(db_policy)
+        policy = _CACHE.get(db_policy.id, db_policy.updated_at)
+        if policy is None:
+            policy = cls._from_object(db_policy)
+            _CACHE.put(db_policy.id, db_policy.updated_at, policy)
+
+        return policy._clone()
+
+    def _clone(self):
+        """Make a copy of a cached policy for private use by a caller."""
+        policy = object.__new__(self.__class__)
+        policy.__dict__.update(self.__dict__)
+        policy.data = copy.deepcopy(self.data)
+        return policy
 
     @classmethod
     def delete(cls, context, policy_id):
         po.Policy.delete(context, policy_id)
+        _CACHE.invalidate(policy_id)
 
     def store(self, context):
         '''Store the policy object into database table.'''
@@ -183,6 +205,7 @@ class Policy(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             po.Policy.update(context, self.id, values)
+            _CACHE.invalidate(self.id)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
@@ -19,6 +19,7 @@ from oslo_utils import timeutils
 from osprofiler import profiler
 import six
 
+from senlin.common import cache
 from senlin.common import consts
 from senlin.common import context
 from senlin.common import exception as exc
@@ -32,6 +33,9 @@ from senlin.objects import profile as po
 
 LOG = logging.getLogger(__name__)
 
+# Profiles parsed from DB records, shared by all threads of an engine
+_CACHE = cache.ObjectCache('profile')
+
 
 class Profile(object):
     """Base class for profiles."""
@@ -150,14 +154,34 @@ class Profile(object):
 
     @classmethod
     def load(cls, ctx, profile=None, profile_id=None, project_safe=True):
-        '''Retrieve a profile object from database.'''
+        '''Retrieve a profile object from database.
+
+        Parsed profiles are cached per engine so that the spec is not parsed
+        again for every node using the same profile. The database record is
+        always retrieved, and a cached profile is only used if it was built
+        from the same version of the record, i.e. if it has not been updated
+        or deleted by another engine since. The object returned is a private
+        copy of the cached one.
+        '''
         if profile is None:
             profile = po.Profile.get(ctx, profile_id,
                                      project_safe=project_safe)
             if profile is None:
                 raise exc.ResourceNotFound(type='profile', id=profile_id)
 
-        return cls._from_object(profile)
+        obj = _CACHE.get(profile.id, profile.updated_at)
+        if obj is None:
+            obj = cls._from_object(profile)
+            _CACHE.put(profile.id, profile.updated_at, obj)
+
+        return obj._clone()
+
+    def _clone(self):
+        """Make a copy of a cached profile for private use by a caller."""
+        obj = object.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__)
+        obj.metadata = copy.deepcopy(self.metadata)
+        return obj
 
     @classmethod
     def create(cls, ctx, name, spec, metadata=None):
@@ -189,6 +213,7 @@ class Profile(object):
     @classmethod
     def delete(cls, ctx, profile_id):
         po.Profile.delete(ctx, profile_id)
+        _CACHE.invalidate(profile_id)
 
     def store(self, ctx):
         '''Store the profile into database and return its ID.'''
@@ -209,6 +234,7 @@ class Profile(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             po.Profile.update(ctx, self.id, values)
+            _CACHE.invalidate(self.id)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
@@ -305,6 +331,33 @@ class Profile(object):
             LOG.error(ex)
             return False
 
+    @classmethod
+    @profiler.trace('Profile.check_objects', hide_args=False)
+    def check_objects(cls, ctx, objs):
+        """Check the health of objects in bulk.
+
+        :param ctx: Request context.
+        :param objs: A list of node objects to check.
+        :returns: A dict mapping the ID of each object to a boolean telling
+                  whether the object is healthy or to the exception raised
+                  when checking the object, or None if any of the profiles
+                  of the objects doesn't support bulk checking.
+        :raises: `InternalError` if the objects could not be checked.
+        """
+        groups = {}
+        for obj in objs:
+            groups.setdefault(obj.profile_id, []).append(obj)
+
+        results = {}
+        for profile_id, group in groups.items():
+            profile = cls.load(ctx, profile_id=profile_id)
+            res = profile.do_check_batch(group)
+            if res is None:
+                return None
+            results.update(res)
+
+        return results
+
     @classmethod
     @profiler.trace('Profile.recover_object', hide_args=False)
     def recover_object(cls, ctx, obj, **options):
@@ -459,6 +512,20 @@ class Profile(object):
         LOG.warning("Check operation not supported.")
         return True
 
+    def do_check_batch(self, objs):
+        """Check the health of a list of objects in one pass.
+
+        For subclass to override when the backend can report the status of
+        many objects at once.
+
+        :param objs: A list of node objects created from this profile.
+        :returns: A dict mapping the ID of each object to a boolean telling
+                  whether the object is healthy, or to the exception raised
+                  when checking the object, or None if bulk checking is not
+                  supported.
+        """
+        return None
+
     def do_get_details(self, obj):
         """For subclass to override."""
         LOG.warning("Get_details operation not supported.")
@@ -12,7 +12,9 @@
 
 import base64
 import copy
+import re
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import encodeutils
 import six
@@ -28,6 +30,10 @@ from senlin.profiles import base
 
 LOG = logging.getLogger(__name__)
 
+# Server names which can be matched by a name filter of the server list
+# without escaping any character.
+_LISTABLE_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
 
 class ServerProfile(base.Profile):
     """Profile for an OpenStack Nova server."""
@@ -252,6 +258,9 @@ class ServerProfile(base.Profile):
     REBOOT_TYPES = (REBOOT_SOFT, REBOOT_HARD) = ('SOFT', 'HARD')
     ADMIN_PASSWORD = 'admin_pass'
     RESCUE_IMAGE = 'image_ref'
+    # Maximum number of server names in the filter of a server list, which
+    # keeps the URL of the list request short
+    CHECK_NAMES_PER_LIST = 50
     EVACUATE_OPTIONS = (
         EVACUATE_HOST, EVACUATE_FORCE
     ) = (
@@ -1541,6 +1550,65 @@ class ServerProfile(base.Profile):
 
         return True
 
+    def do_check_batch(self, objs):
+        """Check the health of a group of servers.
+
+        Groups of at least ``node_check_batch_threshold`` servers are listed
+        by their names, a chunk of names at a time, so that only these
+        servers are fetched. The servers of smaller groups and the servers
+        missing from the lists, e.g. renamed or deleted ones, are checked one
+        by one, so that a server not found is reported as ``do_check`` does.
+
+        :param objs: A list of node objects created from this profile.
+        :returns: A dict mapping the ID of each node to a boolean telling
+                  whether the server of the node is active, or to the
+                  exception raised by ``do_check`` for the server.
+        :raises: `EResourceOperation` if the servers could not be listed.
+        """
+        results = dict((obj.id, False) for obj in objs if not obj.physical_id)
+        checked = [obj for obj in objs if obj.physical_id]
+
+        servers = {}
+        if len(checked) >= cfg.CONF.node_check_batch_threshold:
+            servers = self._list_servers(checked)
+
+        for obj in checked:
+            status = servers.get(obj.physical_id)
+            if status is not None:
+                results[obj.id] = status == consts.VS_ACTIVE
+                continue
+            try:
+                results[obj.id] = self.do_check(obj)
+            except exc.InternalError as ex:
+                results[obj.id] = ex
+
+        return results
+
+    def _list_servers(self, objs):
+        """List the servers of nodes by their names.
+
+        :param objs: A list of node objects created from this profile.
+        :returns: A dict mapping the IDs of the servers found to their
+                  statuses.
+        """
+        names = set(self.properties[self.NAME] or obj.name for obj in objs)
+        names = sorted(n for n in names if _LISTABLE_NAME.match(n))
+
+        servers = {}
+        driver = self.compute(objs[0])
+        size = self.CHECK_NAMES_PER_LIST
+        for i in range(0, len(names), size):
+            query = {'name': '^(%s)$' % '|'.join(names[i:i + size])}
+            try:
+                for server in driver.server_list(**query):
+                    servers[server.id] = server.status
+            except exc.InternalError as ex:
+                raise exc.EResourceOperation(op='checking', type='server',
+                                             id=objs[0].cluster_id,
+                                             message=six.text_type(ex))
+
+        return servers
+
     def do_recover(self, obj, **options):
         """Handler for recover operation.
 
@@ -13,6 +13,7 @@
 import mock
 
 from oslo_config import cfg
+from oslo_utils import timeutils
 import six
 import webob
 
@@ -190,6 +191,52 @@ class TestWebhookMiddleware(base.SenlinTestCase):
                                            {'identity': 'WEBHOOK'})
         rpcc.call.assert_called_with(dbctx, 'receiver_get', obj)
 
+    @mock.patch.object(common_util, 'parse_request')
+    @mock.patch.object(rpc, 'EngineClient')
+    def test_get_actor_cached(self, mock_client, mock_parse):
+        req = mock.Mock()
+        rpcc = mock_client.return_value
+        rpcc.call.return_value = {'id': 'FAKE_ID', 'actor': {'foo': 'bar'}}
+
+        res1 = self.middleware._get_actor(req, self.ctx, 'WEBHOOK')
+        res2 = self.middleware._get_actor(req, self.ctx, 'WEBHOOK')
+
+        self.assertEqual({'foo': 'bar'}, res1)
+        self.assertEqual({'foo': 'bar'}, res2)
+        rpcc.call.assert_called_once_with(self.ctx, 'receiver_get',
+                                          mock_parse.return_value)
+        mock_parse.assert_called_once_with('ReceiverGetRequest', req,
+                                           {'identity': 'WEBHOOK'})
+
+    @mock.patch.object(timeutils, 'is_older_than')
+    @mock.patch.object(common_util, 'parse_request')
+    @mock.patch.object(rpc, 'EngineClient')
+    def test_get_actor_expired(self, mock_client, mock_parse, mock_older):
+        cfg.CONF.set_override('cache_ttl', 30, group='receiver')
+        mock_older.return_value = True
+        rpcc = mock_client.return_value
+        rpcc.call.side_effect = [{'actor': {'trust_id': 'T1'}},
+                                 {'actor': {'trust_id': 'T2'}}]
+
+        self.middleware._get_actor(mock.Mock(), self.ctx, 'WEBHOOK')
+        res = self.middleware._get_actor(mock.Mock(), self.ctx, 'WEBHOOK')
+
+        self.assertEqual({'trust_id': 'T2'}, res)
+        self.assertEqual(2, rpcc.call.call_count)
+        mock_older.assert_called_once_with(mock.ANY, 30)
+
+    @mock.patch.object(common_util, 'parse_request')
+    @mock.patch.object(rpc, 'EngineClient')
+    def test_get_actor_cache_disabled(self, mock_client, mock_parse):
+        cfg.CONF.set_override('cache_ttl', 0, group='receiver')
+        rpcc = mock_client.return_value
+        rpcc.call.return_value = {'actor': {'foo': 'bar'}}
+
+        self.middleware._get_actor(mock.Mock(), self.ctx, 'WEBHOOK')
+        self.middleware._get_actor(mock.Mock(), self.ctx, 'WEBHOOK')
+
+        self.assertEqual(2, rpcc.call.call_count)
+
     def test_process_request_method_not_post(self):
         # Request method is not POST
         req = mock.Mock()
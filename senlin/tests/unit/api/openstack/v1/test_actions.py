@@ -131,6 +131,40 @@ class ActionControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.assertFalse(mock_parse.called)
         self.assertFalse(mock_call.called)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_action_index_with_fields(self, mock_call, mock_parse,
+                                      mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/actions', params={'fields': 'status'},
+                        version='1.11')
+        obj = mock.Mock()
+        mock_parse.return_value = obj
+        mock_call.return_value = []
+
+        result = self.controller.index(req)
+
+        self.assertEqual([], result['actions'])
+        mock_parse.assert_called_once_with(
+            'ActionListRequest', req,
+            {'attributes': ['status'], 'project_safe': True})
+        mock_call.assert_called_once_with(req.context, 'action_list', obj)
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_action_index_fields_unsupported_version(self, mock_call,
+                                                     mock_parse, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/actions', params={'fields': 'status'},
+                        version='1.10')
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller.index, req)
+
+        self.assertEqual("Invalid parameter fields", str(ex))
+        self.assertFalse(mock_parse.called)
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_action_index_with_bad_schema(self, mock_call,
@@ -19,6 +19,7 @@ import six
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.middleware import fault
 from senlin.api.openstack.v1 import clusters
 from senlin.common import exception as senlin_exc
@@ -100,6 +101,40 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
 
         mock_call.assert_called_once_with(req.context, 'cluster_list', obj)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_with_fields(self, mock_call, mock_parse,
+                               mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/clusters', params={'fields': 'status'},
+                        version='1.11')
+        obj = mock.Mock()
+        mock_parse.return_value = obj
+        mock_call.return_value = []
+
+        result = self.controller.index(req)
+
+        self.assertEqual([], result['clusters'])
+        mock_parse.assert_called_once_with(
+            'ClusterListRequest', req,
+            {'attributes': ['status'], 'project_safe': True})
+        mock_call.assert_called_once_with(req.context, 'cluster_list', obj)
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_fields_unsupported_version(self, mock_call,
+                                              mock_parse, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/clusters', params={'fields': 'status'},
+                        version='1.10')
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller.index, req)
+
+        self.assertEqual("Invalid parameter 'fields'", str(ex))
+        self.assertFalse(mock_parse.called)
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_failed_with_exception(self, mock_call, mock_parse,
@@ -1078,6 +1113,21 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
             {'identity': cid, 'params': {'op': 'value'}})
         mock_call.assert_called_once_with(req.context, 'cluster_check', obj)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test__do_check_with_recover(self, mock_call, mock_parse, _ign):
+        req = mock.Mock()
+        cid = 'aaaa-bbbb-cccc'
+        data = {'recover': {'operation': 'REBUILD'}}
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller._do_check,
+                               req, cid, data)
+
+        self.assertEqual("Invalid parameter 'recover'", six.text_type(ex))
+        self.assertFalse(mock_parse.called)
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test__do_check_failed_request(self, mock_call, mock_parse, _ign):
@@ -1134,6 +1184,40 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
             {'identity': cid, 'params': {'op': 'value'}})
         mock_call.assert_called_once_with(req.context, 'cluster_recover', obj)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test__do_recover_with_nodes(self, mock_call, mock_parse, _ignore):
+        req = mock.Mock(version_request=vr.APIVersionRequest('1.11'))
+        cid = 'aaaa-bbbb-cccc'
+        data = {'nodes': ['NODE_1']}
+        obj = mock.Mock()
+        mock_parse.return_value = obj
+        mock_call.return_value = {'action': 'action-id'}
+
+        resp = self.controller._do_recover(req, cid, data)
+
+        self.assertEqual({'action': 'action-id'}, resp)
+        mock_parse.assert_called_once_with(
+            'ClusterRecoverRequest', req,
+            {'identity': cid, 'params': {'nodes': ['NODE_1']}})
+        mock_call.assert_called_once_with(req.context, 'cluster_recover', obj)
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test__do_recover_nodes_unsupported_version(self, mock_call,
+                                                   mock_parse, _ignore):
+        req = mock.Mock(version_request=vr.APIVersionRequest('1.10'))
+        cid = 'aaaa-bbbb-cccc'
+        data = {'nodes': ['NODE_1']}
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller._do_recover,
+                               req, cid, data)
+
+        self.assertEqual("Invalid parameter 'nodes'", six.text_type(ex))
+        self.assertFalse(mock_parse.called)
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test__do_recover_failed_request(self, mock_call, mock_parse, _ign):
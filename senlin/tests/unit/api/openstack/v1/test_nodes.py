@@ -133,6 +133,40 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.assertFalse(mock_call.called)
         self.assertFalse(mock_parse.called)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_node_index_with_fields(self, mock_call, mock_parse,
+                                    mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/nodes', params={'fields': 'status'},
+                        version='1.11')
+        obj = mock.Mock()
+        mock_parse.return_value = obj
+        mock_call.return_value = []
+
+        result = self.controller.index(req)
+
+        self.assertEqual([], result['nodes'])
+        mock_parse.assert_called_once_with(
+            'NodeListRequest', req,
+            {'attributes': ['status'], 'project_safe': True})
+        mock_call.assert_called_once_with(req.context, 'node_list', obj)
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_node_index_fields_unsupported_version(self, mock_call,
+                                                   mock_parse, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/nodes', params={'fields': 'status'},
+                        version='1.10')
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller.index, req)
+
+        self.assertEqual("Invalid parameter fields", str(ex))
+        self.assertFalse(mock_parse.called)
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_node_index_global_project_true(self, mock_call,
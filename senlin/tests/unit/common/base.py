@@ -22,8 +22,13 @@ import six
 import testscenarios
 import testtools
 
+from senlin.api.middleware import webhook
 from senlin.common import messaging
+from senlin.drivers import sdk
 from senlin.engine import scheduler
+from senlin.engine import senlin_lock
+from senlin.policies import base as policy_base
+from senlin.profiles import base as profile_base
 from senlin.tests.unit.common import utils
 
 
@@ -80,6 +85,14 @@ class SenlinTestCase(testscenarios.WithScenarios,
         utils.setup_dummy_db()
         self.addCleanup(utils.reset_dummy_db)
 
+        # state kept by one test must not leak into another one
+        profile_base._CACHE.clear()
+        policy_base._CACHE.clear()
+        sdk._CONNECTIONS.clear()
+        webhook._RECEIVERS.clear()
+        senlin_lock._holders.clear()
+        senlin_lock._waiters.clear()
+
     def stub_wallclock(self):
         # Overrides scheduler wallclock to speed up tests expecting timeouts.
         self._wallclock = time.time()
@@ -10,7 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
 import six
+import sqlalchemy
+from sqlalchemy import orm
 import time
 
 from oslo_utils import timeutils as tu
@@ -71,6 +74,44 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertRaises(exception.ResourceNotFound,
                           db_api.action_update, self.ctx, 'fake-uuid', values)
 
+    def test_action_create_batch(self):
+        values_list = []
+        for i in range(3):
+            data = parser.simple_parse(shared.sample_action)
+            data['name'] = 'action-%s' % i
+            data['user'] = self.ctx.user_id
+            data['project'] = self.ctx.project_id
+            values_list.append(data)
+
+        res = db_api.action_create_batch(self.ctx, values_list)
+
+        self.assertEqual(3, len(res))
+        for i, action_id in enumerate(res):
+            action = db_api.action_get(self.ctx, action_id)
+            self.assertEqual('action-%s' % i, action.name)
+            self.assertEqual(10, action.inputs['max_size'])
+            self.assertEqual(self.ctx.user_id, action.user)
+
+    def test_action_update_batch(self):
+        action1 = _create_action(self.ctx)
+        action2 = _create_action(self.ctx)
+        action3 = _create_action(self.ctx)
+
+        res = db_api.action_update_batch(self.ctx, [action1.id, action2.id],
+                                         {'status': consts.ACTION_READY})
+
+        self.assertEqual(2, res)
+        for action_id in [action1.id, action2.id]:
+            action = db_api.action_get(self.ctx, action_id)
+            self.assertEqual(consts.ACTION_READY, action.status)
+        action = db_api.action_get(self.ctx, action3.id)
+        self.assertEqual(action3.status, action.status)
+
+    def test_action_update_batch_empty(self):
+        res = db_api.action_update_batch(self.ctx, [],
+                                         {'status': consts.ACTION_READY})
+        self.assertEqual(0, res)
+
     def test_action_get(self):
         data = parser.simple_parse(shared.sample_action)
         action = _create_action(self.ctx)
@@ -91,6 +132,15 @@ class DBAPIActionTest(base.SenlinTestCase):
         retobj = db_api.action_get(self.ctx, 'fake-uuid')
         self.assertIsNone(retobj)
 
+    def test_action_get_status(self):
+        action = _create_action(self.ctx, status=consts.ACTION_RUNNING)
+
+        res = db_api.action_get_status(self.ctx, action.id)
+        self.assertEqual(consts.ACTION_RUNNING, res)
+
+        res = db_api.action_get_status(self.ctx, 'fake-uuid')
+        self.assertIsNone(res)
+
     def test_action_get_by_name(self):
         data = parser.simple_parse(shared.sample_action)
         _create_action(self.ctx)
@@ -208,6 +258,212 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertEqual(consts.ACTION_RUNNING, action.status)
         self.assertEqual(timestamp, float(action.start_time))
 
+    def test_action_acquire_batch(self):
+        specs = [
+            {'name': 'A01', 'status': 'INIT'},
+            {'name': 'A02', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A03', 'status': 'READY'},
+            {'name': 'A04', 'status': 'READY'},
+            {'name': 'A05', 'status': 'RUNNING'},
+        ]
+        for spec in specs:
+            spec['created_at'] = tu.utcnow(True)
+            _create_action(self.ctx, **spec)
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp)
+
+        self.assertEqual(['A03', 'A04'], [a.name for a in actions])
+        for action in actions:
+            self.assertEqual('worker2', action.owner)
+            self.assertEqual(consts.ACTION_RUNNING, action.status)
+            self.assertEqual(timestamp, action.start_time)
+
+            action = db_api.action_get(self.ctx, action.id)
+            self.assertEqual('worker2', action.owner)
+            self.assertEqual(consts.ACTION_RUNNING, action.status)
+            self.assertAlmostEqual(timestamp, float(action.start_time),
+                                   places=5)
+
+        # nothing left to be acquired
+        actions = db_api.action_acquire_batch(self.ctx, 'worker3', timestamp)
+        self.assertEqual([], actions)
+
+    def test_action_acquire_batch_with_limit(self):
+        for name in ['A01', 'A02', 'A03']:
+            _create_action(self.ctx, name=name, status='READY',
+                           created_at=tu.utcnow(True))
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_batch(self.ctx, 'worker1', timestamp,
+                                              limit=2)
+        self.assertEqual(['A01', 'A02'], [a.name for a in actions])
+
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp,
+                                              limit=2)
+        self.assertEqual(['A03'], [a.name for a in actions])
+        self.assertEqual('worker2', actions[0].owner)
+
+    def test_action_acquire_batch_with_action_ids(self):
+        ids = []
+        for name in ['A01', 'A02', 'A03']:
+            action = _create_action(self.ctx, name=name, status='READY',
+                                    created_at=tu.utcnow(True))
+            ids.append(action.id)
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_batch(self.ctx, 'worker1', timestamp,
+                                              action_ids=ids[1:])
+        self.assertEqual(['A02', 'A03'], [a.name for a in actions])
+
+        # actions no longer ready are skipped
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp,
+                                              action_ids=ids)
+        self.assertEqual(['A01'], [a.name for a in actions])
+
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp,
+                                              action_ids=[])
+        self.assertEqual([], actions)
+
+    def test_action_acquire_batch_claimed_concurrently(self):
+        ids = []
+        for name in ['A01', 'A02']:
+            action = _create_action(self.ctx, name=name, status='READY',
+                                    created_at=tu.utcnow(True))
+            ids.append(action.id)
+
+        original = orm.Query.with_for_update
+        claimed = []
+
+        def with_for_update(query, **kwargs):
+            # another engine claims A01 once the candidates are selected
+            if not claimed:
+                claimed.append(ids[0])
+                db_api.action_acquire(self.ctx, ids[0], 'worker1',
+                                      time.time())
+            return original(query, **kwargs)
+
+        self.patchobject(orm.Query, 'with_for_update', autospec=True,
+                         side_effect=with_for_update)
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2',
+                                              time.time())
+
+        self.assertEqual(['A02'], [a.name for a in actions])
+        action = db_api.action_get(self.ctx, ids[0])
+        self.assertEqual('worker1', action.owner)
+
+    def test_skip_locked_supported(self):
+        session = mock.Mock()
+        dialect = session.get_bind.return_value.dialect
+        dialect.name = 'sqlite'
+        dialect.server_version_info = (3, 22, 0)
+        self.assertFalse(db_api._skip_locked_supported(session))
+
+        dialect.name = 'postgresql'
+        dialect.server_version_info = (9, 4)
+        self.assertFalse(db_api._skip_locked_supported(session))
+        dialect.server_version_info = (10, 1)
+        self.assertTrue(db_api._skip_locked_supported(session))
+
+        dialect.name = 'mysql'
+        dialect._is_mariadb = False
+        dialect.server_version_info = (5, 7, 21)
+        self.assertFalse(db_api._skip_locked_supported(session))
+        dialect.server_version_info = (8, 0, 11)
+        self.assertTrue(db_api._skip_locked_supported(session))
+
+        with mock.patch.object(sqlalchemy, '__version__', '1.0.10'):
+            self.assertFalse(db_api._skip_locked_supported(session))
+
+    def test_action_get_all_ready(self):
+        profile = shared.create_profile(self.ctx)
+        cluster = shared.create_cluster(self.ctx, profile)
+        node = shared.create_node(self.ctx, cluster, profile)
+        specs = [
+            {'name': 'A01', 'action': consts.NODE_CREATE,
+             'cause': consts.CAUSE_DERIVED, 'target': node.id},
+            {'name': 'A02', 'action': consts.CLUSTER_SCALE_OUT,
+             'cause': consts.CAUSE_RPC, 'target': cluster.id},
+            {'name': 'A03', 'action': consts.NODE_RECOVER,
+             'cause': consts.CAUSE_DERIVED, 'target': node.id},
+            {'name': 'A04', 'action': consts.NODE_CREATE,
+             'cause': consts.CAUSE_DERIVED, 'target': node.id,
+             'owner': 'worker1'},
+            {'name': 'A05', 'action': consts.NODE_DELETE,
+             'cause': consts.CAUSE_DERIVED, 'target': node.id,
+             'status': 'RUNNING'},
+            {'name': 'A06', 'action': consts.NODE_DELETE,
+             'cause': consts.CAUSE_DERIVED, 'target': node.id},
+        ]
+        ids = {}
+        for spec in specs:
+            spec.setdefault('status', 'READY')
+            spec['created_at'] = tu.utcnow(True)
+            ids[spec['name']] = _create_action(self.ctx, **spec).id
+
+        results = db_api.action_get_all_ready(self.ctx)
+
+        self.assertEqual([ids['A03'], ids['A02'], ids['A01'], ids['A06']],
+                         [r.id for r in results])
+        self.assertEqual([consts.ACTION_PRIORITY_HIGH,
+                          consts.ACTION_PRIORITY_NORMAL,
+                          consts.ACTION_PRIORITY_LOW,
+                          consts.ACTION_PRIORITY_LOW],
+                         [r.priority for r in results])
+        self.assertEqual([cluster.id, None, cluster.id, cluster.id],
+                         [r.cluster_id for r in results])
+        self.assertEqual(self.ctx.project_id, results[0].project)
+        self.assertEqual(node.id, results[0].target)
+        self.assertEqual(consts.CAUSE_DERIVED, results[0].cause)
+
+    def test_action_get_all_ready_limit_per_project(self):
+        ctx2 = utils.dummy_context(project='another-project')
+        for name in ['A01', 'A02', 'A03']:
+            _create_action(self.ctx, name=name, status='READY',
+                           created_at=tu.utcnow(True))
+        for name in ['B01', 'B02']:
+            _create_action(ctx2, name=name, status='READY',
+                           created_at=tu.utcnow(True))
+
+        results = db_api.action_get_all_ready(self.ctx, limit_per_project=2)
+
+        self.assertEqual(4, len(results))
+        self.assertEqual(2, len([r for r in results
+                                 if r.project == self.ctx.project_id]))
+        self.assertEqual(2, len([r for r in results
+                                 if r.project == 'another-project']))
+
+    def test_action_get_all_ready_limit_per_project_no_window(self):
+        self.patchobject(db_api, '_window_functions_supported',
+                         return_value=False)
+        ctx2 = utils.dummy_context(project='another-project')
+        ids = []
+        for name in ['A01', 'A02', 'A03']:
+            ids.append(_create_action(self.ctx, name=name, status='READY',
+                                      created_at=tu.utcnow(True)).id)
+        for name in ['B01', 'B02']:
+            ids.append(_create_action(ctx2, name=name, status='READY',
+                                      created_at=tu.utcnow(True)).id)
+
+        results = db_api.action_get_all_ready(self.ctx, limit_per_project=2)
+
+        self.assertEqual([ids[0], ids[1], ids[3], ids[4]],
+                         [r.id for r in results])
+
+    def test_window_functions_supported(self):
+        session = mock.Mock()
+        dialect = session.get_bind.return_value.dialect
+        dialect._is_mariadb = False
+        for name, version, expected in [('postgresql', (9, 3), True),
+                                        ('mysql', (5, 7, 21), False),
+                                        ('mysql', (8, 0, 11), True),
+                                        ('sqlite', (3, 22, 0), False),
+                                        ('sqlite', (3, 25, 0), True)]:
+            dialect.name = name
+            dialect.server_version_info = version
+            self.assertEqual(expected,
+                             db_api._window_functions_supported(session))
+
     def test_action_get_all_by_owner(self):
         specs = [
             {'name': 'A01', 'owner': 'work1'},
@@ -244,6 +500,31 @@ class DBAPIActionTest(base.SenlinTestCase):
         for spec in specs:
             self.assertIn(spec['name'], names)
 
+    def test_action_get_all_with_columns(self):
+        action = _create_action(self.ctx, name='A01', target='cluster_001')
+
+        actions = db_api.action_get_all(self.ctx, columns=['name', 'status'])
+
+        self.assertEqual(1, len(actions))
+        self.assertEqual(action.id, actions[0].id)
+        self.assertEqual('A01', actions[0].name)
+        loaded = actions[0].__dict__
+        for column in ('inputs', 'outputs', 'data', 'context'):
+            self.assertNotIn(column, loaded)
+
+    def test_action_get_all_with_limit_and_marker(self):
+        for name in ('A01', 'A02', 'A03'):
+            _create_action(self.ctx, name=name)
+        expected = [a.id for a in db_api.action_get_all(self.ctx)]
+
+        actions = db_api.action_get_all(self.ctx, limit=1,
+                                        marker=expected[0])
+        self.assertEqual([expected[1]], [a.id for a in actions])
+
+        actions = db_api.action_get_all(self.ctx, limit=5,
+                                        marker=expected[1])
+        self.assertEqual([expected[2]], [a.id for a in actions])
+
     def test_action_get_all_project_safe(self):
         parser.simple_parse(shared.sample_action)
         _create_action(self.ctx)
@@ -360,7 +641,27 @@ class DBAPIActionTest(base.SenlinTestCase):
         return id_of
 
     def test_dependency_add_depended_list(self):
-        self._check_dependency_add_depended_list()
+        id_of = self._check_dependency_add_depended_list()
+
+        for aid in [id_of['A02'], id_of['A03'], id_of['A04']]:
+            action = db_api.action_get(self.ctx, aid)
+            self.assertEqual(id_of['A01'], action.parent)
+            self.assertIsNone(action.data)
+
+    def test_dependency_add_depended_list_dependent_failed(self):
+        parent = _create_action(self.ctx)
+        child1 = _create_action(self.ctx)
+        child2 = _create_action(self.ctx)
+        db_api.dependency_add(self.ctx, [child1.id], parent.id)
+        db_api.action_mark_failed(self.ctx, child1.id, time.time())
+        self.assertEqual(consts.ACTION_FAILED,
+                         db_api.action_get(self.ctx, parent.id).status)
+
+        db_api.dependency_add(self.ctx, [child2.id], parent.id)
+
+        # the failed dependent is not made WAITING again
+        self.assertEqual(consts.ACTION_FAILED,
+                         db_api.action_get(self.ctx, parent.id).status)
 
     def test_dependency_add_dependent_list(self):
         self._check_dependency_add_dependent_list()
@@ -517,6 +818,51 @@ class DBAPIActionTest(base.SenlinTestCase):
         result = db_api.dependency_get_dependents(self.ctx, id_of['A01'])
         self.assertEqual(0, len(result))
 
+    def test_action_mark_failed_transitive(self):
+        timestamp = time.time()
+        id_of = self._prepare_action_mark_failed_cancel()
+        a08 = _create_action(self.ctx, name='A08', status='INIT')
+        a09 = _create_action(self.ctx, name='A09', status='INIT')
+        # A05 <- A08 <- A09, A06 <- A09
+        db_api.dependency_add(self.ctx, id_of['A05'], a08.id)
+        db_api.dependency_add(self.ctx, [a08.id, id_of['A06']], a09.id)
+
+        db_api.action_mark_failed(self.ctx, id_of['A01'], timestamp,
+                                  reason='BOOM')
+
+        action = db_api.action_get(self.ctx, id_of['A01'])
+        self.assertEqual(consts.ACTION_FAILED, action.status)
+        self.assertEqual('BOOM', action.status_reason)
+        for aid in [id_of['A05'], id_of['A06'], id_of['A07'], a08.id,
+                    a09.id]:
+            action = db_api.action_get(self.ctx, aid)
+            self.assertEqual(consts.ACTION_FAILED, action.status)
+            self.assertEqual('Action execution failed', action.status_reason)
+            self.assertIsNone(action.owner)
+            self.assertEqual(round(timestamp, 6), float(action.end_time))
+            result = db_api.dependency_get_dependents(self.ctx, aid)
+            self.assertEqual(0, len(result))
+
+        # the actions depended by the root are not affected
+        for aid in [id_of['A02'], id_of['A03'], id_of['A04']]:
+            action = db_api.action_get(self.ctx, aid)
+            self.assertEqual(consts.ACTION_INIT, action.status)
+
+    def test_action_mark_cancelled_transitive(self):
+        timestamp = time.time()
+        id_of = self._prepare_action_mark_failed_cancel()
+        a08 = _create_action(self.ctx, name='A08', status='INIT')
+        db_api.dependency_add(self.ctx, id_of['A07'], a08.id)
+
+        db_api.action_mark_cancelled(self.ctx, id_of['A01'], timestamp)
+
+        for aid in [id_of['A01'], id_of['A05'], id_of['A06'], id_of['A07'],
+                    a08.id]:
+            action = db_api.action_get(self.ctx, aid)
+            self.assertEqual(consts.ACTION_CANCELLED, action.status)
+        result = db_api.dependency_get_dependents(self.ctx, id_of['A07'])
+        self.assertEqual(0, len(result))
+
     def test_action_mark_ready(self):
         timestamp = time.time()
 
@@ -654,6 +1000,81 @@ class DBAPIActionTest(base.SenlinTestCase):
         actions = db_api.action_get_all(self.ctx)
         self.assertEqual(3, len(actions))
 
+    def test_action_purge(self):
+        old = time.time() - 10 * 86400
+        for status in consts.ACTION_FINAL_STATUSES:
+            _create_action(self.ctx, status=status, end_time=old)
+        recent = _create_action(self.ctx, status=consts.ACTION_SUCCEEDED,
+                                end_time=time.time())
+        running = _create_action(self.ctx, status=consts.ACTION_RUNNING,
+                                 end_time=old)
+        new_ctx = utils.dummy_context(project='a-different-project')
+        other = _create_action(new_ctx, status=consts.ACTION_FAILED,
+                               end_time=old)
+
+        res = db_api.action_purge(project=[self.ctx.project_id],
+                                  granularity='days', age=5, batch_size=2)
+
+        self.assertEqual(3, res)
+        actions = db_api.action_get_all(self.ctx, project_safe=False)
+        self.assertEqual(set([recent.id, running.id, other.id]),
+                         set(a.id for a in actions))
+
+    def test_action_purge_with_dependencies(self):
+        old = time.time() - 10 * 86400
+        parent1 = _create_action(self.ctx)
+        child1 = _create_action(self.ctx, status=consts.ACTION_SUCCEEDED,
+                                end_time=old)
+        db_api.dependency_add(self.ctx, [child1.id], parent1.id)
+        parent2 = _create_action(self.ctx)
+        child2 = _create_action(self.ctx, status=consts.ACTION_FAILED,
+                                end_time=old)
+        db_api.dependency_add(self.ctx, [child2.id], parent2.id)
+        db_api.action_update(self.ctx, parent2.id,
+                             {'status': consts.ACTION_FAILED,
+                              'end_time': old})
+
+        res = db_api.action_purge(project=None, granularity='days', age=5,
+                                  batch_size=1)
+
+        # the child of the parent still waiting is kept
+        self.assertEqual(2, res)
+        actions = db_api.action_get_all(self.ctx)
+        self.assertEqual(set([parent1.id, child1.id]),
+                         set(a.id for a in actions))
+        self.assertEqual([child1.id],
+                         db_api.dependency_get_depended(self.ctx, parent1.id))
+        self.assertEqual([],
+                         db_api.dependency_get_depended(self.ctx, parent2.id))
+
+    def test_action_purge_parent_running(self):
+        old = time.time() - 10 * 86400
+        parent = _create_action(self.ctx)
+        child1 = _create_action(self.ctx)
+        child2 = _create_action(self.ctx, data={'placement': 'zone'})
+        db_api.dependency_add(self.ctx, [child1.id, child2.id], parent.id)
+        # the dependencies are removed when the children complete
+        db_api.action_mark_succeeded(self.ctx, child1.id, old)
+        db_api.action_mark_succeeded(self.ctx, child2.id, old)
+        self.assertEqual([],
+                         db_api.dependency_get_depended(self.ctx, parent.id))
+
+        res = db_api.action_purge(project=None, granularity='days', age=5)
+
+        self.assertEqual(0, res)
+        # the data of the actions is left alone
+        self.assertEqual({'placement': 'zone'},
+                         db_api.action_get(self.ctx, child2.id).data)
+
+        db_api.action_update(self.ctx, parent.id,
+                             {'status': consts.ACTION_SUCCEEDED,
+                              'end_time': old})
+
+        res = db_api.action_purge(project=None, granularity='days', age=5)
+
+        self.assertEqual(3, res)
+        self.assertEqual([], db_api.action_get_all(self.ctx))
+
     def test_action_abandon(self):
         spec = {
             "owner": "test_owner",
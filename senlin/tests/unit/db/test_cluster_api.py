@@ -179,6 +179,20 @@ class DBAPIClusterTest(base.SenlinTestCase):
         names = [ret_cluster.name for ret_cluster in ret_clusters]
         [self.assertIn(val['name'], names) for val in values]
 
+    def test_cluster_get_all_with_columns(self):
+        cluster = shared.create_cluster(self.ctx, self.profile,
+                                        name='cluster1')
+
+        clusters = db_api.cluster_get_all(self.ctx,
+                                          columns=['name', 'status'])
+
+        self.assertEqual(1, len(clusters))
+        self.assertEqual(cluster.id, clusters[0].id)
+        self.assertEqual('cluster1', clusters[0].name)
+        loaded = clusters[0].__dict__
+        for column in ('meta_data', 'data', 'config', 'dependents'):
+            self.assertNotIn(column, loaded)
+
     def test_cluster_get_all_with_regular_project(self):
         values = [
             {'project': UUID1},
@@ -314,6 +328,15 @@ class DBAPIClusterTest(base.SenlinTestCase):
         res = db_api.cluster_get(self.ctx, cluster_id)
         self.assertEqual(3, res.next_index)
 
+    def test_cluster_next_index_with_count(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        res = db_api.cluster_next_index(self.ctx, cluster.id, count=5)
+        self.assertEqual(1, res)
+        res = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual(6, res.next_index)
+        res = db_api.cluster_next_index(self.ctx, cluster.id)
+        self.assertEqual(6, res)
+
     def test_cluster_count_all(self):
         clusters = [shared.create_cluster(self.ctx, self.profile)
                     for i in range(3)]
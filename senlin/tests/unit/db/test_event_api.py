@@ -88,6 +88,30 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.user_id, ret_event.user)
         self.assertEqual(self.ctx.project_id, ret_event.project)
 
+    def test_event_create_batch(self):
+        values = [
+            {'timestamp': tu.utcnow(True), 'level': logging.INFO,
+             'oid': 'FAKE_ID', 'otype': 'NODE', 'oname': 'node-%s' % i,
+             'cluster_id': 'FAKE_CLUSTER', 'user': self.ctx.user_id,
+             'project': self.ctx.project_id, 'action': 'CREATE',
+             'status': 'START', 'status_reason': 'reason %s' % i,
+             'meta_data': {'index': i}}
+            for i in range(3)
+        ]
+
+        res = db_api.event_create_batch(self.ctx, values)
+
+        self.assertEqual(3, res)
+        events = db_api.event_get_all(self.ctx)
+        self.assertEqual(3, len(events))
+        self.assertEqual(set(['node-0', 'node-1', 'node-2']),
+                         set(e.oname for e in events))
+        for event in events:
+            self.assertIsNotNone(event.id)
+            self.assertEqual('FAKE_CLUSTER', event.cluster_id)
+            self.assertEqual({'index': int(event.oname[-1])},
+                             event.meta_data)
+
     def test_event_get_diff_project(self):
         event = self.create_event(self.ctx)
         new_ctx = utils.dummy_context(project='a-different-project')
@@ -194,6 +218,42 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertEqual(1, len(events))
         self.assertEqual(event2_id, events[0].id)
 
+    def test_event_get_all_marker_keyset(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        for i in range(5):
+            self.create_event(self.ctx, entity=cluster1)
+
+        expected = [e.id for e in db_api.event_get_all(self.ctx)]
+        # events with the same timestamp are paged by their IDs
+        self.assertEqual(sorted(expected), expected)
+
+        ids = []
+        marker = None
+        while True:
+            events = db_api.event_get_all(self.ctx, limit=2, marker=marker)
+            if not events:
+                break
+            ids.extend(e.id for e in events)
+            marker = events[-1].id
+        self.assertEqual(expected, ids)
+
+    def test_event_get_all_with_columns(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        event = self.create_event(self.ctx, entity=cluster1)
+
+        events = db_api.event_get_all(self.ctx, columns=['level', 'oname'])
+
+        self.assertEqual(1, len(events))
+        self.assertEqual(event.id, events[0].id)
+        self.assertEqual('20', events[0].level)
+        self.assertEqual(cluster1.name, events[0].oname)
+        loaded = events[0].__dict__
+        self.assertNotIn('meta_data', loaded)
+        self.assertNotIn('status_reason', loaded)
+        self.assertEqual({'id': event.id, 'level': '20'},
+                         events[0].as_dict(['id', 'level']))
+        self.assertNotIn('meta_data', events[0].__dict__)
+
     def test_event_get_all_with_sorting(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile)
 
@@ -458,7 +518,7 @@ class DBAPIEventTest(base.SenlinTestCase):
         events = db_api.event_get_all_by_cluster(self.ctx, cluster1.id,
                                                  filters=filters)
         self.assertEqual(2, len(events))
-        self.assertEqual('cluster1', events[0].oname)
+        self.assertEqual(cluster1.name, events[0].oname)
         self.assertEqual('cluster1', events[1].oname)
 
         filters = {'oname': 'cluster3'}
@@ -545,6 +605,33 @@ class DBAPIEventTest(base.SenlinTestCase):
 
         res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
         self.assertEqual(5, len(res))
-        db_api.event_purge(project=None, granularity='days', age=5)
+        res = db_api.event_purge(project=None, granularity='days', age=5)
+        self.assertEqual(4, res)
+        res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
+        self.assertEqual(1, len(res))
+
+    def test_event_purge_in_batches(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        for i in range(5):
+            self.create_event(self.ctx, entity=cluster1)
+        new_ctx = utils.dummy_context(project='a-different-project')
+        self.create_event(new_ctx, entity=cluster1)
+
+        res = db_api.event_purge(project=[self.ctx.project_id],
+                                 granularity='days', age=5, batch_size=2)
+
+        self.assertEqual(5, res)
+        res = db_api.event_get_all(self.ctx, project_safe=False)
+        self.assertEqual(1, len(res))
+        self.assertEqual('a-different-project', res[0].project)
+
+    def test_event_purge_nothing(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        self.create_event(self.ctx, entity=cluster1, timestamp=tu.utcnow())
+
+        res = db_api.event_purge(project=None, granularity='days', age=5,
+                                 batch_size=1)
+
+        self.assertEqual(0, res)
         res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
         self.assertEqual(1, len(res))
@@ -15,6 +15,7 @@ from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils as tu
 import six
+import sqlalchemy
 
 from senlin.common import consts
 from senlin.common import exception
@@ -54,6 +55,30 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual(self.cluster.id, node.cluster_id)
         self.assertEqual(self.profile.id, node.profile_id)
 
+    def test_node_create_batch(self):
+        values_list = [{
+            'name': 'node-%s' % i,
+            'cluster_id': self.cluster.id,
+            'profile_id': self.profile.id,
+            'index': i,
+            'user': self.ctx.user_id,
+            'project': self.ctx.project_id,
+            'status': 'INIT',
+            'meta_data': {'foo': i},
+        } for i in range(3)]
+
+        res = db_api.node_create_batch(self.ctx, values_list)
+
+        self.assertEqual(3, len(res))
+        for i, node_id in enumerate(res):
+            node = db_api.node_get(self.ctx, node_id)
+            self.assertEqual('node-%s' % i, node.name)
+            self.assertEqual(i, node.index)
+            self.assertEqual({'foo': i}, node.meta_data)
+            self.assertEqual(self.profile.id, node.profile.id)
+        # the values given are not modified
+        self.assertNotIn('id', values_list[0])
+
     def test_node_get(self):
         res = shared.create_node(self.ctx, self.cluster, self.profile)
 
@@ -169,6 +194,66 @@ class DBAPINodeTest(base.SenlinTestCase):
         names = [node.name for node in nodes]
         [self.assertIn(val['name'], names) for val in values]
 
+    def test_node_get_all_with_columns(self):
+        node = shared.create_node(self.ctx, None, self.profile, name='node1')
+
+        nodes = db_api.node_get_all(self.ctx, columns=['name', 'profile_id'])
+
+        self.assertEqual(1, len(nodes))
+        self.assertEqual(node.id, nodes[0].id)
+        self.assertEqual('node1', nodes[0].name)
+        self.assertEqual(self.profile.name, nodes[0].profile.name)
+        loaded = nodes[0].__dict__
+        for column in ('meta_data', 'data', 'dependents'):
+            self.assertNotIn(column, loaded)
+
+    def _count_queries(self, func, *args, **kwargs):
+        statements = []
+
+        def _before_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_api.get_engine()
+        sqlalchemy.event.listen(engine, 'before_cursor_execute',
+                                _before_execute)
+        try:
+            nodes = func(*args, **kwargs)
+            # this is what the node object does for each node
+            [(n.profile.name, n.profile.created_at) for n in nodes]
+        finally:
+            sqlalchemy.event.remove(engine, 'before_cursor_execute',
+                                    _before_execute)
+
+        return len(nodes), len(statements)
+
+    def test_node_get_all_query_count(self):
+        profile2 = shared.create_profile(self.ctx)
+        counts = []
+        for n in (2, 20):
+            for i in range(n):
+                profile = self.profile if i % 2 else profile2
+                shared.create_node(self.ctx, self.cluster, profile)
+
+            counts.append(self._count_queries(db_api.node_get_all, self.ctx))
+            counts.append(self._count_queries(db_api.node_get_all_by_cluster,
+                                              self.ctx, self.cluster.id))
+
+        self.assertEqual(2, counts[0][0])
+        self.assertEqual(22, counts[2][0])
+        # number of queries does not grow with the number of nodes
+        self.assertEqual(counts[0][1], counts[2][1])
+        self.assertEqual(counts[1][1], counts[3][1])
+
+    def test_node_get_profile_columns(self):
+        res = shared.create_node(self.ctx, self.cluster, self.profile)
+
+        node = db_api.node_get(self.ctx, res.id)
+
+        self.assertEqual(self.profile.name, node.profile.name)
+        self.assertEqual(self.profile.created_at, node.profile.created_at)
+        # the profile spec is not loaded along with the node
+        self.assertNotIn('spec', node.profile.__dict__)
+
     def test_node_add_node_dependents(self):
         node_id = 'host_node'
         node = shared.create_node(self.ctx, None, self.profile,
@@ -581,6 +666,52 @@ class DBAPINodeTest(base.SenlinTestCase):
         reason = 'Node new_name: Something is wrong'
         self.assertEqual(reason, cluster.status_reason)
 
+    def test_node_update_status_batch(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node3 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node4 = shared.create_node(self.ctx, self.cluster, self.profile)
+        timestamp = tu.utcnow(True)
+
+        res = db_api.node_update_status_batch(
+            self.ctx,
+            {node1.id: ('ERROR', 'Check: Node is not ACTIVE.'),
+             node2.id: ('ERROR', 'Check: Node is not ACTIVE.'),
+             node3.id: ('ACTIVE', 'Check: Node is ACTIVE.')},
+            timestamp)
+
+        self.assertEqual(3, res)
+        for node_id in (node1.id, node2.id):
+            node = db_api.node_get(self.ctx, node_id)
+            self.assertEqual('ERROR', node.status)
+            self.assertEqual('Check: Node is not ACTIVE.', node.status_reason)
+            self.assertEqual(timestamp, node.updated_at)
+        node = db_api.node_get(self.ctx, node3.id)
+        self.assertEqual('ACTIVE', node.status)
+        node = db_api.node_get(self.ctx, node4.id)
+        self.assertEqual(node4.status, node.status)
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual('WARNING', cluster.status)
+        reason = 'Node %s: Check: Node is ACTIVE.' % node3.name
+        self.assertEqual(reason, cluster.status_reason)
+
+    def test_node_update_status_batch_no_error(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+
+        db_api.node_update_status_batch(
+            self.ctx, {node.id: ('ACTIVE', 'Check: Node is ACTIVE.')},
+            tu.utcnow(True))
+
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual('INIT', cluster.status)
+        reason = 'Node %s: Check: Node is ACTIVE.' % node.name
+        self.assertEqual(reason, cluster.status_reason)
+
+    def test_node_update_status_batch_empty(self):
+        res = db_api.node_update_status_batch(self.ctx, {}, tu.utcnow(True))
+
+        self.assertEqual(0, res)
+
     def test_node_migrate_from_none(self):
         node_orphan = shared.create_node(self.ctx, None, self.profile)
         timestamp = tu.utcnow(True)
@@ -91,6 +91,59 @@ class DBAPIRegistryTest(base.SenlinTestCase):
         self.assertEqual(1, len(registries))
         self.assertEqual('SERVICE_ID_DEAD', registries[0].engine_id)
 
+    def test_registry_claim_with_ring(self):
+        for i in range(2):
+            self._create_registry(cluster_id='cluster-%s' % i,
+                                  check_type='NODE_STATUS_POLLING',
+                                  interval=60,
+                                  params={},
+                                  engine_id='DEAD_ENGINE')
+        ring = mock.Mock()
+        ring.get_node.side_effect = lambda c: {
+            'cluster-0': 'ENGINE_ID', 'cluster-1': 'OTHER_ENGINE'}[c]
+
+        registries = db_api.registry_claim(self.ctx, engine_id='ENGINE_ID',
+                                           ring=ring)
+
+        self.assertEqual(1, len(registries))
+        self.assertEqual('cluster-0', registries[0].cluster_id)
+        self.assertEqual('ENGINE_ID',
+                         db_api.registry_get(self.ctx,
+                                             'cluster-0').engine_id)
+        self.assertEqual('DEAD_ENGINE',
+                         db_api.registry_get(self.ctx,
+                                             'cluster-1').engine_id)
+
+    def test_registry_claim_with_ring_nothing(self):
+        self._create_registry(cluster_id='cluster-0',
+                              check_type='NODE_STATUS_POLLING',
+                              interval=60,
+                              params={},
+                              engine_id='DEAD_ENGINE')
+        ring = mock.Mock()
+        ring.get_node.return_value = 'OTHER_ENGINE'
+
+        registries = db_api.registry_claim(self.ctx, engine_id='ENGINE_ID',
+                                           ring=ring)
+
+        self.assertEqual([], registries)
+        self.assertEqual('DEAD_ENGINE',
+                         db_api.registry_get(self.ctx,
+                                             'cluster-0').engine_id)
+
+    def test_registry_get_all_by_engine(self):
+        for i in range(3):
+            self._create_registry(cluster_id='cluster-%s' % i,
+                                  check_type='NODE_STATUS_POLLING',
+                                  interval=60,
+                                  params={},
+                                  engine_id='ENGINE_%s' % (i % 2))
+
+        registries = db_api.registry_get_all_by_engine(self.ctx, 'ENGINE_0')
+
+        self.assertEqual(set(['cluster-0', 'cluster-2']),
+                         set(r.cluster_id for r in registries))
+
     def test_registry_delete(self):
         registry = self._create_registry('CLUSTER_ID',
                                          check_type='NODE_STATUS_POLLING',
@@ -104,6 +104,17 @@ class TestNovaV2(base.SenlinTestCase):
         d.server_get('foo')
         self.compute.get_server.assert_called_once_with('foo')
 
+    def test_server_list(self):
+        d = nova_v2.NovaClient(self.conn_params)
+        servers = [mock.Mock(), mock.Mock()]
+        self.compute.servers.return_value = iter(servers)
+
+        res = d.server_list(name='foo')
+
+        self.assertEqual(servers, res)
+        self.compute.servers.assert_called_once_with(details=True,
+                                                     name='foo')
+
     def test_server_update(self):
         d = nova_v2.NovaClient(self.conn_params)
         attrs = {'mem': 2}
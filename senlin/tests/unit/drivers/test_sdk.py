@@ -14,6 +14,7 @@ import types
 
 import mock
 from openstack import connection
+from oslo_config import cfg
 from oslo_serialization import jsonutils
 from requests import exceptions as req_exc
 import six
@@ -219,6 +220,81 @@ class OpenStackSDKTest(base.SenlinTestCase):
         self.assertEqual(123, ex.code)
         self.assertEqual('BOOM', ex.message)
 
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_pooled(self, mock_conn):
+        x_conn = mock.Mock()
+        x_conn.session.auth.auth_ref = None
+        mock_conn.return_value = x_conn
+        params = {'user_id': '123', 'password': 'abc', 'trust_id': 'T1'}
+
+        res1 = sdk.create_connection(dict(params))
+        res2 = sdk.create_connection(dict(params))
+
+        self.assertEqual(x_conn, res1)
+        self.assertEqual(x_conn, res2)
+        self.assertEqual(1, mock_conn.call_count)
+        # no credential is kept in clear text in the pool
+        for key in sdk._CONNECTIONS._entries:
+            self.assertNotIn('abc', key)
+
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_pooled_by_params(self, mock_conn):
+        mock_conn.side_effect = lambda **kw: mock.Mock()
+
+        res1 = sdk.create_connection({'trust_id': 'T1'})
+        res2 = sdk.create_connection({'trust_id': 'T2'})
+        res3 = sdk.create_connection({'trust_id': 'T1',
+                                      'region_name': 'REGION_TWO'})
+
+        self.assertEqual(3, mock_conn.call_count)
+        self.assertEqual(3, len(set([res1, res2, res3])))
+
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_token_not_pooled(self, mock_conn):
+        mock_conn.side_effect = lambda **kw: mock.Mock()
+
+        res1 = sdk.create_connection({'token': 'TOKEN'})
+        res2 = sdk.create_connection({'token': 'TOKEN'})
+
+        self.assertNotEqual(res1, res2)
+        self.assertEqual(2, mock_conn.call_count)
+
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_pool_disabled(self, mock_conn):
+        cfg.CONF.set_override('connection_pool_size', 0)
+        mock_conn.side_effect = lambda **kw: mock.Mock()
+
+        sdk.create_connection({'trust_id': 'T1'})
+        sdk.create_connection({'trust_id': 'T1'})
+
+        self.assertEqual(2, mock_conn.call_count)
+
+    @mock.patch('oslo_utils.timeutils.is_older_than')
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_ttl_expired(self, mock_conn, mock_older):
+        mock_conn.side_effect = lambda **kw: mock.Mock()
+        mock_older.return_value = True
+
+        res1 = sdk.create_connection({'trust_id': 'T1'})
+        res2 = sdk.create_connection({'trust_id': 'T1'})
+
+        self.assertNotEqual(res1, res2)
+        self.assertEqual(2, mock_conn.call_count)
+        mock_older.assert_called_once_with(mock.ANY, 3600)
+
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_token_expiring(self, mock_conn):
+        mock_conn.side_effect = lambda **kw: mock.Mock()
+
+        res1 = sdk.create_connection({'trust_id': 'T1'})
+        auth_ref = res1.session.auth.auth_ref
+        auth_ref.will_expire_soon.return_value = True
+        res2 = sdk.create_connection({'trust_id': 'T1'})
+
+        self.assertNotEqual(res1, res2)
+        auth_ref.will_expire_soon.assert_called_once_with(
+            sdk.TOKEN_STALE_DURATION)
+
     @mock.patch.object(sdk, 'create_connection')
     def test_authenticate(self, mock_conn):
         x_conn = mock_conn.return_value
@@ -28,6 +28,7 @@ from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
+from senlin.engine import waiters
 from senlin.objects import action as ao
 from senlin.objects import cluster_policy as cpo
 from senlin.objects import dependency as dobj
@@ -245,6 +246,36 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual('FAKE_ID', result)
         mock_store.assert_called_once_with(self.ctx)
 
+    @mock.patch.object(ao.Action, 'create_batch')
+    def test_action_create_batch(self, mock_create):
+        mock_create.return_value = ['ID1', 'ID2']
+
+        result = ab.Action.create_batch(
+            self.ctx, 'NODE_CREATE',
+            [('NODE1', {'name': 'n1'}), ('NODE2', {'name': 'n2'})])
+
+        self.assertEqual(['ID1', 'ID2'], result)
+        values_list = mock_create.call_args[0][1]
+        self.assertEqual(2, len(values_list))
+        self.assertEqual('NODE1', values_list[0]['target'])
+        self.assertEqual('n1', values_list[0]['name'])
+        self.assertEqual('NODE2', values_list[1]['target'])
+        self.assertEqual('n2', values_list[1]['name'])
+        for values in values_list:
+            self.assertEqual('NODE_CREATE', values['action'])
+            self.assertEqual('INIT', values['status'])
+            self.assertEqual(self.ctx.user_id, values['user'])
+            self.assertIsNotNone(values['created_at'])
+        self.assertEqual(values_list[0]['created_at'],
+                         values_list[1]['created_at'])
+
+    @mock.patch.object(ao.Action, 'create_batch')
+    def test_action_create_batch_empty(self, mock_create):
+        result = ab.Action.create_batch(self.ctx, 'NODE_CREATE', [])
+
+        self.assertEqual([], result)
+        self.assertEqual(0, mock_create.call_count)
+
     def test_action_delete(self):
         result = ab.Action.delete(self.ctx, 'non-existent')
         self.assertIsNone(result)
@@ -456,6 +487,37 @@ class ActionBaseTest(base.SenlinTestCase):
         mock_warning.assert_called_once_with(action, consts.PHASE_ERROR,
                                              'RETRY')
 
+    @mock.patch.object(EVENT, 'info')
+    @mock.patch.object(EVENT, 'error')
+    @mock.patch.object(EVENT, 'warning')
+    @mock.patch.object(ao.Action, 'mark_succeeded')
+    @mock.patch.object(ao.Action, 'mark_failed')
+    @mock.patch.object(ao.Action, 'mark_ready')
+    @mock.patch.object(ao.Action, 'abandon')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(waiters, 'notify_completion')
+    def test_set_status_notify_completion(self, mock_notify, mock_sleep,
+                                          mock_start, mock_abandon,
+                                          mark_ready, mark_fail,
+                                          mark_succeed, mock_warning,
+                                          mock_error, mock_info):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID')
+        action.entity = mock.Mock()
+
+        action.set_status(action.RES_OK)
+        mock_notify.assert_called_once_with('FAKE_ID', action.SUCCEEDED)
+
+        mock_notify.reset_mock()
+        action.set_status(action.RES_ERROR)
+        mock_notify.assert_called_once_with('FAKE_ID', action.FAILED)
+
+        # Neither retrying nor lifecycle completion completes the action
+        mock_notify.reset_mock()
+        action.set_status(action.RES_RETRY)
+        action.set_status(action.RES_LIFECYCLE_COMPLETE)
+        self.assertEqual(0, mock_notify.call_count)
+
     @mock.patch.object(ao.Action, 'check_status')
     def test_get_status(self, mock_get):
         mock_get.return_value = 'FAKE_STATUS'
@@ -13,12 +13,15 @@
 import mock
 
 from senlin.common import consts
+from senlin.common import exception
 from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
 from senlin.engine import dispatcher
+from senlin.engine import node as nm
 from senlin.objects import action as ao
 from senlin.objects import dependency as dobj
+from senlin.objects import node as no
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -30,13 +33,14 @@ class ClusterCheckTest(base.SenlinTestCase):
         super(ClusterCheckTest, self).setUp()
         self.ctx = utils.dummy_context()
 
+    @mock.patch.object(nm.Node, 'check_batch', return_value=None)
     @mock.patch.object(ao.Action, 'update')
     @mock.patch.object(ab.Action, 'create')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_do_check(self, mock_wait, mock_start, mock_dep, mock_action,
-                      mock_update, mock_load):
+                      mock_update, mock_batch, mock_load):
         node1 = mock.Mock(id='NODE_1')
         node2 = mock.Mock(id='NODE_2')
         cluster = mock.Mock(id='FAKE_ID', status='old status',
@@ -82,6 +86,7 @@ class ClusterCheckTest(base.SenlinTestCase):
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_CHECK)
 
+    @mock.patch.object(nm.Node, 'check_batch', return_value=None)
     @mock.patch.object(ao.Action, 'update')
     @mock.patch.object(ab.Action, 'create')
     @mock.patch.object(ao.Action, 'delete_by_target')
@@ -90,7 +95,7 @@ class ClusterCheckTest(base.SenlinTestCase):
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_do_check_need_delete(self, mock_wait, mock_start, mock_dep,
                                   mock_delete, mock_action, mock_update,
-                                  mock_load):
+                                  mock_batch, mock_load):
         node1 = mock.Mock(id='NODE_1')
         node2 = mock.Mock(id='NODE_2')
         cluster = mock.Mock(id='FAKE_ID', status='old status',
@@ -159,13 +164,15 @@ class ClusterCheckTest(base.SenlinTestCase):
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_CHECK)
 
+    @mock.patch.object(nm.Node, 'check_batch', return_value=None)
     @mock.patch.object(ao.Action, 'update')
     @mock.patch.object(ab.Action, 'create')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test_do_check_failed_waiting(self, mock_wait, mock_start, mock_dep,
-                                     mock_action, mock_update, mock_load):
+                                     mock_action, mock_update, mock_batch,
+                                     mock_load):
         node = mock.Mock(id='NODE_1')
         cluster = mock.Mock(id='CLUSTER_ID', status='old status',
                             status_reason='old reason')
@@ -200,3 +207,112 @@ class ClusterCheckTest(base.SenlinTestCase):
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_CHECK)
+
+    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(nm.Node, 'check_batch')
+    def test_do_check_batch(self, mock_batch, mock_action, mock_load):
+        node1 = mock.Mock(id='NODE_1')
+        node2 = mock.Mock(id='NODE_2')
+        cluster = mock.Mock(id='FAKE_ID', nodes=[node1, node2])
+        mock_load.return_value = cluster
+        mock_batch.return_value = {'NODE_1': True, 'NODE_2': False}
+
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('Cluster checking completed.', res_msg)
+        mock_batch.assert_called_once_with(action.context, [node1, node2])
+        # no node action is needed
+        self.assertEqual(0, mock_action.call_count)
+        cluster.eval_status.assert_called_once_with(
+            action.context, consts.CLUSTER_CHECK)
+
+    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(nm.Node, 'check_batch')
+    def test_do_check_batch_failed(self, mock_batch, mock_action, mock_load):
+        cluster = mock.Mock(id='FAKE_ID', nodes=[mock.Mock(id='NODE_1')])
+        mock_load.return_value = cluster
+        mock_batch.side_effect = exception.EResourceOperation(
+            op='checking', type='server', id='FAKE_ID', message='Boom')
+
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx)
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_ERROR, res_code)
+        self.assertEqual("Cluster checking failed: Failed in checking "
+                         "server 'FAKE_ID': Boom.", res_msg)
+        self.assertEqual(0, mock_action.call_count)
+        cluster.eval_status.assert_called_once_with(
+            action.context, consts.CLUSTER_CHECK)
+
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    @mock.patch.object(no.Node, 'get_all_by_cluster')
+    @mock.patch.object(nm.Node, 'check_batch')
+    def test_do_check_recover(self, mock_batch, mock_get, mock_wait,
+                              mock_start, mock_dep, mock_create,
+                              mock_update, mock_load):
+        cluster = mock.Mock(id='FAKE_ID', nodes=[])
+        mock_load.return_value = cluster
+        mock_batch.return_value = {}
+        mock_get.return_value = [
+            mock.Mock(id='NODE_1', status=consts.NS_ACTIVE),
+            mock.Mock(id='NODE_2', status=consts.NS_ERROR),
+            mock.Mock(id='NODE_3', status=consts.NS_WARNING),
+        ]
+        mock_create.return_value = ['ACTION_2', 'ACTION_3']
+        recover = {'operation': 'REBUILD', 'delete_timeout': 10,
+                   'force_recreate': True}
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx,
+                                  inputs={'recover': recover})
+        action.id = 'CLUSTER_ACTION_ID'
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('Cluster checking completed.', res_msg)
+        mock_get.assert_called_once_with(action.context, 'FAKE_ID')
+        inputs = {'operation': [{'name': 'REBUILD'}], 'delete_timeout': 10,
+                  'force_recreate': True}
+        mock_create.assert_called_once_with(
+            action.context, consts.NODE_RECOVER, [
+                ('NODE_2', {'name': 'node_recover_NODE_2',
+                            'cause': consts.CAUSE_RPC, 'status': 'READY',
+                            'inputs': inputs}),
+                ('NODE_3', {'name': 'node_recover_NODE_3',
+                            'cause': consts.CAUSE_RPC, 'status': 'READY',
+                            'inputs': inputs}),
+            ])
+        mock_start.assert_called_once_with()
+        # the recoveries are not derived from the check, so they are neither
+        # dependents of it nor waited for
+        self.assertEqual(0, mock_dep.call_count)
+        self.assertEqual(0, mock_update.call_count)
+        self.assertEqual(0, mock_wait.call_count)
+        cluster.eval_status.assert_called_once_with(
+            action.context, consts.CLUSTER_CHECK)
+
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(no.Node, 'get_all_by_cluster')
+    @mock.patch.object(nm.Node, 'check_batch')
+    def test_do_check_recover_all_healthy(self, mock_batch, mock_get,
+                                          mock_create, mock_load):
+        cluster = mock.Mock(id='FAKE_ID', nodes=[])
+        mock_load.return_value = cluster
+        mock_batch.return_value = {}
+        mock_get.return_value = [
+            mock.Mock(id='NODE_1', status=consts.NS_ACTIVE)]
+        action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_CHECK', self.ctx,
+                                  inputs={'recover': {}})
+
+        res_code, res_msg = action.do_check()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('Cluster checking completed.', res_msg)
+        self.assertEqual(0, mock_create.call_count)
@@ -10,9 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import eventlet
 import mock
+from oslo_config import cfg
 
 from senlin.common import consts
+from senlin.common import exception
 from senlin.common import scaleutils as su
 from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
@@ -33,8 +36,8 @@ class ClusterRecoverTest(base.SenlinTestCase):
         super(ClusterRecoverTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
@@ -53,7 +56,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
         action.id = 'CLUSTER_ACTION_ID'
         action.data = {}
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_action.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         # do it
@@ -65,22 +68,21 @@ class ClusterRecoverTest(base.SenlinTestCase):
 
         cluster.do_recover.assert_called_once_with(action.context)
         mock_action.assert_called_once_with(
-            action.context, 'NODE_2', 'NODE_RECOVER',
-            name='node_recover_NODE_2',
-            cause=consts.CAUSE_DERIVED,
-            inputs={}
-        )
+            action.context, 'NODE_RECOVER',
+            [('NODE_2', {'name': 'node_recover_NODE_2',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {}})])
         mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
                                          'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
+        mock_update.assert_called_once_with(
+            action.context, ['NODE_RECOVER_ID'], {'status': 'READY'})
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
@@ -103,7 +105,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
             }
         }
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_action.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         # do it
@@ -115,25 +117,23 @@ class ClusterRecoverTest(base.SenlinTestCase):
 
         cluster.do_recover.assert_called_once_with(action.context)
         mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_RECOVER',
-            name='node_recover_NODE_1',
-            cause=consts.CAUSE_DERIVED,
-            inputs={
-                'operation': [{'name': 'REBOOT', 'params': None}],
-                'params': {'fence_compute': True}
-            }
-        )
+            action.context, 'NODE_RECOVER',
+            [('NODE_1', {'name': 'node_recover_NODE_1',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {
+                             'operation': [{'name': 'REBOOT', 'params': None}],
+                             'params': {'fence_compute': True}}})])
         mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
                                          'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
+        mock_update.assert_called_once_with(
+            action.context, ['NODE_RECOVER_ID'], {'status': 'READY'})
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
@@ -156,7 +156,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
             'check_capacity': True
         }
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_action.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         # do it
@@ -168,23 +168,64 @@ class ClusterRecoverTest(base.SenlinTestCase):
 
         cluster.do_recover.assert_called_once_with(action.context)
         mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_RECOVER',
-            name='node_recover_NODE_1',
-            cause=consts.CAUSE_DERIVED,
-            inputs={
-                'operation': consts.RECOVER_REBOOT
-            }
-        )
+            action.context, 'NODE_RECOVER',
+            [('NODE_1', {'name': 'node_recover_NODE_1',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {
+                             'operation': consts.RECOVER_REBOOT}})])
         mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
                                          'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
+        mock_update.assert_called_once_with(
+            action.context, ['NODE_RECOVER_ID'], {'status': 'READY'})
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
         mock_check.assert_called_once_with()
 
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    def test_do_recover_with_nodes(self, mock_wait, mock_start, mock_dep,
+                                   mock_action, mock_update, mock_load):
+        node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE')
+        node2 = mock.Mock(id='NODE_2', cluster_id='FAKE_ID', status='ERROR')
+        node3 = mock.Mock(id='NODE_3', cluster_id='FAKE_ID', status='ACTIVE')
+        cluster = mock.Mock(id='FAKE_ID', desired_capacity=3)
+        cluster.nodes = [node1, node2, node3]
+        mock_load.return_value = cluster
+
+        action = ca.ClusterAction(cluster.id, 'CLUSTER_RECOVER', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        action.data = {
+            'health': {
+                'recover_action': [{'name': 'REBOOT', 'params': None}],
+            }
+        }
+        action.inputs = {'nodes': ['NODE_1', 'NODE_3']}
+        mock_action.return_value = ['RECOVER_1', 'RECOVER_3']
+        mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
+
+        # do it
+        res_code, res_msg = action.do_recover()
+
+        # assertions
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('Cluster recovery succeeded.', res_msg)
+        # only the nodes requested are recovered, even if they are ACTIVE
+        inputs = {'operation': [{'name': 'REBOOT', 'params': None}]}
+        mock_action.assert_called_once_with(
+            action.context, 'NODE_RECOVER',
+            [('NODE_1', {'name': 'node_recover_NODE_1',
+                         'cause': consts.CAUSE_DERIVED, 'inputs': inputs}),
+             ('NODE_3', {'name': 'node_recover_NODE_3',
+                         'cause': consts.CAUSE_DERIVED, 'inputs': inputs})])
+        mock_dep.assert_called_once_with(action.context,
+                                         ['RECOVER_1', 'RECOVER_3'],
+                                         'CLUSTER_ACTION_ID')
+
     def test_do_recover_all_nodes_active(self, mock_load):
         cluster = mock.Mock(id='FAKE_ID', desired_capacity=2)
         cluster.do_recover.return_value = True
@@ -205,8 +246,8 @@ class ClusterRecoverTest(base.SenlinTestCase):
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
@@ -219,7 +260,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
         cluster.do_recover.return_value = True
         cluster.nodes = [node]
         mock_load.return_value = cluster
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_action.return_value = ['NODE_ACTION_ID']
 
         action = ca.ClusterAction('FAKE_CLUSTER', 'CLUSTER_REOVER', self.ctx)
         action.id = 'CLUSTER_ACTION_ID'
@@ -234,14 +275,13 @@ class ClusterRecoverTest(base.SenlinTestCase):
         mock_load.assert_called_once_with(self.ctx, 'FAKE_CLUSTER')
         cluster.do_recover.assert_called_once_with(action.context)
         mock_action.assert_called_once_with(
-            action.context, 'NODE_1', 'NODE_RECOVER',
-            name='node_recover_NODE_1',
-            cause=consts.CAUSE_DERIVED,
-            inputs={}
-        )
+            action.context, 'NODE_RECOVER',
+            [('NODE_1', {'name': 'node_recover_NODE_1',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {}})])
         mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
                                          'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_ACTION_ID',
+        mock_update.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
                                             {'status': 'READY'})
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
@@ -251,8 +291,9 @@ class ClusterRecoverTest(base.SenlinTestCase):
 
     @mock.patch.object(ca.ClusterAction, '_check_capacity')
     @mock.patch.object(nm.Node, 'load')
-    def test_do_recover_with_check_active(self, mock_node, mock_desired,
-                                          mock_load):
+    @mock.patch.object(nm.Node, 'check_batch', return_value=None)
+    def test_do_recover_with_check_active(self, mock_batch, mock_node,
+                                          mock_desired, mock_load):
         cluster = mock.Mock(id='FAKE_ID', desired_capacity=2)
         cluster.do_recover.return_value = True
         mock_load.return_value = cluster
@@ -294,16 +335,18 @@ class ClusterRecoverTest(base.SenlinTestCase):
             action.context, consts.CLUSTER_RECOVER)
         self.assertFalse(mock_desired.called)
 
-    @mock.patch.object(ao.Action, 'update')
-    @mock.patch.object(ab.Action, 'create')
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
     @mock.patch.object(dobj.Dependency, 'create')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     @mock.patch.object(ca.ClusterAction, '_check_capacity')
     @mock.patch.object(nm.Node, 'load')
-    def test_do_recover_with_check_error(self, mock_node, mock_desired,
-                                         mock_wait, mock_start, mock_dep,
-                                         mock_action, mock_update, mock_load):
+    @mock.patch.object(nm.Node, 'check_batch', return_value=None)
+    def test_do_recover_with_check_error(self, mock_batch, mock_node,
+                                         mock_desired, mock_wait, mock_start,
+                                         mock_dep, mock_action, mock_update,
+                                         mock_load):
         node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE')
         node2 = mock.Mock(id='NODE_2', cluster_id='FAKE_ID', status='ACTIVE')
 
@@ -324,7 +367,7 @@ class ClusterRecoverTest(base.SenlinTestCase):
         action.inputs = {'check': True,
                          'check_capacity': True}
 
-        mock_action.return_value = 'NODE_RECOVER_ID'
+        mock_action.return_value = ['NODE_RECOVER_ID']
         mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
 
         def set_status(*args, **kwargs):
@@ -343,11 +386,10 @@ class ClusterRecoverTest(base.SenlinTestCase):
 
         cluster.do_recover.assert_called_once_with(action.context)
         mock_action.assert_called_once_with(
-            action.context, 'NODE_2', 'NODE_RECOVER',
-            name='node_recover_NODE_2',
-            cause=consts.CAUSE_DERIVED,
-            inputs={}
-        )
+            action.context, 'NODE_RECOVER',
+            [('NODE_2', {'name': 'node_recover_NODE_2',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {}})])
         node_calls = [
             mock.call(self.ctx, node_id='NODE_1'),
             mock.call(self.ctx, node_id='NODE_2')
@@ -357,14 +399,159 @@ class ClusterRecoverTest(base.SenlinTestCase):
         eng_node2.do_check.assert_called_once_with(self.ctx)
         mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
                                          'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(action.context, 'NODE_RECOVER_ID',
-                                            {'status': 'READY'})
+        mock_update.assert_called_once_with(
+            action.context, ['NODE_RECOVER_ID'], {'status': 'READY'})
         mock_start.assert_called_once_with()
         mock_wait.assert_called_once_with()
         cluster.eval_status.assert_called_once_with(
             action.context, consts.CLUSTER_RECOVER)
         mock_desired.assert_called_once_with()
 
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    @mock.patch.object(nm.Node, 'load')
+    @mock.patch.object(nm.Node, 'check_batch')
+    def test_do_recover_with_check_batch(self, mock_batch, mock_node,
+                                         mock_wait, mock_start, mock_dep,
+                                         mock_action, mock_update, mock_load):
+        node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE')
+        node2 = mock.Mock(id='NODE_2', cluster_id='FAKE_ID', status='ACTIVE')
+        cluster = mock.Mock(id='FAKE_ID', desired_capacity=2)
+        cluster.nodes = [node1, node2]
+        mock_load.return_value = cluster
+
+        def check_batch(ctx, nodes):
+            node2.status = 'ERROR'
+            return {'NODE_1': True, 'NODE_2': False}
+
+        mock_batch.side_effect = check_batch
+        mock_action.return_value = ['NODE_RECOVER_ID']
+
+        action = ca.ClusterAction(cluster.id, 'CLUSTER_RECOVER', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        action.inputs = {'check': True}
+        mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
+
+        res_code, res_msg = action.do_recover()
+
+        self.assertEqual(action.RES_OK, res_code)
+        mock_batch.assert_called_once_with(action.context, [node1, node2])
+        mock_node.assert_not_called()
+        mock_action.assert_called_once_with(
+            action.context, 'NODE_RECOVER',
+            [('NODE_2', {'name': 'node_recover_NODE_2',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {}})])
+        mock_dep.assert_called_once_with(action.context, ['NODE_RECOVER_ID'],
+                                         'CLUSTER_ACTION_ID')
+        mock_start.assert_called_once_with()
+
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    @mock.patch.object(nm.Node, 'load')
+    @mock.patch.object(nm.Node, 'check_batch')
+    def test_do_recover_with_check_concurrent(self, mock_batch, mock_node,
+                                              mock_wait, mock_start,
+                                              mock_dep, mock_action,
+                                              mock_update, mock_load):
+        cfg.CONF.set_override('node_check_concurrency', 2)
+        mock_batch.side_effect = exception.InternalError(message='BOOM')
+        cluster = mock.Mock(id='FAKE_ID', desired_capacity=4)
+        cluster.nodes = [
+            mock.Mock(id='NODE_%s' % i, cluster_id='FAKE_ID',
+                      status='ACTIVE')
+            for i in range(4)]
+        mock_load.return_value = cluster
+
+        running = []
+        peak = []
+
+        def load(ctx, node_id):
+            node = mock.Mock(id=node_id, status='ACTIVE')
+
+            def do_check(ctx):
+                running.append(node_id)
+                peak.append(len(running))
+                eventlet.sleep(0)
+                running.remove(node_id)
+                if node_id in ('NODE_1', 'NODE_3'):
+                    node.status = 'ERROR'
+
+            node.do_check.side_effect = do_check
+            return node
+
+        mock_node.side_effect = load
+        mock_action.side_effect = lambda ctx, name, specs: [
+            'RECOVER_%s' % node_id for node_id, kwargs in specs]
+
+        action = ca.ClusterAction(cluster.id, 'CLUSTER_RECOVER', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        action.inputs = {'check': True}
+        mock_wait.return_value = (action.RES_OK, 'Everything is Okay')
+
+        res_code, res_msg = action.do_recover()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual(2, max(peak))
+        self.assertEqual(4, mock_node.call_count)
+        # each recovery is started when the check of its node completes,
+        # its dependency being created before it is made READY
+        mock_dep.assert_has_calls([
+            mock.call(action.context, ['RECOVER_NODE_1'],
+                      'CLUSTER_ACTION_ID'),
+            mock.call(action.context, ['RECOVER_NODE_3'],
+                      'CLUSTER_ACTION_ID')])
+        mock_update.assert_has_calls([
+            mock.call(action.context, ['RECOVER_NODE_1'],
+                      {'status': 'READY'}),
+            mock.call(action.context, ['RECOVER_NODE_3'],
+                      {'status': 'READY'})])
+        self.assertEqual(2, mock_start.call_count)
+        mock_wait.assert_called_once_with()
+
+    @mock.patch.object(ao.Action, 'update_batch')
+    @mock.patch.object(ab.Action, 'create_batch')
+    @mock.patch.object(dobj.Dependency, 'create')
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(nm.Node, 'load')
+    @mock.patch.object(nm.Node, 'check_batch', return_value=None)
+    def test_do_recover_with_check_failed(self, mock_batch, mock_node,
+                                          mock_start, mock_dep, mock_action,
+                                          mock_update, mock_load):
+        cluster = mock.Mock(id='FAKE_ID', desired_capacity=2)
+        cluster.nodes = [
+            mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE'),
+            mock.Mock(id='NODE_2', cluster_id='FAKE_ID', status='ACTIVE')]
+        mock_load.return_value = cluster
+        node1 = mock.Mock(id='NODE_1', status='ERROR')
+        node2 = mock.Mock(id='NODE_2', status='ACTIVE')
+        node2.do_check.side_effect = exception.ResourceNotFound(
+            type='node', id='NODE_2')
+        mock_node.side_effect = [node1, node2]
+        mock_action.return_value = ['RECOVER_NODE_1']
+
+        action = ca.ClusterAction(cluster.id, 'CLUSTER_RECOVER', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        action.inputs = {'check': True}
+
+        self.assertRaises(exception.ResourceNotFound, action.do_recover)
+
+        # the recovery of the node checked before the failure was started
+        mock_action.assert_called_once_with(
+            action.context, 'NODE_RECOVER',
+            [('NODE_1', {'name': 'node_recover_NODE_1',
+                         'cause': consts.CAUSE_DERIVED,
+                         'inputs': {}})])
+        mock_dep.assert_called_once_with(action.context, ['RECOVER_NODE_1'],
+                                         'CLUSTER_ACTION_ID')
+        mock_start.assert_called_once_with()
+
     @mock.patch.object(ca.ClusterAction, '_create_nodes')
     def test__check_capacity_create(self, mock_create, mock_load):
         node1 = mock.Mock(id='NODE_1', cluster_id='FAKE_ID', status='ACTIVE')
@@ -15,7 +15,8 @@ import mock
 from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
-from senlin.engine import scheduler
+from senlin.engine import waiters
+from senlin.objects import dependency as dobj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -76,16 +77,24 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         super(ClusterActionWaitTest, self).setUp()
         self.ctx = utils.dummy_context()
 
+    @mock.patch.object(dobj.Dependency, 'get_depended')
     @mock.patch.object(cm.Cluster, 'load')
-    @mock.patch.object(scheduler, 'reschedule')
-    def test_wait_dependents(self, mock_reschedule, mock_load):
+    @mock.patch.object(waiters, 'wait_for_dependents')
+    def test_wait_dependents(self, mock_wait, mock_load, mock_depended):
+        mock_depended.return_value = ['CHILD_1', 'CHILD_2']
         action = ca.ClusterAction('ID', 'ACTION', self.ctx)
         action.id = 'FAKE_ID'
         self.patchobject(action, 'get_status', side_effect=self.statuses)
         self.patchobject(action, 'is_cancelled', side_effect=self.cancelled)
         self.patchobject(action, 'is_timeout', side_effect=self.timeout)
+        mock_add = self.patchobject(waiters, 'add_waiter')
+        mock_remove = self.patchobject(waiters, 'remove_waiter')
 
         res_code, res_msg = action._wait_for_dependents()
         self.assertEqual(self.code, res_code)
         self.assertEqual(self.message, res_msg)
-        self.assertEqual(self.rescheduled_times, mock_reschedule.call_count)
+        self.assertEqual(self.rescheduled_times, mock_wait.call_count)
+        mock_wait.assert_called_with('FAKE_ID', 10)
+        mock_depended.assert_called_once_with(action.context, 'FAKE_ID')
+        mock_add.assert_called_once_with('FAKE_ID', ['CHILD_1', 'CHILD_2'])
+        mock_remove.assert_called_once_with('FAKE_ID')
@@ -11,6 +11,7 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 from oslo_messaging.rpc import dispatcher as rpc
 import six
 
@@ -46,7 +47,22 @@ class ActionTest(base.SenlinTestCase):
         expected = [{'k': 'v1'}, {'k': 'v2'}]
         self.assertEqual(expected, result)
 
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         limit=1000)
+
+    @mock.patch.object(ao.Action, 'get_all')
+    def test_action_list_with_attributes(self, mock_get):
+        x_1 = mock.Mock()
+        x_1.to_dict.return_value = {'id': 'AID', 'status': 'READY'}
+        mock_get.return_value = [x_1]
+
+        req = orao.ActionListRequest(attributes=['status'])
+        result = self.eng.action_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([{'id': 'AID', 'status': 'READY'}], result)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         limit=1000, fields=['status'])
+        x_1.to_dict.assert_called_once_with(['status'])
 
     @mock.patch.object(ao.Action, 'get_all')
     def test_action_list_with_params(self, mock_get):
@@ -72,6 +88,18 @@ class ActionTest(base.SenlinTestCase):
                                          project_safe=True
                                          )
 
+    @mock.patch.object(ao.Action, 'get_all')
+    def test_action_list_limit_capped(self, mock_get):
+        cfg.CONF.set_override('max_list_limit', 50)
+        mock_get.return_value = []
+
+        req = orao.ActionListRequest(limit=100)
+        result = self.eng.action_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([], result)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         limit=50)
+
     def test_action_list_with_bad_params(self):
         req = orao.ActionListRequest(project_safe=False)
         ex = self.assertRaises(rpc.ExpectedException,
@@ -86,7 +114,8 @@ class ActionTest(base.SenlinTestCase):
         req = orao.ActionListRequest(project_safe=True)
         result = self.eng.action_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         limit=1000)
 
         self.ctx.is_admin = True
 
@@ -94,13 +123,15 @@ class ActionTest(base.SenlinTestCase):
         req = orao.ActionListRequest(project_safe=True)
         result = self.eng.action_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         limit=1000)
 
         mock_get.reset_mock()
         req = orao.ActionListRequest(project_safe=False)
         result = self.eng.action_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=False)
+        mock_get.assert_called_once_with(self.ctx, project_safe=False,
+                                         limit=1000)
 
     @mock.patch.object(ab.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
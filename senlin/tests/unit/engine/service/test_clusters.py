@@ -93,6 +93,20 @@ class ClusterTest(base.SenlinTestCase):
         self.assertEqual([{'k': 'v1'}, {'k': 'v2'}], result)
         mock_get.assert_called_once_with(self.ctx, project_safe=True)
 
+    @mock.patch.object(co.Cluster, 'get_all')
+    def test_cluster_list_with_attributes(self, mock_get):
+        x_obj = mock.Mock()
+        x_obj.to_dict.return_value = {'id': 'CID', 'name': 'c1'}
+        mock_get.return_value = [x_obj]
+        req = orco.ClusterListRequest(project_safe=True, attributes=['name'])
+
+        result = self.eng.cluster_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([{'id': 'CID', 'name': 'c1'}], result)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         fields=['name'])
+        x_obj.to_dict.assert_called_once_with(['name'])
+
     @mock.patch.object(co.Cluster, 'get_all')
     def test_cluster_list_with_params(self, mock_get):
         mock_get.return_value = []
@@ -103,7 +117,8 @@ class ClusterTest(base.SenlinTestCase):
             'name': ['test_cluster'],
             'status': ['ACTIVE'],
             'sort': 'name:asc',
-            'project_safe': True
+            'project_safe': True,
+            'attributes': None,
         }
         self._prepare_request(req)
 
@@ -1512,6 +1527,48 @@ class ClusterTest(base.SenlinTestCase):
         )
         notify.assert_called_once_with()
 
+    @mock.patch.object(am.Action, 'create')
+    @mock.patch.object(no.Node, 'ids_by_cluster')
+    @mock.patch.object(co.Cluster, 'find')
+    @mock.patch.object(dispatcher, 'start_action')
+    def test_cluster_recover_with_nodes(self, notify, mock_find, mock_ids,
+                                        mock_action):
+        x_cluster = mock.Mock(id='CID')
+        mock_find.return_value = x_cluster
+        mock_ids.return_value = ['N1', 'N2', 'N3']
+        mock_action.return_value = 'ACTION_ID'
+        req = orco.ClusterRecoverRequest(identity='C1',
+                                         params={'nodes': ['N1', 'N3']})
+
+        result = self.eng.cluster_recover(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual({'action': 'ACTION_ID'}, result)
+        mock_ids.assert_called_once_with(self.ctx, 'CID')
+        mock_action.assert_called_once_with(
+            self.ctx, 'CID', consts.CLUSTER_RECOVER,
+            name='cluster_recover_CID',
+            cause=consts.CAUSE_RPC,
+            status=am.Action.READY,
+            inputs={'nodes': ['N1', 'N3']},
+        )
+        notify.assert_called_once_with()
+
+    @mock.patch.object(no.Node, 'ids_by_cluster')
+    @mock.patch.object(co.Cluster, 'find')
+    def test_cluster_recover_with_bad_nodes(self, mock_find, mock_ids):
+        mock_find.return_value = mock.Mock(id='CID')
+        mock_ids.return_value = ['N1']
+        req = orco.ClusterRecoverRequest(identity='C1',
+                                         params={'nodes': ['N1', 'N2']})
+
+        ex = self.assertRaises(rpc.ExpectedException,
+                               self.eng.cluster_recover,
+                               self.ctx, req.obj_to_primitive())
+
+        self.assertEqual(exc.BadRequest, ex.exc_info[0])
+        self.assertEqual("Nodes not members of specified cluster: ['N2'].",
+                         six.text_type(ex.exc_info[1]))
+
     @mock.patch.object(co.Cluster, 'find')
     def test_cluster_recover_cluster_not_found(self, mock_find):
         mock_find.side_effect = exc.ResourceNotFound(type='cluster',
@@ -12,6 +12,7 @@
 
 import mock
 
+from oslo_config import cfg
 from oslo_messaging.rpc import dispatcher as rpc
 
 from senlin.common import consts
@@ -45,7 +46,8 @@ class EventTest(base.SenlinTestCase):
         expected = [{'level': 'DEBUG'}, {'level': 'INFO'}]
 
         self.assertEqual(expected, result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=True)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          limit=1000)
 
     @mock.patch.object(eo.Event, 'get_all')
     def test_event_list_with_params(self, mock_load):
@@ -74,6 +76,33 @@ class EventTest(base.SenlinTestCase):
                                           marker=marker_uuid,
                                           project_safe=True)
 
+    @mock.patch.object(eo.Event, 'get_all')
+    def test_event_list_limit_capped(self, mock_load):
+        cfg.CONF.set_override('max_list_limit', 50)
+        mock_load.return_value = []
+
+        req = oreo.EventListRequest(limit=100)
+        result = self.eng.event_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([], result)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          limit=50)
+
+    @mock.patch.object(eo.Event, 'get_all')
+    def test_event_list_with_attributes(self, mock_load):
+        obj_1 = mock.Mock()
+        obj_1.as_dict.return_value = {'id': 'EID', 'status': 'CREATE'}
+        mock_load.return_value = [obj_1]
+
+        req = oreo.EventListRequest(attributes=['status'])
+        result = self.eng.event_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([{'id': 'EID', 'status': 'CREATE'}], result)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          limit=1000,
+                                          columns=['id', 'status'])
+        obj_1.as_dict.assert_called_once_with(['id', 'status'])
+
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(eo.Event, 'get_all')
     def test_event_list_with_cluster_id(self, mock_load, mock_find):
@@ -95,7 +124,7 @@ class EventTest(base.SenlinTestCase):
 
         filters = {'cluster_id': ['FAKE1', 'FAKE2']}
         mock_load.assert_called_once_with(self.ctx, filters=filters,
-                                          project_safe=True)
+                                          limit=1000, project_safe=True)
         mock_find.assert_has_calls([
             mock.call(self.ctx, 'CLUSTERA'),
             mock.call(self.ctx, 'CLUSTER2')
@@ -134,7 +163,8 @@ class EventTest(base.SenlinTestCase):
         req = oreo.EventListRequest(project_safe=True)
         result = self.eng.event_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=True)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          limit=1000)
 
         self.ctx.is_admin = True
 
@@ -142,13 +172,15 @@ class EventTest(base.SenlinTestCase):
         req = oreo.EventListRequest(project_safe=True)
         result = self.eng.event_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=True)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          limit=1000)
 
         mock_load.reset_mock()
         req = oreo.EventListRequest(project_safe=False)
         result = self.eng.event_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=False)
+        mock_load.assert_called_once_with(self.ctx, project_safe=False,
+                                          limit=1000)
 
     @mock.patch.object(eo.Event, 'find')
     def test_event_get(self, mock_find):
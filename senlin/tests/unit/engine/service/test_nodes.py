@@ -54,6 +54,20 @@ class NodeTest(base.SenlinTestCase):
         self.assertEqual([{'k': 'v1'}, {'k': 'v2'}], result)
         mock_get.assert_called_once_with(self.ctx, project_safe=True)
 
+    @mock.patch.object(no.Node, 'get_all')
+    def test_node_list_with_attributes(self, mock_get):
+        obj_1 = mock.Mock()
+        obj_1.to_dict.return_value = {'id': 'NID', 'status': 'ACTIVE'}
+        mock_get.return_value = [obj_1]
+
+        req = orno.NodeListRequest(attributes=['status'])
+        result = self.eng.node_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([{'id': 'NID', 'status': 'ACTIVE'}], result)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         fields=['status'])
+        obj_1.to_dict.assert_called_once_with(['status'])
+
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(no.Node, 'get_all')
     def test_node_list_with_cluster_id(self, mock_get, mock_find):
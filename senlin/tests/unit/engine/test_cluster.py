@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import eventlet
 import mock
 from oslo_config import cfg
 import six
@@ -868,31 +869,113 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual(0, len(result))
 
     @mock.patch.object(node_mod.Node, 'load_all')
-    @mock.patch.object(node_mod.Node, 'do_check')
+    @mock.patch.object(node_mod.Node, 'check_batch')
     @mock.patch.object(cm.Cluster, 'update_node')
-    def test_health_check(self, mock_update, mock_check, mock_load):
+    def test_health_check(self, mock_update, mock_batch, mock_load):
         cluster = cm.Cluster('test-cluster', 5, PROFILE_ID,
                              min_size=2, id=CLUSTER_ID)
-        node1 = node_mod.Node('fake1', PROFILE_ID, status='ACTIVE')
-        node2 = node_mod.Node('fake2', PROFILE_ID, status='ACTIVE')
-        nodes = [node1, node2]
+        node1 = node_mod.Node('fake1', PROFILE_ID, status='ACTIVE',
+                              physical_id='SERVER_1')
+        node2 = node_mod.Node('fake2', PROFILE_ID, status='ACTIVE',
+                              physical_id='SERVER_2')
+        node3 = node_mod.Node('fake3', PROFILE_ID, status='ERROR')
+        for node in [node1, node2, node3]:
+            cluster.add_node(node)
+        mock_batch.return_value = {node1.id: False, node2.id: True}
+        mock_load.return_value = [node1, node2, node3]
+
+        cluster.health_check(self.context)
+
+        mock_batch.assert_called_once_with(self.context, [node1, node2])
+        mock_load.assert_called_once_with(self.context, cluster_id=CLUSTER_ID)
+        mock_update.assert_called_once_with([node1, node2, node3])
+
+    @mock.patch.object(node_mod.Node, 'load_all')
+    @mock.patch.object(node_mod.Node, 'store_check_results')
+    @mock.patch.object(node_mod.Node, 'check_batch')
+    @mock.patch.object(cm.Cluster, '_check_node')
+    @mock.patch.object(cm.Cluster, 'update_node')
+    def test_health_check_concurrent(self, mock_update, mock_check,
+                                     mock_batch, mock_store, mock_load):
+        cfg.CONF.set_override('node_check_concurrency', 2)
+        cluster = cm.Cluster('test-cluster', 5, PROFILE_ID,
+                             min_size=2, id=CLUSTER_ID)
+        nodes = [node_mod.Node('fake%s' % i, PROFILE_ID, status='ACTIVE',
+                               physical_id='SERVER_%s' % i)
+                 for i in range(4)]
         for node in nodes:
             cluster.add_node(node)
+        mock_batch.side_effect = exception.InternalError(message='BOOM')
+        mock_load.return_value = nodes
 
-        node1.status = 'ERROR'
-        mock_load.return_value = [node1, node2]
+        running = []
+        peak = []
+
+        def check(ctx, node):
+            running.append(node.id)
+            peak.append(len(running))
+            eventlet.sleep(0)
+            running.remove(node.id)
+            return node.id, node.physical_id != 'SERVER_1'
+
+        mock_check.side_effect = check
 
         cluster.health_check(self.context)
 
-        self.assertEqual(2, len(cluster.nodes))
-        self.assertEqual([node1, node2], cluster.nodes)
+        self.assertEqual(2, max(peak))
+        self.assertEqual(4, mock_check.call_count)
+        results = dict((n.id, n.physical_id != 'SERVER_1') for n in nodes)
+        mock_store.assert_called_once_with(self.context, nodes, results)
+        mock_update.assert_called_once_with(nodes)
 
-        mock_update.assert_called_once_with([node1, node2])
-        mock_check.assert_has_calls([
-            mock.call(self.context),
-            mock.call(self.context)
-        ])
-        mock_load.assert_called_once_with(self.context, cluster_id=CLUSTER_ID)
+    @mock.patch.object(pfb.Profile, 'check_object')
+    def test__check_node(self, mock_check):
+        cluster = cm.Cluster('test-cluster', 5, PROFILE_ID, id=CLUSTER_ID)
+        node = mock.Mock(id='NODE_ID')
+        mock_check.return_value = False
+
+        res = cluster._check_node(self.context, node)
+
+        self.assertEqual(('NODE_ID', False), res)
+        mock_check.assert_called_once_with(self.context, node)
+
+    @mock.patch.object(pfb.Profile, 'check_object')
+    def test__check_node_timeout(self, mock_check):
+        cfg.CONF.set_override('node_check_timeout', 1)
+        cluster = cm.Cluster('test-cluster', 5, PROFILE_ID, id=CLUSTER_ID)
+        node = mock.Mock(id='NODE_ID')
+        mock_check.side_effect = eventlet.Timeout()
+
+        res = cluster._check_node(self.context, node)
+
+        self.assertEqual(('NODE_ID', False), res)
+
+    @mock.patch.object(pfb.Profile, 'check_object')
+    def test__check_node_failed(self, mock_check):
+        cluster = cm.Cluster('test-cluster', 5, PROFILE_ID, id=CLUSTER_ID)
+        node = mock.Mock(id='NODE_ID')
+        mock_check.side_effect = exception.EResourceOperation(
+            op='checking', type='server', id='SERVER', message='BOOM')
+
+        res = cluster._check_node(self.context, node)
+
+        self.assertEqual(('NODE_ID', False), res)
+        node.set_status.assert_not_called()
+
+    @mock.patch.object(pfb.Profile, 'check_object')
+    def test__check_node_not_found(self, mock_check):
+        cluster = cm.Cluster('test-cluster', 5, PROFILE_ID, id=CLUSTER_ID)
+        node = mock.Mock(id='NODE_ID')
+        mock_check.side_effect = exception.EServerNotFound(
+            type='server', id='SERVER', message='No Server found')
+
+        res = cluster._check_node(self.context, node)
+
+        self.assertEqual(('NODE_ID', None), res)
+        node.set_status.assert_called_once_with(
+            self.context, consts.NS_ERROR,
+            "Failed in found server 'SERVER': No Server found.",
+            physical_id=None)
 
     @mock.patch.object(co.Cluster, 'update')
     @mock.patch.object(node_mod.Node, 'load_all')
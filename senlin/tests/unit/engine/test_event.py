@@ -161,6 +161,37 @@ class TestEvent(testtools.TestCase):
         finally:
             event.dispatchers = saved_dispathers
 
+    def test_flush(self):
+        saved_dispathers = event.dispatchers
+        event.dispatchers = mock.Mock()
+        try:
+            res = event.flush()
+
+            self.assertIsNone(res)
+            event.dispatchers.map_method.assert_called_once_with('flush')
+        finally:
+            event.dispatchers = saved_dispathers
+
+    def test_flush_with_exception(self):
+        saved_dispathers = event.dispatchers
+        event.dispatchers = mock.Mock()
+        event.dispatchers.map_method.side_effect = Exception('fab')
+        try:
+            res = event.flush()
+
+            self.assertIsNone(res)  # exception logged only
+            event.dispatchers.map_method.assert_called_once_with('flush')
+        finally:
+            event.dispatchers = saved_dispathers
+
+    def test_flush_no_dispatchers(self):
+        saved_dispathers = event.dispatchers
+        event.dispatchers = None
+        try:
+            self.assertIsNone(event.flush())
+        finally:
+            event.dispatchers = saved_dispathers
+
 
 @mock.patch.object(event, '_dump')
 class TestLogMethods(testtools.TestCase):
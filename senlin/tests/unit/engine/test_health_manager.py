@@ -11,8 +11,10 @@
 # under the License.
 
 import copy
+import datetime
 import time
 
+import eventlet
 import mock
 from oslo_config import cfg
 from oslo_utils import timeutils as tu
@@ -23,6 +25,7 @@ from senlin.common import messaging
 from senlin.common import utils
 from senlin.engine import health_manager as hm
 from senlin import objects
+from senlin.objects import action as obj_action
 from senlin.objects import cluster as obj_cluster
 from senlin.objects import health_registry as hr
 from senlin.objects import node as obj_node
@@ -50,11 +53,190 @@ class TestChaseUp(base.SenlinTestCase):
         self.assertTrue(res <= 1)
 
 
+class TestGetEngineRing(base.SenlinTestCase):
+
+    @mock.patch.object(objects.Service, 'get_all')
+    def test_get_engine_ring(self, mock_get):
+        now = tu.utcnow(True)
+        mock_get.return_value = [
+            mock.Mock(id='E1', updated_at=now),
+            mock.Mock(id='E2', updated_at=now - datetime.timedelta(days=1)),
+            mock.Mock(id='E3', updated_at=now),
+        ]
+        ctx = mock.Mock()
+
+        ring = hm.get_engine_ring(ctx)
+
+        self.assertEqual(['E1', 'E3'], ring.nodes)
+        mock_get.assert_called_once_with(ctx)
+
+    @mock.patch.object(objects.Service, 'get_all')
+    def test_get_engine_ring_with_engine(self, mock_get):
+        mock_get.return_value = []
+
+        ring = hm.get_engine_ring(mock.Mock(), 'E1')
+
+        self.assertEqual(['E1'], ring.nodes)
+        self.assertEqual('E1', ring.get_node('CLUSTER_ID'))
+
+    @mock.patch.object(hm, 'notify')
+    @mock.patch.object(hm, 'get_engine_ring')
+    def test_register(self, mock_ring, mock_notify):
+        mock_ring.return_value.get_node.return_value = 'E2'
+
+        res = hm.register('CLUSTER_ID', interval=30)
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_ring.return_value.get_node.assert_called_once_with('CLUSTER_ID')
+        mock_notify.assert_called_once_with(
+            'E2', 'register_cluster', cluster_id='CLUSTER_ID', interval=30,
+            check_type=consts.NODE_STATUS_POLLING, params={}, enabled=True)
+
+    @mock.patch.object(hm, 'notify')
+    @mock.patch.object(objects.Service, 'get_all')
+    def test_register_no_engine_alive(self, mock_get, mock_notify):
+        mock_get.return_value = []
+
+        with mock.patch.object(hm, '_local_engine_id', 'E0'):
+            hm.register('CLUSTER_ID', interval=30)
+
+        mock_notify.assert_called_once_with(
+            'E0', 'register_cluster', cluster_id='CLUSTER_ID', interval=30,
+            check_type=consts.NODE_STATUS_POLLING, params={}, enabled=True)
+
+    @mock.patch.object(hm, 'notify')
+    @mock.patch.object(hm, 'get_engine_ring')
+    def test_register_with_engine(self, mock_ring, mock_notify):
+        hm.register('CLUSTER_ID', engine_id='E1', interval=30)
+
+        mock_ring.assert_not_called()
+        mock_notify.assert_called_once_with(
+            'E1', 'register_cluster', cluster_id='CLUSTER_ID', interval=30,
+            check_type=consts.NODE_STATUS_POLLING, params={}, enabled=True)
+
+
+class TestRecoveryAggregator(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestRecoveryAggregator, self).setUp()
+        self.tg = mock.Mock(timers=[])
+        self.aggregator = hm.RecoveryAggregator(self.tg)
+        self.aggregator.rpc = mock.Mock()
+
+    def test_add(self):
+        cfg.CONF.set_override('recover_batch_window', 7,
+                              group='health_manager')
+
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE2')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER2', 'NODE3')
+
+        self.assertEqual(
+            {'CLUSTER1': {'project': 'PROJECT', 'user': 'USER',
+                          'nodes': ['NODE1', 'NODE2']},
+             'CLUSTER2': {'project': 'PROJECT', 'user': 'USER',
+                          'nodes': ['NODE3']}},
+            self.aggregator._pending)
+        self.tg.add_timer.assert_has_calls([
+            mock.call(7, self.aggregator.flush, 7, 'CLUSTER1'),
+            mock.call(7, self.aggregator.flush, 7, 'CLUSTER2')])
+        self.assertEqual(2, self.tg.add_timer.call_count)
+
+    @mock.patch.object(obj_node.Node, 'ids_by_cluster')
+    @mock.patch.object(context, 'get_service_context')
+    def test_flush(self, mock_ctx, mock_ids):
+        mock_ids.return_value = ['NODE1', 'NODE2', 'NODE4']
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE2')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE3')
+
+        self.aggregator.flush('CLUSTER1')
+
+        mock_ctx.assert_called_once_with(project_id='PROJECT',
+                                         user_id='USER')
+        ctx = mock_ctx.return_value
+        mock_ids.assert_called_once_with(ctx, 'CLUSTER1')
+        self.aggregator.rpc.call.assert_called_once_with(
+            ctx, 'cluster_recover', mock.ANY)
+        req = self.aggregator.rpc.call.call_args[0][2]
+        self.assertIsInstance(req, objects.ClusterRecoverRequest)
+        self.assertEqual('CLUSTER1', req.identity)
+        self.assertEqual({'nodes': ['NODE1', 'NODE2']}, req.params)
+        self.assertEqual({}, self.aggregator._pending)
+
+    @mock.patch.object(obj_node.Node, 'ids_by_cluster')
+    @mock.patch.object(context, 'get_service_context')
+    def test_flush_timer(self, mock_ctx, mock_ids):
+        mock_ids.return_value = []
+        timer = mock.Mock()
+        self.tg.add_timer.return_value = timer
+        self.tg.timers = [timer]
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+
+        self.aggregator.flush('CLUSTER1')
+
+        # the timer is stopped and removed from the thread group
+        timer.stop.assert_called_once_with()
+        self.tg.timer_done.assert_called_once_with(timer)
+        self.assertEqual({}, self.aggregator._timers)
+
+    @mock.patch.object(obj_node.Node, 'ids_by_cluster')
+    @mock.patch.object(context, 'get_service_context')
+    def test_flush_nothing_pending(self, mock_ctx, mock_ids):
+        self.aggregator.flush('CLUSTER1')
+
+        mock_ids.assert_not_called()
+        self.aggregator.rpc.call.assert_not_called()
+
+    @mock.patch.object(obj_node.Node, 'ids_by_cluster')
+    @mock.patch.object(context, 'get_service_context')
+    def test_flush_no_member(self, mock_ctx, mock_ids):
+        mock_ids.return_value = []
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+
+        self.aggregator.flush('CLUSTER1')
+
+        self.aggregator.rpc.call.assert_not_called()
+
+    @mock.patch.object(obj_node.Node, 'ids_by_cluster')
+    @mock.patch.object(context, 'get_service_context')
+    def test_flush_rpc_failed(self, mock_ctx, mock_ids):
+        mock_ids.return_value = ['NODE1']
+        self.aggregator.rpc.call.side_effect = Exception('boom')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+
+        self.aggregator.flush('CLUSTER1')
+
+        self.assertEqual(1, self.aggregator.rpc.call.call_count)
+        self.assertEqual({}, self.aggregator._pending)
+
+    def test_flush_all(self):
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER1', 'NODE1')
+        self.aggregator.add('PROJECT', 'USER', 'CLUSTER2', 'NODE2')
+
+        with mock.patch.object(self.aggregator, 'flush') as mock_flush:
+            self.aggregator.flush_all()
+
+        mock_flush.assert_has_calls([mock.call('CLUSTER1'),
+                                     mock.call('CLUSTER2')],
+                                    any_order=True)
+
+
 @mock.patch('oslo_messaging.NotificationFilter')
 class TestNovaNotificationEndpoint(base.SenlinTestCase):
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_init(self, mock_rpc, mock_filter):
+    def setUp(self):
+        super(TestNovaNotificationEndpoint, self).setUp()
+        self.aggregator = mock.Mock()
+
+    def test_get_cluster_id(self, mock_filter):
+        payload = {'metadata': {'cluster_id': 'CLUSTER_ID'}}
+        self.assertEqual('CLUSTER_ID',
+                         hm.NovaNotificationEndpoint.get_cluster_id(payload))
+        self.assertIsNone(hm.NovaNotificationEndpoint.get_cluster_id({}))
+
+    def test_init(self, mock_filter):
         x_filter = mock_filter.return_value
         event_map = {
             'compute.instance.pause.end': 'PAUSE',
@@ -64,28 +246,25 @@ class TestNovaNotificationEndpoint(base.SenlinTestCase):
             'compute.instance.soft_delete.end': 'SOFT_DELETE',
         }
         recover_action = {'operation': 'REBUILD'}
-        obj = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER', recover_action)
+        obj = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER', recover_action,
+                                          self.aggregator)
 
         mock_filter.assert_called_once_with(
             publisher_id='^compute.*',
             event_type='^compute\.instance\..*',
             context={'project_id': '^PROJECT$'})
-        mock_rpc.assert_called_once_with()
         self.assertEqual(x_filter, obj.filter_rule)
-        self.assertEqual(mock_rpc.return_value, obj.rpc)
+        self.assertEqual(self.aggregator, obj.aggregator)
         for e in event_map:
             self.assertIn(e, obj.VM_FAILURE_EVENTS)
             self.assertEqual(event_map[e], obj.VM_FAILURE_EVENTS[e])
         self.assertEqual('PROJECT', obj.project_id)
         self.assertEqual('CLUSTER', obj.cluster_id)
 
-    @mock.patch.object(context.RequestContext, 'from_dict')
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info(self, mock_rpc, mock_context, mock_filter):
-        x_rpc = mock_rpc.return_value
+    def test_info(self, mock_filter):
         recover_action = {'operation': 'REBUILD'}
         endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
+                                               recover_action, self.aggregator)
         ctx = mock.Mock()
         payload = {
             'metadata': {
@@ -98,114 +277,50 @@ class TestNovaNotificationEndpoint(base.SenlinTestCase):
             'state': 'shutoff',
         }
         metadata = {'timestamp': 'TIMESTAMP'}
-        call_ctx = mock.Mock()
-        mock_context.return_value = call_ctx
 
         res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.shutdown.end',
                             payload, metadata)
 
         self.assertIsNone(res)
-        x_rpc.call.assert_called_once_with(call_ctx, 'node_recover', mock.ANY)
-        req = x_rpc.call.call_args[0][2]
-        self.assertIsInstance(req, objects.NodeRecoverRequest)
-        self.assertEqual('FAKE_NODE', req.identity)
-        expected_params = {
-            'event': 'SHUTDOWN',
-            'state': 'shutoff',
-            'instance_id': 'PHYSICAL_ID',
-            'timestamp': 'TIMESTAMP',
-            'publisher': 'PUBLISHER',
-            'operation': 'REBUILD'
-        }
-        self.assertEqual(expected_params, req.params)
+        self.aggregator.add.assert_called_once_with(
+            'PROJECT', 'USER', 'CLUSTER_ID', 'FAKE_NODE')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_no_metadata(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
+    def _test_info_ignored(self, payload, event_type):
         recover_action = {'operation': 'REBUILD'}
         endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'metadata': {}}
+                                               recover_action, self.aggregator)
         metadata = {'timestamp': 'TIMESTAMP'}
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.delete.end',
-                            payload, metadata)
+        res = endpoint.info(mock.Mock(), 'PUBLISHER', event_type, payload,
+                            metadata)
 
         self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
-
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_no_cluster_in_metadata(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'metadata': {'foo': 'bar'}}
-        metadata = {'timestamp': 'TIMESTAMP'}
+        self.aggregator.add.assert_not_called()
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.delete.end',
-                            payload, metadata)
+    def test_info_no_metadata(self, mock_filter):
+        self._test_info_ignored({'metadata': {}},
+                                'compute.instance.delete.end')
 
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+    def test_info_no_cluster_in_metadata(self, mock_filter):
+        self._test_info_ignored({'metadata': {'foo': 'bar'}},
+                                'compute.instance.delete.end')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_cluster_id_not_match(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'metadata': {'cluster_id': 'FOOBAR'}}
-        metadata = {'timestamp': 'TIMESTAMP'}
+    def test_info_cluster_id_not_match(self, mock_filter):
+        self._test_info_ignored({'metadata': {'cluster_id': 'FOOBAR'}},
+                                'compute.instance.delete.end')
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.delete.end',
-                            payload, metadata)
+    def test_info_event_type_not_interested(self, mock_filter):
+        self._test_info_ignored({'metadata': {'cluster_id': 'CLUSTER_ID'}},
+                                'compute.instance.delete.start')
 
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+    def test_info_no_node_id(self, mock_filter):
+        self._test_info_ignored({'metadata': {'cluster_id': 'CLUSTER_ID'}},
+                                'compute.instance.shutdown.end')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_event_type_not_interested(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
+    def test_info_default_values(self, mock_filter):
         recover_action = {'operation': 'REBUILD'}
         endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'metadata': {'cluster_id': 'CLUSTER_ID'}}
-        metadata = {'timestamp': 'TIMESTAMP'}
-
-        res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.delete.start',
-                            payload, metadata)
-
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
-
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_no_node_id(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'metadata': {'cluster_id': 'CLUSTER_ID'}}
-        metadata = {'timestamp': 'TIMESTAMP'}
-
-        res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.delete.end',
-                            payload, metadata)
-
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
-
-    @mock.patch.object(context.RequestContext, 'from_dict')
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_default_values(self, mock_rpc, mock_context, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.NovaNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
+                                               recover_action, self.aggregator)
         ctx = mock.Mock()
         payload = {
             'metadata': {
@@ -215,60 +330,55 @@ class TestNovaNotificationEndpoint(base.SenlinTestCase):
             'user_id': 'USER',
         }
         metadata = {'timestamp': 'TIMESTAMP'}
-        call_ctx = mock.Mock()
-        mock_context.return_value = call_ctx
 
         res = endpoint.info(ctx, 'PUBLISHER', 'compute.instance.shutdown.end',
                             payload, metadata)
 
         self.assertIsNone(res)
-        x_rpc.call.assert_called_once_with(call_ctx, 'node_recover', mock.ANY)
-        req = x_rpc.call.call_args[0][2]
-        self.assertIsInstance(req, objects.NodeRecoverRequest)
-        self.assertEqual('NODE_ID', req.identity)
-        expected_params = {
-            'event': 'SHUTDOWN',
-            'state': 'Unknown',
-            'instance_id': 'Unknown',
-            'timestamp': 'TIMESTAMP',
-            'publisher': 'PUBLISHER',
-            'operation': 'REBUILD',
-        }
-        self.assertEqual(expected_params, req.params)
+        self.aggregator.add.assert_called_once_with(
+            'PROJECT', 'USER', 'CLUSTER_ID', 'NODE_ID')
 
 
 @mock.patch('oslo_messaging.NotificationFilter')
 class TestHeatNotificationEndpoint(base.SenlinTestCase):
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_init(self, mock_rpc, mock_filter):
+    def setUp(self):
+        super(TestHeatNotificationEndpoint, self).setUp()
+        self.aggregator = mock.Mock()
+
+    def test_get_cluster_id(self, mock_filter):
+        payload = {'tags': ['cluster_node_id=NODE_ID',
+                            'cluster_id=CLUSTER_ID']}
+        self.assertEqual('CLUSTER_ID',
+                         hm.HeatNotificationEndpoint.get_cluster_id(payload))
+        self.assertIsNone(
+            hm.HeatNotificationEndpoint.get_cluster_id({'tags': None}))
+
+    def test_init(self, mock_filter):
         x_filter = mock_filter.return_value
         event_map = {
             'orchestration.stack.delete.end': 'DELETE',
         }
         recover_action = {'operation': 'REBUILD'}
-        obj = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER', recover_action)
+        obj = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER', recover_action,
+                                          self.aggregator)
 
         mock_filter.assert_called_once_with(
             publisher_id='^orchestration.*',
             event_type='^orchestration\.stack\..*',
             context={'project_id': '^PROJECT$'})
-        mock_rpc.assert_called_once_with()
         self.assertEqual(x_filter, obj.filter_rule)
-        self.assertEqual(mock_rpc.return_value, obj.rpc)
+        self.assertEqual(self.aggregator, obj.aggregator)
         for e in event_map:
             self.assertIn(e, obj.STACK_FAILURE_EVENTS)
             self.assertEqual(event_map[e], obj.STACK_FAILURE_EVENTS[e])
         self.assertEqual('PROJECT', obj.project_id)
         self.assertEqual('CLUSTER', obj.cluster_id)
 
-    @mock.patch.object(context.RequestContext, 'from_dict')
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info(self, mock_rpc, mock_context, mock_filter):
-        x_rpc = mock_rpc.return_value
+    def test_info(self, mock_filter):
         recover_action = {'operation': 'REBUILD'}
         endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
+                                               recover_action, self.aggregator)
         ctx = mock.Mock()
         payload = {
             'tags': {
@@ -281,172 +391,172 @@ class TestHeatNotificationEndpoint(base.SenlinTestCase):
             'state': 'DELETE_COMPLETE',
         }
         metadata = {'timestamp': 'TIMESTAMP'}
-        call_ctx = mock.Mock()
-        mock_context.return_value = call_ctx
 
         res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
                             payload, metadata)
 
         self.assertIsNone(res)
-        x_rpc.call.assert_called_once_with(call_ctx, 'node_recover', mock.ANY)
-        req = x_rpc.call.call_args[0][2]
-        self.assertIsInstance(req, objects.NodeRecoverRequest)
-        self.assertEqual('FAKE_NODE', req.identity)
-        expected_params = {
-            'event': 'DELETE',
-            'state': 'DELETE_COMPLETE',
-            'stack_id': 'PHYSICAL_ID',
-            'timestamp': 'TIMESTAMP',
-            'publisher': 'PUBLISHER',
-            'operation': 'REBUILD',
-        }
-        self.assertEqual(expected_params, req.params)
+        self.aggregator.add.assert_called_once_with(
+            'PROJECT', 'USER', 'CLUSTER_ID', 'FAKE_NODE')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_event_type_not_interested(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
+    def _test_info_ignored(self, payload, event_type):
         recover_action = {'operation': 'REBUILD'}
         endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'tags': {'cluster_id': 'CLUSTER_ID'}}
+                                               recover_action, self.aggregator)
         metadata = {'timestamp': 'TIMESTAMP'}
 
-        res = endpoint.info(ctx, 'PUBLISHER',
-                            'orchestration.stack.create.start',
-                            payload, metadata)
+        res = endpoint.info(mock.Mock(), 'PUBLISHER', event_type, payload,
+                            metadata)
 
         self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+        self.aggregator.add.assert_not_called()
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_no_tag(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'tags': None}
-        metadata = {'timestamp': 'TIMESTAMP'}
+    def test_info_event_type_not_interested(self, mock_filter):
+        self._test_info_ignored({'tags': {'cluster_id': 'CLUSTER_ID'}},
+                                'orchestration.stack.create.start')
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
-                            payload, metadata)
+    def test_info_no_tag(self, mock_filter):
+        self._test_info_ignored({'tags': None},
+                                'orchestration.stack.delete.end')
 
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+    def test_info_empty_tag(self, mock_filter):
+        self._test_info_ignored({'tags': []},
+                                'orchestration.stack.delete.end')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_empty_tag(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'tags': []}
-        metadata = {'timestamp': 'TIMESTAMP'}
+    def test_info_no_cluster_in_tag(self, mock_filter):
+        self._test_info_ignored({'tags': ['foo', 'bar']},
+                                'orchestration.stack.delete.end')
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
-                            payload, metadata)
+    def test_info_no_node_in_tag(self, mock_filter):
+        self._test_info_ignored({'tags': ['cluster_id=C1ID']},
+                                'orchestration.stack.delete.end')
 
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+    def test_info_cluster_id_not_match(self, mock_filter):
+        self._test_info_ignored(
+            {'tags': ['cluster_id=FOOBAR', 'cluster_node_id=N2']},
+            'orchestration.stack.delete.end')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_no_cluster_in_tag(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
+    def test_info_default_values(self, mock_filter):
         recover_action = {'operation': 'REBUILD'}
         endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
+                                               recover_action, self.aggregator)
         ctx = mock.Mock()
-        payload = {'tags': ['foo', 'bar']}
+        payload = {
+            'tags': [
+                'cluster_id=CLUSTER_ID',
+                'cluster_node_id=NODE_ID'
+            ],
+            'user_identity': 'USER',
+        }
         metadata = {'timestamp': 'TIMESTAMP'}
 
         res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
                             payload, metadata)
 
         self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+        self.aggregator.add.assert_called_once_with(
+            'PROJECT', 'USER', 'CLUSTER_ID', 'NODE_ID')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_no_node_in_tag(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'tags': ['cluster_id=C1ID']}
-        metadata = {'timestamp': 'TIMESTAMP'}
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
-                            payload, metadata)
+class TestNotificationRouter(base.SenlinTestCase):
 
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+    def setUp(self):
+        super(TestNotificationRouter, self).setUp()
+        self.endpoint_class = mock.Mock(PUBLISHER_ID='^compute.*',
+                                        EVENT_TYPE='^compute\\.instance.*')
+        self.endpoint_class.get_cluster_id.side_effect = (
+            lambda p: p['metadata'].get('cluster_id'))
+        self.aggregator = mock.Mock()
+        self.router = hm.NotificationRouter('EXCHANGE', self.endpoint_class,
+                                            self.aggregator)
+
+    @mock.patch('oslo_messaging.NotificationFilter')
+    def test_init(self, mock_filter):
+        router = hm.NotificationRouter('EXCHANGE', self.endpoint_class,
+                                       self.aggregator)
+
+        self.assertEqual('EXCHANGE', router.exchange)
+        self.assertEqual(self.aggregator, router.aggregator)
+        self.assertEqual({}, router.endpoints)
+        self.assertIsNone(router.listener)
+        self.assertEqual(mock_filter.return_value, router.filter_rule)
+        mock_filter.assert_called_once_with(
+            publisher_id='^compute.*', event_type='^compute\\.instance.*')
 
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_cluster_id_not_match(self, mock_rpc, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {'tags': ['cluster_id=FOOBAR', 'cluster_node_id=N2']}
-        metadata = {'timestamp': 'TIMESTAMP'}
+    def test_add_remove(self):
+        self.router.add('PROJECT', 'CLUSTER1', {'operation': 'REBUILD'})
+        self.router.add('PROJECT', 'CLUSTER2', {'operation': 'REBOOT'})
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
-                            payload, metadata)
+        self.assertEqual(set(['CLUSTER1', 'CLUSTER2']),
+                         set(self.router.endpoints))
+        self.endpoint_class.assert_has_calls([
+            mock.call('PROJECT', 'CLUSTER1', {'operation': 'REBUILD'},
+                      self.aggregator),
+            mock.call('PROJECT', 'CLUSTER2', {'operation': 'REBOOT'},
+                      self.aggregator)])
 
-        self.assertIsNone(res)
-        self.assertEqual(0, x_rpc.node_recover.call_count)
+        self.router.remove('CLUSTER1')
+        self.router.remove('CLUSTER3')
 
-    @mock.patch.object(context.RequestContext, 'from_dict')
-    @mock.patch('senlin.rpc.client.EngineClient')
-    def test_info_default_values(self, mock_rpc, mock_context, mock_filter):
-        x_rpc = mock_rpc.return_value
-        recover_action = {'operation': 'REBUILD'}
-        endpoint = hm.HeatNotificationEndpoint('PROJECT', 'CLUSTER_ID',
-                                               recover_action)
-        ctx = mock.Mock()
-        payload = {
-            'tags': [
-                'cluster_id=CLUSTER_ID',
-                'cluster_node_id=NODE_ID'
-            ],
-            'user_identity': 'USER',
-        }
-        metadata = {'timestamp': 'TIMESTAMP'}
-        call_ctx = mock.Mock()
-        mock_context.return_value = call_ctx
+        self.assertEqual(['CLUSTER2'], list(self.router.endpoints))
 
-        res = endpoint.info(ctx, 'PUBLISHER', 'orchestration.stack.delete.end',
-                            payload, metadata)
+    def test_info(self):
+        endpoint1 = mock.Mock()
+        endpoint2 = mock.Mock()
+        self.router.endpoints = {'CLUSTER1': endpoint1,
+                                 'CLUSTER2': endpoint2}
+        payload = {'metadata': {'cluster_id': 'CLUSTER2'}}
 
-        self.assertIsNone(res)
-        x_rpc.call.assert_called_once_with(call_ctx, 'node_recover', mock.ANY)
-        req = x_rpc.call.call_args[0][2]
-        self.assertIsInstance(req, objects.NodeRecoverRequest)
-        self.assertEqual('NODE_ID', req.identity)
-        expected_params = {
-            'event': 'DELETE',
-            'state': 'Unknown',
-            'stack_id': 'Unknown',
-            'timestamp': 'TIMESTAMP',
-            'publisher': 'PUBLISHER',
-            'operation': 'REBUILD',
-        }
-        self.assertEqual(expected_params, req.params)
+        self.router.info('CTX', 'PUBLISHER', 'EVENT', payload, 'META')
+
+        endpoint2.filter_rule.match.assert_called_once_with(
+            'CTX', 'PUBLISHER', 'EVENT', 'META', payload)
+        endpoint2.info.assert_called_once_with(
+            'CTX', 'PUBLISHER', 'EVENT', payload, 'META')
+        endpoint1.filter_rule.match.assert_not_called()
+        endpoint1.info.assert_not_called()
+
+    def test_info_filtered(self):
+        endpoint = mock.Mock()
+        endpoint.filter_rule.match.return_value = False
+        self.router.endpoints = {'CLUSTER1': endpoint}
+        payload = {'metadata': {'cluster_id': 'CLUSTER1'}}
+
+        self.router.info('CTX', 'PUBLISHER', 'EVENT', payload, 'META')
+
+        endpoint.info.assert_not_called()
+
+    def test_info_unknown_cluster(self):
+        endpoint = mock.Mock()
+        self.router.endpoints = {'CLUSTER1': endpoint}
+
+        self.router.info('CTX', 'PUBLISHER', 'EVENT', {'metadata': {}},
+                         'META')
+
+        endpoint.filter_rule.match.assert_not_called()
+        endpoint.info.assert_not_called()
+
+    def test_warn_debug(self):
+        endpoint = mock.Mock()
+        self.router.endpoints = {'CLUSTER1': endpoint}
+        payload = {'metadata': {'cluster_id': 'CLUSTER1'}}
+
+        self.router.warn('CTX', 'PUBLISHER', 'EVENT', payload, 'META')
+        self.router.debug('CTX', 'PUBLISHER', 'EVENT', payload, 'META')
+
+        endpoint.warn.assert_called_once_with(
+            'CTX', 'PUBLISHER', 'EVENT', payload, 'META')
+        endpoint.debug.assert_called_once_with(
+            'CTX', 'PUBLISHER', 'EVENT', payload, 'META')
 
 
-@mock.patch('senlin.engine.health_manager.HeatNotificationEndpoint')
-@mock.patch('senlin.engine.health_manager.NovaNotificationEndpoint')
 @mock.patch('oslo_messaging.Target')
 @mock.patch('oslo_messaging.get_notification_transport')
 @mock.patch('oslo_messaging.get_notification_listener')
 class TestListenerProc(base.SenlinTestCase):
 
     def test_listener_proc_nova(self, mock_listener, mock_transport,
-                                mock_target, mock_novaendpoint,
-                                mock_heatendpoint):
+                                mock_target):
         cfg.CONF.set_override('nova_control_exchange', 'FAKE_EXCHANGE',
                               group='health_manager')
 
@@ -456,48 +566,37 @@ class TestListenerProc(base.SenlinTestCase):
         mock_transport.return_value = x_transport
         x_target = mock.Mock()
         mock_target.return_value = x_target
-        x_endpoint = mock.Mock()
-        mock_novaendpoint.return_value = x_endpoint
+        x_router = mock.Mock()
 
-        recover_action = {'operation': 'REBUILD'}
-        res = hm.ListenerProc('FAKE_EXCHANGE', 'PROJECT_ID', 'CLUSTER_ID',
-                              recover_action)
+        res = hm.ListenerProc('FAKE_EXCHANGE', x_router)
 
-        self.assertIsNone(res)
+        self.assertEqual(x_listener, res)
         mock_transport.assert_called_once_with(cfg.CONF)
         mock_target.assert_called_once_with(topic="versioned_notifications",
                                             exchange='FAKE_EXCHANGE')
-        mock_novaendpoint.assert_called_once_with('PROJECT_ID', 'CLUSTER_ID',
-                                                  recover_action)
         mock_listener.assert_called_once_with(
-            x_transport, [x_target], [x_endpoint],
+            x_transport, [x_target], [x_router],
             executor='threading', pool="senlin-listeners")
         x_listener.start.assert_called_once_with()
 
     def test_listener_proc_heat(self, mock_listener, mock_transport,
-                                mock_target, mock_novaendpoint,
-                                mock_heatendpoint):
+                                mock_target):
         x_listener = mock.Mock()
         mock_listener.return_value = x_listener
         x_transport = mock.Mock()
         mock_transport.return_value = x_transport
         x_target = mock.Mock()
         mock_target.return_value = x_target
-        x_endpoint = mock.Mock()
-        mock_heatendpoint.return_value = x_endpoint
+        x_router = mock.Mock()
 
-        recover_action = {'operation': 'REBUILD'}
-        res = hm.ListenerProc('heat', 'PROJECT_ID', 'CLUSTER_ID',
-                              recover_action)
+        res = hm.ListenerProc('heat', x_router)
 
-        self.assertIsNone(res)
+        self.assertEqual(x_listener, res)
         mock_transport.assert_called_once_with(cfg.CONF)
         mock_target.assert_called_once_with(topic="notifications",
                                             exchange='heat')
-        mock_heatendpoint.assert_called_once_with('PROJECT_ID', 'CLUSTER_ID',
-                                                  recover_action)
         mock_listener.assert_called_once_with(
-            x_transport, [x_target], [x_endpoint],
+            x_transport, [x_target], [x_router],
             executor='threading', pool="senlin-listeners")
         x_listener.start.assert_called_once_with()
 
@@ -520,16 +619,21 @@ class TestHealthManager(base.SenlinTestCase):
         self.assertEqual(consts.HEALTH_MANAGER_TOPIC, self.hm.topic)
         self.assertEqual(consts.RPC_API_VERSION, self.hm.version)
         self.assertEqual(0, len(self.hm.rt['registries']))
+        self.assertIsInstance(self.hm.aggregator, hm.RecoveryAggregator)
 
     @mock.patch.object(hm.HealthManager, "_load_runtime_registry")
     def test__dummy_task(self, mock_load):
         self.hm._dummy_task()
         mock_load.assert_called_once_with()
 
+    @mock.patch.object(hm, 'get_engine_ring')
+    @mock.patch.object(hr.HealthRegistry, 'get_all_by_engine')
     @mock.patch.object(hr.HealthRegistry, 'claim')
     @mock.patch.object(objects.HealthRegistry, 'update')
-    def test__load_runtime_registry(self, mock_update, mock_claim):
-        mock_claim.return_value = [
+    def test__load_runtime_registry(self, mock_update, mock_claim,
+                                    mock_get_all, mock_ring):
+        ring = mock_ring.return_value
+        mock_get_all.return_value = [
             mock.Mock(cluster_id='CID1',
                       check_type=consts.NODE_STATUS_POLLING,
                       interval=12,
@@ -554,7 +658,11 @@ class TestHealthManager(base.SenlinTestCase):
         self.hm._load_runtime_registry()
 
         # assertions
-        mock_claim.assert_called_once_with(self.hm.ctx, self.hm.engine_id)
+        mock_ring.assert_called_once_with(self.hm.ctx, self.hm.engine_id)
+        mock_claim.assert_called_once_with(self.hm.ctx, self.hm.engine_id,
+                                           ring=ring)
+        mock_get_all.assert_called_once_with(self.hm.ctx, self.hm.engine_id)
+        mock_update.assert_not_called()
         mock_calls = [
             mock.call(self.hm._poll_cluster, None, None, 'CID1', 12, {})
         ]
@@ -580,6 +688,87 @@ class TestHealthManager(base.SenlinTestCase):
             },
             self.hm.registries[1])
 
+    @mock.patch.object(hm.HealthManager, '_start_check')
+    @mock.patch.object(hm.HealthManager, '_stop_check')
+    @mock.patch.object(hm, 'get_engine_ring')
+    @mock.patch.object(hr.HealthRegistry, 'get_all_by_engine')
+    @mock.patch.object(hr.HealthRegistry, 'claim')
+    @mock.patch.object(objects.HealthRegistry, 'update')
+    def test__load_runtime_registry_rebalance(self, mock_update, mock_claim,
+                                              mock_get_all, mock_ring,
+                                              mock_stop, mock_start):
+        owners = {'CID1': 'ENGINE_ID', 'CID2': 'OTHER_ENGINE'}
+        mock_ring.return_value.get_node.side_effect = owners.get
+        entry1 = {'cluster_id': 'CID1', 'enabled': True}
+        entry2 = {'cluster_id': 'CID2', 'enabled': True}
+        self.hm.rt['registries'] = [entry1, entry2]
+        # CID1 is already loaded, CID3 was handed over by another engine
+        mock_get_all.return_value = [
+            mock.Mock(cluster_id='CID1', enabled=True),
+            mock.Mock(cluster_id='CID3', check_type=consts.LIFECYCLE_EVENTS,
+                      interval=12, params={}, enabled=True),
+        ]
+        entry3 = mock.Mock()
+        mock_start.return_value = entry3
+        mock_settled = self.patchobject(self.hm, '_is_engine_settled',
+                                        return_value=True)
+
+        self.hm._load_runtime_registry()
+
+        mock_settled.assert_called_once_with('OTHER_ENGINE')
+        mock_stop.assert_called_once_with(entry2)
+        mock_update.assert_called_once_with(self.hm.ctx, 'CID2',
+                                            {'engine_id': 'OTHER_ENGINE'})
+        mock_start.assert_called_once_with({
+            'cluster_id': 'CID3',
+            'check_type': consts.LIFECYCLE_EVENTS,
+            'interval': 12,
+            'params': {},
+            'enabled': True,
+        })
+        self.assertEqual([entry1, entry3], self.hm.registries)
+
+    @mock.patch.object(hm.HealthManager, '_stop_check')
+    @mock.patch.object(hm, 'get_engine_ring')
+    @mock.patch.object(hr.HealthRegistry, 'get_all_by_engine')
+    @mock.patch.object(hr.HealthRegistry, 'claim')
+    @mock.patch.object(objects.HealthRegistry, 'update')
+    def test__load_runtime_registry_owner_not_settled(self, mock_update,
+                                                      mock_claim,
+                                                      mock_get_all,
+                                                      mock_ring, mock_stop):
+        mock_ring.return_value.get_node.return_value = 'OTHER_ENGINE'
+        entry1 = {'cluster_id': 'CID1', 'enabled': True}
+        entry2 = {'cluster_id': 'CID2', 'enabled': True}
+        self.hm.rt['registries'] = [entry1, entry2]
+        mock_get_all.return_value = []
+        mock_settled = self.patchobject(self.hm, '_is_engine_settled',
+                                        return_value=False)
+
+        self.hm._load_runtime_registry()
+
+        # the new owner is only checked once per pass
+        mock_settled.assert_called_once_with('OTHER_ENGINE')
+        mock_stop.assert_not_called()
+        mock_update.assert_not_called()
+        self.assertEqual([entry1, entry2], self.hm.registries)
+
+    @mock.patch.object(objects.Service, 'get')
+    def test__is_engine_settled(self, mock_get):
+        cfg.CONF.set_override('periodic_interval', 60)
+        now = tu.utcnow(True)
+        mock_get.return_value = mock.Mock(
+            created_at=now - datetime.timedelta(seconds=120))
+
+        self.assertTrue(self.hm._is_engine_settled('OTHER_ENGINE'))
+        mock_get.assert_called_once_with(self.hm.ctx, 'OTHER_ENGINE')
+
+        mock_get.return_value = mock.Mock(created_at=now)
+        self.assertFalse(self.hm._is_engine_settled('OTHER_ENGINE'))
+
+        mock_get.return_value = None
+        self.assertFalse(self.hm._is_engine_settled('OTHER_ENGINE'))
+
     def test__expand_url_template(self):
         url_template = 'https://abc123/foo/bar'
         node = mock.Mock()
@@ -600,24 +789,87 @@ class TestHealthManager(base.SenlinTestCase):
 
         self.assertEqual(res, expanded_url)
 
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(obj_action.Action, 'get_status')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test__wait_for_action(self, mock_rpc, mock_status, mock_sleep):
+        ctx = mock.Mock()
+        mock_status.side_effect = [consts.ACTION_READY,
+                                   consts.ACTION_RUNNING,
+                                   consts.ACTION_RUNNING,
+                                   consts.ACTION_SUCCEEDED]
+
+        res, reason = self.hm._wait_for_action(ctx, 'ACTION_ID', 60)
+
+        self.assertTrue(res)
+        self.assertEqual('', reason)
+        mock_status.assert_has_calls([mock.call(ctx, 'ACTION_ID')] * 4)
+        # the status is read from the DB with an increasing interval
+        mock_sleep.assert_has_calls([mock.call(1), mock.call(2),
+                                     mock.call(4)])
+        mock_rpc.assert_not_called()
+
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(obj_action.Action, 'get_status')
+    def test__wait_for_action_max_interval(self, mock_status, mock_sleep):
+        mock_status.side_effect = [consts.ACTION_RUNNING] * 6 + [
+            consts.ACTION_SUCCEEDED]
+
+        res, reason = self.hm._wait_for_action(mock.Mock(), 'ACTION_ID',
+                                               3600)
+
+        self.assertTrue(res)
+        mock_sleep.assert_has_calls([mock.call(1), mock.call(2),
+                                     mock.call(4), mock.call(8),
+                                     mock.call(16), mock.call(16)])
+
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(obj_action.Action, 'get_status')
+    def test__wait_for_action_failed(self, mock_status, mock_sleep):
+        mock_status.return_value = consts.ACTION_FAILED
+
+        res, reason = self.hm._wait_for_action(mock.Mock(), 'ACTION_ID', 60)
+
+        self.assertFalse(res)
+        self.assertEqual('Cluster check action failed or cancelled', reason)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(obj_action.Action, 'get_status')
+    def test__wait_for_action_not_found(self, mock_status, mock_sleep):
+        mock_status.return_value = None
+
+        res, reason = self.hm._wait_for_action(mock.Mock(), 'ACTION_ID', 60)
+
+        self.assertFalse(res)
+        self.assertEqual('Action ACTION_ID is not found', reason)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(obj_action.Action, 'get_status')
+    def test__wait_for_action_timeout(self, mock_status, mock_sleep):
+        mock_status.return_value = consts.ACTION_RUNNING
+
+        res, reason = self.hm._wait_for_action(mock.Mock(), 'ACTION_ID', 0)
+
+        self.assertFalse(res)
+        self.assertEqual('Timeout while polling cluster status', reason)
+        mock_status.assert_not_called()
+
     @mock.patch.object(hm, "_chase_up")
-    @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
     @mock.patch.object(hm.HealthManager, "_wait_for_action")
     @mock.patch.object(obj_cluster.Cluster, 'get')
     @mock.patch.object(context, 'get_service_context')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test__poll_cluster(self, mock_rpc, mock_ctx, mock_get,
-                           mock_wait, mock_nodes, mock_chase):
+                           mock_wait, mock_chase):
         x_cluster = mock.Mock(user='USER_ID', project='PROJECT_ID')
         mock_get.return_value = x_cluster
         ctx = mock.Mock()
         mock_ctx.return_value = ctx
         mock_wait.return_value = (True, "")
-        x_node = mock.Mock(id='FAKE_NODE', status="ERROR")
-        mock_nodes.return_value = [x_node]
         x_action_check = {'action': 'CHECK_ID'}
-        x_action_recover = {'action': 'RECOVER_ID'}
-        mock_rpc.side_effect = [x_action_check, x_action_recover]
+        mock_rpc.return_value = x_action_check
 
         recover_action = {'operation': 'REBUILD'}
         # do it
@@ -628,10 +880,12 @@ class TestHealthManager(base.SenlinTestCase):
                                          project_safe=False)
         mock_ctx.assert_called_once_with(user_id=x_cluster.user,
                                          project_id=x_cluster.project)
-        mock_rpc.assert_has_calls([
-            mock.call(ctx, 'cluster_check', mock.ANY),
-            mock.call(ctx, 'node_recover', mock.ANY)
-        ])
+        # the nodes are recovered by the check action itself
+        mock_rpc.assert_called_once_with(ctx, 'cluster_check', mock.ANY)
+        req = mock_rpc.call_args[0][2]
+        self.assertEqual('CLUSTER_ID', req.identity)
+        self.assertEqual({'delete_check_action': True,
+                          'recover': recover_action}, req.params)
         mock_wait.assert_called_once_with(ctx, "CHECK_ID", 456)
         mock_chase.assert_called_once_with(mock.ANY, 456)
 
@@ -701,21 +955,7 @@ class TestHealthManager(base.SenlinTestCase):
         mock_wait.assert_called_once_with(ctx, "CHECK_ID", 456)
         mock_chase.assert_called_once_with(mock.ANY, 456)
 
-    @mock.patch.object(tu, "is_older_than")
-    @mock.patch.object(hm.HealthManager, "_expand_url_template")
-    @mock.patch.object(utils, 'url_fetch')
-    @mock.patch.object(rpc_client.EngineClient, 'call')
-    def test__check_url_and_recover_node_healthy(
-            self, mock_rpc, mock_url_fetch, mock_expand_url, mock_time):
-        ctx = mock.Mock()
-        node = mock.Mock()
-        node.status = consts.NS_ACTIVE
-        mock_time.return_value = True
-        mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
-        x_action_check = {'action': 'CHECK_ID'}
-        mock_rpc.return_value = x_action_check
-        mock_url_fetch.return_value = ("Healthy because this return value "
-                                       "contains FAKE_HEALTHY_PATTERN")
+    def _url_params(self, **kwargs):
         params = {
             'poll_url': 'FAKE_POLL_URL',
             'poll_url_ssl_verify': True,
@@ -724,201 +964,203 @@ class TestHealthManager(base.SenlinTestCase):
             'poll_url_retry_interval': 1,
             'node_update_timeout': 5,
         }
+        params.update(kwargs)
+        return params
 
-        recover_action = {'operation': 'REBUILD'}
+    @mock.patch.object(tu, "is_older_than")
+    @mock.patch.object(hm.HealthManager, "_expand_url_template")
+    @mock.patch.object(utils, 'url_fetch')
+    def test__check_url_healthy(self, mock_url_fetch, mock_expand_url,
+                                mock_time):
+        node = mock.Mock(status=consts.NS_ACTIVE)
+        mock_time.return_value = True
+        mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
+        mock_url_fetch.return_value = ("Healthy because this return value "
+                                       "contains FAKE_HEALTHY_PATTERN")
+        cfg.CONF.set_override('poll_url_timeout', 3, group='health_manager')
 
-        # do it
-        res = self.hm._check_url_and_recover_node(ctx, node, recover_action,
-                                                  params)
+        res = self.hm._check_url(node, self._url_params())
 
-        self.assertIsNone(res)
-        mock_rpc.assert_not_called()
-        mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL',
-                                               verify=True)
+        self.assertFalse(res)
+        mock_url_fetch.assert_called_once_with(
+            'FAKE_EXPANDED_URL', verify=True, session=self.hm.session,
+            timeout=3)
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.HealthManager, "_expand_url_template")
     @mock.patch.object(utils, 'url_fetch')
-    @mock.patch.object(rpc_client.EngineClient, 'call')
-    def test__check_url_and_recover_node_unhealthy_inactive(
-            self, mock_rpc, mock_url_fetch, mock_expand_url, mock_time):
-        ctx = mock.Mock()
-        node = mock.Mock()
-        node.status = consts.NS_RECOVERING
+    def test__check_url_fetch_error(self, mock_url_fetch, mock_expand_url,
+                                    mock_time):
+        node = mock.Mock(status=consts.NS_ACTIVE)
+        mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
+        mock_url_fetch.side_effect = utils.URLFetchError('boom')
+
+        res = self.hm._check_url(node, self._url_params())
+
+        self.assertFalse(res)
+        mock_time.assert_not_called()
+
+    @mock.patch.object(tu, "is_older_than")
+    @mock.patch.object(hm.HealthManager, "_expand_url_template")
+    @mock.patch.object(utils, 'url_fetch')
+    def test__check_url_unhealthy_inactive(self, mock_url_fetch,
+                                           mock_expand_url, mock_time):
+        node = mock.Mock(status=consts.NS_RECOVERING)
         mock_time.return_value = True
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
-        x_action_check = {'action': 'CHECK_ID'}
-        mock_rpc.return_value = x_action_check
         mock_url_fetch.return_value = ""
-        params = {
-            'poll_url': 'FAKE_POLL_URL',
-            'poll_url_ssl_verify': True,
-            'poll_url_healthy_response': 'FAKE_HEALTHY_PATTERN',
-            'poll_url_retry_limit': 2,
-            'poll_url_retry_interval': 1,
-            'node_update_timeout': 5,
-        }
 
-        recover_action = {'operation': 'REBUILD'}
+        res = self.hm._check_url(node, self._url_params())
 
-        # do it
-        res = self.hm._check_url_and_recover_node(ctx, node, recover_action,
-                                                  params)
-
-        self.assertIsNone(res)
-        mock_rpc.assert_not_called()
-        mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL',
-                                               verify=True)
+        self.assertFalse(res)
+        mock_time.assert_not_called()
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.HealthManager, "_expand_url_template")
     @mock.patch.object(utils, 'url_fetch')
-    @mock.patch.object(rpc_client.EngineClient, 'call')
-    def test__check_url_and_recover_node_unhealthy_update_timeout(
-            self, mock_rpc, mock_url_fetch, mock_expand_url, mock_time):
-        ctx = mock.Mock()
-        node = mock.Mock()
-        node.id = 'FAKE_NODE_ID'
-        node.updated_at = 'FAKE_UPDATE_TIME'
-        node.status = consts.NS_ACTIVE
+    def test__check_url_unhealthy_update_timeout(self, mock_url_fetch,
+                                                 mock_expand_url, mock_time):
+        node = mock.Mock(id='FAKE_NODE_ID', updated_at='FAKE_UPDATE_TIME',
+                         status=consts.NS_ACTIVE)
         mock_time.return_value = False
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
-        x_action_check = {'action': 'CHECK_ID'}
-        mock_rpc.return_value = x_action_check
         mock_url_fetch.return_value = ""
-        params = {
-            'poll_url': 'FAKE_POLL_URL',
-            'poll_url_ssl_verify': True,
-            'poll_url_healthy_response': 'FAKE_HEALTHY_PATTERN',
-            'poll_url_retry_limit': 2,
-            'poll_url_retry_interval': 1,
-            'node_update_timeout': 5,
-        }
 
-        recover_action = {'operation': 'REBUILD'}
+        res = self.hm._check_url(node, self._url_params())
 
-        # do it
-        res = self.hm._check_url_and_recover_node(ctx, node, recover_action,
-                                                  params)
-
-        self.assertIsNone(res)
-        mock_rpc.assert_not_called()
-        mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL',
-                                               verify=True)
+        self.assertFalse(res)
+        mock_time.assert_called_once_with('FAKE_UPDATE_TIME', 5)
 
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.HealthManager, "_expand_url_template")
     @mock.patch.object(utils, 'url_fetch')
-    @mock.patch.object(rpc_client.EngineClient, 'call')
-    def test__check_url_and_recover_node_unhealthy_init_timeout(
-            self, mock_rpc, mock_url_fetch, mock_expand_url, mock_time):
-        ctx = mock.Mock()
-        node = mock.Mock()
-        node.id = 'FAKE_NODE_ID'
-        node.updated_at = None
-        node.init_at = 'FAKE_INIT_TIME'
-        node.status = consts.NS_ACTIVE
+    def test__check_url_unhealthy_init_timeout(self, mock_url_fetch,
+                                               mock_expand_url, mock_time):
+        node = mock.Mock(id='FAKE_NODE_ID', updated_at=None,
+                         init_at='FAKE_INIT_TIME', status=consts.NS_ACTIVE)
         mock_time.return_value = False
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
-        x_action_check = {'action': 'CHECK_ID'}
-        mock_rpc.return_value = x_action_check
         mock_url_fetch.return_value = ""
-        params = {
-            'poll_url': 'FAKE_POLL_URL',
-            'poll_url_ssl_verify': True,
-            'poll_url_healthy_response': 'FAKE_HEALTHY_PATTERN',
-            'poll_url_retry_limit': 2,
-            'poll_url_retry_interval': 1,
-            'node_update_timeout': 5,
-        }
-
-        recover_action = {'operation': 'REBUILD'}
 
-        # do it
-        res = self.hm._check_url_and_recover_node(ctx, node, recover_action,
-                                                  params)
+        res = self.hm._check_url(node, self._url_params())
 
-        self.assertIsNone(res)
-        mock_rpc.assert_not_called()
-        mock_url_fetch.assert_called_once_with('FAKE_EXPANDED_URL',
-                                               verify=True)
+        self.assertFalse(res)
+        mock_time.assert_called_once_with('FAKE_INIT_TIME', 5)
 
-    @mock.patch.object(time, "sleep")
     @mock.patch.object(tu, "is_older_than")
     @mock.patch.object(hm.HealthManager, "_expand_url_template")
     @mock.patch.object(utils, 'url_fetch')
-    @mock.patch.object(rpc_client.EngineClient, 'call')
-    def test__check_url_and_recover_node_unhealthy(self,
-                                                   mock_rpc, mock_url_fetch,
-                                                   mock_expand_url, mock_time,
-                                                   mock_sleep):
-        ctx = mock.Mock()
-        node = mock.Mock()
-        node.status = consts.NS_ACTIVE
-        node.id = 'FAKE_ID'
+    def test__check_url_unhealthy(self, mock_url_fetch, mock_expand_url,
+                                  mock_time):
+        node = mock.Mock(id='FAKE_ID', status=consts.NS_ACTIVE)
         mock_time.return_value = True
         mock_expand_url.return_value = 'FAKE_EXPANDED_URL'
-        x_action_check = {'action': 'CHECK_ID'}
-        mock_rpc.return_value = x_action_check
         mock_url_fetch.return_value = ""
-        params = {
-            'poll_url': 'FAKE_POLL_URL',
-            'poll_url_ssl_verify': False,
-            'poll_url_healthy_response': 'FAKE_HEALTHY_PATTERN',
-            'poll_url_retry_limit': 2,
-            'poll_url_retry_interval': 1,
-            'node_update_timeout': 5,
-        }
 
+        res = self.hm._check_url(node, self._url_params(
+            poll_url_ssl_verify=False))
+
+        self.assertTrue(res)
+        mock_url_fetch.assert_called_once_with(
+            'FAKE_EXPANDED_URL', verify=False, session=self.hm.session,
+            timeout=10)
+
+    @mock.patch.object(objects, 'NodeRecoverRequest')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test__recover_node(self, mock_rpc, mock_req):
+        ctx = mock.Mock()
+        node = mock.Mock(id='FAKE_ID')
+        mock_rpc.return_value = {'action': 'RECOVER_ID'}
         recover_action = {'operation': 'REBUILD'}
 
-        # do it
-        res = self.hm._check_url_and_recover_node(ctx, node, recover_action,
-                                                  params)
-
-        self.assertEqual(mock_rpc.return_value, res)
-        mock_rpc.assert_called_once_with(ctx, 'node_recover', mock.ANY)
-        mock_url_fetch.assert_has_calls(
-            [
-                mock.call('FAKE_EXPANDED_URL', verify=False),
-                mock.call('FAKE_EXPANDED_URL', verify=False)
-            ]
-        )
-        mock_sleep.assert_has_calls([mock.call(1), mock.call(1)])
+        res = self.hm._recover_node(ctx, node, recover_action)
 
-    @mock.patch.object(hm, "_chase_up")
-    @mock.patch.object(hm.HealthManager, "_check_url_and_recover_node")
+        self.assertEqual({'action': 'RECOVER_ID'}, res)
+        mock_req.assert_called_once_with(identity='FAKE_ID',
+                                         params=recover_action)
+        mock_rpc.assert_called_once_with(ctx, 'node_recover',
+                                         mock_req.return_value)
+
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test__recover_node_failed(self, mock_rpc):
+        node = mock.Mock(id='FAKE_ID')
+        mock_rpc.side_effect = Exception('boom')
+
+        res = self.hm._recover_node(mock.Mock(), node, {})
+
+        self.assertIsNone(res)
+
+    @mock.patch.object(hm.HealthManager, "_record_poll")
+    @mock.patch.object(eventlet, "sleep")
+    @mock.patch.object(hm.HealthManager, "_recover_node")
+    @mock.patch.object(hm.HealthManager, "_check_url")
     @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
     @mock.patch.object(hm.HealthManager, "_wait_for_action")
     @mock.patch.object(obj_cluster.Cluster, 'get')
     @mock.patch.object(context, 'get_service_context')
     def test__poll_url(self, mock_ctx, mock_get, mock_wait, mock_nodes,
-                       mock_check_url, mock_chase):
+                       mock_check_url, mock_recover, mock_sleep,
+                       mock_record):
         x_cluster = mock.Mock(user='USER_ID', project='PROJECT_ID')
         mock_get.return_value = x_cluster
         ctx = mock.Mock()
         mock_ctx.return_value = ctx
         mock_wait.return_value = (True, "")
-        x_node = mock.Mock(id='FAKE_NODE', status="ERROR")
-        mock_nodes.return_value = [x_node]
-        x_action_recover = {'action': 'RECOVER_ID'}
-        mock_check_url.return_value = x_action_recover
+        x_node1 = mock.Mock(id='NODE1')
+        x_node2 = mock.Mock(id='NODE2')
+        mock_nodes.return_value = [x_node1, x_node2]
+        # node1 is down in both attempts, node2 is up on its second attempt
+        down = {'NODE1': [True, True], 'NODE2': [True, False]}
+        mock_check_url.side_effect = lambda n, p: down[n.id].pop(0)
+        mock_recover.return_value = {'action': 'RECOVER_ID'}
 
         recover_action = {'operation': 'REBUILD'}
-        params = {}
+        params = self._url_params()
 
         # do it
         res = self.hm._poll_url('CLUSTER_ID', 456, recover_action, params)
 
-        self.assertEqual(mock_chase.return_value, res)
+        self.assertEqual(mock_record.return_value, res)
         mock_get.assert_called_once_with(self.hm.ctx, 'CLUSTER_ID',
                                          project_safe=False)
         mock_ctx.assert_called_once_with(user_id=x_cluster.user,
                                          project_id=x_cluster.project)
-        mock_check_url.assert_called_once_with(ctx, x_node,
-                                               recover_action, params)
+        mock_check_url.assert_has_calls([
+            mock.call(x_node1, params), mock.call(x_node1, params),
+            mock.call(x_node2, params), mock.call(x_node2, params)],
+            any_order=True)
+        # each node waits out its own retry interval
+        mock_sleep.assert_has_calls([mock.call(1), mock.call(1)])
+        self.assertEqual(2, mock_sleep.call_count)
+        mock_recover.assert_called_once_with(ctx, x_node1, recover_action)
         mock_wait.assert_called_once_with(ctx, "RECOVER_ID", 456)
-        mock_chase.assert_called_once_with(mock.ANY, 456)
+        mock_record.assert_called_once_with('CLUSTER_ID', mock.ANY, 456)
+
+    @mock.patch.object(hm.HealthManager, "_check_url")
+    @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
+    @mock.patch.object(obj_cluster.Cluster, 'get')
+    @mock.patch.object(context, 'get_service_context')
+    def test__poll_url_concurrent(self, mock_ctx, mock_get, mock_nodes,
+                                  mock_check_url):
+        cfg.CONF.set_override('poll_url_concurrency', 4,
+                              group='health_manager')
+        mock_nodes.return_value = [mock.Mock(id=i) for i in range(8)]
+        running = []
+        peak = []
+
+        def _check(node, params):
+            running.append(node)
+            peak.append(len(running))
+            eventlet.sleep(0)
+            running.remove(node)
+            return False
+
+        mock_check_url.side_effect = _check
+
+        self.hm._poll_url('CLUSTER_ID', 456, {}, self._url_params())
+
+        self.assertEqual(8, mock_check_url.call_count)
+        self.assertEqual(4, max(peak))
 
     @mock.patch.object(hm, "_chase_up")
     @mock.patch.object(obj_cluster.Cluster, 'get')
@@ -937,47 +1179,52 @@ class TestHealthManager(base.SenlinTestCase):
         mock_ctx.assert_not_called()
         mock_chase.assert_called_once_with(mock.ANY, 123)
 
-    @mock.patch.object(hm, "_chase_up")
-    @mock.patch.object(hm.HealthManager, "_check_url_and_recover_node")
+    @mock.patch.object(hm.HealthManager, "_record_poll")
+    @mock.patch.object(hm.HealthManager, "_recover_node")
+    @mock.patch.object(hm.HealthManager, "_check_url")
     @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
     @mock.patch.object(hm.HealthManager, "_wait_for_action")
     @mock.patch.object(obj_cluster.Cluster, 'get')
     @mock.patch.object(context, 'get_service_context')
     def test__poll_url_no_action(self, mock_ctx, mock_get, mock_wait,
-                                 mock_nodes, mock_check_url, mock_chase):
+                                 mock_nodes, mock_check_url, mock_recover,
+                                 mock_record):
         x_cluster = mock.Mock(user='USER_ID', project='PROJECT_ID')
         mock_get.return_value = x_cluster
         ctx = mock.Mock()
         mock_ctx.return_value = ctx
-        mock_wait.return_value = (True, "")
         x_node = mock.Mock(id='FAKE_NODE', status="ERROR")
         mock_nodes.return_value = [x_node]
-        mock_check_url.return_value = None
+        mock_check_url.return_value = False
 
         recover_action = {'operation': 'REBUILD'}
-        params = {}
+        params = self._url_params()
 
         # do it
         res = self.hm._poll_url('CLUSTER_ID', 456, recover_action, params)
 
-        self.assertEqual(mock_chase.return_value, res)
-        mock_get.assert_called_once_with(self.hm.ctx, 'CLUSTER_ID',
-                                         project_safe=False)
-        mock_ctx.assert_called_once_with(user_id=x_cluster.user,
-                                         project_id=x_cluster.project)
-        mock_check_url.assert_called_once_with(ctx, x_node,
-                                               recover_action, params)
+        self.assertEqual(mock_record.return_value, res)
+        mock_check_url.assert_called_once_with(x_node, params)
+        mock_recover.assert_not_called()
         mock_wait.assert_not_called()
-        mock_chase.assert_called_once_with(mock.ANY, 456)
+        mock_record.assert_called_once_with('CLUSTER_ID', mock.ANY, 456)
+
+    @mock.patch.object(hm, "_chase_up")
+    def test__record_poll(self, mock_chase):
+        start = tu.utcnow(True)
+
+        res = self.hm._record_poll('CLUSTER_ID', start, 60)
+
+        self.assertEqual(mock_chase.return_value, res)
+        mock_chase.assert_called_once_with(start, 60)
 
+    @mock.patch.object(hm, 'ListenerProc')
     @mock.patch.object(obj_profile.Profile, 'get')
     @mock.patch.object(obj_cluster.Cluster, 'get')
-    def test__add_listener_nova(self, mock_cluster, mock_profile):
+    def test__add_listener_nova(self, mock_cluster, mock_profile,
+                                mock_proc):
         cfg.CONF.set_override('nova_control_exchange', 'FAKE_NOVA_EXCHANGE',
                               group='health_manager')
-        x_listener = mock.Mock()
-        mock_add_thread = self.patchobject(self.hm.TG, 'add_thread',
-                                           return_value=x_listener)
         x_cluster = mock.Mock(project='PROJECT_ID', profile_id='PROFILE_ID')
         mock_cluster.return_value = x_cluster
         x_profile = mock.Mock(type='os.nova.server-1.0')
@@ -988,23 +1235,28 @@ class TestHealthManager(base.SenlinTestCase):
         res = self.hm._add_listener('CLUSTER_ID', recover_action)
 
         # assertions
-        self.assertEqual(x_listener, res)
+        self.assertIsInstance(res, hm.NotificationRouter)
+        self.assertEqual('FAKE_NOVA_EXCHANGE', res.exchange)
+        self.assertEqual(hm.NovaNotificationEndpoint, res.endpoint_class)
+        self.assertEqual(mock_proc.return_value, res.listener)
+        self.assertEqual({'FAKE_NOVA_EXCHANGE': res}, self.hm.routers)
+        endpoint = res.endpoints['CLUSTER_ID']
+        self.assertEqual('PROJECT_ID', endpoint.project_id)
+        self.assertEqual(recover_action, endpoint.recover_action)
+        self.assertEqual(self.hm.aggregator, endpoint.aggregator)
         mock_cluster.assert_called_once_with(self.hm.ctx, 'CLUSTER_ID',
                                              project_safe=False)
         mock_profile.assert_called_once_with(self.hm.ctx, 'PROFILE_ID',
                                              project_safe=False)
-        mock_add_thread.assert_called_once_with(
-            hm.ListenerProc, 'FAKE_NOVA_EXCHANGE', 'PROJECT_ID', 'CLUSTER_ID',
-            recover_action)
+        mock_proc.assert_called_once_with('FAKE_NOVA_EXCHANGE', res)
 
+    @mock.patch.object(hm, 'ListenerProc')
     @mock.patch.object(obj_profile.Profile, 'get')
     @mock.patch.object(obj_cluster.Cluster, 'get')
-    def test__add_listener_heat(self, mock_cluster, mock_profile):
+    def test__add_listener_heat(self, mock_cluster, mock_profile,
+                                mock_proc):
         cfg.CONF.set_override('heat_control_exchange', 'FAKE_HEAT_EXCHANGE',
                               group='health_manager')
-        x_listener = mock.Mock()
-        mock_add_thread = self.patchobject(self.hm.TG, 'add_thread',
-                                           return_value=x_listener)
         x_cluster = mock.Mock(project='PROJECT_ID', profile_id='PROFILE_ID')
         mock_cluster.return_value = x_cluster
         x_profile = mock.Mock(type='os.heat.stack-1.0')
@@ -1015,19 +1267,59 @@ class TestHealthManager(base.SenlinTestCase):
         res = self.hm._add_listener('CLUSTER_ID', recover_action)
 
         # assertions
-        self.assertEqual(x_listener, res)
-        mock_cluster.assert_called_once_with(self.hm.ctx, 'CLUSTER_ID',
-                                             project_safe=False)
-        mock_profile.assert_called_once_with(self.hm.ctx, 'PROFILE_ID',
-                                             project_safe=False)
-        mock_add_thread.assert_called_once_with(
-            hm.ListenerProc, 'FAKE_HEAT_EXCHANGE', 'PROJECT_ID', 'CLUSTER_ID',
-            recover_action)
+        self.assertIsInstance(res, hm.NotificationRouter)
+        self.assertEqual('FAKE_HEAT_EXCHANGE', res.exchange)
+        self.assertEqual(hm.HeatNotificationEndpoint, res.endpoint_class)
+        self.assertIn('CLUSTER_ID', res.endpoints)
+        mock_proc.assert_called_once_with('FAKE_HEAT_EXCHANGE', res)
 
+    @mock.patch.object(hm, 'ListenerProc')
     @mock.patch.object(obj_profile.Profile, 'get')
     @mock.patch.object(obj_cluster.Cluster, 'get')
-    def test__add_listener_other_types(self, mock_cluster, mock_profile):
-        mock_add_thread = self.patchobject(self.hm.TG, 'add_thread')
+    def test__add_listener_shared(self, mock_cluster, mock_profile,
+                                  mock_proc):
+        mock_cluster.side_effect = [
+            mock.Mock(project='PROJECT1', profile_id='PROFILE_ID'),
+            mock.Mock(project='PROJECT2', profile_id='PROFILE_ID'),
+        ]
+        mock_profile.return_value = mock.Mock(type='os.nova.server-1.0')
+
+        res1 = self.hm._add_listener('CLUSTER1', {'operation': 'REBUILD'})
+        res2 = self.hm._add_listener('CLUSTER2', {'operation': 'REBOOT'})
+
+        # a single listener is started for the exchange
+        self.assertIs(res1, res2)
+        self.assertEqual(set(['CLUSTER1', 'CLUSTER2']),
+                         set(res1.endpoints))
+        self.assertEqual(1, len(self.hm.routers))
+        mock_proc.assert_called_once_with('nova', res1)
+
+    def test__remove_listener(self):
+        x_listener = mock.Mock()
+        router = hm.NotificationRouter('nova', hm.NovaNotificationEndpoint,
+                                       self.hm.aggregator)
+        router.listener = x_listener
+        router.endpoints = {'CLUSTER1': mock.Mock(), 'CLUSTER2': mock.Mock()}
+        self.hm.routers = {'nova': router}
+
+        self.hm._remove_listener('CLUSTER1', router)
+
+        self.assertEqual(['CLUSTER2'], list(router.endpoints))
+        self.assertEqual({'nova': router}, self.hm.routers)
+        x_listener.stop.assert_not_called()
+
+        self.hm._remove_listener('CLUSTER2', router)
+
+        self.assertEqual({}, router.endpoints)
+        self.assertEqual({}, self.hm.routers)
+        x_listener.stop.assert_called_once_with()
+        x_listener.wait.assert_called_once_with()
+
+    @mock.patch.object(hm, 'ListenerProc')
+    @mock.patch.object(obj_profile.Profile, 'get')
+    @mock.patch.object(obj_cluster.Cluster, 'get')
+    def test__add_listener_other_types(self, mock_cluster, mock_profile,
+                                       mock_proc):
         x_cluster = mock.Mock(project='PROJECT_ID', profile_id='PROFILE_ID')
         mock_cluster.return_value = x_cluster
         x_profile = mock.Mock(type='other.types-1.0')
@@ -1043,12 +1335,13 @@ class TestHealthManager(base.SenlinTestCase):
                                              project_safe=False)
         mock_profile.assert_called_once_with(self.hm.ctx, 'PROFILE_ID',
                                              project_safe=False)
-        self.assertFalse(mock_add_thread.called)
+        mock_proc.assert_not_called()
+        self.assertEqual({}, self.hm.routers)
 
+    @mock.patch.object(hm, 'ListenerProc')
     @mock.patch.object(obj_cluster.Cluster, 'get')
-    def test__add_listener_cluster_not_found(self, mock_get):
+    def test__add_listener_cluster_not_found(self, mock_get, mock_proc):
         mock_get.return_value = None
-        mock_add_thread = self.patchobject(self.hm.TG, 'add_thread')
 
         recover_action = {'operation': 'REBUILD'}
         # do it
@@ -1058,7 +1351,7 @@ class TestHealthManager(base.SenlinTestCase):
         self.assertIsNone(res)
         mock_get.assert_called_once_with(self.hm.ctx, 'CLUSTER_ID',
                                          project_safe=False)
-        self.assertEqual(0, mock_add_thread.call_count)
+        mock_proc.assert_not_called()
 
     def test__start_check_for_polling(self):
         x_timer = mock.Mock()
@@ -1164,17 +1457,16 @@ class TestHealthManager(base.SenlinTestCase):
         x_timer.stop.assert_called_once_with()
         mock_timer_done.assert_called_once_with(x_timer)
 
-    def test__stop_check_with_listener(self):
-        x_thread = mock.Mock()
-        entry = {'listener': x_thread}
-        mock_thread_done = self.patchobject(self.hm.TG, 'thread_done')
+    @mock.patch.object(hm.HealthManager, '_remove_listener')
+    def test__stop_check_with_listener(self, mock_remove):
+        x_router = mock.Mock()
+        entry = {'cluster_id': 'CLUSTER_ID', 'listener': x_router}
 
         # do it
         res = self.hm._stop_check(entry)
 
         self.assertIsNone(res)
-        x_thread.stop.assert_called_once_with()
-        mock_thread_done.assert_called_once_with(x_thread)
+        mock_remove.assert_called_once_with('CLUSTER_ID', x_router)
 
     @mock.patch('oslo_messaging.Target')
     def test_start(self, mock_target):
@@ -1200,6 +1492,22 @@ class TestHealthManager(base.SenlinTestCase):
         mock_add_timer.assert_called_once_with(
             cfg.CONF.periodic_interval, self.hm._dummy_task)
 
+    @mock.patch('oslo_service.service.Service.stop')
+    def test_stop(self, mock_stop):
+        self.hm.TG = mock.Mock()
+        self.hm.aggregator = mock.Mock()
+        router = mock.Mock()
+        self.hm.routers = {'nova': router}
+
+        self.hm.stop()
+
+        self.hm.TG.stop_timers.assert_called_once_with()
+        router.listener.stop.assert_called_once_with()
+        router.listener.wait.assert_called_once_with()
+        self.assertEqual({}, self.hm.routers)
+        self.hm.aggregator.flush_all.assert_called_once_with()
+        mock_stop.assert_called_once_with()
+
     @mock.patch.object(hr.HealthRegistry, 'create')
     def test_register_cluster(self, mock_reg_create):
         ctx = mock.Mock()
@@ -12,6 +12,7 @@
 
 import mock
 from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import six
 
@@ -103,6 +104,45 @@ class TestNode(base.SenlinTestCase):
 
         self.assertEqual(node_id, new_node_id)
 
+    def test_node_store_batch(self):
+        node1 = nodem.Node('node1', PROFILE_ID, CLUSTER_ID, index=1,
+                           user=self.context.user_id,
+                           project=self.context.project_id)
+        node2 = nodem.Node('node2', PROFILE_ID, CLUSTER_ID, index=2,
+                           user=self.context.user_id,
+                           project=self.context.project_id)
+
+        node_ids = nodem.Node.store_batch(self.context, [node1, node2])
+
+        self.assertEqual([node1.id, node2.id], node_ids)
+        for node, name, index in [(node1, 'node1', 1), (node2, 'node2', 2)]:
+            node_info = node_obj.Node.get(self.context, node.id)
+            self.assertEqual(name, node_info.name)
+            self.assertEqual(CLUSTER_ID, node_info.cluster_id)
+            self.assertEqual(index, node_info.index)
+            self.assertEqual('INIT', node_info.status)
+            self.assertIsNotNone(node_info.init_at)
+            self.assertEqual(PROFILE_ID, node.rt['profile'].id)
+
+    @mock.patch.object(pb.Profile, 'load')
+    def test_node_store_batch_profile_loaded_once(self, mock_load):
+        profile = mock.Mock()
+        mock_load.return_value = profile
+        nodes = [nodem.Node('node%s' % i, PROFILE_ID, CLUSTER_ID, index=i,
+                            user=self.context.user_id,
+                            project=self.context.project_id)
+                 for i in range(3)]
+
+        nodem.Node.store_batch(self.context, nodes)
+
+        mock_load.assert_called_once_with(self.context, profile_id=PROFILE_ID,
+                                          project_safe=False)
+        for node in nodes:
+            self.assertEqual({'profile': profile}, node.rt)
+
+    def test_node_store_batch_empty(self):
+        self.assertEqual([], nodem.Node.store_batch(self.context, []))
+
     def test_node_load(self):
         ex = self.assertRaises(exception.ResourceNotFound,
                                nodem.Node.load,
@@ -562,6 +602,93 @@ class TestNode(base.SenlinTestCase):
             consts.NS_ERROR,
             "Failed in checking server '%s': failed get." % node.physical_id)
 
+    @mock.patch.object(nodem.Node, 'store_check_results')
+    @mock.patch.object(pb.Profile, 'check_objects')
+    def test_node_check_batch(self, mock_check, mock_store):
+        nodes = [mock.Mock(), mock.Mock()]
+        results = {'NODE_1': True, 'NODE_2': False}
+        mock_check.return_value = results
+
+        res = nodem.Node.check_batch(self.context, nodes)
+
+        self.assertEqual(results, res)
+        mock_check.assert_called_once_with(self.context, nodes)
+        mock_store.assert_called_once_with(self.context, nodes, results)
+
+    @mock.patch.object(timeutils, 'utcnow')
+    @mock.patch.object(node_obj.Node, 'update_status_batch')
+    def test_node_store_check_results(self, mock_update, mock_now):
+        mock_now.return_value = 'NOW'
+        node1 = nodem.Node('node1', PROFILE_ID, '', id='NODE_1',
+                           physical_id='SERVER_1', status=consts.NS_ACTIVE,
+                           status_reason='Check: Node is ACTIVE.')
+        node2 = nodem.Node('node2', PROFILE_ID, '', id='NODE_2',
+                           physical_id='SERVER_2', status=consts.NS_ACTIVE,
+                           status_reason='Check: Node is ACTIVE.')
+        node3 = nodem.Node('node3', PROFILE_ID, '', id='NODE_3',
+                           physical_id='SERVER_3', status=consts.NS_ERROR,
+                           status_reason='Creation failed.')
+        node4 = nodem.Node('node4', PROFILE_ID, '', id='NODE_4',
+                           status=consts.NS_ERROR)
+        node5 = nodem.Node('node5', PROFILE_ID, '', id='NODE_5',
+                           physical_id='SERVER_5', status=consts.NS_ERROR)
+        nodes = [node1, node2, node3, node4, node5]
+        results = {'NODE_1': True, 'NODE_2': False, 'NODE_3': True,
+                   'NODE_4': False}
+
+        nodem.Node.store_check_results(self.context, nodes, results)
+
+        # only the nodes whose status changes are updated
+        mock_update.assert_called_once_with(
+            self.context,
+            {'NODE_2': (consts.NS_ERROR, 'Check: Node is not ACTIVE.'),
+             'NODE_3': (consts.NS_ACTIVE, 'Check: Node is ACTIVE.')},
+            'NOW')
+        self.assertEqual(consts.NS_ERROR, node2.status)
+        self.assertEqual('Check: Node is not ACTIVE.', node2.status_reason)
+        self.assertEqual('NOW', node2.updated_at)
+        self.assertEqual(consts.NS_ACTIVE, node3.status)
+        self.assertEqual(consts.NS_ERROR, node5.status)
+
+    @mock.patch.object(timeutils, 'utcnow')
+    @mock.patch.object(nodem.Node, 'set_status')
+    @mock.patch.object(node_obj.Node, 'update_status_batch')
+    def test_node_store_check_results_exception(self, mock_update,
+                                                mock_status, mock_now):
+        mock_now.return_value = 'NOW'
+        node1 = nodem.Node('node1', PROFILE_ID, '', id='NODE_1',
+                           physical_id='SERVER_1', status=consts.NS_ACTIVE)
+        node2 = nodem.Node('node2', PROFILE_ID, '', id='NODE_2',
+                           physical_id='SERVER_2', status=consts.NS_ACTIVE)
+        err1 = exception.EServerNotFound(type='server', id='SERVER_1',
+                                         message='No Server found')
+        err2 = exception.EResourceOperation(op='checking', type='server',
+                                            id='SERVER_2', message='Boom')
+        results = {'NODE_1': err1, 'NODE_2': err2}
+
+        nodem.Node.store_check_results(self.context, [node1, node2], results)
+
+        mock_status.assert_called_once_with(
+            self.context, consts.NS_ERROR,
+            six.text_type(err1), physical_id=None)
+        mock_update.assert_called_once_with(
+            self.context,
+            {'NODE_2': (consts.NS_ERROR,
+                        "Failed in checking server 'SERVER_2': Boom.")},
+            'NOW')
+
+    @mock.patch.object(nodem.Node, 'set_status')
+    @mock.patch.object(pb.Profile, 'check_objects')
+    def test_node_check_batch_not_supported(self, mock_check, mock_status):
+        node = nodem.Node('node1', PROFILE_ID, '', id='NODE_1',
+                          physical_id='SERVER_1')
+        mock_check.return_value = None
+
+        res = nodem.Node.check_batch(self.context, [node])
+
+        self.assertIsNone(res)
+        self.assertEqual(0, mock_status.call_count)
+
     def test_node_check_no_physical_id(self):
         node = nodem.Node('node1', PROFILE_ID, '')
 
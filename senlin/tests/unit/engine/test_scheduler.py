@@ -16,12 +16,23 @@ from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_service import threadgroup
 
+from senlin.common import consts
 from senlin.db import api as db_api
 from senlin.engine.actions import base as actionm
 from senlin.engine import scheduler
+from senlin.objects import action as ao
+from senlin.objects import event as eo
 from senlin.tests.unit.common import base
 
 
+def _candidate(action_id, project='PROJECT', cluster_id='CLUSTER',
+               priority=consts.ACTION_PRIORITY_LOW,
+               cause=consts.CAUSE_DERIVED, action=consts.NODE_CREATE):
+    return mock.Mock(id=action_id, project=project, cluster_id=cluster_id,
+                     target='NODE_' + action_id, priority=priority,
+                     cause=cause, action=action)
+
+
 class DummyThread(object):
 
     def __init__(self, function, *args, **kwargs):
@@ -72,6 +83,72 @@ class SchedulerTest(base.SenlinTestCase):
             cfg.CONF.periodic_interval,
             tgm._service_task)
 
+    def test_create_with_event_retention(self):
+        cfg.CONF.set_override('event_retention_days', 7)
+        cfg.CONF.set_override('event_purge_interval', 600)
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+
+        mock_group.add_timer.assert_has_calls([
+            mock.call(cfg.CONF.periodic_interval, tgm._service_task),
+            mock.call(600, tgm._purge_events),
+        ])
+
+    @mock.patch.object(eo.Event, 'purge')
+    def test_purge_events(self, mock_purge):
+        cfg.CONF.set_override('event_retention_days', 7)
+        mock_purge.return_value = 3
+        tgm = scheduler.ThreadGroupManager()
+
+        tgm._purge_events()
+
+        mock_purge.assert_called_once_with(granularity='days', age=7)
+
+    @mock.patch.object(eo.Event, 'purge')
+    def test_purge_events_failed(self, mock_purge):
+        mock_purge.side_effect = Exception('boom')
+        tgm = scheduler.ThreadGroupManager()
+
+        res = tgm._purge_events()
+
+        self.assertIsNone(res)
+        self.assertEqual(1, mock_purge.call_count)
+
+    def test_create_with_action_retention(self):
+        cfg.CONF.set_override('action_retention_days', 7)
+        cfg.CONF.set_override('action_purge_interval', 600)
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+
+        mock_group.add_timer.assert_has_calls([
+            mock.call(cfg.CONF.periodic_interval, tgm._service_task),
+            mock.call(600, tgm._purge_actions),
+        ])
+
+    @mock.patch.object(ao.Action, 'purge')
+    def test_purge_actions(self, mock_purge):
+        cfg.CONF.set_override('action_retention_days', 7)
+        mock_purge.return_value = 3
+        tgm = scheduler.ThreadGroupManager()
+
+        tgm._purge_actions()
+
+        mock_purge.assert_called_once_with(granularity='days', age=7)
+
+    @mock.patch.object(ao.Action, 'purge')
+    def test_purge_actions_failed(self, mock_purge):
+        mock_purge.side_effect = Exception('boom')
+        tgm = scheduler.ThreadGroupManager()
+
+        res = tgm._purge_actions()
+
+        self.assertIsNone(res)
+        self.assertEqual(1, mock_purge.call_count)
+
     def test_start(self):
         def f():
             pass
@@ -87,16 +164,15 @@ class SchedulerTest(base.SenlinTestCase):
             oslo_context.get_current(),
             None, f)
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_get_all_ready')
     @mock.patch.object(db_api, 'action_acquire')
-    def test_start_action(self, mock_action_acquire,
-                          mock_action_acquire_1st):
+    def test_start_action(self, mock_action_acquire, mock_get_ready):
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
         action = mock.Mock()
         action.id = '0123'
         mock_action_acquire.return_value = action
-        mock_action_acquire_1st.return_value = None
+        mock_get_ready.return_value = []
 
         tgm = scheduler.ThreadGroupManager()
         tgm.start_action('4567', '0123')
@@ -107,12 +183,17 @@ class SchedulerTest(base.SenlinTestCase):
             None, actionm.ActionProc,
             tgm.db_session, '0123')
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
-    def test_start_action_no_action_id(self, mock_acquire_action):
+    @mock.patch.object(scheduler, 'wallclock')
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_no_action_id(self, mock_get_ready,
+                                       mock_acquire_batch, mock_clock):
+        mock_clock.return_value = 12345
+        candidate = _candidate('0123', cause=consts.CAUSE_RPC)
+        mock_get_ready.return_value = [candidate]
         mock_action = mock.Mock()
         mock_action.id = '0123'
-        mock_action.action = 'CLUSTER_CREATE'
-        mock_acquire_action.side_effect = [mock_action, None]
+        mock_acquire_batch.return_value = [mock_action]
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
@@ -124,81 +205,198 @@ class SchedulerTest(base.SenlinTestCase):
             oslo_context.get_current(),
             None, actionm.ActionProc,
             tgm.db_session, '0123')
+        mock_get_ready.assert_called_once_with(
+            tgm.db_session,
+            limit_per_project=cfg.CONF.max_actions_per_acquire)
+        mock_acquire_batch.assert_called_once_with(
+            tgm.db_session, '4567', 12345, limit=1, action_ids=['0123'])
+        # actions requested by users are not tracked
+        self.assertEqual({}, tgm._running)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_multiple_acquires(self, mock_get_ready,
+                                            mock_acquire_batch):
+        cfg.CONF.set_override('max_actions_per_acquire', 2)
+        candidates = [_candidate('ID%d' % (i + 1)) for i in range(3)]
+        mock_get_ready.side_effect = [candidates, candidates[2:]]
+        actions = []
+        for c in candidates:
+            mock_action = mock.Mock()
+            mock_action.id = c.id
+            actions.append(mock_action)
+        mock_acquire_batch.side_effect = [actions[:2], actions[2:]]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
 
-    @mock.patch.object(scheduler, 'sleep')
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
-    def test_start_action_batch_control(self, mock_acquire_action, mock_sleep):
-        mock_action1 = mock.Mock()
-        mock_action1.id = 'ID1'
-        mock_action1.action = 'NODE_CREATE'
-        mock_action2 = mock.Mock()
-        mock_action2.id = 'ID2'
-        mock_action2.action = 'CLUSTER_CREATE'
-        mock_action3 = mock.Mock()
-        mock_action3.id = 'ID3'
-        mock_action3.action = 'NODE_DELETE'
-        mock_acquire_action.side_effect = [mock_action1, mock_action2,
-                                           mock_action3, None]
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567')
+
+        # The second batch is short, so no further acquiring is attempted
+        self.assertEqual(2, mock_acquire_batch.call_count)
+        self.assertEqual(['ID1', 'ID2', 'ID3'],
+                         [c[0][-1] for c in
+                          mock_group.add_thread.call_args_list])
+        mock_acquire_batch.assert_has_calls([
+            mock.call(tgm.db_session, '4567', mock.ANY, limit=2,
+                      action_ids=['ID1', 'ID2']),
+            mock.call(tgm.db_session, '4567', mock.ANY, limit=1,
+                      action_ids=['ID3'])])
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_claimed_by_others(self, mock_get_ready,
+                                            mock_acquire_batch):
+        mock_get_ready.return_value = [_candidate('ID1'), _candidate('ID2')]
+        mock_action = mock.Mock()
+        mock_action.id = 'ID2'
+        mock_acquire_batch.return_value = [mock_action]
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
-        cfg.CONF.set_override('max_actions_per_batch', 1)
-        cfg.CONF.set_override('batch_interval', 2)
 
         tgm = scheduler.ThreadGroupManager()
         tgm.start_action('4567')
 
-        mock_sleep.assert_called_once_with(2)
-        self.assertEqual(mock_group.add_thread.call_count, 3)
+        mock_group.add_thread.assert_called_once_with(
+            tgm._start_with_trace, oslo_context.get_current(), None,
+            actionm.ActionProc, tgm.db_session, 'ID2')
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_held_back(self, mock_get_ready,
+                                    mock_acquire_batch):
+        cfg.CONF.set_override('max_running_actions_per_cluster', 1)
+        candidates = [_candidate('ID1'), _candidate('ID2')]
+        mock_get_ready.return_value = candidates
+        mock_action = mock.Mock()
+        mock_action.id = 'ID1'
+        mock_acquire_batch.return_value = [mock_action]
+        mock_group = mock.Mock()
+        mock_thread = mock.Mock()
+        mock_group.add_thread.return_value = mock_thread
+        self.mock_tg.return_value = mock_group
 
-    @mock.patch.object(scheduler, 'sleep')
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
-    def test_start_action_multiple_batches(self, mock_acquire_action,
-                                           mock_sleep):
-        action_types = ['NODE_CREATE', 'NODE_DELETE']
-        actions = []
-        for index in range(10):
-            mock_action = mock.Mock()
-            mock_action.id = 'ID%d' % (index + 1)
-            mock_action.action = action_types[index % 2]
-            actions.append(mock_action)
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567')
+
+        mock_acquire_batch.assert_called_once_with(
+            tgm.db_session, '4567', mock.ANY, limit=1, action_ids=['ID1'])
+        self.assertEqual({'ID1': ('PROJECT', 'CLUSTER')}, tgm._running)
+        self.assertTrue(tgm._deferred)
+        mock_thread.link.assert_called_once_with(tgm._action_done, '4567',
+                                                 'ID1')
 
-        # Add a None at the end to end the process.
-        actions.insert(len(actions), None)
+        # completion of the running action reschedules the held ones
+        mock_group.add_thread.reset_mock()
+        tgm._action_done(mock_thread, '4567', 'ID1')
 
-        mock_acquire_action.side_effect = actions
+        self.assertEqual({}, tgm._running)
+        self.assertFalse(tgm._deferred)
+        mock_group.add_thread.assert_called_once_with(
+            tgm._start_with_trace, oslo_context.get_current(), None,
+            tgm.start_action, '4567')
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_throttled(self, mock_get_ready,
+                                    mock_acquire_batch):
+        cfg.CONF.set_override('action_rate_limits', {'NODE': '1:4'})
+        mock_get_ready.return_value = [_candidate('ID1'), _candidate('ID2'),
+                                       _candidate('ID3')]
+        mock_action = mock.Mock()
+        mock_action.id = 'ID1'
+        mock_acquire_batch.return_value = [mock_action]
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
-        cfg.CONF.set_override('max_actions_per_batch', 3)
-        cfg.CONF.set_override('batch_interval', 5)
 
         tgm = scheduler.ThreadGroupManager()
-        tgm.start_action(worker_id='4567')
+        tgm.start_action('4567')
+
+        mock_acquire_batch.assert_called_once_with(
+            tgm.db_session, '4567', mock.ANY, limit=1, action_ids=['ID1'])
+        self.assertTrue(tgm._wakeup)
+        mock_group.add_thread.assert_has_calls([
+            mock.call(tgm._start_with_trace, oslo_context.get_current(),
+                      None, tgm._wakeup_after, '4567', mock.ANY),
+            mock.call(tgm._start_with_trace, oslo_context.get_current(),
+                      None, actionm.ActionProc, tgm.db_session, 'ID1')])
+        delay = mock_group.add_thread.call_args_list[0][0][-1]
+        self.assertAlmostEqual(4, delay, places=1)
+
+        # only one wakeup is pending at a time
+        tgm.start_action('4567')
+        self.assertEqual(1, len([
+            c for c in mock_group.add_thread.call_args_list
+            if c[0][3] == tgm._wakeup_after]))
+
+    @mock.patch.object(scheduler, 'sleep')
+    def test_wakeup_after(self, mock_sleep):
+        tgm = scheduler.ThreadGroupManager()
+        tgm._wakeup = True
+        self.patchobject(tgm, 'start_action')
+
+        tgm._wakeup_after('4567', 2.5)
+
+        mock_sleep.assert_called_once_with(2.5)
+        self.assertFalse(tgm._wakeup)
+        tgm.start_action.assert_called_once_with('4567')
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_refund_unclaimed(self, mock_get_ready,
+                                           mock_acquire_batch):
+        cfg.CONF.set_override('action_rate_limits', {'NODE': '2'})
+        mock_get_ready.return_value = [_candidate('ID1'), _candidate('ID2')]
+        mock_action = mock.Mock()
+        mock_action.id = 'ID2'
+        mock_acquire_batch.return_value = [mock_action]
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567')
+
+        stats = tgm.limiter.stats()
+        self.assertEqual(1, stats[0]['allowed'])
+
+    def test_action_done_not_deferred(self):
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+        tgm = scheduler.ThreadGroupManager()
+        tgm._running['ID1'] = ('PROJECT', 'CLUSTER')
 
-        self.assertEqual(mock_sleep.call_count, 3)
-        self.assertEqual(mock_group.add_thread.call_count, 10)
+        tgm._action_done(mock.Mock(), '4567', 'ID1')
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+        self.assertEqual({}, tgm._running)
+        self.assertEqual(0, mock_group.add_thread.call_count)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
     @mock.patch.object(db_api, 'action_acquire')
     def test_start_action_failed_locking_action(self, mock_acquire_action,
-                                                mock_acquire_action_1st):
+                                                mock_get_ready,
+                                                mock_acquire_batch):
         mock_acquire_action.return_value = None
-        mock_acquire_action_1st.return_value = None
+        mock_get_ready.return_value = []
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
         tgm = scheduler.ThreadGroupManager()
         res = tgm.start_action('4567', '0123')
         self.assertIsNone(res)
+        self.assertEqual(0, mock_acquire_batch.call_count)
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
-    def test_start_action_no_action_ready(self, mock_acquire_action):
-        mock_acquire_action.return_value = None
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_no_action_ready(self, mock_get_ready,
+                                          mock_acquire_batch):
+        mock_get_ready.return_value = []
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
         tgm = scheduler.ThreadGroupManager()
         res = tgm.start_action('4567')
         self.assertIsNone(res)
+        self.assertEqual(0, mock_group.add_thread.call_count)
+        self.assertEqual(0, mock_acquire_batch.call_count)
 
     def test_cancel_action(self):
         mock_action = mock.Mock()
@@ -286,3 +484,258 @@ class SchedulerTest(base.SenlinTestCase):
         mock_sleep = self.patchobject(eventlet, 'sleep')
         scheduler.sleep(1)
         mock_sleep.assert_called_once_with(1)
+
+
+class SelectActionsTest(base.SenlinTestCase):
+
+    def _ids(self, actions):
+        return [a.id for a in actions]
+
+    def test_select_all(self):
+        candidates = [_candidate('A1'), _candidate('A2'), _candidate('A3')]
+
+        selected, held, throttled = scheduler.select_actions(candidates, [])
+
+        self.assertEqual(['A1', 'A2', 'A3'], self._ids(selected))
+        self.assertEqual(0, held)
+
+    def test_select_empty(self):
+        self.assertEqual(([], 0, 0), scheduler.select_actions([], []))
+
+    def test_select_limit(self):
+        candidates = [_candidate('A1'), _candidate('A2'), _candidate('A3')]
+
+        selected, held, throttled = scheduler.select_actions(candidates, [], 2)
+
+        self.assertEqual(['A1', 'A2'], self._ids(selected))
+        self.assertEqual(0, held)
+
+    def test_select_fair_share(self):
+        candidates = [
+            _candidate('A1', project='P1'),
+            _candidate('A2', project='P1'),
+            _candidate('A3', project='P1'),
+            _candidate('B1', project='P2'),
+            _candidate('C1', project='P3'),
+            _candidate('C2', project='P3'),
+        ]
+
+        selected, held, throttled = scheduler.select_actions(candidates, [])
+
+        self.assertEqual(['A1', 'B1', 'C1', 'A2', 'C2', 'A3'],
+                         self._ids(selected))
+
+    def test_select_priority_weights(self):
+        cfg.CONF.set_override('action_priority_weights', [2, 1, 1])
+        high = consts.ACTION_PRIORITY_HIGH
+        normal = consts.ACTION_PRIORITY_NORMAL
+        candidates = [
+            _candidate('H1', priority=high),
+            _candidate('H2', priority=high),
+            _candidate('H3', priority=high),
+            _candidate('N1', priority=normal),
+            _candidate('N2', priority=normal),
+            _candidate('L1'),
+        ]
+
+        selected, held, throttled = scheduler.select_actions(candidates, [])
+
+        self.assertEqual(['H1', 'H2', 'N1', 'L1', 'H3', 'N2'],
+                         self._ids(selected))
+
+    def test_select_starved_project_first(self):
+        # the single recovery of a project is not queued behind the bulk of
+        # node creations of another project
+        candidates = [_candidate('A%s' % i, project='P1')
+                      for i in range(100)]
+        candidates.append(_candidate('B1', project='P2',
+                                     priority=consts.ACTION_PRIORITY_HIGH))
+
+        selected, held, throttled = scheduler.select_actions(candidates, [], 2)
+
+        self.assertEqual(['B1', 'A0'], self._ids(selected))
+
+    def test_select_engine_limit(self):
+        cfg.CONF.set_override('max_running_actions_per_engine', 3)
+        candidates = [_candidate('A1', cluster_id='C1'),
+                      _candidate('A2', cluster_id='C2'),
+                      _candidate('A3', cause=consts.CAUSE_RPC)]
+
+        selected, held, throttled = scheduler.select_actions(
+            candidates, [('PROJECT', 'C3'), ('PROJECT', 'C4')])
+
+        self.assertEqual(['A1', 'A3'], self._ids(selected))
+        self.assertEqual(1, held)
+
+    def test_select_project_limit(self):
+        cfg.CONF.set_override('max_running_actions_per_project', 1)
+        candidates = [_candidate('A1', project='P1'),
+                      _candidate('A2', project='P1'),
+                      _candidate('B1', project='P2')]
+
+        selected, held, throttled = scheduler.select_actions(
+            candidates, [('P2', 'CLUSTER')])
+
+        self.assertEqual(['A1'], self._ids(selected))
+        self.assertEqual(2, held)
+
+    def test_select_cluster_limit(self):
+        cfg.CONF.set_override('max_running_actions_per_cluster', 2)
+        candidates = [_candidate('A1', cluster_id='C1'),
+                      _candidate('A2', cluster_id='C1'),
+                      _candidate('A3', cluster_id='C1'),
+                      _candidate('A4', cluster_id=None)]
+
+        selected, held, throttled = scheduler.select_actions(
+            candidates, [('PROJECT', 'C1')])
+
+        # actions not targeting any node of a cluster use their targets
+        self.assertEqual(['A1', 'A4'], self._ids(selected))
+        self.assertEqual(2, held)
+
+    def test_select_rate_limited(self):
+        limiter = mock.Mock()
+        limiter.consume.side_effect = [True, False, True]
+        candidates = [_candidate('A1'), _candidate('A2'),
+                      _candidate('A3', action=consts.NODE_DELETE)]
+
+        selected, held, throttled = scheduler.select_actions(
+            candidates, [], limiter=limiter)
+
+        self.assertEqual(['A1', 'A3'], self._ids(selected))
+        self.assertEqual(0, held)
+        self.assertEqual(1, throttled)
+        limiter.consume.assert_has_calls([
+            mock.call(consts.NODE_CREATE), mock.call(consts.NODE_CREATE),
+            mock.call(consts.NODE_DELETE)])
+
+    def test_select_rate_limit_after_caps(self):
+        cfg.CONF.set_override('max_running_actions_per_cluster', 1)
+        limiter = mock.Mock()
+        candidates = [_candidate('A1')]
+
+        selected, held, throttled = scheduler.select_actions(
+            candidates, [('PROJECT', 'CLUSTER')], limiter=limiter)
+
+        self.assertEqual([], selected)
+        self.assertEqual(1, held)
+        # no token is consumed for actions held back
+        self.assertEqual(0, limiter.consume.call_count)
+
+
+class TokenBucketTest(base.SenlinTestCase):
+
+    @mock.patch.object(scheduler, 'wallclock')
+    def test_consume(self, mock_clock):
+        mock_clock.return_value = 100
+        bucket = scheduler.TokenBucket(2, 10)
+
+        self.assertTrue(bucket.consume())
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+        self.assertEqual(5, bucket.wait_time())
+
+        # one token every 5 seconds
+        mock_clock.return_value = 105
+        self.assertEqual(0, bucket.wait_time())
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+
+        # never more tokens than the capacity
+        mock_clock.return_value = 1000
+        self.assertTrue(bucket.consume())
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+
+    @mock.patch.object(scheduler, 'wallclock')
+    def test_refund(self, mock_clock):
+        mock_clock.return_value = 100
+        bucket = scheduler.TokenBucket(1, 1)
+
+        self.assertTrue(bucket.consume())
+        bucket.refund()
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+
+        bucket.refund()
+        bucket.refund()
+        self.assertEqual(1, bucket.tokens)
+
+
+class RateLimiterTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(RateLimiterTest, self).setUp()
+        self.clock = self.patchobject(scheduler, 'wallclock',
+                                      return_value=100)
+
+    def test_no_limits(self):
+        self.limiter = scheduler.RateLimiter()
+        for _ in range(100):
+            self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+        self.assertEqual([], self.limiter.stats())
+        self.assertEqual(0, self.limiter.wait_time())
+
+    def test_limit_by_name_and_prefix(self):
+        cfg.CONF.set_override('action_rate_limits',
+                              {'NODE': '2', 'NODE_DELETE': '1:10'})
+        self.limiter = scheduler.RateLimiter()
+
+        self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+        self.assertTrue(self.limiter.consume(consts.NODE_UPDATE))
+        self.assertFalse(self.limiter.consume(consts.NODE_CREATE))
+        self.assertTrue(self.limiter.consume(consts.NODE_DELETE))
+        self.assertFalse(self.limiter.consume(consts.NODE_DELETE))
+        self.assertTrue(self.limiter.consume(consts.CLUSTER_CREATE))
+
+        self.assertEqual(0.5, self.limiter.wait_time())
+        self.assertEqual([
+            {'name': 'NODE', 'capacity': 2, 'period': 1.0, 'tokens': 0,
+             'allowed': 2, 'throttled': 1},
+            {'name': 'NODE_DELETE', 'capacity': 1, 'period': 10.0,
+             'tokens': 0, 'allowed': 1, 'throttled': 1},
+        ], self.limiter.stats())
+
+        self.clock.return_value = 101
+        self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+        self.assertFalse(self.limiter.consume(consts.NODE_DELETE))
+
+    def test_refund(self):
+        cfg.CONF.set_override('action_rate_limits', {'NODE': '1'})
+        self.limiter = scheduler.RateLimiter()
+
+        self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+        self.limiter.refund(consts.NODE_CREATE)
+        self.limiter.refund(consts.CLUSTER_CREATE)
+
+        self.assertEqual(1, self.limiter.stats()[0]['tokens'])
+        self.assertEqual(0, self.limiter.stats()[0]['allowed'])
+
+    def test_invalid_limits(self):
+        cfg.CONF.set_override('action_rate_limits',
+                              {'NODE': 'fast', 'CLUSTER': '0',
+                               'NODE_CREATE': '1:0'})
+        self.limiter = scheduler.RateLimiter()
+
+        for _ in range(10):
+            self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+            self.assertTrue(self.limiter.consume(consts.CLUSTER_CREATE))
+
+    def test_batch_options(self):
+        cfg.CONF.set_override('max_actions_per_batch', 2)
+        cfg.CONF.set_override('batch_interval', 6)
+        self.limiter = scheduler.RateLimiter()
+
+        self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+        self.assertTrue(self.limiter.consume(consts.NODE_DELETE))
+        self.assertFalse(self.limiter.consume(consts.NODE_CREATE))
+        self.assertTrue(self.limiter.consume(consts.CLUSTER_CREATE))
+        self.assertEqual(3, self.limiter.wait_time())
+
+    def test_limits_parsed_once(self):
+        cfg.CONF.set_override('action_rate_limits', {'NODE': '1'})
+        self.limiter = scheduler.RateLimiter()
+        self.assertTrue(self.limiter.consume(consts.NODE_CREATE))
+
+        cfg.CONF.set_override('action_rate_limits', {'NODE': '2'})
+        self.assertFalse(self.limiter.consume(consts.NODE_CREATE))
@@ -10,7 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import eventlet
 import mock
+from oslo_config import cfg
 
 from senlin.common import utils as common_utils
 from senlin.engine import senlin_lock as lockm
@@ -108,6 +110,131 @@ class SenlinLockTest(base.SenlinTestCase):
         self.assertEqual(3, mock_acquire.call_count)
         mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XY')
 
+    def _spawn_acquire(self, action_id, scope=lockm.CLUSTER_SCOPE):
+        result = {}
+
+        def _acquire():
+            result['res'] = lockm.cluster_lock_acquire(
+                self.ctx, 'CLUSTER_A', action_id, scope=scope)
+
+        thread = eventlet.spawn(_acquire)
+        # let the thread run until it blocks
+        eventlet.sleep(0)
+        return thread, result
+
+    def test_cluster_lock_acquire_wait_local(self):
+        self.assertTrue(lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                   'ACTION_1'))
+        thread, result = self._spawn_acquire('ACTION_2')
+        self.assertEqual({}, result)
+        self.assertEqual(1, len(lockm._waiters['CLUSTER_A']))
+
+        lockm.cluster_lock_release('CLUSTER_A', 'ACTION_1',
+                                   lockm.CLUSTER_SCOPE)
+        thread.wait()
+
+        self.assertTrue(result['res'])
+        self.assertNotIn('CLUSTER_A', lockm._waiters)
+        self.assertEqual({'CLUSTER_A': set(['ACTION_2'])}, lockm._holders)
+
+    def test_cluster_lock_acquire_wait_fifo(self):
+        self.assertTrue(lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                   'ACTION_1'))
+        thread2, result2 = self._spawn_acquire('ACTION_2')
+        thread3, result3 = self._spawn_acquire('ACTION_3')
+
+        lockm.cluster_lock_release('CLUSTER_A', 'ACTION_1',
+                                   lockm.CLUSTER_SCOPE)
+        thread2.wait()
+        eventlet.sleep(0)
+
+        self.assertTrue(result2['res'])
+        self.assertEqual({}, result3)
+
+        lockm.cluster_lock_release('CLUSTER_A', 'ACTION_2',
+                                   lockm.CLUSTER_SCOPE)
+        thread3.wait()
+
+        self.assertTrue(result3['res'])
+
+    def test_cluster_lock_acquire_wait_node_scope(self):
+        self.assertTrue(lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                   'ACTION_1'))
+        thread2, result2 = self._spawn_acquire('ACTION_2', lockm.NODE_SCOPE)
+        thread3, result3 = self._spawn_acquire('ACTION_3', lockm.NODE_SCOPE)
+
+        lockm.cluster_lock_release('CLUSTER_A', 'ACTION_1',
+                                   lockm.CLUSTER_SCOPE)
+        thread2.wait()
+        thread3.wait()
+
+        # node scope waiters share the lock
+        self.assertTrue(result2['res'])
+        self.assertTrue(result3['res'])
+
+    @mock.patch.object(common_utils, 'is_engine_dead')
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    def test_cluster_lock_acquire_wait_timeout(self, mock_acquire,
+                                               mock_dead):
+        cfg.CONF.set_override('lock_wait_timeout', 0)
+        mock_dead.return_value = False
+        mock_acquire.return_value = ['ACTION_ABC']
+        lockm._holders['CLUSTER_A'] = set(['ACTION_ABC'])
+        self.patchobject(lockm.eventlet, 'sleep')
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ')
+
+        self.assertFalse(res)
+        self.assertEqual(3, mock_acquire.call_count)
+        self.assertNotIn('CLUSTER_A', lockm._waiters)
+
+    @mock.patch.object(clo.ClusterLock, "release")
+    def test_cluster_lock_release_wake_waiter(self, mock_release):
+        sem1 = mock.Mock()
+        sem2 = mock.Mock()
+        lockm._waiters['CLUSTER_A'] = [(lockm.CLUSTER_SCOPE, sem1),
+                                       (lockm.CLUSTER_SCOPE, sem2)]
+        lockm._holders['CLUSTER_A'] = set(['ACTION_1'])
+
+        lockm.cluster_lock_release('CLUSTER_A', 'ACTION_1',
+                                   lockm.CLUSTER_SCOPE)
+
+        sem1.release.assert_called_once_with()
+        self.assertEqual(0, sem2.release.call_count)
+        self.assertNotIn('CLUSTER_A', lockm._holders)
+
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    @mock.patch.object(clo.ClusterLock, "steal")
+    def test_cluster_lock_acquire_forced_wake_waiter(self, mock_steal,
+                                                     mock_acquire):
+        mock_acquire.return_value = ['ACTION_1']
+        mock_steal.return_value = ['ACTION_XY']
+        sem = mock.Mock()
+        lockm._waiters['CLUSTER_A'] = [(lockm.CLUSTER_SCOPE, sem)]
+        lockm._holders['CLUSTER_A'] = set(['ACTION_1'])
+        cfg.CONF.set_override('lock_wait_timeout', 0)
+        self.patchobject(lockm.eventlet, 'sleep')
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                         'ACTION_XY', forced=True)
+
+        self.assertTrue(res)
+        self.assertEqual({'CLUSTER_A': set(['ACTION_XY'])}, lockm._holders)
+        sem.release.assert_called_with()
+
+    @mock.patch.object(svco.Service, 'gc_by_engine')
+    def test_gc_by_engine(self, mock_gc):
+        sem1 = mock.Mock()
+        sem2 = mock.Mock()
+        lockm._waiters['CLUSTER_A'] = [(lockm.CLUSTER_SCOPE, sem1)]
+        lockm._waiters['CLUSTER_B'] = [(lockm.NODE_SCOPE, sem2)]
+
+        lockm.gc_by_engine('ENGINE_ID')
+
+        mock_gc.assert_called_once_with('ENGINE_ID')
+        sem1.release.assert_called_once_with()
+        sem2.release.assert_called_once_with()
+
     @mock.patch.object(clo.ClusterLock, "release")
     def test_cluster_lock_release(self, mock_release):
         actual = lockm.cluster_lock_release('C', 'A', 'S')
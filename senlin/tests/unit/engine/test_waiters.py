@@ -0,0 +1,87 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+
+from senlin.engine import waiters
+from senlin.tests.unit.common import base
+
+
+class ActionWaiterTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ActionWaiterTest, self).setUp()
+        self.addCleanup(waiters._waiters.clear)
+        self.addCleanup(waiters._depended.clear)
+
+    def test_add_remove_waiter(self):
+        waiters.add_waiter('PARENT', ['C1', 'C2'])
+
+        self.assertIn('PARENT', waiters._waiters)
+        self.assertEqual({'PARENT'}, waiters._depended['C1'])
+        self.assertEqual({'PARENT'}, waiters._depended['C2'])
+
+        waiters.remove_waiter('PARENT')
+        self.assertEqual({}, waiters._waiters)
+        self.assertEqual({}, waiters._depended)
+
+        # removing an unknown waiter is a no-op
+        waiters.remove_waiter('PARENT')
+
+    def test_notify_completion_all_succeeded(self):
+        waiters.add_waiter('PARENT', ['C1', 'C2'])
+        events = waiters._waiters['PARENT'][1]
+
+        waiters.notify_completion('C1', 'SUCCEEDED')
+        self.assertTrue(events.empty())
+
+        waiters.notify_completion('C2', 'SUCCEEDED')
+        self.assertEqual('C2', events.get_nowait())
+        self.assertEqual({}, waiters._depended)
+
+    def test_notify_completion_failed(self):
+        waiters.add_waiter('PARENT', ['C1', 'C2'])
+        events = waiters._waiters['PARENT'][1]
+
+        waiters.notify_completion('C1', 'FAILED')
+        self.assertEqual('C1', events.get_nowait())
+
+    def test_notify_completion_not_waited(self):
+        # no exception when nobody is waiting
+        waiters.notify_completion('C1', 'SUCCEEDED')
+
+    def test_wait_for_dependents_notified(self):
+        waiters.add_waiter('PARENT', ['C1'])
+        waiters.notify_completion('C1', 'SUCCEEDED')
+        mock_sleep = self.patchobject(eventlet, 'sleep')
+
+        waiters.wait_for_dependents('PARENT', 10)
+
+        self.assertEqual(0, mock_sleep.call_count)
+        self.assertTrue(waiters._waiters['PARENT'][1].empty())
+
+    def test_wait_for_dependents_timeout(self):
+        waiters.add_waiter('PARENT', ['C1'])
+        events = waiters._waiters['PARENT'][1]
+        mock_get = self.patchobject(events, 'get',
+                                    side_effect=eventlet.queue.Empty)
+
+        waiters.wait_for_dependents('PARENT', 10)
+
+        mock_get.assert_called_once_with(timeout=10)
+
+    def test_wait_for_dependents_not_registered(self):
+        mock_sleep = self.patchobject(eventlet, 'sleep')
+
+        waiters.wait_for_dependents('PARENT', 10)
+
+        mock_sleep.assert_called_once_with(10)
@@ -10,7 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import eventlet
 import mock
+from oslo_config import cfg
 import testtools
 
 from senlin.common import consts
@@ -29,7 +31,7 @@ class TestDatabase(testtools.TestCase):
         self.context = utils.dummy_context()
 
     @mock.patch.object(base.EventBackend, '_check_entity')
-    @mock.patch.object(eo.Event, 'create')
+    @mock.patch.object(DB.WRITER, 'put')
     def test_dump(self, mock_create, mock_check):
         mock_check.return_value = 'CLUSTER'
         entity = mock.Mock(id='CLUSTER_ID')
@@ -59,7 +61,7 @@ class TestDatabase(testtools.TestCase):
             })
 
     @mock.patch.object(base.EventBackend, '_check_entity')
-    @mock.patch.object(eo.Event, 'create')
+    @mock.patch.object(DB.WRITER, 'put')
     def test_dump_with_extra_but_no_status_(self, mock_create, mock_check):
         mock_check.return_value = 'NODE'
         entity = mock.Mock(id='NODE_ID', status='S1', status_reason='R1',
@@ -92,7 +94,7 @@ class TestDatabase(testtools.TestCase):
             })
 
     @mock.patch.object(base.EventBackend, '_check_entity')
-    @mock.patch.object(eo.Event, 'create')
+    @mock.patch.object(DB.WRITER, 'put')
     def test_dump_operation_action(self, mock_create, mock_check):
         mock_check.return_value = 'CLUSTER'
         entity = mock.Mock(id='CLUSTER_ID')
@@ -120,3 +122,77 @@ class TestDatabase(testtools.TestCase):
                 'status_reason': 'REASON',
                 'meta_data': {}
             })
+
+    @mock.patch.object(DB.WRITER, 'flush')
+    def test_flush(self, mock_flush):
+        res = DB.DBEvent.flush()
+
+        self.assertIsNone(res)
+        mock_flush.assert_called_once_with()
+
+
+class TestEventWriter(testtools.TestCase):
+
+    def setUp(self):
+        super(TestEventWriter, self).setUp()
+        self.context = utils.dummy_context()
+        self.addCleanup(cfg.CONF.reset)
+        self.writer = DB.EventWriter()
+        self.addCleanup(self.writer.flush)
+
+    @mock.patch.object(eo.Event, 'create_batch')
+    @mock.patch.object(eo.Event, 'create')
+    def test_put_not_buffered(self, mock_create, mock_batch):
+        cfg.CONF.set_override('database_queue_size', 0, group='dispatchers')
+
+        self.writer.put(self.context, {'level': 'L1'})
+
+        mock_create.assert_called_once_with(self.context, {'level': 'L1'})
+        self.assertEqual(0, mock_batch.call_count)
+        self.assertIsNone(self.writer._thread)
+
+    @mock.patch.object(eo.Event, 'create_batch')
+    @mock.patch.object(eo.Event, 'create')
+    def test_put_flush(self, mock_create, mock_batch):
+        cfg.CONF.set_override('database_batch_size', 2, group='dispatchers')
+        cfg.CONF.set_override('database_flush_interval', 60,
+                              group='dispatchers')
+
+        for i in range(5):
+            self.writer.put(self.context, {'level': i})
+        self.writer.flush()
+
+        self.assertEqual(0, mock_create.call_count)
+        mock_batch.assert_has_calls([
+            mock.call(mock.ANY, [{'level': 0}, {'level': 1}]),
+            mock.call(mock.ANY, [{'level': 2}, {'level': 3}]),
+            mock.call(mock.ANY, [{'level': 4}]),
+        ])
+        self.assertEqual(3, mock_batch.call_count)
+        self.assertIsNone(self.writer._thread)
+
+    @mock.patch.object(eo.Event, 'create_batch')
+    def test_put_flush_interval(self, mock_batch):
+        cfg.CONF.set_override('database_flush_interval', 0,
+                              group='dispatchers')
+
+        self.writer.put(self.context, {'level': 'L1'})
+        eventlet.sleep(0)
+        eventlet.sleep(0)
+
+        mock_batch.assert_called_once_with(mock.ANY, [{'level': 'L1'}])
+
+    @mock.patch.object(eo.Event, 'create_batch')
+    def test_write_failed(self, mock_batch):
+        mock_batch.side_effect = Exception('boom')
+
+        self.writer.put(self.context, {'level': 'L1'})
+        self.writer.put(self.context, {'level': 'L2'})
+        self.writer.flush()
+
+        mock_batch.assert_called_once_with(
+            mock.ANY, [{'level': 'L1'}, {'level': 'L2'}])
+        self.assertIsNone(self.writer._thread)
+
+    def test_flush_not_started(self):
+        self.assertIsNone(self.writer.flush())
@@ -119,6 +119,20 @@ class TestActionList(test_base.SenlinTestCase):
         sot.obj_set_defaults()
         self.assertTrue(sot.project_safe)
 
+    def test_attributes(self):
+        sot = actions.ActionListRequest(attributes=['status'])
+        self.assertEqual(['status'], sot.attributes)
+
+    def test_attributes_invalid(self):
+        self.assertRaises(ValueError, actions.ActionListRequest,
+                          attributes=['context'])
+
+    def test_make_compatible_1_0(self):
+        sot = actions.ActionListRequest(attributes=['status'])
+        res = sot.obj_to_primitive()
+        sot.obj_make_compatible(res, '1.0')
+        self.assertNotIn('attributes', res['senlin_object.data'])
+
 
 class TestActionGet(test_base.SenlinTestCase):
 
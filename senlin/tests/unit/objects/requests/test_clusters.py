@@ -241,6 +241,20 @@ class TestClusterList(test_base.SenlinTestCase):
         self.assertEqual('name:asc', sot.sort)
         self.assertFalse(sot.project_safe)
 
+    def test_attributes(self):
+        sot = clusters.ClusterListRequest(attributes=['desired_capacity'])
+        self.assertEqual(['desired_capacity'], sot.attributes)
+
+    def test_attributes_invalid(self):
+        self.assertRaises(ValueError, clusters.ClusterListRequest,
+                          attributes=['spec'])
+
+    def test_make_compatible_1_0(self):
+        sot = clusters.ClusterListRequest(attributes=['desired_capacity'])
+        res = sot.obj_to_primitive()
+        sot.obj_make_compatible(res, '1.0')
+        self.assertNotIn('attributes', res['senlin_object.data'])
+
 
 class TestClusterGet(test_base.SenlinTestCase):
 
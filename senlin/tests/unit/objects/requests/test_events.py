@@ -47,6 +47,20 @@ class TestEventList(test_base.SenlinTestCase):
         sot.obj_set_defaults()
         self.assertTrue(sot.project_safe)
 
+    def test_attributes(self):
+        sot = events.EventListRequest(attributes=['status'])
+        self.assertEqual(['status'], sot.attributes)
+
+    def test_attributes_invalid(self):
+        self.assertRaises(ValueError, events.EventListRequest,
+                          attributes=['cluster'])
+
+    def test_make_compatible_1_0(self):
+        sot = events.EventListRequest(attributes=['status'])
+        res = sot.obj_to_primitive()
+        sot.obj_make_compatible(res, '1.0')
+        self.assertNotIn('attributes', res['senlin_object.data'])
+
 
 class TestEventGet(test_base.SenlinTestCase):
 
@@ -121,6 +121,20 @@ class TestNodeList(test_base.SenlinTestCase):
         sot.obj_set_defaults()
         self.assertTrue(sot.project_safe)
 
+    def test_attributes(self):
+        sot = nodes.NodeListRequest(attributes=['physical_id'])
+        self.assertEqual(['physical_id'], sot.attributes)
+
+    def test_attributes_invalid(self):
+        self.assertRaises(ValueError, nodes.NodeListRequest,
+                          attributes=['profile_created_at'])
+
+    def test_make_compatible_1_0(self):
+        sot = nodes.NodeListRequest(attributes=['physical_id'])
+        res = sot.obj_to_primitive()
+        sot.obj_make_compatible(res, '1.0')
+        self.assertNotIn('attributes', res['senlin_object.data'])
+
 
 class TestNodeGet(test_base.SenlinTestCase):
 
@@ -88,3 +88,31 @@ class TestAction(testtools.TestCase):
                          six.text_type(ex))
         mock_name.assert_called_once_with(self.ctx, 'BOGUS')
         mock_shortid.assert_called_once_with(self.ctx, 'BOGUS')
+
+    @mock.patch('senlin.db.api.action_get_all')
+    def test_get_all_with_fields(self, mock_get_all):
+        aid = uuidutils.generate_uuid()
+        mock_get_all.return_value = [{'id': aid, 'name': 'A01'}]
+
+        result = ao.Action.get_all(self.ctx, fields=['name', 'depends_on'])
+
+        mock_get_all.assert_called_once_with(self.ctx,
+                                             columns=['id', 'name'])
+        self.assertEqual(1, len(result))
+        self.assertEqual(aid, result[0].id)
+        self.assertEqual('A01', result[0].name)
+        self.assertFalse(result[0].obj_attr_is_set('inputs'))
+
+    @mock.patch('senlin.objects.dependency.Dependency.get_dependents')
+    @mock.patch('senlin.objects.dependency.Dependency.get_depended')
+    def test_to_dict_with_fields(self, mock_depended, mock_dependents):
+        aid = uuidutils.generate_uuid()
+        action = ao.Action(id=aid, name='A01', status='READY')
+        action.context = {}
+        mock_depended.return_value = ['A00']
+
+        result = action.to_dict(['status', 'depends_on'])
+
+        self.assertEqual({'id': aid, 'status': 'READY',
+                          'depends_on': ['A00']}, result)
+        self.assertEqual(0, mock_dependents.call_count)
@@ -145,3 +145,48 @@ class TestCluster(base.SenlinTestCase):
         }
 
         self.assertEqual(expected, cluster.to_dict())
+
+    @mock.patch.object(db_api, 'cluster_policy_ids_by_cluster')
+    @mock.patch.object(db_api, 'node_ids_by_cluster')
+    @mock.patch.object(db_api, 'profile_get')
+    def test_to_dict_with_fields(self, mock_profile, mock_nodes,
+                                 mock_bindings):
+        values = {
+            'profile_id': '96f4df4b-889e-4184-ba8d-b5ca122f95bb',
+            'name': 'test-cluster',
+            'status': 'INIT',
+            'init_at': timeutils.utcnow(True),
+            'user': self.ctx.user_id,
+            'project': self.ctx.project_id,
+        }
+        cluster = co.Cluster.create(self.ctx, values)
+        mock_nodes.return_value = ['N1', 'N2']
+
+        result = cluster.to_dict(['name', 'metadata', 'nodes'])
+
+        expected = {
+            'id': cluster.id,
+            'name': 'test-cluster',
+            'metadata': {},
+            'nodes': ['N1', 'N2'],
+        }
+        self.assertEqual(expected, result)
+        self.assertEqual(0, mock_profile.call_count)
+        self.assertEqual(0, mock_bindings.call_count)
+
+    @mock.patch.object(db_api, 'cluster_get_all')
+    def test_get_all_with_fields(self, mock_get_all):
+        cid = uuidutils.generate_uuid()
+        pid = uuidutils.generate_uuid()
+        mock_get_all.return_value = [
+            {'id': cid, 'profile_id': pid, 'meta_data': {'k': 'v'}}]
+
+        result = co.Cluster.get_all(self.ctx, fields=['profile_name',
+                                                      'metadata', 'nodes'],
+                                    limit=10)
+
+        mock_get_all.assert_called_once_with(
+            self.ctx, limit=10, columns=['id', 'meta_data', 'profile_id'])
+        self.assertEqual(1, len(result))
+        self.assertEqual({'k': 'v'}, result[0].metadata)
+        self.assertFalse(result[0].obj_attr_is_set('name'))
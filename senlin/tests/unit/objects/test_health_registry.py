@@ -60,7 +60,23 @@ class TestHealthRegistry(testtools.TestCase):
         result = hro.HealthRegistry.claim(self.ctx, "FAKE_ENGINE")
 
         self.assertEqual([x_obj], result)
-        mock_claim.assert_called_once_with(self.ctx, "FAKE_ENGINE")
+        mock_claim.assert_called_once_with(self.ctx, "FAKE_ENGINE",
+                                           ring=None)
+        mock_from.assert_called_once_with(self.ctx, mock.ANY, x_registry)
+
+    @mock.patch.object(base.SenlinObject, '_from_db_object')
+    @mock.patch.object(db_api, 'registry_get_all_by_engine')
+    def test_get_all_by_engine(self, mock_get, mock_from):
+        x_registry = mock.Mock()
+        mock_get.return_value = [x_registry]
+        x_obj = mock.Mock()
+        mock_from.side_effect = [x_obj]
+
+        result = hro.HealthRegistry.get_all_by_engine(self.ctx,
+                                                      "FAKE_ENGINE")
+
+        self.assertEqual([x_obj], result)
+        mock_get.assert_called_once_with(self.ctx, "FAKE_ENGINE")
         mock_from.assert_called_once_with(self.ctx, mock.ANY, x_registry)
 
     @mock.patch.object(db_api, 'registry_delete')
@@ -134,3 +134,41 @@ class TestNode(base.SenlinTestCase):
         result = no.Node.get(self.ctx, node.id)
         dt = result.to_dict()
         self.assertEqual(expected, dt)
+
+    def test_to_dict_with_fields(self):
+        values = {
+            'name': 'test_node',
+            'profile_id': uuidutils.generate_uuid(),
+            'cluster_id': uuidutils.generate_uuid(),
+            'user': self.ctx.user_id,
+            'project': self.ctx.project_id,
+            'index': -1,
+            'init_at': timeutils.utcnow(True),
+            'status': 'Initializing',
+        }
+        node = no.Node.create(self.ctx, values)
+
+        result = no.Node.get(self.ctx, node.id)
+        dt = result.to_dict(['name', 'init_at'])
+
+        expected = {
+            'id': node.id,
+            'name': 'test_node',
+            'init_at': common_utils.isotime(node.init_at),
+        }
+        self.assertEqual(expected, dt)
+
+    @mock.patch('senlin.db.api.node_get_all')
+    def test_get_all_with_fields(self, mock_get_all):
+        nid = uuidutils.generate_uuid()
+        db_node = {'id': nid, 'profile': mock.Mock(), 'profile_id': 'P'}
+        db_node['profile'].name = 'PROFILE'
+        mock_get_all.return_value = [db_node]
+
+        result = no.Node.get_all(self.ctx, fields=['profile_name'])
+
+        mock_get_all.assert_called_once_with(self.ctx,
+                                             columns=['id', 'profile_id'])
+        self.assertEqual(1, len(result))
+        self.assertEqual('PROFILE', result[0].profile_name)
+        self.assertFalse(result[0].obj_attr_is_set('profile_created_at'))
@@ -162,6 +162,51 @@ class TestPolicyBase(base.SenlinTestCase):
         self.assertIsNotNone(res)
         self.assertEqual(policy.id, res.id)
 
+    def test_load_cached(self):
+        policy = utils.create_policy(self.ctx, UUID1)
+        res1 = pb.Policy.load(self.ctx, policy.id)
+
+        with mock.patch.object(pb.Policy, '_from_object') as mock_parse:
+            res2 = pb.Policy.load(self.ctx, policy.id)
+            self.assertEqual(0, mock_parse.call_count)
+
+        self.assertEqual(policy.id, res2.id)
+        # callers get their own copies of the cached policy
+        self.assertIsNot(res1, res2)
+        res2.name = 'new-name'
+        self.assertEqual(policy.name, res1.name)
+
+    def test_load_cached_invalidated(self):
+        policy = utils.create_policy(self.ctx, UUID1)
+        res = pb.Policy.load(self.ctx, policy.id)
+
+        res.name = 'new-name'
+        res.store(self.ctx)
+        res = pb.Policy.load(self.ctx, policy.id)
+        self.assertEqual('new-name', res.name)
+
+        pb.Policy.delete(self.ctx, policy.id)
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Policy.load,
+                          self.ctx, policy.id, None)
+
+    def test_load_cached_updated_elsewhere(self):
+        policy = utils.create_policy(self.ctx, UUID1)
+        pb.Policy.load(self.ctx, policy.id)
+
+        # the record was updated by another engine, which could not
+        # invalidate the cache of this engine
+        po.Policy.update(self.ctx, policy.id,
+                         {'name': 'new-name',
+                          'updated_at': timeutils.utcnow(True)})
+        res = pb.Policy.load(self.ctx, policy.id)
+        self.assertEqual('new-name', res.name)
+
+        po.Policy.delete(self.ctx, policy.id)
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Policy.load,
+                          self.ctx, policy.id, None)
+
     def test_load_not_found(self):
         ex = self.assertRaises(exception.ResourceNotFound,
                                pb.Policy.load,
@@ -13,6 +13,7 @@
 import base64
 
 import mock
+from oslo_config import cfg
 from oslo_utils import encodeutils
 import six
 
@@ -1369,6 +1370,109 @@ class TestNovaServerBasic(base.SenlinTestCase):
                          six.text_type(ex))
         cc.server_get.assert_called_once_with('FAKE_ID')
 
+    def test_do_check_batch(self):
+        cfg.CONF.set_override('node_check_batch_threshold', 2)
+        profile = server.ServerProfile('t', self.spec)
+        cc = mock.Mock()
+        cc.server_list.return_value = [
+            mock.Mock(id='SERVER_1', status='ACTIVE'),
+            mock.Mock(id='SERVER_2', status='ERROR'),
+            mock.Mock(id='OTHER_SERVER', status='ACTIVE'),
+        ]
+        cc.server_get.return_value = mock.Mock(status='ACTIVE')
+        profile._computeclient = cc
+        nodes = [
+            mock.Mock(id='NODE_1', physical_id='SERVER_1'),
+            mock.Mock(id='NODE_2', physical_id='SERVER_2'),
+            mock.Mock(id='NODE_3', physical_id='SERVER_3'),
+            mock.Mock(id='NODE_4', physical_id=None),
+        ]
+
+        res = profile.do_check_batch(nodes)
+
+        self.assertEqual({'NODE_1': True, 'NODE_2': False, 'NODE_3': True,
+                          'NODE_4': False}, res)
+        cc.server_list.assert_called_once_with(name='^(FAKE_SERVER_NAME)$')
+        # the server missing from the list is checked on its own
+        cc.server_get.assert_called_once_with('SERVER_3')
+
+    def test_do_check_batch_node_names(self):
+        cfg.CONF.set_override('node_check_batch_threshold', 1)
+        self.spec['properties'].pop('name')
+        profile = server.ServerProfile('t', self.spec)
+        profile.CHECK_NAMES_PER_LIST = 2
+        cc = mock.Mock()
+        cc.server_list.side_effect = [
+            [mock.Mock(id='SERVER_1', status='ACTIVE'),
+             mock.Mock(id='SERVER_2', status='ACTIVE')],
+            [],
+        ]
+        profile._computeclient = cc
+        nodes = []
+        for i, name in enumerate(['node-a', 'node-b', 'node-c', 'node.d']):
+            node = mock.Mock(id='NODE_%s' % i, physical_id='SERVER_%s' % i)
+            node.name = name
+            nodes.append(node)
+        cc.server_get.side_effect = [
+            exc.InternalError(code=404, message='No Server found'),
+            mock.Mock(status='ACTIVE'),
+        ]
+
+        res = profile.do_check_batch(nodes)
+
+        cc.server_list.assert_has_calls([
+            mock.call(name='^(node-a|node-b)$'),
+            mock.call(name='^(node-c)$'),
+        ])
+        # the names needing escaping are not listed
+        cc.server_get.assert_has_calls([mock.call('SERVER_0'),
+                                        mock.call('SERVER_3')])
+        self.assertIsInstance(res['NODE_0'], exc.EServerNotFound)
+        self.assertEqual({'NODE_1': True, 'NODE_2': True, 'NODE_3': True},
+                         dict((k, v) for k, v in res.items()
+                              if k != 'NODE_0'))
+
+    def test_do_check_batch_small(self):
+        profile = server.ServerProfile('t', self.spec)
+        cc = mock.Mock()
+        cc.server_get.side_effect = exc.InternalError(code=500,
+                                                      message='Boom')
+        profile._computeclient = cc
+        nodes = [mock.Mock(id='NODE_1', physical_id='SERVER_1')]
+
+        res = profile.do_check_batch(nodes)
+
+        self.assertEqual(0, cc.server_list.call_count)
+        cc.server_get.assert_called_once_with('SERVER_1')
+        self.assertIsInstance(res['NODE_1'], exc.EResourceOperation)
+
+    def test_do_check_batch_no_physical_id(self):
+        profile = server.ServerProfile('t', self.spec)
+        cc = mock.Mock()
+        profile._computeclient = cc
+
+        res = profile.do_check_batch([mock.Mock(id='NODE_1',
+                                                physical_id=None)])
+
+        self.assertEqual({'NODE_1': False}, res)
+        self.assertEqual(0, cc.server_list.call_count)
+
+    def test_do_check_batch_failed(self):
+        cfg.CONF.set_override('node_check_batch_threshold', 1)
+        profile = server.ServerProfile('t', self.spec)
+        cc = mock.Mock()
+        err = exc.InternalError(code=500, message='Nova Error')
+        cc.server_list.side_effect = err
+        profile._computeclient = cc
+        nodes = [mock.Mock(id='NODE_1', physical_id='SERVER_1',
+                           cluster_id='CLUSTER_ID')]
+
+        ex = self.assertRaises(exc.EResourceOperation,
+                               profile.do_check_batch, nodes)
+
+        self.assertEqual("Failed in checking server 'CLUSTER_ID': "
+                         "Nova Error.", six.text_type(ex))
+
     @mock.patch.object(server.ServerProfile, 'do_delete')
     @mock.patch.object(server.ServerProfile, 'do_create')
     def test_do_recover_operation_is_none(self, mock_create, mock_delete):
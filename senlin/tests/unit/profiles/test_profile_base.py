@@ -14,6 +14,7 @@ import copy
 
 import mock
 from oslo_context import context as oslo_ctx
+from oslo_utils import timeutils
 import six
 
 from senlin.common import context as senlin_ctx
@@ -206,6 +207,82 @@ class TestProfileBase(base.SenlinTestCase):
 
         self.assertEqual(profile.id, res.id)
 
+    def test_load_cached(self):
+        obj = self._create_profile('test-profile-dd')
+        profile_id = obj.store(self.ctx)
+        res1 = pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        with mock.patch.object(pb.Profile, '_from_object') as mock_parse:
+            res2 = pb.Profile.load(self.ctx, profile_id=profile_id)
+            self.assertEqual(0, mock_parse.call_count)
+
+        self.assertEqual(profile_id, res2.id)
+        # callers get their own copies of the cached profile
+        self.assertIsNot(res1, res2)
+        res2.metadata['foo'] = 'bar'
+        self.assertEqual({}, res1.metadata)
+        self.assertEqual(1, pb._CACHE.hits)
+
+    def test_load_cached_diff_project(self):
+        obj = self._create_profile('test-profile-ee')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        new_ctx = utils.dummy_context(project='a-different-project')
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Profile.load,
+                          new_ctx, profile_id=profile_id)
+        res = pb.Profile.load(new_ctx, profile_id=profile_id,
+                              project_safe=False)
+        self.assertEqual(profile_id, res.id)
+
+    def test_load_cached_invalidated(self):
+        obj = self._create_profile('test-profile-ff')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        obj.name = 'new-name'
+        obj.store(self.ctx)
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual('new-name', res.name)
+
+        pb.Profile.delete(self.ctx, profile_id)
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Profile.load,
+                          self.ctx, profile_id=profile_id)
+
+    def test_load_with_profile_updated(self):
+        obj = self._create_profile('test-profile-gg')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        # the record was updated by another engine
+        po.Profile.update(self.ctx, profile_id,
+                          {'name': 'new-name',
+                           'updated_at': timeutils.utcnow(True)})
+        profile = po.Profile.get(self.ctx, profile_id)
+        res = pb.Profile.load(self.ctx, profile=profile)
+
+        self.assertEqual('new-name', res.name)
+
+    def test_load_by_id_updated_elsewhere(self):
+        obj = self._create_profile('test-profile-hh')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        # the record was updated by another engine, which could not
+        # invalidate the cache of this engine
+        po.Profile.update(self.ctx, profile_id,
+                          {'name': 'new-name',
+                           'updated_at': timeutils.utcnow(True)})
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual('new-name', res.name)
+
+        po.Profile.delete(self.ctx, profile_id)
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Profile.load,
+                          self.ctx, profile_id=profile_id)
+
     @mock.patch.object(po.Profile, 'get')
     def test_load_not_found(self, mock_get):
         mock_get.return_value = None
@@ -353,6 +430,43 @@ class TestProfileBase(base.SenlinTestCase):
         res_obj = profile.do_check.return_value
         self.assertEqual(res_obj, res)
 
+    @mock.patch.object(pb.Profile, 'load')
+    def test_check_objects(self, mock_load):
+        profile1 = mock.Mock()
+        profile1.do_check_batch.return_value = {'NODE_1': True,
+                                                'NODE_3': False}
+        profile2 = mock.Mock()
+        profile2.do_check_batch.return_value = {'NODE_2': False}
+        mock_load.side_effect = lambda ctx, profile_id: {
+            'P1': profile1, 'P2': profile2}[profile_id]
+        obj1 = mock.Mock(id='NODE_1', profile_id='P1')
+        obj2 = mock.Mock(id='NODE_2', profile_id='P2')
+        obj3 = mock.Mock(id='NODE_3', profile_id='P1')
+
+        res = pb.Profile.check_objects(self.ctx, [obj1, obj2, obj3])
+
+        self.assertEqual({'NODE_1': True, 'NODE_2': False, 'NODE_3': False},
+                         res)
+        self.assertEqual(2, mock_load.call_count)
+        profile1.do_check_batch.assert_called_once_with([obj1, obj3])
+        profile2.do_check_batch.assert_called_once_with([obj2])
+
+    @mock.patch.object(pb.Profile, 'load')
+    def test_check_objects_not_supported(self, mock_load):
+        profile = mock.Mock()
+        profile.do_check_batch.return_value = None
+        mock_load.return_value = profile
+        obj = mock.Mock(id='NODE_1', profile_id='P1')
+
+        res = pb.Profile.check_objects(self.ctx, [obj])
+
+        self.assertIsNone(res)
+
+    def test_do_check_batch(self):
+        profile = self._create_profile('test-profile')
+
+        self.assertIsNone(profile.do_check_batch([mock.Mock()]))
+
     @mock.patch.object(pb.Profile, 'load')
     def test_delete_object(self, mock_load):
         profile = mock.Mock()
@@ -0,0 +1,122 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from senlin.common import cache
+from senlin.tests.unit.common import base
+
+
+class ObjectCacheTest(base.SenlinTestCase):
+
+    def test_get_put(self):
+        c = cache.ObjectCache('test')
+        self.assertIsNone(c.get('K1'))
+
+        c.put('K1', 'V1', 'OBJ1')
+
+        self.assertEqual('OBJ1', c.get('K1'))
+        self.assertEqual('OBJ1', c.get('K1', 'V1'))
+        self.assertIsNone(c.get('K1', 'V2'))
+        self.assertEqual(2, c.hits)
+        self.assertEqual(2, c.misses)
+
+    def test_put_replace(self):
+        c = cache.ObjectCache('test')
+        c.put('K1', 'V1', 'OBJ1')
+        c.put('K1', 'V2', 'OBJ2')
+
+        self.assertEqual('OBJ2', c.get('K1', 'V2'))
+        self.assertEqual(1, c.stats()['entries'])
+
+    def test_evict_least_recently_used(self):
+        c = cache.ObjectCache('test', size=2)
+        c.put('K1', 'V', 'OBJ1')
+        c.put('K2', 'V', 'OBJ2')
+        # make K1 the most recently used one
+        c.get('K1')
+
+        c.put('K3', 'V', 'OBJ3')
+
+        self.assertEqual('OBJ1', c.get('K1'))
+        self.assertIsNone(c.get('K2'))
+        self.assertEqual('OBJ3', c.get('K3'))
+
+    def test_size_from_config(self):
+        cfg.CONF.set_override('object_cache_size', 1)
+        c = cache.ObjectCache('test')
+        c.put('K1', 'V', 'OBJ1')
+        c.put('K2', 'V', 'OBJ2')
+
+        self.assertIsNone(c.get('K1'))
+        self.assertEqual('OBJ2', c.get('K2'))
+
+    def test_size_from_other_option(self):
+        cfg.CONF.set_override('connection_pool_size', 1)
+        c = cache.ObjectCache('test', size_opt='connection_pool_size')
+        c.put('K1', 'V', 'OBJ1')
+        c.put('K2', 'V', 'OBJ2')
+
+        self.assertEqual(1, c.size)
+        self.assertIsNone(c.get('K1'))
+        self.assertEqual('OBJ2', c.get('K2'))
+
+    def test_disabled(self):
+        cfg.CONF.set_override('object_cache_size', 0)
+        c = cache.ObjectCache('test')
+        c.put('K1', 'V', 'OBJ1')
+
+        self.assertIsNone(c.get('K1'))
+
+    @mock.patch.object(timeutils, 'is_older_than')
+    def test_ttl(self, mock_older):
+        c = cache.ObjectCache('test')
+        c.put('K1', 'V', 'OBJ1', ttl=30)
+        c.put('K2', 'V', 'OBJ2')
+        mock_older.return_value = False
+
+        self.assertEqual('OBJ1', c.get('K1'))
+        mock_older.assert_called_once_with(mock.ANY, 30)
+
+        mock_older.return_value = True
+
+        self.assertIsNone(c.get('K1'))
+        self.assertEqual(1, c.misses)
+        self.assertEqual(1, c.stats()['entries'])
+        # entries without a ttl never expire
+        self.assertEqual('OBJ2', c.get('K2'))
+        self.assertEqual(2, mock_older.call_count)
+
+    def test_invalidate(self):
+        c = cache.ObjectCache('test')
+        c.put('K1', 'V', 'OBJ1')
+
+        c.invalidate('K1')
+        c.invalidate('K2')
+
+        self.assertIsNone(c.get('K1'))
+
+    def test_clear_and_stats(self):
+        c = cache.ObjectCache('test', size=10)
+        c.put('K1', 'V', 'OBJ1')
+        c.get('K1')
+        c.get('K2')
+
+        self.assertEqual({'name': 'test', 'entries': 1, 'size': 10,
+                          'hits': 1, 'misses': 1}, c.stats())
+
+        c.clear()
+
+        self.assertEqual({'name': 'test', 'entries': 0, 'size': 10,
+                          'hits': 0, 'misses': 0}, c.stats())
@@ -0,0 +1,70 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import collections
+
+from senlin.common import hash_ring
+from senlin.tests.unit.common import base
+
+
+class HashRingTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(HashRingTest, self).setUp()
+        self.keys = ['cluster-%s' % i for i in range(2000)]
+
+    def _assign(self, ring):
+        return dict((k, ring.get_node(k)) for k in self.keys)
+
+    def test_empty(self):
+        ring = hash_ring.HashRing([])
+
+        self.assertEqual([], ring.nodes)
+        self.assertIsNone(ring.get_node('cluster-1'))
+
+    def test_single_node(self):
+        ring = hash_ring.HashRing(['E1', 'E1'])
+
+        self.assertEqual(['E1'], ring.nodes)
+        self.assertEqual(set(['E1']), set(self._assign(ring).values()))
+
+    def test_stable(self):
+        ring1 = hash_ring.HashRing(['E1', 'E2', 'E3'])
+        ring2 = hash_ring.HashRing(['E3', 'E1', 'E2'])
+
+        self.assertEqual(self._assign(ring1), self._assign(ring2))
+
+    def test_balanced(self):
+        ring = hash_ring.HashRing(['E1', 'E2', 'E3', 'E4'])
+
+        load = collections.Counter(self._assign(ring).values())
+
+        self.assertEqual(4, len(load))
+        for count in load.values():
+            self.assertLess(abs(count - 500), 150)
+
+    def test_node_join(self):
+        before = self._assign(hash_ring.HashRing(['E1', 'E2', 'E3']))
+        after = self._assign(hash_ring.HashRing(['E1', 'E2', 'E3', 'E4']))
+
+        moved = [k for k in self.keys if before[k] != after[k]]
+        # only the keys taken over by the new node are moved
+        self.assertEqual(set(['E4']), set(after[k] for k in moved))
+        self.assertLess(len(moved), len(self.keys) * 0.35)
+
+    def test_node_leave(self):
+        before = self._assign(hash_ring.HashRing(['E1', 'E2', 'E3']))
+        after = self._assign(hash_ring.HashRing(['E1', 'E3']))
+
+        moved = [k for k in self.keys if before[k] != after[k]]
+        # only the keys of the node leaving are moved
+        self.assertEqual(set(['E2']), set(before[k] for k in moved))
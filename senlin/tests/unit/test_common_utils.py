@@ -53,6 +53,9 @@ class Response(object):
     def raise_for_status(self):
         pass
 
+    def close(self):
+        pass
+
 
 class UrlFetchTest(base.SenlinTestCase):
     def test_file_scheme_default_behaviour(self):
@@ -83,6 +86,19 @@ class UrlFetchTest(base.SenlinTestCase):
         self.patchobject(requests, 'get', return_value=response)
         self.assertEqual(data, utils.url_fetch(url))
 
+    def test_http_scheme_with_session(self):
+        url = 'http://example.com/somedata'
+        data = '{ "foo": "bar" }'
+        mock_get = self.patchobject(requests, 'get')
+        session = mock.Mock()
+        session.get.return_value = Response(data)
+
+        self.assertEqual(data, utils.url_fetch(url, session=session,
+                                               timeout=5))
+        session.get.assert_called_once_with(url, stream=True, verify=True,
+                                            timeout=5)
+        mock_get.assert_not_called()
+
     def test_https_scheme(self):
         url = 'https://example.com/somedata'
         data = '{ "foo": "bar" }'